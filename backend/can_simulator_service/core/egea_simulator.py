@@ -6,17 +6,28 @@ Folgt hexagonaler Architektur - Domain Layer
 """
 
 import logging
-import math
-import time
 import threading
 from dataclasses import dataclass
 from typing import Dict, List, Callable, Optional, Any
 from enum import Enum
 
+import numpy as np
+
+from common.suspension_core.clock import Clock, get_clock
+from common.suspension_core.egea.utils.quarter_car import QuarterCarEngine, QuarterCarParameters
+from common.suspension_core.egea.utils.sweep_synthesizer import SweepBlock, SweepModel, SweepSynthesizer
+
 from .config import TestConfiguration
 
 logger = logging.getLogger(__name__)
 
+# Signalmodelle der Dämpfungsprofile
+ENGINE_PHASE_MODEL = "phase_model"   # Phasenmodell φ(f) aus resonance_freq/min_phase
+ENGINE_QUARTER_CAR = "quarter_car"   # Viertelfahrzeug-ODE aus damping_ratio/rigidity
+
+QUARTER_CAR_SAMPLE_RATE = 1000.0     # Integrationsrate der Viertelfahrzeug-Simulation in Hz
+QUARTER_CAR_AD_PER_NEWTON = 0.15     # AD-Counts pro N dynamischer Reifenkraft
+
 
 class DampingQuality(Enum):
     """Dämpfungsqualitäts-Kategorien nach EGEA-Standard"""
@@ -24,6 +35,7 @@ class DampingQuality(Enum):
     GOOD = "good"           # φmin ≥ 35°
     ACCEPTABLE = "acceptable" # φmin ≥ 25°
     POOR = "poor"           # φmin < 25°
+    QUARTER_CAR = "quarter_car"  # φmin aus Viertelfahrzeug-Simulation
 
 
 @dataclass
@@ -33,6 +45,7 @@ class DampingParameters:
     min_phase: float          # Minimaler Phasenwinkel in Grad
     damping_ratio: float      # Dämpfungsverhältnis
     rigidity: float           # Reifensteifigkeit in N/mm
+    engine: str = ENGINE_PHASE_MODEL  # Signalmodell (ENGINE_PHASE_MODEL oder ENGINE_QUARTER_CAR)
 
 
 @dataclass
@@ -115,12 +128,26 @@ class EGEASimulator:
             min_phase=18.0,
             damping_ratio=0.15,
             rigidity=150.0
+        ),
+        DampingQuality.QUARTER_CAR.value: DampingParameters(
+            resonance_freq=11.8,  # Nur Referenzwerte, Signal aus damping_ratio/rigidity
+            min_phase=38.0,
+            damping_ratio=0.25,
+            rigidity=200.0,
+            engine=ENGINE_QUARTER_CAR
         )
     }
     
-    def __init__(self, config: Optional[TestConfiguration] = None):
-        """Initialisiert Simulator mit optionaler Konfiguration"""
+    def __init__(self, config: Optional[TestConfiguration] = None, clock: Optional[Clock] = None):
+        """
+        Initialisiert Simulator mit optionaler Konfiguration
+        
+        Args:
+            config: Testkonfiguration
+            clock: Zeitquelle (Standard: prozessweite Uhr, siehe suspension_core.clock)
+        """
         self.config = config or TestConfiguration()
+        self.clock = clock or get_clock()
         self.damping_params = self.DEFAULT_DAMPING_PARAMS.copy()
         
         # Zustandsvariablen
@@ -130,6 +157,8 @@ class EGEASimulator:
         self.test_duration = 0.0
         self.test_start_time = 0.0
         self.simulation_time = 0.0
+        self._synthesizer: Optional[SweepSynthesizer] = None
+        self._quarter_car: Optional[Dict[str, Any]] = None
         
         # Event-Handler (Observer Pattern)
         self._event_handlers: List[Callable[[EGEASimulationEvent], None]] = []
@@ -171,6 +200,7 @@ class EGEASimulator:
         """
         if quality in self.damping_params:
             self.current_damping_quality = quality
+            self._reset_signal_model()
             logger.info(f"Dämpfungsqualität gesetzt: {quality}")
         else:
             available = list(self.damping_params.keys())
@@ -179,6 +209,7 @@ class EGEASimulator:
     def add_custom_damping_params(self, quality: str, params: DampingParameters):
         """Fügt benutzerdefinierte Dämpfungsparameter hinzu"""
         self.damping_params[quality] = params
+        self._reset_signal_model()
         logger.info(f"Benutzerdefinierte Dämpfungsparameter hinzugefügt: {quality}")
     
     def start_test(self, side: str, duration: float):
@@ -202,8 +233,9 @@ class EGEASimulator:
         # Test-Parameter setzen
         self.current_side = side
         self.test_duration = duration
-        self.test_start_time = time.time()
+        self.test_start_time = self.clock.time()
         self.simulation_time = 0.0
+        self._reset_signal_model()
         self.test_active = True
         
         # Event senden
@@ -224,7 +256,7 @@ class EGEASimulator:
             # Event senden
             event = TestStoppedEvent(
                 side=self.current_side,
-                timestamp=time.time()
+                timestamp=self.clock.time()
             )
             self._emit_event(event)
             
@@ -240,7 +272,7 @@ class EGEASimulator:
         if not self.test_active:
             return None
         
-        current_time = time.time()
+        current_time = self.clock.time()
         elapsed = current_time - self.test_start_time
         
         # Test beenden wenn Dauer erreicht
@@ -272,76 +304,119 @@ class EGEASimulator:
             event = TestCompletedEvent(
                 side=side,
                 duration=duration,
-                timestamp=time.time()
+                timestamp=self.clock.time()
             )
             self._emit_event(event)
             
             logger.info(f"EGEA-Test abgeschlossen: {side}, {duration:.1f}s")
     
-    def _calculate_physics(self, current_time: float, elapsed: float) -> SimulationDataPoint:
+    def generate_block(self, count: int, start_elapsed: float = 0.0) -> SweepBlock:
         """
-        Berechnet physikalisch realistische Simulationswerte
+        Generiert einen Block von Samples mit der konfigurierten Abtastrate
         
-        Implementiert EGEA-konforme Phasenverschiebungsberechnung
-        """
-        # Aktuelle Frequenz (linearer Sweep)
-        progress = elapsed / self.test_duration
-        frequency = self.config.freq_start - progress * (self.config.freq_start - self.config.freq_end)
+        Unabhängig von der Wanduhr, z.B. für Lasttests oder um einen
+        kompletten Test vorab zu erzeugen.
         
-        # Dämpfungsparameter abrufen
+        Args:
+            count: Anzahl Samples
+            start_elapsed: Startzeit seit Teststart in s
+            
+        Returns:
+            SweepBlock mit Frequenz, Plattform, Kraft, Phase und DMS-Werten
+        """
+        return self._samples(start_elapsed + np.arange(count) / self.config.sample_rate)
+    
+    def _reset_signal_model(self):
+        """Verwirft Synthesizer und Simulation nach Änderung von Test oder Profil"""
+        self._synthesizer = None
+        self._quarter_car = None
+    
+    def _samples(self, elapsed) -> SweepBlock:
+        """Signale zu den Zeitpunkten elapsed nach dem Modell des aktuellen Profils"""
         damping = self.damping_params[self.current_damping_quality]
+        if damping.engine != ENGINE_QUARTER_CAR:
+            return self._sweep_synthesizer().samples(elapsed)
         
-        # Phasenverschiebung berechnen (EGEA-Modell)
-        freq_factor = abs(frequency - damping.resonance_freq) / 10.0
-        phase_shift = damping.min_phase + 15.0 * math.exp(-2 * freq_factor)
-        phase_rad = math.radians(phase_shift)
-        
-        # Plattformposition (Sinuswelle)
-        platform_pos = self.config.platform_amplitude * math.sin(
-            2 * math.pi * frequency * elapsed
-        )
-        
-        # Reifenkraft mit Phasenverschiebung
-        static_weight = 512  # AD-Mittelwert (0-1023 Bereich)
-        force_amplitude = 100 * (1.0 + 0.5 * math.exp(-freq_factor))
-        tire_force = static_weight + force_amplitude * math.sin(
-            2 * math.pi * frequency * elapsed - phase_rad
-        )
-        
-        # DMS-Werte generieren (4 Dehnungsmessstreifen)
-        dms_values = self._generate_dms_values(platform_pos, tire_force, static_weight)
+        simulation = self._quarter_car_simulation()
+        synthesizer = self._sweep_synthesizer()
+        t = np.atleast_1d(np.asarray(elapsed, dtype=np.float64))
+        frequency = synthesizer.frequency(t)
+        platform = np.interp(t, simulation["time"], simulation["platform_position"])
+        tire_force = np.interp(t, simulation["time"], simulation["tire_force"])
         
-        return SimulationDataPoint(
-            timestamp=current_time,
-            elapsed=elapsed,
+        return SweepBlock(
+            elapsed=t,
             frequency=frequency,
-            platform_position=platform_pos,
+            platform_position=platform,
             tire_force=tire_force,
-            phase_shift=phase_shift,
-            dms_values=dms_values
+            phase_shift=simulation["parameters"].phase_shift(frequency),
+            dms=synthesizer.dms_values(platform, tire_force)
         )
     
-    def _generate_dms_values(self, platform_pos: float, tire_force: float, static_weight: float) -> List[int]:
+    def _quarter_car_simulation(self) -> Dict[str, Any]:
         """
-        Generiert realistische DMS-Werte (0-1023 Bereich)
+        Simuliert den kompletten Test mit dem Viertelfahrzeugmodell
         
-        Args:
-            platform_pos: Plattformposition in mm
-            tire_force: Reifenkraft (normiert)
-            static_weight: Statisches Gewicht
+        Die ODE ist zustandsbehaftet, daher wird der Test einmal vorab mit
+        QUARTER_CAR_SAMPLE_RATE integriert und danach interpoliert.
+        """
+        if self._quarter_car is None:
+            damping = self.damping_params[self.current_damping_quality]
+            parameters = QuarterCarParameters.from_damping_ratio(
+                damping.damping_ratio,
+                tire_stiffness=damping.rigidity * 1000.0  # N/mm → N/m
+            )
+            model = self._sweep_synthesizer().model
+            engine = QuarterCarEngine(sample_rate=max(self.config.sample_rate, QUARTER_CAR_SAMPLE_RATE))
+            result = engine.simulate_sweep(parameters, model)
             
-        Returns:
-            Liste von 4 DMS-Werten [0-1023]
+            # Dynamische Reifenkraft in den AD-Bereich um den Ruhewert abbilden
+            dynamic_force = result.tire_force[0] - result.static_weight[0]
+            self._quarter_car = {
+                "parameters": parameters,
+                "time": result.time,
+                "platform_position": result.platform_position * 1000.0,  # m → mm
+                "tire_force": model.static_force + dynamic_force * QUARTER_CAR_AD_PER_NEWTON
+            }
+            logger.info(
+                f"Viertelfahrzeug simuliert: D={parameters.damping_ratio:.2f}, "
+                f"{len(result)} Samples"
+            )
+        return self._quarter_car
+    
+    def _sweep_synthesizer(self) -> SweepSynthesizer:
+        """Liefert den Synthesizer für Testdauer und Dämpfungsqualität"""
+        if self._synthesizer is None:
+            damping = self.damping_params[self.current_damping_quality]
+            model = SweepModel(
+                freq_start=self.config.freq_start,
+                freq_end=self.config.freq_end,
+                duration=self.test_duration or self.config.default_duration,
+                platform_amplitude=self.config.platform_amplitude,
+                static_force=512.0,  # AD-Mittelwert (0-1023 Bereich)
+                resonance_freq=damping.resonance_freq,
+                min_phase=damping.min_phase
+            )
+            self._synthesizer = SweepSynthesizer(model, sample_rate=self.config.sample_rate)
+        return self._synthesizer
+    
+    def _calculate_physics(self, current_time: float, elapsed: float) -> SimulationDataPoint:
         """
-        # DMS1 & DMS2: Plattform-Sensoren (leicht unterschiedlich kalibriert)
-        dms1 = int(max(0, min(1023, static_weight + platform_pos * 20)))
-        dms2 = int(max(0, min(1023, static_weight + platform_pos * 18)))
+        Berechnet physikalisch realistische Simulationswerte
         
-        # DMS3 & DMS4: Reifen-Kraftsensoren
-        dms3 = int(max(0, min(1023, tire_force)))
-        dms4 = int(max(0, min(1023, tire_force * 0.95)))  # Leichte Asymmetrie
+        Implementiert EGEA-konforme Phasenverschiebungsberechnung
+        """
+        sample = self._samples(elapsed)
         
-        return [dms1, dms2, dms3, dms4]
+        return SimulationDataPoint(
+            timestamp=current_time,
+            elapsed=elapsed,
+            frequency=float(sample.frequency[0]),
+            platform_position=float(sample.platform_position[0]),
+            tire_force=float(sample.tire_force[0]),
+            phase_shift=float(sample.phase_shift[0]),
+            dms_values=sample.dms[0].tolist()
+        )
     
     def get_current_status(self) -> Dict[str, Any]:
         """
@@ -354,7 +429,7 @@ class EGEASimulator:
             "test_active": self.test_active,
             "current_side": self.current_side,
             "test_duration": self.test_duration,
-            "elapsed_time": time.time() - self.test_start_time if self.test_active else 0.0,
+            "elapsed_time": self.clock.time() - self.test_start_time if self.test_active else 0.0,
             "damping_quality": self.current_damping_quality,
             "config": {
                 "freq_start": self.config.freq_start,
@@ -17,6 +17,9 @@ from collections import deque
 
 import numpy as np
 
+from common.suspension_core.clock import get_clock
+from common.suspension_core.egea.utils.sweep_synthesizer import SweepModel, SweepSynthesizer
+
 # Versuche python-can zu importieren, falle zurück auf eigene Implementation wenn nicht verfügbar
 try:
     import can
@@ -47,16 +50,18 @@ class CanSimulator:
     # EUSAMA-Protokoll Dokumentation spezifiziert 10ms (100 Hz)
     DEFAULT_MESSAGE_INTERVAL = 0.01  # 100 Hz statt 1000 Hz
 
-    def __init__(self, profile="eusama", message_interval=None):
+    def __init__(self, profile="eusama", message_interval=None, clock=None):
         """
         Initialisiert den CAN-Simulator mit dem gewählten Protokollprofil.
 
         Args:
             profile: Name des Protokollprofils ("eusama" oder "asa")
             message_interval: Zeit zwischen Nachrichten in Sekunden
+            clock: Zeitquelle für Takt und Zeitstempel (Standard: prozessweite Uhr)
         """
         self.profile = profile.lower()
         self.message_interval = message_interval or self.DEFAULT_MESSAGE_INTERVAL
+        self.clock = clock or get_clock()
         self.running = False
         self.thread = None
         self.callbacks = []
@@ -83,8 +88,10 @@ class CanSimulator:
 
         # Für Simulation realistische Schwingungsmuster
         self.simulation_time = 0.0
-        self.freq_sweep = {"current": 25.0, "target": 6.0, "duration": 10.0}
+        self.freq_sweep = {"start": 25.0, "current": 25.0, "target": 6.0, "duration": 10.0}
         self.phase_shift = {"left": 45.0, "right": 42.0}  # Grad (gut: > 35°)
+        self._sweeps = {}  # Seite → SweepSynthesizer
+        self._rng = np.random.default_rng()
 
         # Protokollspezifische Konstanten
         if self.profile == "eusama":
@@ -165,17 +172,22 @@ class CanSimulator:
         """
         try:
             # Nachrichtenbatch generieren
-            next_batch_time = time.time()
+            next_batch_time = self.clock.time()
             batch_interval = self.message_interval * self.batch_size
 
             while self.running and not self.stop_event.is_set():
                 # Aktuellen Batch generieren wenn es Zeit ist
-                current_time = time.time()
+                current_time = self.clock.time()
 
                 if current_time >= next_batch_time:
                     # Zeit für Generierung messen (Performance-Monitoring)
                     gen_start_time = time.time()
 
+                    # DMS-Werte des ganzen Batches blockweise synthetisieren
+                    if self.profile == "eusama":
+                        left_block = self._generate_dms_block("left", self.batch_size)
+                        right_block = self._generate_dms_block("right", self.batch_size)
+
                     # Simulationszeit aktualisieren
                     self.simulation_time += batch_interval
 
@@ -190,14 +202,11 @@ class CanSimulator:
                         if self.motor_runtime_right <= 0:
                             self.right_motor_running = False
 
-                    # Frequenzsweep aktualisieren, wenn ein Motor läuft
+                    # Aktuelle Sweepfrequenz für Statusabfragen, wenn ein Motor läuft
                     if self.left_motor_running or self.right_motor_running:
-                        # Linear von freq_start bis freq_end über die angegebene Dauer
-                        progress = min(1.0, self.simulation_time / self.freq_sweep["duration"])
-                        current_freq = self.freq_sweep["current"] - progress * (
-                            self.freq_sweep["current"] - self.freq_sweep["target"]
+                        self.freq_sweep["current"] = float(
+                            self._sweep_synthesizer("left").frequency(self.simulation_time)
                         )
-                        self.freq_sweep["current"] = current_freq
 
                     # Generiere einen ganzen Batch von CAN-Nachrichten
                     batch_messages = []
@@ -207,7 +216,9 @@ class CanSimulator:
 
                         # Generiere einen Satz CAN-Nachrichten basierend auf dem Profil
                         if self.profile == "eusama":
-                            messages = self._generate_eusama_messages(batch_time)
+                            messages = self._generate_eusama_messages(
+                                batch_time, left_block[i], right_block[i]
+                            )
                         elif self.profile == "asa":
                             messages = self._generate_asa_messages(batch_time)
                         else:
@@ -247,10 +258,10 @@ class CanSimulator:
 
                 # OPTIMIERUNG: Dynamisches Sleep-Intervall
                 # Berechne Zeit bis zum nächsten Batch
-                sleep_time = max(0.001, next_batch_time - time.time())
+                sleep_time = max(0.001, next_batch_time - self.clock.time())
 
-                # Verwende Event.wait statt time.sleep - unterbrechbar bei Stop
-                self.stop_event.wait(timeout=min(sleep_time, 0.1))
+                # Verwende Event.wait statt time.sleep - unterbrechbar bei Stop, in Simulationszeit
+                self.clock.wait(self.stop_event, timeout=min(sleep_time, 0.1))
 
         except Exception as e:
             logger.error(f"Fehler in der Simulationsschleife: {e}")
@@ -259,46 +270,40 @@ class CanSimulator:
             logger.error(traceback.format_exc())
             self.running = False
 
-    def _generate_eusama_messages(self, timestamp=None):
+    def _generate_eusama_messages(self, timestamp=None, left_dms=None, right_dms=None):
         """
         Generiert einen Satz EUSAMA-CAN-Nachrichten.
 
         Args:
             timestamp: Optionaler Zeitstempel für die Nachrichten
+            left_dms: Vorberechnete DMS-Werte links (4 Werte, None = neu berechnen)
+            right_dms: Vorberechnete DMS-Werte rechts (4 Werte, None = neu berechnen)
 
         Returns:
             list: Liste mit generierten CAN-Nachrichten
         """
         # Standardzeitstempel wenn nicht angegeben
         if timestamp is None:
-            timestamp = time.time()
+            timestamp = self.clock.time()
 
         # Generiere DMS-Werte
-        left_dms = self._generate_dms_values("left")
-        right_dms = self._generate_dms_values("right")
-
-        # Erzeuge Nachricht für linke Seite (DMS 1-4)
-        msg1_data = bytearray(8)
-        for i in range(4):
-            msg1_data[i * 2] = (left_dms[i] >> 8) & 0xFF  # High Byte
-            msg1_data[i * 2 + 1] = left_dms[i] & 0xFF  # Low Byte
+        if left_dms is None:
+            left_dms = self._generate_dms_values("left")
+        if right_dms is None:
+            right_dms = self._generate_dms_values("right")
 
+        # Erzeuge Nachricht für linke Seite (DMS 1-4, je High/Low Byte)
         msg1 = self._create_message(
             arbitration_id=self.RAW_DATA_LEFT_ID,
-            data=bytes(msg1_data),
+            data=np.asarray(left_dms, dtype=">u2").tobytes(),
             is_extended_id=True,
             timestamp=timestamp,
         )
 
         # Erzeuge Nachricht für rechte Seite (DMS 5-8)
-        msg2_data = bytearray(8)
-        for i in range(4):
-            msg2_data[i * 2] = (right_dms[i] >> 8) & 0xFF  # High Byte
-            msg2_data[i * 2 + 1] = right_dms[i] & 0xFF  # Low Byte
-
         msg2 = self._create_message(
             arbitration_id=self.RAW_DATA_RIGHT_ID,
-            data=bytes(msg2_data),
+            data=np.asarray(right_dms, dtype=">u2").tobytes(),
             is_extended_id=True,
             timestamp=timestamp,
         )
@@ -333,7 +338,7 @@ class CanSimulator:
         """
         # Standardzeitstempel wenn nicht angegeben
         if timestamp is None:
-            timestamp = time.time()
+            timestamp = self.clock.time()
 
         # Simuliere Bremskräfte und Geschwindigkeiten
         left_brake = int(random.uniform(1000, 3000))
@@ -396,7 +401,7 @@ class CanSimulator:
         """
         # Standardzeitstempel wenn nicht angegeben
         if timestamp is None:
-            timestamp = time.time()
+            timestamp = self.clock.time()
 
         arbitration_id = random.randint(0x100, 0x7FF)
         data_length = random.randint(1, 8)
@@ -414,7 +419,6 @@ class CanSimulator:
     def _generate_dms_values(self, side):
         """
         Generiert simulierte DMS-Werte basierend auf dem Zustand.
-        OPTIMIERTE Version mit NumPy für bessere Performance.
 
         Args:
             side: "left" oder "right"
@@ -422,55 +426,46 @@ class CanSimulator:
         Returns:
             Liste mit 4 DMS-Werten im Bereich 0-1023
         """
-        is_motor_running = self.left_motor_running if side == "left" else self.right_motor_running
-
-        base_value = 512  # Mittelwert des AD-Bereichs (0-1023)
-
-        if is_motor_running:
-            # Aktuelle Frequenz und Phasenverschiebung verwenden
-            freq = self.freq_sweep["current"]
-            phase_deg = self.phase_shift[side]
-            phase_rad = phase_deg * np.pi / 180.0
-
-            # Zeit für den aktuellen Datenpunkt
-            t = self.simulation_time
+        return self._generate_dms_block(side, 1)[0].tolist()
 
-            # Oszillation berechnen - OPTIMIERUNG: Einfachere Formel
-            # Amplitude entsprechend der Frequenz anpassen - mehr Amplitude bei niedrigerer Frequenz
-            amplitude_factor = 1.0 - (freq - 6.0) / 20.0  # Normalisierter Faktor (0-1)
-            amplitude = 200 * amplitude_factor  # Basisamplitude von 200 Einheiten
-
-            # Sinus für Plattformposition, verschobener Sinus für Kraft
-            platform_pos = base_value + amplitude * np.sin(2 * np.pi * freq * t)
-            tire_force = base_value + amplitude * np.sin(2 * np.pi * freq * t - phase_rad)
-
-            # OPTIMIERUNG: NumPy-Vektorisierung statt manuelle Berechnung für Rauschen
-            # Erzeuge vier Werte mit etwas Rauschen für die DMS-Sensoren
-            rng = np.random.default_rng()
-            noise_factor = 0.05  # 5% Rauschen
-            noise_amplitude = amplitude * noise_factor
-
-            # Rauschen für die vier DMS-Sensoren
-            noise = rng.normal(0, noise_amplitude, 4)
-
-            # Die ersten beiden Werte basieren auf der Plattformposition
-            dms1 = int(platform_pos + noise[0])
-            dms2 = int(platform_pos + noise[1])
+    def _generate_dms_block(self, side, count):
+        """
+        Generiert simulierte DMS-Werte für count aufeinanderfolgende Nachrichten.
+        OPTIMIERTE Version: ein NumPy-Block statt Berechnung pro Nachricht.
 
-            # Die letzten beiden Werte basieren auf der Reifenkraft
-            dms3 = int(tire_force + noise[2])
-            dms4 = int(tire_force + noise[3])
+        Args:
+            side: "left" oder "right"
+            count: Anzahl Nachrichten ab der aktuellen Simulationszeit
 
-            values = [dms1, dms2, dms3, dms4]
+        Returns:
+            Array (count, 4) mit DMS-Werten im Bereich 0-1023
+        """
+        is_motor_running = self.left_motor_running if side == "left" else self.right_motor_running
 
-        else:
-            # Ruhewerte mit leichtem Rauschen
-            rng = np.random.default_rng()
-            noise = rng.integers(-10, 11, 4)  # Rauschen im Bereich -10 bis +10
-            values = [base_value + n for n in noise]
+        if is_motor_running:
+            # Frequenzsweep mit fester Phasenverschiebung pro Seite, 5% Rauschen
+            times = self.simulation_time + np.arange(count) * self.message_interval
+            return self._sweep_synthesizer(side).samples(times).dms
 
-        # Sicherstellen, dass die Werte im gültigen Bereich liegen
-        return [max(0, min(val, 1023)) for val in values]
+        # Ruhewerte mit leichtem Rauschen im Bereich -10 bis +10
+        base_value = 512  # Mittelwert des AD-Bereichs (0-1023)
+        return (base_value + self._rng.integers(-10, 11, (count, 4))).astype(np.uint16)
+
+    def _sweep_synthesizer(self, side):
+        """Liefert den Sweep-Synthesizer einer Seite (nach Motorstart neu aufgebaut)."""
+        synthesizer = self._sweeps.get(side)
+        if synthesizer is None:
+            model = SweepModel(
+                freq_start=self.freq_sweep["start"],
+                freq_end=self.freq_sweep["target"],
+                duration=self.freq_sweep["duration"],
+                min_phase=self.phase_shift[side],
+                phase_boost=0.0,
+                dms_noise=5.0,
+            )
+            synthesizer = SweepSynthesizer(model, sample_rate=1.0 / self.message_interval)
+            self._sweeps[side] = synthesizer
+        return synthesizer
 
     def process_message(self, arbitration_id, data, is_extended_id=False):
         """
@@ -568,7 +563,8 @@ class CanSimulator:
         """
         # Simulationszeit und Frequenzsweep zurücksetzen
         self.simulation_time = 0.0
-        self.freq_sweep["current"] = 25.0  # Startfrequenz zurücksetzen
+        self.freq_sweep["current"] = self.freq_sweep["start"]  # Startfrequenz zurücksetzen
+        self._sweeps.clear()
 
         if side.lower() == "left" or side.lower() == "both":
             self.left_motor_running = True
@@ -613,7 +609,7 @@ class CanSimulator:
         """
         # Standardzeitstempel wenn nicht angegeben
         if timestamp is None:
-            timestamp = time.time()
+            timestamp = self.clock.time()
 
         if CAN_AVAILABLE:
             return can.Message(
@@ -14,7 +14,6 @@ import asyncio
 import logging
 import signal
 import sys
-import time
 from pathlib import Path
 import itertools
 
@@ -173,8 +172,8 @@ class SimulatorService:
                 if self.mqtt_adapter:
                     self.mqtt_adapter.publish_heartbeat()
 
-                # Kurze Pause (100Hz Sample Rate)
-                await asyncio.sleep(0.01)  # 10ms = 100Hz
+                # Kurze Pause (100Hz Sample Rate, in Simulationszeit)
+                await self.simulator.clock.async_sleep(0.01)  # 10ms = 100Hz
 
         except Exception as e:
             logger.error(f"Fehler im Service-Loop: {e}")
@@ -202,18 +201,18 @@ class SimulatorService:
 
                 # Dämpfungsqualität setzen
                 self.simulator.set_damping_quality(quality)
-                await asyncio.sleep(0.5)
+                await self.simulator.clock.async_sleep(0.5)
 
                 # Test starten
                 self.simulator.start_test(side, self.test_duration)
 
                 # Service-Loop während Test läuft
-                test_start = time.time()
+                test_start = self.simulator.clock.time()
                 while self.simulator.test_active and self.running:
                     # Simulationsdaten generieren
                     data_point = self.simulator.generate_data_point()
                     if data_point:
-                        elapsed = time.time() - test_start
+                        elapsed = self.simulator.clock.time() - test_start
                         # Live-Anzeige alle 2 Sekunden
                         if int(elapsed) % 2 == 0:
                             logger.info(
@@ -224,7 +223,7 @@ class SimulatorService:
                     if self.mqtt_adapter:
                         self.mqtt_adapter.publish_heartbeat()
 
-                    await asyncio.sleep(0.1)  # 10Hz Update
+                    await self.simulator.clock.async_sleep(0.1)  # 10Hz Update
 
                 logger.info(f"✅ Test #{test_count} abgeschlossen: {quality} {side}")
 
@@ -233,7 +232,7 @@ class SimulatorService:
 
                 # Pause zwischen Tests
                 logger.info(f"⏳ Pause {self.endless_pause}s...")
-                await asyncio.sleep(self.endless_pause)
+                await self.simulator.clock.async_sleep(self.endless_pause)
 
         except Exception as e:
             logger.error(f"Fehler in Endlos-Tests: {e}")
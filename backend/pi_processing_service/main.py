@@ -4,66 +4,55 @@ Pi Processing Service - Hauptmodul
 Hauptservice für Post-Processing der Fahrwerkstester-Messdaten
 
 Funktionalitäten:
-- Empfang kompletter Messdaten über MQTT
+- Empfang kompletter Messdaten über MQTT (chunkweise mit Wiederholung fehlender Chunks)
+- Inkrementelle Phase-Shift-Analyse mit Per-Zyklus-Ergebnissen während des Tests
 - Phase-Shift-Berechnung nach Testende
 - Sinuskurven-Generierung für GUI
 - Robuste Queue-basierte Verarbeitung
+- Archivierung von Rohsignalen und Ergebnis jedes Tests (TestArchive)
 """
 
 import asyncio
 import logging
 import signal
 import sys
-import time
-from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Union
 import numpy as np
 
 # Füge das Common-Library-Verzeichnis zum Python-Pfad hinzu
 sys.path.append(str(Path(__file__).parent.parent.parent / "common"))
 
 # Zentrale suspension_core Imports (KORRIGIERT)
-from suspension_core.mqtt import MqttHandler
+from suspension_core.mqtt import MqttHandler, SampleBatch
+from suspension_core.mqtt.chunked_transfer import ChunkedDatasetReceiver, ReceivedDataset
 from suspension_core.mqtt.service import MqttServiceBase, MqttTopics
 from suspension_core.config import ConfigManager
+from suspension_core.archive import TestArchive, record_to_dict
+from suspension_core.clock import Clock, get_clock
+from suspension_core.tracing import (
+    STAGE_ANALYSIS_END,
+    STAGE_ANALYSIS_START,
+    STAGE_QUEUE_ENTER,
+    STAGE_QUEUE_EXIT,
+    STAGE_RESULT_PUBLISH,
+)
 
 # Lokale Imports (KORRIGIERT)
 from .processing.phase_shift_calculator import PhaseShiftCalculator
 from .processing.data_validator import DataValidator
+from .processing.sample_store import TestSampleStore
+from .processing.post_processor import (
+    ProcessingTask,
+    ProcessingResult,
+    evaluate_egea_result,
+)
+from .processing.worker_pool import ProcessingWorkerPool, MODE_PROCESS
 from .utils.signal_processing import SignalProcessor
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class ProcessingTask:
-    """Container für Processing-Aufgaben"""
-
-    task_id: str
-    position: str  # front_left, front_right, etc.
-    raw_data: Dict[str, Any]
-    timestamp: float
-    priority: int = 0  # 0 = höchste Priorität
-
-    def __lt__(self, other):
-        """Für Priority-Queue-Sortierung"""
-        return self.priority < other.priority
-
-
-@dataclass
-class ProcessingResult:
-    """Container für Processing-Ergebnisse"""
-
-    task_id: str
-    position: str
-    success: bool
-    results: Dict[str, Any]
-    processing_time: float
-    timestamp: float
-    error_message: Optional[str] = None
-
-
 class PiProcessingService(MqttServiceBase):
     """
     Modernisierter Pi Processing Service mit einheitlicher MQTT-Integration
@@ -76,19 +65,23 @@ class PiProcessingService(MqttServiceBase):
     - Saubere Async/Sync-Bridge ohne Event-Loop-Probleme
     """
 
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, clock: Optional[Clock] = None):
         """
         Initialisiert den Pi Processing Service
 
         Args:
             config_path: Pfad zur Konfigurationsdatei
+            clock: Uhr für Zeitstempel und Test-Timeouts (Standard: prozessweite Uhr)
         """
         # Konfiguration laden und MqttServiceBase initialisieren
         config = ConfigManager(config_path)
         super().__init__("pi_processing", config)
+        self.clock = clock or get_clock()
 
         # Prozessoren initialisieren
-        self.phase_shift_calculator = PhaseShiftCalculator()
+        self.phase_shift_calculator = PhaseShiftCalculator({
+            "analysis_cache_dir": self.config.get("processing.analysis_cache.directory"),
+        })
         self.data_validator = DataValidator()
         self.signal_processor = SignalProcessor()
 
@@ -96,6 +89,33 @@ class PiProcessingService(MqttServiceBase):
         self.processing_queue = asyncio.PriorityQueue()
         self.result_callbacks: Dict[str, Callable] = {}
 
+        # Worker-Pool für die Auswertung (Prozesse, optional Threads)
+        self.worker_pool = ProcessingWorkerPool(
+            mode=self.config.get("processing.workers.mode", MODE_PROCESS),
+            max_workers=self.config.get("processing.workers.max_workers"),
+        )
+        # Position -> Future der zuletzt eingereihten Publikation (Reihenfolge pro Position)
+        self._position_tails: Dict[str, asyncio.Future] = {}
+
+        # Empfänger für chunkweise übertragene Datasets der Hardware Bridge
+        self.dataset_receiver = ChunkedDatasetReceiver(
+            self.mqtt.publish,
+            retransmit_timeout=self.config.get("processing.dataset_transfer.retransmit_timeout", 2.0),
+            max_retransmits=self.config.get("processing.dataset_transfer.max_retransmits", 3),
+            clock=self.clock,
+        )
+
+        # Archiv für Rohsignale und Ergebnisse abgeschlossener Tests (opt-in, in pi_processing_config.yaml aktiviert)
+        self.archive: Optional[TestArchive] = None
+        if self.config.get("processing.archive.enabled", False):
+            try:
+                self.archive = TestArchive(
+                    self.config.get("processing.archive.directory", "/var/lib/fahrwerkstester/archive")
+                )
+            except Exception as e:
+                logger.error(f"Test-Archiv konnte nicht geöffnet werden: {e}")
+        self.phase_threshold = self.config.get("processing.phase_shift.phase_threshold", 35.0)
+
         # Test-Daten-Sammlung für Post-Processing
         self.active_tests: Dict[str, Dict[str, Any]] = {}  # test_id -> gesammelte Daten
         self.test_timeouts: Dict[str, float] = {}  # test_id -> timeout timestamp
@@ -103,6 +123,7 @@ class PiProcessingService(MqttServiceBase):
         # Service-Status
         self.tasks_processed = 0
         self.tasks_failed = 0
+        self.live_periods_published = 0
         self.service_start_time = None
 
         # Graceful Shutdown Handler
@@ -118,8 +139,16 @@ class PiProcessingService(MqttServiceBase):
         self.register_topic_handler(MqttTopics.TEST_COMPLETED, self.handle_test_completed)
 
         # Data Input - verschiedene Datenquellen
-        self.register_topic_handler(MqttTopics.MEASUREMENT_PROCESSED, self.handle_measurement_data)
-        self.register_topic_handler(MqttTopics.RAW_DATA_COMPLETE, self.handle_raw_data)
+        # (Binär-Frames auf "<topic>/bin" werden als SampleBatch blockweise übernommen)
+        self.register_topic_handler(
+            MqttTopics.MEASUREMENT_PROCESSED, self.handle_measurement_data, accepts_batches=True
+        )
+        self.register_topic_handler(
+            MqttTopics.RAW_DATA_COMPLETE, self.handle_raw_data, accepts_batches=True
+        )
+        self.register_topic_handler(MqttTopics.RAW_DATA_MANIFEST, self.handle_dataset_manifest)
+        self.register_topic_handler(MqttTopics.RAW_DATA_CHUNK, self.handle_dataset_chunk)
+        self.register_topic_handler(MqttTopics.RAW_DATA_COMMIT, self.handle_dataset_commit)
 
         # Commands
         self.register_topic_handler(MqttTopics.PI_PROCESSING_COMMAND, self.handle_command)
@@ -129,6 +158,7 @@ class PiProcessingService(MqttServiceBase):
         logger.info("   - suspension/test/completed (für Test-Completion)")
         logger.info("   - suspension/measurements/processed (für Live-Daten)")
         logger.info("   - suspension/raw_data/complete (für Rohdaten)")
+        logger.info("   - suspension/raw_data/complete/{manifest,chunk,commit} (für Dataset-Übertragung)")
         logger.info("   - suspension/processing/command (für Service-Commands)")
 
     def _signal_handler(self, signum, frame):
@@ -139,7 +169,7 @@ class PiProcessingService(MqttServiceBase):
     async def start(self):
         """Startet den Processing Service mit neuer MqttServiceBase"""
         logger.info("Starte Pi Processing Service...")
-        self.service_start_time = time.time()
+        self.service_start_time = self.clock.time()
 
         try:
             # MQTT-Integration starten (ersetzt manuelle Verbindung)
@@ -147,6 +177,9 @@ class PiProcessingService(MqttServiceBase):
                 logger.error("MQTT-Verbindung fehlgeschlagen")
                 return False
 
+            # Worker vor dem ersten Test starten
+            self.worker_pool.start()
+
             # Status senden
             await self.publish_status("ready", {"message": "Pi Processing Service ready"})
 
@@ -171,6 +204,9 @@ class PiProcessingService(MqttServiceBase):
         # MQTT-Integration stoppen (ersetzt manuelle Trennung)
         await self.stop_mqtt()
 
+        # Worker beenden
+        self.worker_pool.shutdown(wait=False)
+
         logger.info("Pi Processing Service gestoppt")
 
 
@@ -214,17 +250,22 @@ class PiProcessingService(MqttServiceBase):
         """
         logger.info(f"Starte Datensammlung für Test: {test_id}")
 
+        # Spaltenspeicher aus erwarteter Dauer und Abtastrate vorab dimensionieren
+        duration = test_info.get("duration", 60)
+        sample_rate = test_info.get("sample_rate", self.phase_shift_calculator.sample_rate)
+
         self.active_tests[test_id] = {
             "test_id": test_id,
             "position": test_info.get("position", "unknown"),
-            "start_time": time.time(),
-            "data_points": [],
+            "start_time": self.clock.time(),
+            "samples": TestSampleStore.for_duration(duration, sample_rate),
             "metadata": test_info,
+            # "analyzer" wird mit dem ersten Datenpunkt (statisches Gewicht) erstellt
         }
 
         # Timeout setzen (falls Test nicht ordnungsgemäß beendet wird)
-        timeout_duration = test_info.get("duration", 60) + 30  # 30s Puffer
-        self.test_timeouts[test_id] = time.time() + timeout_duration
+        timeout_duration = duration + 30  # 30s Puffer
+        self.test_timeouts[test_id] = self.clock.time() + timeout_duration
 
     async def _finalize_test_data_collection(self, test_id: str):
         """
@@ -239,11 +280,14 @@ class PiProcessingService(MqttServiceBase):
 
         test_data = self.active_tests[test_id]
         logger.info(
-            f"Beende Datensammlung für Test: {test_id} mit {len(test_data['data_points'])} Datenpunkten"
+            f"Beende Datensammlung für Test: {test_id} mit {len(test_data['samples'])} Datenpunkten"
         )
 
+        # Vorläufiges Ergebnis aus der inkrementellen Analyse sofort publizieren
+        await self._publish_incremental_verdict(test_data)
+
         # Alle gesammelten Daten zu einem Processing-Task zusammenfassen
-        if len(test_data["data_points"]) > 0:
+        if len(test_data["samples"]) > 0:
             # Erstelle Processing-Task mit allen gesammelten Daten
             combined_data = self._combine_test_data_points(test_data)
 
@@ -251,11 +295,12 @@ class PiProcessingService(MqttServiceBase):
                 task_id=test_id,
                 position=test_data["position"],
                 raw_data=combined_data,
-                timestamp=time.time(),
+                timestamp=self.clock.time(),
                 priority=0,
             )
 
             # Task in Queue einreihen
+            self.tracer.stamp(test_id, STAGE_QUEUE_ENTER)
             await self.processing_queue.put((task.priority, task))
 
             logger.info(f"Post-Processing-Task erstellt: {test_id}")
@@ -267,62 +312,51 @@ class PiProcessingService(MqttServiceBase):
 
     def _combine_test_data_points(self, test_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Kombiniert alle Datenpunkte eines Tests zu einem einzigen Dataset
+        Stellt das Dataset eines Tests aus dem Spaltenspeicher zusammen
 
         Args:
             test_data: Gesammelte Test-Daten
 
         Returns:
-            Kombiniertes Dataset für Processing
+            Kombiniertes Dataset für Processing (Zeitreihen als Array-Views ohne Kopie)
         """
-        data_points = test_data["data_points"]
+        samples: TestSampleStore = test_data["samples"]
 
-        if not data_points:
+        if len(samples) == 0:
             return {}
 
-        # Listen für alle Zeitreihen-Daten
-        time_series = []
-        platform_positions = []
-        tire_forces = []
-        frequencies = []
-        phase_shifts = []
-        dms_values_series = []
-
-        # Alle Datenpunkte zusammenfassen
-        for point in data_points:
-            time_series.append(point.get("elapsed", 0))
-            platform_positions.append(point.get("platform_position", 0))
-            tire_forces.append(point.get("tire_force", 0))
-            frequencies.append(point.get("frequency", 0))
-            phase_shifts.append(point.get("phase_shift", 0))
-
-            if "dms_values" in point:
-                dms_values_series.append(point["dms_values"])
+        columns = samples.columns()
 
         # Kombiniertes Dataset
         combined_data = {
             "test_id": test_data["test_id"],
             "position": test_data["position"],
             "start_time": test_data["start_time"],
-            "end_time": time.time(),
-            "duration": time.time() - test_data["start_time"],
+            "end_time": self.clock.time(),
+            "duration": self.clock.time() - test_data["start_time"],
             # Zeitreihen-Daten
-            "time_data": time_series,
-            "platform_position_data": platform_positions,
-            "tire_force_data": tire_forces,
-            "frequency_data": frequencies,
-            "phase_shift_data": phase_shifts,
-            "dms_data": dms_values_series,
+            "time_data": columns["time"],
+            "platform_position_data": columns["platform_position"],
+            "tire_force_data": columns["tire_force"],
+            "frequency_data": columns["frequency"],
+            "phase_shift_data": columns["phase_shift"],
+            "dms_data": columns["dms"],
             # Metadaten
-            "sample_count": len(time_series),
-            "static_weight": data_points[0].get("static_weight", 512)
-            if data_points
-            else 512,
+            "sample_count": len(samples),
+            "static_weight": samples.static_weight,
             "metadata": test_data["metadata"],
+            # Gleiche TOP-Suche wie das inkrementelle Ergebnis bei Testende
+            "top_parameters": dict(self.phase_shift_calculator.top_parameters),
         }
 
+        # Hat der Analyzer genau diese Samples gesehen, übernimmt die Batch-Analyse seine TOPs
+        analyzer = test_data.get("analyzer")
+        if analyzer is not None and analyzer.sample_count == len(samples):
+            combined_data["platform_tops"] = analyzer.platform_tops
+
         logger.info(
-            f"Kombinierte {len(data_points)} Datenpunkte zu Dataset mit {len(time_series)} Samples"
+            f"Dataset mit {len(samples)} Samples zusammengestellt "
+            f"({samples.nbytes / 1024:.0f} KB, {samples.resize_count} Vergrößerungen)"
         )
 
         return combined_data
@@ -340,14 +374,18 @@ class PiProcessingService(MqttServiceBase):
         if test_id in self.test_timeouts:
             del self.test_timeouts[test_id]
 
-    async def handle_raw_data(self, topic: str, payload: Dict[str, Any]):
+    async def handle_raw_data(self, topic: str, payload: Union[Dict[str, Any], SampleBatch]):
         """
         Sammelt eingehende Live-Messdaten während Test läuft
 
         Args:
             topic: MQTT-Topic
-            payload: Live-Messdaten-Payload
+            payload: Live-Messdaten-Payload (einzelnes Sample oder Binär-Batch)
         """
+        if isinstance(payload, SampleBatch):
+            await self._handle_sample_batch(payload)
+            return
+
         try:
             # WICHTIG: Diese Funktion sammelt Live-Daten während Test läuft
 
@@ -358,7 +396,7 @@ class PiProcessingService(MqttServiceBase):
             # Falls kein test_id, versuche aus anderen Feldern zu rekonstruieren
             if not test_id:
                 # Fallback: generiere test_id aus timestamp und position
-                timestamp = payload.get("timestamp", time.time())
+                timestamp = payload.get("timestamp", self.clock.time())
                 test_id = f"auto_{position}_{int(timestamp)}"
 
                 # Automatisch Test starten falls noch nicht vorhanden
@@ -376,10 +414,18 @@ class PiProcessingService(MqttServiceBase):
             # Prüfe ob Test aktiv ist
             if test_id in self.active_tests:
                 # Datenpunkt zur Sammlung hinzufügen
-                self.active_tests[test_id]["data_points"].append(payload)
+                self.active_tests[test_id]["samples"].append(payload)
+
+                # Abgeschlossene Zyklen sofort auswerten
+                await self._feed_incremental_analyzer(
+                    self.active_tests[test_id],
+                    payload.get("elapsed", 0),
+                    payload.get("platform_position", 0),
+                    payload.get("tire_force", 0),
+                )
 
                 # Debug-Log alle 25 Datenpunkte
-                point_count = len(self.active_tests[test_id]["data_points"])
+                point_count = len(self.active_tests[test_id]["samples"])
                 if point_count % 25 == 0:
                     logger.info(f"Test {test_id}: {point_count} Datenpunkte gesammelt")
             else:
@@ -389,6 +435,230 @@ class PiProcessingService(MqttServiceBase):
         except Exception as e:
             logger.error(f"Fehler beim Sammeln der Messdaten: {e}")
 
+    async def _handle_sample_batch(self, batch: SampleBatch):
+        """
+        Übernimmt einen Binär-Batch blockweise in Spaltenspeicher und Analyse
+
+        Args:
+            batch: Dekodierter Binär-Frame
+        """
+        try:
+            if not batch.test_id:
+                # Ohne test_id greift die Auto-Start-Logik pro Sample
+                for sample in batch.to_samples():
+                    await self.handle_raw_data(MqttTopics.RAW_DATA_COMPLETE, sample)
+                return
+
+            test_data = self.active_tests.get(batch.test_id)
+            if test_data is None:
+                logger.debug(f"Batch fuer inaktiven Test ignoriert: {batch.test_id}")
+                return
+
+            columns = batch.columns
+            elapsed = columns["elapsed"]
+            platform = columns.get("platform_position", np.zeros(len(batch)))
+            force = columns.get("tire_force", np.zeros(len(batch)))
+
+            test_data["samples"].extend(
+                elapsed,
+                platform,
+                force,
+                frequency=columns.get("frequency"),
+                phase_shift=columns.get("phase_shift"),
+                dms=columns.get("dms_values"),
+                static_weight=batch.static_weight,
+            )
+
+            # Abgeschlossene Zyklen sofort auswerten
+            await self._feed_incremental_analyzer(test_data, elapsed, platform, force)
+
+        except Exception as e:
+            logger.error(f"Fehler beim Übernehmen des Binär-Batches: {e}")
+
+    async def handle_dataset_manifest(self, topic: str, payload: Dict[str, Any]):
+        """
+        Beginnt den Empfang eines chunkweise übertragenen Datasets
+
+        Args:
+            topic: MQTT-Topic
+            payload: Manifest mit Spalten, Samples und Chunk-Anzahl
+        """
+        try:
+            self.dataset_receiver.on_manifest(payload)
+        except Exception as e:
+            logger.error(f"Fehler beim Verarbeiten des Dataset-Manifests: {e}")
+
+    async def handle_dataset_chunk(self, topic: str, payload: bytes):
+        """
+        Übernimmt einen Dataset-Chunk in den vorab allokierten Speicher
+
+        Args:
+            topic: MQTT-Topic
+            payload: Chunk-Frame
+        """
+        try:
+            dataset = self.dataset_receiver.on_chunk(payload)
+            if dataset is not None:
+                await self._process_received_dataset(dataset)
+        except Exception as e:
+            logger.error(f"Fehler beim Verarbeiten des Dataset-Chunks: {e}")
+
+    async def handle_dataset_commit(self, topic: str, payload: Dict[str, Any]):
+        """
+        Schließt eine Dataset-Übertragung ab (fehlende Chunks werden angefordert)
+
+        Args:
+            topic: MQTT-Topic
+            payload: Commit-Nachricht
+        """
+        try:
+            dataset = self.dataset_receiver.on_commit(payload)
+            if dataset is not None:
+                await self._process_received_dataset(dataset)
+        except Exception as e:
+            logger.error(f"Fehler beim Abschluss der Dataset-Übertragung: {e}")
+
+    async def _process_received_dataset(self, dataset: ReceivedDataset):
+        """
+        Übergibt ein vollständig empfangenes Dataset an das Post-Processing
+
+        Das Dataset der Bridge (nur Rohdaten-Samples der Testposition) ersetzt
+        die bis dahin gesammelten Live-Samples des Tests; anschließend wird der
+        Test sofort abgeschlossen.
+
+        Args:
+            dataset: Zusammengesetztes Dataset
+        """
+        metadata = dataset.metadata
+        test_id = metadata.get("test_id") or dataset.transfer_id
+        columns = dataset.columns
+
+        if len(dataset) == 0 and test_id in self.active_tests:
+            # Leeres Dataset: gesammelte Live-Samples nicht verwerfen
+            logger.warning(f"Dataset für Test {test_id} ohne Samples - verwende Live-Samples")
+            await self._finalize_test_data_collection(test_id)
+            return
+
+        if test_id not in self.active_tests:
+            self._start_test_data_collection(
+                test_id,
+                {
+                    "position": metadata.get("position", "unknown"),
+                    "duration": metadata.get("duration", 60),
+                    "bridge_metadata": metadata.get("metadata", {}),
+                },
+            )
+        test_data = self.active_tests[test_id]
+
+        timestamps = columns["timestamp"]
+        start_time = metadata.get("start_time", timestamps[0] if len(timestamps) else 0.0)
+        count = len(dataset)
+
+        samples = TestSampleStore(count)
+        samples.extend(
+            timestamps - start_time,
+            columns.get("platform_position", np.zeros(count)),
+            columns.get("tire_force", np.zeros(count)),
+            frequency=columns.get("frequency"),
+            phase_shift=columns.get("phase_shift"),
+            static_weight=test_data["samples"].static_weight,
+        )
+        test_data["samples"] = samples
+        test_data["transfer"] = dataset.stats
+
+        logger.info(
+            f"Dataset für Test {test_id} empfangen: {count} Samples, "
+            f"{dataset.stats['throughput_kbps']:.0f} KB/s, "
+            f"Zusammensetzung {dataset.stats['reassembly_ms']:.1f} ms"
+        )
+
+        await self._finalize_test_data_collection(test_id)
+
+    async def _feed_incremental_analyzer(self, test_data: Dict[str, Any], elapsed, platform_position, tire_force):
+        """
+        Übergibt Samples an die inkrementelle Analyse und publiziert abgeschlossene Zyklen
+
+        Args:
+            test_data: Gesammelte Test-Daten
+            elapsed: Zeitstempel (Skalar oder Array)
+            platform_position: Plattformposition (Skalar oder Array)
+            tire_force: Reifenkraft (Skalar oder Array)
+        """
+        try:
+            if "analyzer" not in test_data:
+                test_data["analyzer"] = self.phase_shift_calculator.create_incremental_analyzer(
+                    test_data["samples"].static_weight
+                )
+
+            analyzer = test_data["analyzer"]
+            if analyzer is None:
+                return  # Analyzer nicht verfügbar
+
+            periods = analyzer.feed(elapsed, platform_position, tire_force)
+
+            for period in periods:
+                live_result = {
+                    "type": "period",
+                    "test_id": test_data["test_id"],
+                    "position": test_data["position"],
+                    "timestamp": self.clock.time(),
+                    "period_index": period.period_index,
+                    "frequency": float(period.frequency),
+                    "phase_shift": float(period.phase_shift),
+                    "rfa_max": float(period.rfa_max),
+                    "min_phase_shift": analyzer.min_phase_shift,
+                    "rfa_max_value": analyzer.rfa_max_value,
+                }
+                await self.publish(MqttTopics.TEST_RESULTS_LIVE, live_result)
+                self.live_periods_published += 1
+
+        except Exception as e:
+            logger.error(f"Fehler bei der inkrementellen Phase-Shift-Analyse: {e}")
+
+    async def _publish_incremental_verdict(self, test_data: Dict[str, Any]):
+        """
+        Publiziert das Ergebnis der inkrementellen Analyse direkt bei Testende
+
+        Args:
+            test_data: Gesammelte Test-Daten
+        """
+        analyzer = test_data.get("analyzer")
+        if analyzer is None:
+            return
+
+        try:
+            phase_result = analyzer.finalize()
+            min_phase_shift = phase_result.min_phase_shift
+
+            # Ohne auswertbare Periode gibt es kein Urteil (nicht "sehr schlecht")
+            evaluation = (
+                evaluate_egea_result(min_phase_shift) if min_phase_shift is not None else "unknown"
+            )
+
+            verdict = {
+                "type": "verdict",
+                "test_id": test_data["test_id"],
+                "position": test_data["position"],
+                "timestamp": self.clock.time(),
+                "evaluation": evaluation,
+                "insufficient_data": min_phase_shift is None,
+                "min_phase_shift": min_phase_shift,
+                "min_phase_frequency": phase_result.min_phase_frequency,
+                "rfa_max_value": phase_result.rfa_max_value,
+                "rfa_max_frequency": phase_result.rfa_max_frequency,
+                "period_count": len(phase_result.periods),
+                "f_under_flag": bool(phase_result.f_under_flag),
+                "source": "pi_processing_service",
+            }
+
+            await self.publish(MqttTopics.TEST_RESULTS_LIVE, verdict)
+            logger.info(
+                f"Inkrementelles Ergebnis publiziert: {test_data['test_id']} - φmin={min_phase_shift}"
+            )
+
+        except Exception as e:
+            logger.error(f"Fehler beim Publizieren des inkrementellen Ergebnisses: {e}")
+
     async def _handle_test_completion(self, topic: str, payload: Dict[str, Any]):
         """
         Behandelt Test-Abschluss-Signale
@@ -415,6 +685,11 @@ class PiProcessingService(MqttServiceBase):
             await self.stop()
         elif command == "clear_queue":
             await self._clear_processing_queue()
+        elif command in ("archive_query", "archive_get"):
+            response = await asyncio.get_running_loop().run_in_executor(
+                None, self._archive_request, command, payload
+            )
+            await self.publish(MqttTopics.ARCHIVE_RESULTS, response)
         else:
             logger.warning(f"Unbekanntes Command: {command}")
 
@@ -449,39 +724,50 @@ class PiProcessingService(MqttServiceBase):
         return {
             "tasks_processed": self.tasks_processed,
             "tasks_failed": self.tasks_failed,
+            "live_periods_published": self.live_periods_published,
             "active_tests": len(self.active_tests),
             "processing_queue_size": self.processing_queue.qsize(),
-            "uptime": time.time() - self.service_start_time if self.service_start_time else 0
+            "worker_pool": self.worker_pool.get_stats(),
+            "dataset_transfer": self.dataset_receiver.get_stats(),
+            "archive": self.archive.get_stats() if self.archive else None,
+            "tracing": self.tracer.get_stats(),
+            "uptime": self.clock.time() - self.service_start_time if self.service_start_time else 0
         }
 
     async def _processing_loop(self):
-        """Haupt-Processing-Loop"""
+        """Haupt-Processing-Loop: verteilt Tasks aus der Priority-Queue auf den Worker-Pool"""
         logger.info("Processing-Loop gestartet")
 
+        # Nur so viele Tasks entnehmen, wie Worker frei sind (Priorität bleibt wirksam)
+        free_workers = asyncio.Semaphore(self.worker_pool.max_workers)
+        loop = asyncio.get_running_loop()
+
         while self._running:
             try:
+                await free_workers.acquire()
+
                 # Warte auf Processing-Task mit Timeout
                 try:
                     priority, task = await asyncio.wait_for(
-                        self.processing_queue.get(), timeout=1.0
+                        self.processing_queue.get(), timeout=self.clock.idle_timeout(1.0)
                     )
                 except asyncio.TimeoutError:
+                    free_workers.release()
+                    # Stockende Dataset-Übertragungen nachfordern, hängende Tests abschließen
+                    self.dataset_receiver.check_timeouts()
+                    await self._check_test_timeouts()
                     continue
 
-                # Führe Processing durch
-                result = await self._process_test_data(task)
+                self.tracer.stamp(task.task_id, STAGE_QUEUE_EXIT)
 
-                # Publiziere Ergebnisse
-                await self._publish_results(result)
+                # Ergebnisse einer Position in Einreihungsreihenfolge publizieren
+                previous = self._position_tails.get(task.position)
+                published = loop.create_future()
+                self._position_tails[task.position] = published
 
-                # Statistiken aktualisieren
-                if result.success:
-                    self.tasks_processed += 1
-                else:
-                    self.tasks_failed += 1
-
-                # Task als erledigt markieren
-                self.processing_queue.task_done()
+                asyncio.create_task(
+                    self._run_processing_task(task, previous, published, free_workers)
+                )
 
             except Exception as e:
                 logger.error(f"Fehler in Processing-Loop: {e}")
@@ -489,249 +775,185 @@ class PiProcessingService(MqttServiceBase):
 
         logger.info("Processing-Loop beendet")
 
-    async def _process_test_data(self, task: ProcessingTask) -> ProcessingResult:
+    async def _run_processing_task(
+        self,
+        task: ProcessingTask,
+        previous: Optional[asyncio.Future],
+        published: asyncio.Future,
+        free_workers: asyncio.Semaphore,
+    ):
         """
-        Führt komplette Post-Processing-Analyse durch
+        Führt einen Task im Worker-Pool aus und publiziert das Ergebnis
 
         Args:
-            task: Processing-Task mit vollständigen Test-Daten
-
-        Returns:
-            ProcessingResult mit vollständigen Sinuskurven
+            task: Processing-Task
+            previous: Publikation des vorherigen Tasks derselben Position
+            published: Wird nach der eigenen Publikation erfüllt
+            free_workers: Freigabe des Worker-Slots nach der Berechnung
         """
-        start_time = time.perf_counter()
-
         try:
-            logger.info(
-                f"Starte Post-Processing für Test: {task.task_id}, Position: {task.position}"
-            )
-
-            # 1. Vollständige Testdaten extrahieren
-            raw_data = task.raw_data
+            try:
+                # Führe Processing durch
+                self.tracer.stamp(task.task_id, STAGE_ANALYSIS_START)
+                result = await self._process_test_data(task)
+                self.tracer.stamp(task.task_id, STAGE_ANALYSIS_END)
+            finally:
+                free_workers.release()
+
+            # Vorgänger derselben Position zuerst publizieren lassen
+            if previous is not None:
+                await previous
+
+            # Publiziere Ergebnisse
+            await self._publish_results(result)
+            self.tracer.stamp(task.task_id, STAGE_RESULT_PUBLISH)
+            await self.publish_trace(task.task_id)
+
+            # Rohsignale und Ergebnis archivieren (Dateizugriff außerhalb des Event-Loops)
+            if self.archive is not None and result.success:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._archive_test, task, result
+                )
 
-            # Zeitreihen-Daten extrahieren
-            time_data = np.array(raw_data.get("time_data", []))
-            platform_data = np.array(raw_data.get("platform_position_data", []))
-            force_data = np.array(raw_data.get("tire_force_data", []))
-            frequency_data = np.array(raw_data.get("frequency_data", []))
-            phase_shift_data = np.array(raw_data.get("phase_shift_data", []))
+            # Statistiken aktualisieren
+            if result.success:
+                self.tasks_processed += 1
+            else:
+                self.tasks_failed += 1
 
-            if len(time_data) == 0:
-                raise ValueError("Keine Zeitreihen-Daten vorhanden")
+        except Exception as e:
+            logger.error(f"Fehler bei der Verarbeitung von Task {task.task_id}: {e}")
+            self.tasks_failed += 1
 
-            logger.info(
-                f"Verarbeite {len(time_data)} Datenpunkte über {time_data[-1] - time_data[0]:.1f}s"
-            )
+        finally:
+            published.set_result(None)
+            if self._position_tails.get(task.position) is published:
+                del self._position_tails[task.position]
 
-            # 2. Datenvalidierung
-            if not self._validate_time_series_data(
-                time_data, platform_data, force_data
-            ):
-                raise ValueError("Zeitreihen-Datenvalidierung fehlgeschlagen")
-
-            # 3. Signal-Preprocessing für bessere Sinuskurven
-            processed_platform = self._preprocess_signal(platform_data)
-            processed_force = self._preprocess_signal(force_data)
-
-            # 4. Phase-Shift-Analyse über Frequenzbereich
-            phase_analysis = self._analyze_phase_shift_vs_frequency(
-                time_data,
-                processed_platform,
-                processed_force,
-                frequency_data,
-                phase_shift_data,
-            )
+            # Task als erledigt markieren
+            self.processing_queue.task_done()
 
-            # 5. Sinuskurven für vollständige Anzeige generieren
-            sine_curves = {
-                "time": time_data.tolist(),
-                "platform_position": processed_platform.tolist(),
-                "tire_force": processed_force.tolist(),
-                "duration": float(time_data[-1] - time_data[0])
-                if len(time_data) > 1
-                else 0,
-            }
+    def _archive_request(self, command: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Beantwortet eine Archiv-Abfrage (Liste gefilterter Tests oder ein Test per test_id)
 
-            # 6. Frequenzanalyse für Spektrum-Plot
-            frequency_analysis = self._perform_frequency_analysis(
-                time_data, processed_platform, processed_force
-            )
+        Args:
+            command: "archive_query" oder "archive_get"
+            payload: Command-Payload mit Filtern bzw. test_id und optionalen Kanälen
 
-            # 7. EGEA-konforme Bewertung
-            min_phase_shift = phase_analysis.get("min_phase_shift", 0)
-            egea_evaluation = self._evaluate_egea_result(min_phase_shift)
+        Returns:
+            Antwort-Payload für MqttTopics.ARCHIVE_RESULTS
+        """
+        response: Dict[str, Any] = {"command": command, "request_id": payload.get("request_id")}
+        if self.archive is None:
+            response["error"] = "Archiv deaktiviert"
+            return response
 
-            # 8. Vollständiges Ergebnis zusammenstellen
-            results = {
-                "phase_shift_result": phase_analysis,
-                "sine_curves": sine_curves,
-                "frequency_analysis": frequency_analysis,
-                "evaluation": egea_evaluation,
-                "min_phase_shift": min_phase_shift,
-                "test_metadata": {
-                    "position": task.position,
-                    "duration": sine_curves["duration"],
-                    "sample_count": len(time_data),
-                    "static_weight": raw_data.get("static_weight", 512),
-                    "sample_rate": len(time_data) / sine_curves["duration"]
-                    if sine_curves["duration"] > 0
-                    else 0,
-                },
+        try:
+            if command == "archive_query":
+                filters = {
+                    key: payload[key]
+                    for key in ("start", "end", "position", "vehicle_type", "passed")
+                    if payload.get(key) is not None
+                }
+                response["tests"] = self.archive.list_tests(limit=payload.get("limit", 100), **filters)
+                return response
+
+            test_id = str(payload.get("test_id", ""))
+            test = self.archive.get(test_id)
+            if test is None:
+                response["error"] = f"Test {test_id} nicht im Archiv"
+                return response
+            response["test"] = record_to_dict(test.record)
+            response["metadata"] = test.metadata
+            response["channels"] = test.channel_names()
+            # Zeitreihen nur auf Anfrage - sie sind deutlich größer als die Kennwerte
+            response["signals"] = {
+                name: np.asarray(test.channel(name)).tolist()
+                for name in payload.get("channels") or ()
+                if name in test.columns
             }
+        except Exception as e:
+            logger.error(f"Fehler bei Archiv-Abfrage {command}: {e}")
+            response["error"] = str(e)
+        return response
 
-            processing_time = time.perf_counter() - start_time
+    def _archive_test(self, task: ProcessingTask, result: ProcessingResult):
+        """
+        Speichert Rohsignale und EGEA-Ergebnis eines Tests im Archiv
 
-            logger.info(
-                f"Post-Processing erfolgreich: {task.task_id} - φmin={min_phase_shift:.1f}° - {egea_evaluation} in {processing_time:.3f}s"
-            )
+        Args:
+            task: Processing-Task mit den Zeitreihen
+            result: Erfolgreiches Processing-Ergebnis
+        """
+        try:
+            raw_data = task.raw_data
+            columns = {
+                "time": raw_data["time_data"],
+                "platform_position": raw_data["platform_position_data"],
+                "tire_force": raw_data["tire_force_data"],
+                "frequency": raw_data["frequency_data"],
+                "phase_shift": raw_data["phase_shift_data"],
+            }
+            if len(raw_data.get("dms_data", ())):
+                columns["dms"] = raw_data["dms_data"]
 
-            return ProcessingResult(
-                task_id=task.task_id,
+            metadata = raw_data.get("metadata") or {}
+            phase_result = result.results.get("phase_shift_result", {})
+            min_phase_shift = result.results.get("min_phase_shift")
+            min_phase_shift = float("nan") if min_phase_shift is None else float(min_phase_shift)
+            # Ohne Phasenverschiebung ist die Bewertung unbekannt, nicht "nicht bestanden"
+            passed = None if np.isnan(min_phase_shift) else bool(min_phase_shift >= self.phase_threshold)
+
+            self.archive.store(
+                task.task_id,
+                columns,
                 position=task.position,
-                success=True,
-                results=results,
-                processing_time=processing_time,
-                timestamp=time.time(),
+                vehicle_type=str(metadata.get("vehicle_type", "")),
+                timestamp=raw_data.get("start_time", task.timestamp),
+                min_phase_shift=min_phase_shift,
+                passed=passed,
+                evaluation=result.results.get("evaluation", ""),
+                metadata={
+                    "static_weight": raw_data.get("static_weight"),
+                    "duration": raw_data.get("duration"),
+                    "test_metadata": result.results.get("test_metadata", {}),
+                    # Nur Kennwerte - die Zeitreihen liegen als Spalten vor
+                    "min_phase_frequency": phase_result.get("min_phase_frequency"),
+                    "phase_shift_range": phase_result.get("phase_shift_range"),
+                },
             )
-
+            logger.info(f"Test {task.task_id} archiviert")
         except Exception as e:
-            processing_time = time.perf_counter() - start_time
-            error_msg = f"Post-Processing-Fehler für Test {task.task_id}: {e}"
-            logger.error(error_msg)
-
-            return ProcessingResult(
-                task_id=task.task_id,
-                position=task.position,
-                success=False,
-                results={},
-                processing_time=processing_time,
-                timestamp=time.time(),
-                error_message=str(e),
-            )
-
-    def _validate_time_series_data(
-        self, time_data: np.ndarray, platform_data: np.ndarray, force_data: np.ndarray
-    ) -> bool:
-        """Validiert Zeitreihen-Daten"""
-        if len(time_data) != len(platform_data) or len(time_data) != len(force_data):
-            logger.error("Zeitreihen haben unterschiedliche Längen")
-            return False
+            logger.error(f"Fehler beim Archivieren von Test {task.task_id}: {e}")
 
-        if len(time_data) < 10:
-            logger.error("Zu wenige Datenpunkte für sinnvolle Analyse")
-            return False
-
-        return True
+    async def _process_test_data(self, task: ProcessingTask) -> ProcessingResult:
+        """
+        Führt die komplette Post-Processing-Analyse im Worker-Pool durch
 
-    def _preprocess_signal(self, signal_data: np.ndarray) -> np.ndarray:
-        """Preprocessed Signal für bessere Sinuskurven"""
-        try:
-            # Einfache Glättung um Rauschen zu reduzieren
-            from scipy import signal
-
-            # Butterworth-Filter für Glättung
-            b, a = signal.butter(4, 0.1, btype="low")
-            filtered = signal.filtfilt(b, a, signal_data)
-            return filtered
-        except ImportError:
-            # Fallback: Einfacher gleitender Durchschnitt
-            window_size = min(5, len(signal_data) // 10)
-            if window_size < 2:
-                return signal_data
-
-            smoothed = np.convolve(
-                signal_data, np.ones(window_size) / window_size, mode="same"
-            )
-            return smoothed
-        except Exception as e:
-            logger.warning(f"Signal-Preprocessing fehlgeschlagen: {e}")
-            return signal_data
+        Args:
+            task: Processing-Task mit vollständigen Test-Daten
 
-    def _analyze_phase_shift_vs_frequency(
-        self,
-        time_data: np.ndarray,
-        platform_data: np.ndarray,
-        force_data: np.ndarray,
-        frequency_data: np.ndarray,
-        phase_shift_data: np.ndarray,
-    ) -> Dict[str, Any]:
-        """Analysiert Phasenverschiebung über Frequenzbereich"""
-        try:
-            # Finde minimale Phasenverschiebung
-            if len(phase_shift_data) > 0:
-                min_phase_shift = float(np.min(phase_shift_data))
-                min_phase_freq = (
-                    float(frequency_data[np.argmin(phase_shift_data)])
-                    if len(frequency_data) > 0
-                    else 0
-                )
-            else:
-                min_phase_shift = 0
-                min_phase_freq = 0
+        Returns:
+            ProcessingResult mit vollständigen Sinuskurven
+        """
+        logger.info(
+            f"Starte Post-Processing für Test: {task.task_id}, Position: {task.position}"
+        )
+        return await self.worker_pool.submit(task)
 
-            return {
-                "min_phase_shift": min_phase_shift,
-                "min_phase_frequency": min_phase_freq,
-                "phase_shifts": phase_shift_data.tolist()
-                if len(phase_shift_data) > 0
-                else [],
-                "frequencies": frequency_data.tolist()
-                if len(frequency_data) > 0
-                else [],
-                "phase_shift_range": [
-                    float(np.min(phase_shift_data)),
-                    float(np.max(phase_shift_data)),
-                ]
-                if len(phase_shift_data) > 0
-                else [0, 0],
-            }
-        except Exception as e:
-            logger.error(f"Phase-Shift-Analyse fehlgeschlagen: {e}")
-            return {"min_phase_shift": 0, "error": str(e)}
+    async def _publish_mqtt(self, topic: str, payload: Dict[str, Any]) -> bool:
+        """
+        Publiziert ein Ergebnis über die MqttServiceBase
 
-    def _perform_frequency_analysis(
-        self, time_data: np.ndarray, platform_data: np.ndarray, force_data: np.ndarray
-    ) -> Dict[str, Any]:
-        """Führt Frequenzanalyse für Spektrum-Plot durch"""
-        try:
-            if len(time_data) < 2:
-                return {}
-
-            # Sample-Rate berechnen
-            dt = np.mean(np.diff(time_data))
-            sample_rate = 1.0 / dt if dt > 0 else 1.0
-
-            # FFT für beide Signale
-            platform_fft = np.fft.fft(platform_data)
-            force_fft = np.fft.fft(force_data)
-
-            # Frequenz-Array
-            frequencies = np.fft.fftfreq(len(time_data), dt)
-
-            # Nur positive Frequenzen
-            pos_freq_idx = frequencies > 0
-            frequencies = frequencies[pos_freq_idx]
-            platform_magnitude = np.abs(platform_fft[pos_freq_idx])
-            force_magnitude = np.abs(force_fft[pos_freq_idx])
-
-            # Begrenze auf relevanten Bereich (0-30 Hz)
-            relevant_idx = frequencies <= 30.0
-            frequencies = frequencies[relevant_idx]
-            platform_magnitude = platform_magnitude[relevant_idx]
-            force_magnitude = force_magnitude[relevant_idx]
-
-            return {
-                "sample_rate": sample_rate,
-                "spectral_data": {
-                    "frequencies": frequencies.tolist(),
-                    "platform_magnitude": platform_magnitude.tolist(),
-                    "force_magnitude": force_magnitude.tolist(),
-                },
-            }
+        Args:
+            topic: MQTT-Topic
+            payload: Ergebnis-Payload
 
-        except Exception as e:
-            logger.error(f"Frequenzanalyse fehlgeschlagen: {e}")
-            return {"error": str(e)}
+        Returns:
+            True wenn erfolgreich
+        """
+        return await self.publish(topic, payload)
 
     async def _publish_results(self, result: ProcessingResult):
         """
@@ -770,9 +992,9 @@ class PiProcessingService(MqttServiceBase):
             frequency_analysis = result.results.get("frequency_analysis", {})
             metadata = result.results.get("test_metadata", {})
 
-            # EGEA-Bewertung bestimmen
-            min_phase_shift = phase_result.get("min_phase_shift", 0)
-            evaluation = self._evaluate_egea_result(min_phase_shift)
+            # EGEA-Bewertung aus dem Post-Processing (φmin der EGEA-Analyse)
+            min_phase_shift = result.results.get("min_phase_shift")
+            evaluation = result.results.get("evaluation", "unknown")
 
             # Vollständige finale Ergebnisse für GUI
             final_result = {
@@ -782,6 +1004,9 @@ class PiProcessingService(MqttServiceBase):
                 "success": result.success,
                 "evaluation": evaluation,
                 "min_phase_shift": min_phase_shift,
+                "min_phase_frequency": phase_result.get("min_phase_frequency"),
+                "rfa_max_value": phase_result.get("rfa_max_value"),
+                "period_count": phase_result.get("period_count"),
                 # Vollständige Sinuskurven-Daten
                 "time_data": sine_curves.get("time", []),
                 "platform_position": sine_curves.get("platform_position", []),
@@ -858,32 +1083,9 @@ class PiProcessingService(MqttServiceBase):
         except Exception as e:
             logger.error(f"Fehler beim Publizieren des Fehler-Ergebnisses: {e}")
 
-    def _evaluate_egea_result(self, min_phase_shift: float) -> str:
-        """
-        Bewertet das EGEA-Ergebnis basierend auf Phasenverschiebung
-
-        Args:
-            min_phase_shift: Minimale Phasenverschiebung in Grad
-
-        Returns:
-            EGEA-Bewertung als String
-        """
-        if min_phase_shift >= 40:
-            return "EXCELLENT"
-        elif min_phase_shift >= 35:
-            return "GOOD"
-        elif min_phase_shift >= 25:
-            return "ACCEPTABLE"
-        elif min_phase_shift >= 15:
-            return "POOR"
-        else:
-            return "VERY_POOR"
-
-
-
     async def _check_test_timeouts(self):
         """Prüft und behandelt Test-Timeouts"""
-        current_time = time.time()
+        current_time = self.clock.time()
         timeout_tests = []
 
         for test_id, timeout_time in self.test_timeouts.items():
@@ -892,6 +1094,7 @@ class PiProcessingService(MqttServiceBase):
 
         for test_id in timeout_tests:
             logger.warning(f"Test-Timeout für {test_id} - starte Force-Processing")
+            self.test_timeouts.pop(test_id, None)
             await self._finalize_test_data_collection(test_id)
 
 
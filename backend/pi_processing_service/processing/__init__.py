@@ -4,15 +4,26 @@ Processing Package für Pi Processing Service
 Enthält alle Module für die Datenverarbeitung:
 - phase_shift_calculator: EGEA-konforme Phase-Shift-Berechnung
 - data_validator: Validierung eingehender Rohdaten
+- sample_store: Spaltenbasierter Sample-Speicher pro Test
+- post_processor: Post-Processing-Analyse eines vollständigen Tests
+- worker_pool: Prozess-/Thread-Pool für das Post-Processing
 """
 
 from .phase_shift_calculator import PhaseShiftCalculator
 from .data_validator import DataValidator
+from .sample_store import TestSampleStore
+from .post_processor import PostProcessor, ProcessingTask, ProcessingResult
+from .worker_pool import ProcessingWorkerPool
 
 __version__ = "1.0.0"
 
 # Public API
 __all__ = [
     "PhaseShiftCalculator",
-    "DataValidator"
+    "DataValidator",
+    "TestSampleStore",
+    "PostProcessor",
+    "ProcessingTask",
+    "ProcessingResult",
+    "ProcessingWorkerPool"
 ]
@@ -26,7 +26,12 @@ logger = logging.getLogger(__name__)
 
 # Import des bestehenden Processors aus suspension_core
 try:
-    from suspension_core.egea import PhaseShiftProcessor
+    from suspension_core.egea import (
+        PhaseShiftProcessor,
+        IncrementalPhaseShiftAnalyzer,
+        get_analysis_cache,
+        get_filter_bank,
+    )
     EGEA_PROCESSOR_AVAILABLE = True
     logger.info("✅ Zentrale PhaseShiftProcessor erfolgreich importiert")
 except ImportError as e:
@@ -60,6 +65,7 @@ class PhaseShiftCalculator:
         self.max_calc_freq = self.config.get("max_calc_freq", 18.0)
         self.phase_threshold = self.config.get("phase_threshold", 35.0)
         self.delta_f = self.config.get("delta_f", 5.0)
+        self.sample_rate = self.config.get("sample_rate", 1000.0)
         
         # Performance-Parameter für Pi
         self.use_optimized_algorithms = True
@@ -68,9 +74,23 @@ class PhaseShiftCalculator:
         # Bestehenden EGEA-Processor initialisieren falls verfügbar
         if EGEA_PROCESSOR_AVAILABLE:
             self.egea_processor = PhaseShiftProcessor()
+            # Gleiche TOP-Parameter für inkrementelle und Batch-Analyse (identische Ergebnisse)
+            self.top_parameters = IncrementalPhaseShiftAnalyzer.default_top_parameters(
+                self.egea_processor.params, self.sample_rate
+            )
+            # Filterentwurf aus dem Hot-Path nehmen: Filterbank für erwartete Abtastrate vorberechnen
+            get_filter_bank().prepare(self.sample_rate)
+            # Analyse-Ergebnisse optional auf Festplatte cachen (erneute Auswertung archivierter Tests)
+            cache_dir = self.config.get("analysis_cache_dir")
+            if cache_dir:
+                try:
+                    get_analysis_cache().enable_persistence(cache_dir)
+                except OSError as e:
+                    logger.error(f"Analyse-Cache-Verzeichnis nicht nutzbar: {e}")
             logger.info("✅ Zentrale PhaseShiftProcessor-Implementierung wird verwendet")
         else:
             self.egea_processor = None
+            self.top_parameters = {}
             logger.info("⚠️ PhaseShiftProcessor nicht verfügbar - verwende Fallback")
         
         # Performance-Tracking
@@ -79,6 +99,23 @@ class PhaseShiftCalculator:
         
         logger.info("PhaseShiftCalculator initialisiert")
     
+    def create_incremental_analyzer(self, static_weight: float) -> Optional["IncrementalPhaseShiftAnalyzer"]:
+        """
+        Erstellt einen inkrementellen Analyzer für einen laufenden Test
+        
+        Args:
+            static_weight: Statisches Gewicht
+            
+        Returns:
+            IncrementalPhaseShiftAnalyzer oder None ohne zentrale EGEA-Implementierung
+        """
+        if self.egea_processor is None:
+            return None
+        
+        return IncrementalPhaseShiftAnalyzer(
+            static_weight, self.sample_rate, processor=self.egea_processor, **self.top_parameters
+        )
+    
     async def calculate(self, 
                        platform_data: np.ndarray, 
                        force_data: np.ndarray, 
@@ -292,12 +329,18 @@ class PhaseShiftCalculator:
             # Async-Wrapper um synchronen EGEA-Processor
             await asyncio.sleep(0)  # Yield control
             
+            # TOPs wie im inkrementellen Analyzer bestimmen
+            platform_peaks = self.egea_processor.signal_processor.find_platform_tops(
+                platform_data, **self.top_parameters
+            )
+            
             # Bestehenden Processor aufrufen mit neuer API
             result = self.egea_processor.calculate_phase_shift_advanced(
                 platform_position=platform_data,
                 tire_force=force_data,
                 time_array=time_data,
-                static_weight=static_weight
+                static_weight=static_weight,
+                platform_peaks=platform_peaks
             )
             
             return result
@@ -438,7 +481,7 @@ class PhaseShiftCalculator:
         if not self.calculation_times:
             return {"no_data": True}
         
-        return {
+        stats = {
             "total_calculations": self.calculations_count,
             "avg_time": np.mean(self.calculation_times),
             "min_time": np.min(self.calculation_times),
@@ -446,6 +489,12 @@ class PhaseShiftCalculator:
             "last_time": self.calculation_times[-1],
             "egea_processor_available": EGEA_PROCESSOR_AVAILABLE
         }
+        
+        if EGEA_PROCESSOR_AVAILABLE:
+            stats["filter_bank"] = get_filter_bank().get_stats()
+            stats["analysis_cache"] = get_analysis_cache().get_stats()
+        
+        return stats
     
     def reset_performance_stats(self):
         """Setzt Performance-Statistiken zurück"""
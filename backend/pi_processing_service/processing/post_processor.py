@@ -0,0 +1,392 @@
+"""
+Post-Processing-Analyse für Pi Processing Service
+
+Enthält die rechenintensive Auswertung eines vollständigen Tests. Die Klasse ist
+synchron und ohne MQTT-Abhängigkeiten, damit sie in Worker-Prozessen oder
+-Threads des ProcessingWorkerPool laufen kann.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from suspension_core.egea import PhaseShiftProcessor
+    EGEA_PROCESSOR_AVAILABLE = True
+except ImportError as e:
+    EGEA_PROCESSOR_AVAILABLE = False
+    logger.warning(f"Zentrale PhaseShiftProcessor nicht verfügbar: {e} - φmin aus Live-Spalte")
+
+
+@dataclass
+class ProcessingTask:
+    """Container für Processing-Aufgaben"""
+
+    task_id: str
+    position: str  # front_left, front_right, etc.
+    raw_data: Dict[str, Any]
+    timestamp: float
+    priority: int = 0  # 0 = höchste Priorität
+    # Erstellungszeitpunkt (time.monotonic) für die Latenzmessung, unabhängig von der injizierten Uhr
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    def __lt__(self, other):
+        """Für Priority-Queue-Sortierung"""
+        return self.priority < other.priority
+
+
+@dataclass
+class ProcessingResult:
+    """Container für Processing-Ergebnisse"""
+
+    task_id: str
+    position: str
+    success: bool
+    results: Dict[str, Any]
+    processing_time: float
+    timestamp: float
+    error_message: Optional[str] = None
+
+
+def evaluate_egea_result(min_phase_shift: float) -> str:
+    """
+    Bewertet das EGEA-Ergebnis basierend auf Phasenverschiebung
+
+    Args:
+        min_phase_shift: Minimale Phasenverschiebung in Grad
+
+    Returns:
+        EGEA-Bewertung als String
+    """
+    if min_phase_shift >= 40:
+        return "EXCELLENT"
+    elif min_phase_shift >= 35:
+        return "GOOD"
+    elif min_phase_shift >= 25:
+        return "ACCEPTABLE"
+    elif min_phase_shift >= 15:
+        return "POOR"
+    else:
+        return "VERY_POOR"
+
+
+class PostProcessor:
+    """
+    Vollständige Post-Processing-Analyse eines Tests
+
+    Zustandslos; jeder Worker hält eine eigene Instanz.
+
+    φmin stammt aus der EGEA-Batch-Analyse der Rohsignale mit denselben TOPs wie
+    das inkrementelle Ergebnis bei Testende: raw_data["platform_tops"] (TOPs des
+    Analyzers) bzw. find_platform_tops mit raw_data["top_parameters"].
+    """
+
+    def __init__(self):
+        self.egea_processor = PhaseShiftProcessor() if EGEA_PROCESSOR_AVAILABLE else None
+
+    def process(self, task: ProcessingTask) -> ProcessingResult:
+        """
+        Führt komplette Post-Processing-Analyse durch
+
+        Args:
+            task: Processing-Task mit vollständigen Test-Daten
+
+        Returns:
+            ProcessingResult mit vollständigen Sinuskurven
+        """
+        start_time = time.perf_counter()
+
+        try:
+            # 1. Vollständige Testdaten extrahieren
+            raw_data = task.raw_data
+
+            # Zeitreihen-Daten extrahieren
+            time_data = np.asarray(raw_data.get("time_data", []), dtype=np.float64)
+            platform_data = np.asarray(raw_data.get("platform_position_data", []), dtype=np.float64)
+            force_data = np.asarray(raw_data.get("tire_force_data", []), dtype=np.float64)
+            frequency_data = np.asarray(raw_data.get("frequency_data", []))
+            phase_shift_data = np.asarray(raw_data.get("phase_shift_data", []))
+
+            if len(time_data) == 0:
+                raise ValueError("Keine Zeitreihen-Daten vorhanden")
+
+            logger.info(
+                f"Verarbeite {len(time_data)} Datenpunkte über {time_data[-1] - time_data[0]:.1f}s"
+            )
+
+            # 2. Datenvalidierung
+            if not self._validate_time_series_data(
+                time_data, platform_data, force_data
+            ):
+                raise ValueError("Zeitreihen-Datenvalidierung fehlgeschlagen")
+
+            # 3. Signal-Preprocessing für bessere Sinuskurven
+            processed_platform = self._preprocess_signal(platform_data)
+            processed_force = self._preprocess_signal(force_data)
+
+            # 4. EGEA-Phase-Shift-Analyse der Rohsignale (gleiche TOPs wie das inkrementelle Ergebnis)
+            if self.egea_processor is not None:
+                phase_analysis = self._analyze_egea_phase_shift(
+                    time_data,
+                    platform_data,
+                    force_data,
+                    raw_data.get("static_weight") or 512,
+                    raw_data.get("platform_tops"),
+                    raw_data.get("top_parameters") or {},
+                )
+            else:
+                phase_analysis = self._analyze_phase_shift_vs_frequency(
+                    time_data,
+                    processed_platform,
+                    processed_force,
+                    frequency_data,
+                    phase_shift_data,
+                )
+
+            # 5. Sinuskurven für vollständige Anzeige generieren
+            sine_curves = {
+                "time": time_data.tolist(),
+                "platform_position": processed_platform.tolist(),
+                "tire_force": processed_force.tolist(),
+                "duration": float(time_data[-1] - time_data[0])
+                if len(time_data) > 1
+                else 0,
+            }
+
+            # 6. Frequenzanalyse für Spektrum-Plot
+            frequency_analysis = self._perform_frequency_analysis(
+                time_data, processed_platform, processed_force
+            )
+
+            # 7. EGEA-konforme Bewertung (ohne auswertbare Periode kein Urteil)
+            min_phase_shift = phase_analysis.get("min_phase_shift")
+            egea_evaluation = (
+                evaluate_egea_result(min_phase_shift) if min_phase_shift is not None else "unknown"
+            )
+
+            # 8. Vollständiges Ergebnis zusammenstellen
+            results = {
+                "phase_shift_result": phase_analysis,
+                "sine_curves": sine_curves,
+                "frequency_analysis": frequency_analysis,
+                "evaluation": egea_evaluation,
+                "min_phase_shift": min_phase_shift,
+                "test_metadata": {
+                    "position": task.position,
+                    "duration": sine_curves["duration"],
+                    "sample_count": len(time_data),
+                    "static_weight": raw_data.get("static_weight", 512),
+                    "sample_rate": len(time_data) / sine_curves["duration"]
+                    if sine_curves["duration"] > 0
+                    else 0,
+                },
+            }
+
+            processing_time = time.perf_counter() - start_time
+
+            logger.info(
+                f"Post-Processing erfolgreich: {task.task_id} - φmin={min_phase_shift}° - {egea_evaluation} in {processing_time:.3f}s"
+            )
+
+            return ProcessingResult(
+                task_id=task.task_id,
+                position=task.position,
+                success=True,
+                results=results,
+                processing_time=processing_time,
+                timestamp=time.time(),
+            )
+
+        except Exception as e:
+            processing_time = time.perf_counter() - start_time
+            error_msg = f"Post-Processing-Fehler für Test {task.task_id}: {e}"
+            logger.error(error_msg)
+
+            return ProcessingResult(
+                task_id=task.task_id,
+                position=task.position,
+                success=False,
+                results={},
+                processing_time=processing_time,
+                timestamp=time.time(),
+                error_message=str(e),
+            )
+
+    def _validate_time_series_data(
+        self, time_data: np.ndarray, platform_data: np.ndarray, force_data: np.ndarray
+    ) -> bool:
+        """Validiert Zeitreihen-Daten"""
+        if len(time_data) != len(platform_data) or len(time_data) != len(force_data):
+            logger.error("Zeitreihen haben unterschiedliche Längen")
+            return False
+
+        if len(time_data) < 10:
+            logger.error("Zu wenige Datenpunkte für sinnvolle Analyse")
+            return False
+
+        return True
+
+    def _preprocess_signal(self, signal_data: np.ndarray) -> np.ndarray:
+        """Preprocessed Signal für bessere Sinuskurven"""
+        try:
+            # Einfache Glättung um Rauschen zu reduzieren
+            from scipy import signal
+
+            # Butterworth-Filter für Glättung
+            b, a = signal.butter(4, 0.1, btype="low")
+            filtered = signal.filtfilt(b, a, signal_data)
+            return filtered
+        except ImportError:
+            # Fallback: Einfacher gleitender Durchschnitt
+            window_size = min(5, len(signal_data) // 10)
+            if window_size < 2:
+                return signal_data
+
+            smoothed = np.convolve(
+                signal_data, np.ones(window_size) / window_size, mode="same"
+            )
+            return smoothed
+        except Exception as e:
+            logger.warning(f"Signal-Preprocessing fehlgeschlagen: {e}")
+            return signal_data
+
+    def _analyze_egea_phase_shift(
+        self,
+        time_data: np.ndarray,
+        platform_data: np.ndarray,
+        force_data: np.ndarray,
+        static_weight: float,
+        platform_tops: Optional[np.ndarray],
+        top_parameters: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        EGEA-Phasenverschiebung über alle Perioden (calculate_phase_shift_advanced)
+
+        Args:
+            time_data: Zeitstempel
+            platform_data: Plattformposition (ungefiltert)
+            force_data: Reifenkraft (ungefiltert)
+            static_weight: Statisches Gewicht
+            platform_tops: TOPs des inkrementellen Analyzers (None = neu bestimmen)
+            top_parameters: Parameter für find_platform_tops
+
+        Returns:
+            Dict mit φmin, RFAmax, Flags und den gültigen Perioden
+        """
+        if platform_tops is None:
+            platform_tops = self.egea_processor.signal_processor.find_platform_tops(
+                platform_data, **top_parameters
+            )
+
+        result = self.egea_processor.calculate_phase_shift_advanced(
+            platform_data,
+            force_data,
+            time_data,
+            float(static_weight),
+            platform_peaks=np.asarray(platform_tops, dtype=np.int64),
+        )
+        valid_periods = [p for p in result.periods if p.is_valid]
+        phase_shifts = [float(p.phase_shift) for p in valid_periods]
+
+        return {
+            "min_phase_shift": result.min_phase_shift,
+            "min_phase_frequency": result.min_phase_frequency,
+            "rfa_max_value": result.rfa_max_value,
+            "rfa_max_frequency": result.rfa_max_frequency,
+            "period_count": len(result.periods),
+            "f_under_flag": bool(result.f_under_flag),
+            "f_over_flag": bool(result.f_over_flag),
+            "phase_shifts": phase_shifts,
+            "frequencies": [float(p.frequency) for p in valid_periods],
+            "phase_shift_range": [min(phase_shifts), max(phase_shifts)] if phase_shifts else None,
+        }
+
+    def _analyze_phase_shift_vs_frequency(
+        self,
+        time_data: np.ndarray,
+        platform_data: np.ndarray,
+        force_data: np.ndarray,
+        frequency_data: np.ndarray,
+        phase_shift_data: np.ndarray,
+    ) -> Dict[str, Any]:
+        """Analysiert Phasenverschiebung über Frequenzbereich"""
+        try:
+            # Finde minimale Phasenverschiebung
+            if len(phase_shift_data) > 0:
+                min_phase_shift = float(np.min(phase_shift_data))
+                min_phase_freq = (
+                    float(frequency_data[np.argmin(phase_shift_data)])
+                    if len(frequency_data) > 0
+                    else 0
+                )
+            else:
+                min_phase_shift = 0
+                min_phase_freq = 0
+
+            return {
+                "min_phase_shift": min_phase_shift,
+                "min_phase_frequency": min_phase_freq,
+                "phase_shifts": phase_shift_data.tolist()
+                if len(phase_shift_data) > 0
+                else [],
+                "frequencies": frequency_data.tolist()
+                if len(frequency_data) > 0
+                else [],
+                "phase_shift_range": [
+                    float(np.min(phase_shift_data)),
+                    float(np.max(phase_shift_data)),
+                ]
+                if len(phase_shift_data) > 0
+                else [0, 0],
+            }
+        except Exception as e:
+            logger.error(f"Phase-Shift-Analyse fehlgeschlagen: {e}")
+            return {"min_phase_shift": 0, "error": str(e)}
+
+    def _perform_frequency_analysis(
+        self, time_data: np.ndarray, platform_data: np.ndarray, force_data: np.ndarray
+    ) -> Dict[str, Any]:
+        """Führt Frequenzanalyse für Spektrum-Plot durch"""
+        try:
+            if len(time_data) < 2:
+                return {}
+
+            # Sample-Rate berechnen
+            dt = np.mean(np.diff(time_data))
+            sample_rate = 1.0 / dt if dt > 0 else 1.0
+
+            # FFT für beide Signale
+            platform_fft = np.fft.fft(platform_data)
+            force_fft = np.fft.fft(force_data)
+
+            # Frequenz-Array
+            frequencies = np.fft.fftfreq(len(time_data), dt)
+
+            # Nur positive Frequenzen
+            pos_freq_idx = frequencies > 0
+            frequencies = frequencies[pos_freq_idx]
+            platform_magnitude = np.abs(platform_fft[pos_freq_idx])
+            force_magnitude = np.abs(force_fft[pos_freq_idx])
+
+            # Begrenze auf relevanten Bereich (0-30 Hz)
+            relevant_idx = frequencies <= 30.0
+            frequencies = frequencies[relevant_idx]
+            platform_magnitude = platform_magnitude[relevant_idx]
+            force_magnitude = force_magnitude[relevant_idx]
+
+            return {
+                "sample_rate": sample_rate,
+                "spectral_data": {
+                    "frequencies": frequencies.tolist(),
+                    "platform_magnitude": platform_magnitude.tolist(),
+                    "force_magnitude": force_magnitude.tolist(),
+                },
+            }
+
+        except Exception as e:
+            logger.error(f"Frequenzanalyse fehlgeschlagen: {e}")
+            return {"error": str(e)}
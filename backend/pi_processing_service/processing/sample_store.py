@@ -0,0 +1,195 @@
+"""
+Spaltenbasierter Sample-Speicher für Pi Processing Service
+
+Ersetzt die Liste von MQTT-Payload-Dicts pro Test durch typisierte NumPy-Spalten.
+Die Spalten werden aus der Testdauer vorab dimensioniert und bei Bedarf
+geometrisch vergrößert (amortisiert O(1) pro Sample). Beim Abschluss werden
+Views ohne Kopie geliefert.
+"""
+
+import logging
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class TestSampleStore:
+    """
+    Wachsender Spaltenpuffer für die Samples eines Tests
+
+    Spalten:
+    - time, platform_position, tire_force: float64 (Analyse)
+    - frequency, phase_shift: float32 (Live-Werte, nur Anzeige)
+    - dms: float32, Form (n, 4); fehlende Werte sind NaN
+    """
+
+    __test__ = False  # Kein pytest-Testfall trotz Namenspräfix
+
+    ANALYSIS_COLUMNS = ("time", "platform_position", "tire_force")
+    LIVE_COLUMNS = ("frequency", "phase_shift")
+    DMS_CHANNELS = 4
+
+    MIN_CAPACITY = 1024
+    GROWTH_FACTOR = 1.5
+
+    def __init__(self, capacity: int = MIN_CAPACITY):
+        """
+        Initialisiert den Speicher
+
+        Args:
+            capacity: Anfangskapazität in Samples
+        """
+        capacity = max(int(capacity), 1)
+
+        self._analysis = np.empty((len(self.ANALYSIS_COLUMNS), capacity), dtype=np.float64)
+        self._live = np.empty((len(self.LIVE_COLUMNS), capacity), dtype=np.float32)
+        self._dms = np.empty((capacity, self.DMS_CHANNELS), dtype=np.float32)
+
+        self._size = 0
+        self.has_dms = False
+        self.static_weight: Optional[float] = None
+        self.resize_count = 0
+
+    @classmethod
+    def for_duration(cls, duration: float, sample_rate: float, margin: float = 1.1) -> "TestSampleStore":
+        """
+        Erstellt einen Speicher passend zur erwarteten Testdauer
+
+        Args:
+            duration: Erwartete Testdauer in Sekunden
+            sample_rate: Erwartete Abtastrate in Hz
+            margin: Reserve für Vor- und Nachlauf
+
+        Returns:
+            TestSampleStore
+        """
+        capacity = int(np.ceil(max(duration, 0.0) * max(sample_rate, 0.0) * margin))
+        return cls(max(capacity, cls.MIN_CAPACITY))
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._analysis.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        """Belegter Speicher aller Spalten in Bytes"""
+        return self._analysis.nbytes + self._live.nbytes + self._dms.nbytes
+
+    def append(self, payload: Dict[str, Any]) -> None:
+        """
+        Übernimmt einen Datenpunkt aus einem MQTT-Payload
+
+        Args:
+            payload: Live-Messdaten mit elapsed, platform_position, tire_force, ...
+        """
+        if self._size == self.capacity:
+            self._grow(self._size + 1)
+
+        i = self._size
+        self._analysis[0, i] = payload.get("elapsed", 0)
+        self._analysis[1, i] = payload.get("platform_position", 0)
+        self._analysis[2, i] = payload.get("tire_force", 0)
+        self._live[0, i] = payload.get("frequency", 0)
+        self._live[1, i] = payload.get("phase_shift", 0)
+
+        self._dms[i] = np.nan
+        dms_values = payload.get("dms_values")
+        if dms_values:
+            count = min(len(dms_values), self.DMS_CHANNELS)
+            self._dms[i, :count] = dms_values[:count]
+            self.has_dms = True
+
+        if self.static_weight is None:
+            self.static_weight = payload.get("static_weight", 512)
+
+        self._size += 1
+
+    def extend(self,
+               time: Sequence[float],
+               platform_position: Sequence[float],
+               tire_force: Sequence[float],
+               frequency: Optional[Sequence[float]] = None,
+               phase_shift: Optional[Sequence[float]] = None,
+               dms: Optional[np.ndarray] = None,
+               static_weight: Optional[float] = None) -> None:
+        """
+        Übernimmt einen Block von Samples
+
+        Args:
+            time: Zeitstempel
+            platform_position: Plattformposition
+            tire_force: Reifenkraft
+            frequency: Live-Frequenz (optional, sonst 0)
+            phase_shift: Live-Phasenverschiebung (optional, sonst 0)
+            dms: DMS-Werte mit Form (n, 4) (optional, sonst NaN)
+            static_weight: Statisches Gewicht (übernommen, falls noch nicht bekannt)
+        """
+        count = len(time)
+        if count == 0:
+            return
+
+        if self._size + count > self.capacity:
+            self._grow(self._size + count)
+
+        window = slice(self._size, self._size + count)
+        self._analysis[0, window] = time
+        self._analysis[1, window] = platform_position
+        self._analysis[2, window] = tire_force
+        self._live[0, window] = frequency if frequency is not None else 0
+        self._live[1, window] = phase_shift if phase_shift is not None else 0
+
+        if dms is not None:
+            self._dms[window] = dms
+            self.has_dms = True
+        else:
+            self._dms[window] = np.nan
+
+        if self.static_weight is None:
+            self.static_weight = static_weight if static_weight is not None else 512
+
+        self._size += count
+
+    def _grow(self, required: int) -> None:
+        """Vergrößert alle Spalten geometrisch"""
+        capacity = max(required, int(self.capacity * self.GROWTH_FACTOR) + 1)
+
+        analysis = np.empty((self._analysis.shape[0], capacity), dtype=self._analysis.dtype)
+        live = np.empty((self._live.shape[0], capacity), dtype=self._live.dtype)
+        dms = np.empty((capacity, self.DMS_CHANNELS), dtype=self._dms.dtype)
+
+        analysis[:, :self._size] = self._analysis[:, :self._size]
+        live[:, :self._size] = self._live[:, :self._size]
+        dms[:self._size] = self._dms[:self._size]
+
+        self._analysis, self._live, self._dms = analysis, live, dms
+        self.resize_count += 1
+        logger.debug(f"Sample-Speicher vergrößert auf {capacity} Samples")
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Liefert eine Spalte als View ohne Kopie
+
+        Args:
+            name: Spaltenname (siehe ANALYSIS_COLUMNS, LIVE_COLUMNS, "dms")
+
+        Returns:
+            Array-View der gefüllten Samples
+        """
+        if name in self.ANALYSIS_COLUMNS:
+            return self._analysis[self.ANALYSIS_COLUMNS.index(name), :self._size]
+        if name in self.LIVE_COLUMNS:
+            return self._live[self.LIVE_COLUMNS.index(name), :self._size]
+        if name == "dms":
+            return self._dms[:self._size]
+        raise KeyError(f"Unbekannte Spalte: {name}")
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Liefert alle Spalten als Views ohne Kopie"""
+        result = {name: self.column(name) for name in self.ANALYSIS_COLUMNS + self.LIVE_COLUMNS}
+        result["dms"] = self.column("dms") if self.has_dms else np.empty((0, self.DMS_CHANNELS), dtype=np.float32)
+        return result
@@ -0,0 +1,296 @@
+"""
+Worker-Pool für das Post-Processing im Pi Processing Service
+
+Führt PostProcessor.process in einem Prozess- (Standard) oder Thread-Pool aus,
+damit die NumPy/SciPy-Auswertung weder MQTT-Handling noch Heartbeats blockiert
+und mehrere Tests parallel ausgewertet werden können.
+
+Im Prozessmodus werden die Zeitreihen über Shared Memory übergeben; gepickelt
+werden nur die Metadaten des Tasks.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .post_processor import PostProcessor, ProcessingResult, ProcessingTask
+
+logger = logging.getLogger(__name__)
+
+MODE_PROCESS = "process"
+MODE_THREAD = "thread"
+MODES = (MODE_PROCESS, MODE_THREAD)
+
+_ARRAY_ALIGNMENT = 64  # Bytes
+
+# PostProcessor des aktuellen Worker-Prozesses
+_worker_processor: Optional[PostProcessor] = None
+
+
+def _init_worker() -> None:
+    """Initialisiert einen Worker-Prozess"""
+    global _worker_processor
+    _worker_processor = PostProcessor()
+
+
+def _pack_shared_arrays(arrays: Dict[str, np.ndarray]) -> Tuple[shared_memory.SharedMemory, Dict[str, Any]]:
+    """
+    Kopiert Arrays in einen gemeinsamen Shared-Memory-Block
+
+    Args:
+        arrays: Zu übergebende Arrays
+
+    Returns:
+        (SharedMemory, Deskriptor mit Name und Layout)
+    """
+    layout = {}
+    offset = 0
+    for key, array in arrays.items():
+        offset = -(-offset // _ARRAY_ALIGNMENT) * _ARRAY_ALIGNMENT
+        layout[key] = (offset, array.shape, array.dtype.str)
+        offset += array.nbytes
+
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    try:
+        for key, array in arrays.items():
+            start, shape, dtype = layout[key]
+            np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)[...] = array
+    except Exception:
+        shm.close()
+        shm.unlink()
+        raise
+
+    return shm, {"name": shm.name, "layout": layout}
+
+
+def _attach_shared_arrays(descriptor: Dict[str, Any]) -> Tuple[shared_memory.SharedMemory, Dict[str, np.ndarray]]:
+    """
+    Öffnet einen Shared-Memory-Block und liefert Views auf die Arrays
+
+    Args:
+        descriptor: Deskriptor aus _pack_shared_arrays
+
+    Returns:
+        (SharedMemory, Array-Views)
+    """
+    if sys.version_info >= (3, 13):
+        shm = shared_memory.SharedMemory(name=descriptor["name"], track=False)
+    else:
+        # Vor 3.13 registriert auch das Öffnen den Block beim Resource-Tracker;
+        # Eigentümer ist der Elternprozess, der ihn freigibt. Worker bearbeiten
+        # einen Task nach dem anderen, das kurzzeitige Ersetzen ist daher sicher.
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            shm = shared_memory.SharedMemory(name=descriptor["name"])
+        finally:
+            resource_tracker.register = register
+    arrays = {
+        key: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)
+        for key, (start, shape, dtype) in descriptor["layout"].items()
+    }
+    return shm, arrays
+
+
+def _run_shared_task(task: ProcessingTask, descriptor: Dict[str, Any]) -> ProcessingResult:
+    """Worker-Einstiegspunkt im Prozessmodus: Arrays aus Shared Memory einsetzen und auswerten"""
+    global _worker_processor
+    if _worker_processor is None:
+        _init_worker()
+
+    shm, arrays = _attach_shared_arrays(descriptor)
+    try:
+        task.raw_data.update(arrays)
+        return _worker_processor.process(task)
+    finally:
+        # Views freigeben, sonst kann der Block nicht geschlossen werden
+        task.raw_data.clear()
+        del arrays
+        shm.close()
+
+
+class ProcessingWorkerPool:
+    """
+    Pool für die Ausführung von ProcessingTasks
+
+    Features:
+    - Prozess- (Standard) oder Thread-basiert
+    - Zeitreihen über Shared Memory statt Pickling
+    - Auslastung und Latenz pro Task für get_service_status
+    - Neustart nach abgestürztem Worker-Prozess
+    """
+
+    def __init__(self, mode: str = MODE_PROCESS, max_workers: Optional[int] = None):
+        """
+        Initialisiert den Pool
+
+        Args:
+            mode: "process" oder "thread"
+            max_workers: Anzahl Worker (Standard: CPU-Kerne - 1, mindestens 1)
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown worker pool mode: {mode} (expected one of {MODES})")
+
+        self.mode = mode
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 1) - 1)
+
+        self._executor: Optional[Executor] = None
+        self._thread_processor = PostProcessor()
+        self._lock = threading.Lock()
+
+        # Statistiken
+        self.busy_workers = 0
+        self.tasks_completed = 0
+        self.tasks_failed = 0
+        self.restarts = 0
+        self._busy_time = 0.0
+        self._start_time: Optional[float] = None
+        self._latencies = deque(maxlen=100)  # Sekunden von Task-Erstellung bis Ergebnis
+        self._execution_times = deque(maxlen=100)
+
+    def start(self) -> None:
+        """Startet die Worker"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._create_executor()
+                self._start_time = time.time()
+
+                if self.mode == MODE_PROCESS:
+                    # Worker-Prozesse sofort starten, nicht erst beim ersten Test
+                    for _ in range(self.max_workers):
+                        self._executor.submit(os.getpid)
+
+        logger.info(f"Worker-Pool gestartet: {self.max_workers} Worker ({self.mode})")
+
+    def _create_executor(self) -> Executor:
+        if self.mode == MODE_THREAD:
+            return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pi_processing")
+
+        # spawn statt fork: der Service-Prozess hat laufende MQTT- und Event-Loop-Threads
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Beendet die Worker"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info("Worker-Pool beendet")
+
+    async def submit(self, task: ProcessingTask) -> ProcessingResult:
+        """
+        Führt einen Task im Pool aus
+
+        Args:
+            task: ProcessingTask mit vollständigen Testdaten
+
+        Returns:
+            ProcessingResult (bei Fehlern success=False)
+        """
+        if self._executor is None:
+            self.start()
+
+        loop = asyncio.get_running_loop()
+        shm = None
+        self.busy_workers += 1
+        started = time.perf_counter()
+
+        try:
+            if self.mode == MODE_THREAD:
+                result = await loop.run_in_executor(self._executor, self._thread_processor.process, task)
+            else:
+                arrays = {k: v for k, v in task.raw_data.items() if isinstance(v, np.ndarray)}
+                metadata = {k: v for k, v in task.raw_data.items() if k not in arrays}
+                shm, descriptor = _pack_shared_arrays(arrays)
+
+                worker_task = ProcessingTask(
+                    task_id=task.task_id,
+                    position=task.position,
+                    raw_data=metadata,
+                    timestamp=task.timestamp,
+                    priority=task.priority,
+                    enqueued_at=task.enqueued_at,
+                )
+                result = await loop.run_in_executor(self._executor, _run_shared_task, worker_task, descriptor)
+
+        except BrokenProcessPool as e:
+            logger.error(f"Worker-Prozess abgestürzt, starte Pool neu: {e}")
+            self._restart()
+            result = self._failed_result(task, started, e)
+        except Exception as e:
+            logger.error(f"Fehler bei der Ausführung im Worker-Pool: {e}")
+            result = self._failed_result(task, started, e)
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+            execution_time = time.perf_counter() - started
+            self.busy_workers -= 1
+            self._busy_time += execution_time
+            self._execution_times.append(execution_time)
+            self._latencies.append(time.monotonic() - task.enqueued_at)
+
+        if result.success:
+            self.tasks_completed += 1
+        else:
+            self.tasks_failed += 1
+
+        return result
+
+    def _restart(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, self._create_executor()
+            self.restarts += 1
+
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _failed_result(self, task: ProcessingTask, started: float, error: Exception) -> ProcessingResult:
+        return ProcessingResult(
+            task_id=task.task_id,
+            position=task.position,
+            success=False,
+            results={},
+            processing_time=time.perf_counter() - started,
+            timestamp=time.time(),
+            error_message=str(error),
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Auslastungs- und Latenzstatistiken zurück"""
+        uptime = time.time() - self._start_time if self._start_time else 0.0
+        capacity = uptime * self.max_workers
+
+        latencies = list(self._latencies)
+        execution_times = list(self._execution_times)
+
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "busy_workers": self.busy_workers,
+            "utilization": min(self._busy_time / capacity, 1.0) if capacity > 0 else 0.0,
+            "tasks_completed": self.tasks_completed,
+            "tasks_failed": self.tasks_failed,
+            "restarts": self.restarts,
+            "avg_latency": float(np.mean(latencies)) if latencies else 0.0,
+            "max_latency": float(np.max(latencies)) if latencies else 0.0,
+            "last_latency": latencies[-1] if latencies else 0.0,
+            "avg_execution_time": float(np.mean(execution_times)) if execution_times else 0.0,
+        }
@@ -27,6 +27,7 @@ logger = logging.getLogger(__name__)
 # Zentrale EGEA-Implementation importieren
 try:
     from suspension_core.egea import PhaseShiftProcessor as CentralPhaseShiftProcessor
+    from suspension_core.egea import get_filter_bank
     from suspension_core.config import ConfigManager
     EGEA_AVAILABLE = True
     logger.info("✅ Zentrale PhaseShiftProcessor erfolgreich importiert")
@@ -79,6 +80,9 @@ class PhaseShiftProcessor:
         # Zentrale EGEA-Implementation initialisieren
         self.egea_processor = CentralPhaseShiftProcessor()
         
+        # Filterbank für die erwartete Abtastrate vorberechnen
+        get_filter_bank().prepare(self.config.get("sample_rate", 1000.0))
+        
         # Test-Controller-spezifische Parameter
         self.min_freq = self.config["min_freq"]
         self.max_freq = self.config["max_freq"]
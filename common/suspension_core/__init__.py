@@ -13,6 +13,12 @@ Components:
 
 __version__ = "1.0.0"
 
+# suspension_core und common.suspension_core auf dieselben Module abbilden;
+# muss vor allen weiteren Importen des Pakets stehen
+from ._import_alias import install as _install_import_alias
+
+_install_import_alias(__name__)
+
 # Import key components for easier access
 from common.suspension_core.config.manager import ConfigManager
 
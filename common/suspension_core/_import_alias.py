@@ -0,0 +1,57 @@
+"""
+Einheitlicher Importpfad für suspension_core
+
+Services mit common/ im Suchpfad importieren "suspension_core.*", Hardware
+Bridge, Simulatoren und Tests "common.suspension_core.*". Ohne Abgleich lädt
+Python jedes Modul zweimal – mit doppelten Singletons (Standarduhr, Tracer,
+Filterbank, Analyse-Cache, ConfigManager).
+
+Der Paketname, unter dem suspension_core zuerst importiert wird, ist
+maßgeblich. Für den jeweils anderen Präfix liefert ein Finder im Importsystem
+das bereits geladene Modul des maßgeblichen Pfads, sodass beide Namen auf
+dieselben Modulobjekte zeigen (inklusive Attributzugriff über das Paket).
+"""
+
+import importlib
+import importlib.abc
+import importlib.util
+import sys
+
+PACKAGE_NAMES = ("suspension_core", "common.suspension_core")
+
+
+class SuspensionCoreAliasFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """Leitet Importe unter dem Alias-Präfix auf den maßgeblichen Präfix um"""
+
+    def __init__(self, canonical: str, alias: str):
+        self.canonical = canonical
+        self.alias = alias
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname != self.alias and not fullname.startswith(self.alias + "."):
+            return None
+        return importlib.util.spec_from_loader(fullname, self)
+
+    def create_module(self, spec):
+        # Bereits vorhandenes Modul des maßgeblichen Pfads wiederverwenden
+        return importlib.import_module(self.canonical + spec.name[len(self.alias):])
+
+    def exec_module(self, module):
+        # Modul wurde unter dem maßgeblichen Namen bereits ausgeführt
+        pass
+
+
+def install(package_name: str) -> None:
+    """
+    Registriert den Finder für den anderen Präfix (einmal pro Prozess)
+
+    Args:
+        package_name: Name, unter dem das Paket gerade importiert wird
+    """
+    if package_name not in PACKAGE_NAMES:
+        return
+    if any(isinstance(finder, SuspensionCoreAliasFinder) for finder in sys.meta_path):
+        return
+
+    alias = next(name for name in PACKAGE_NAMES if name != package_name)
+    sys.meta_path.insert(0, SuspensionCoreAliasFinder(package_name, alias))
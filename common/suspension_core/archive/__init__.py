@@ -0,0 +1,10 @@
+"""
+Archive Package for Fahrwerkstester Common Library
+
+On-disk archive of test results and raw signals (memory-mapped column files
+plus an append-only index).
+"""
+
+from common.suspension_core.archive.archive import ArchivedTest, ArchiveError, TestArchive, record_to_dict
+
+__all__ = ["ArchivedTest", "ArchiveError", "TestArchive", "record_to_dict"]
@@ -0,0 +1,447 @@
+# suspension_core/archive/archive.py
+"""
+Test-Archiv mit Memory-Mapped-Spaltendateien.
+
+Aufbau des Archiv-Verzeichnisses:
+
+    index.sti                 Anhängender Index (fester Record pro Test)
+    signals/<JJJJ-MM>/<id>.sta  Eine Spaltendatei pro Test
+
+Spaltendatei (Little Endian):
+
+    SIGNAL_HEADER   Magic "STA1", Version, Spaltenanzahl, Länge der Metadaten
+    Spalten-Verzeichnis  je Spalte Name, dtype, Form, Offset
+    Metadaten       JSON (Ergebnis-Zusammenfassung)
+    Spalten         jeweils auf ALIGNMENT Bytes ausgerichtet
+
+Eine Spalte wird als np.memmap über genau ihren Dateibereich geöffnet - das
+Lesen eines Kanals lädt die übrigen nicht. Der Index ist ein Array fester
+Records (INDEX_DTYPE), das ebenfalls gemappt und vektorisiert gefiltert wird.
+"""
+
+import json
+import logging
+import os
+import re
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_MAGIC = b"STA1"
+INDEX_MAGIC = b"STI1"
+VERSION = 1
+ALIGNMENT = 64
+
+INDEX_FILE = "index.sti"
+SIGNAL_DIR = "signals"
+SIGNAL_SUFFIX = ".sta"
+
+# Magic, Version, Spaltenanzahl, Länge der Metadaten, Anzahl Samples
+SIGNAL_HEADER = struct.Struct("<4sHHIQ")
+# Name, dtype (NumPy-String), Breite (0 = eindimensional), Offset, Länge in Bytes
+COLUMN_ENTRY = struct.Struct("<32s8sIQQ")
+# Magic, Version, Record-Größe
+INDEX_HEADER = struct.Struct("<4sHH8x")
+
+INDEX_DTYPE = np.dtype([
+    ("test_id", "S40"),
+    ("position", "S12"),
+    ("vehicle_type", "S12"),
+    ("evaluation", "S12"),
+    ("timestamp", "<f8"),
+    ("min_phase_shift", "<f4"),
+    ("sample_count", "<u4"),
+    ("passed", "i1"),  # 1 = bestanden, 0 = nicht bestanden, -1 = unbekannt
+    ("reserved", "V3"),
+])
+
+PASSED_UNKNOWN = -1
+
+
+class ArchiveError(Exception):
+    """Fehler beim Lesen oder Schreiben des Archivs"""
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _key(test_id: str) -> bytes:
+    return test_id.encode()[:INDEX_DTYPE["test_id"].itemsize]
+
+
+def _file_name(test_id: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", test_id) + SIGNAL_SUFFIX
+
+
+def record_to_dict(record: np.void) -> Dict[str, Any]:
+    """
+    Wandelt einen Index-Record in ein JSON-serialisierbares Dict um.
+
+    Args:
+            record: Index-Record (INDEX_DTYPE)
+
+    Returns:
+            Dict mit Kennwerten; passed und min_phase_shift sind None, wenn unbekannt
+    """
+    min_phase_shift = float(record["min_phase_shift"])
+    passed = int(record["passed"])
+    return {
+        "test_id": record["test_id"].decode(errors="replace"),
+        "position": record["position"].decode(errors="replace"),
+        "vehicle_type": record["vehicle_type"].decode(errors="replace"),
+        "evaluation": record["evaluation"].decode(errors="replace"),
+        "timestamp": float(record["timestamp"]),
+        "min_phase_shift": None if np.isnan(min_phase_shift) else min_phase_shift,
+        "sample_count": int(record["sample_count"]),
+        "passed": None if passed == PASSED_UNKNOWN else bool(passed),
+    }
+
+
+def write_signal_file(path: str, columns: Dict[str, np.ndarray], metadata: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Schreibt eine Spaltendatei (atomar über eine temporäre Datei).
+
+    Args:
+            path: Zielpfad
+            columns: Spaltenname -> 1D-Array oder 2D-Array (n, Breite)
+            metadata: JSON-serialisierbare Metadaten
+
+    Returns:
+            Anzahl Samples (Länge der ersten Dimension)
+    """
+    arrays = {name: np.ascontiguousarray(values) for name, values in columns.items()}
+    lengths = {len(values) for values in arrays.values()}
+    if len(lengths) > 1:
+        raise ArchiveError(f"Spalten haben unterschiedliche Längen: {sorted(lengths)}")
+    sample_count = lengths.pop() if lengths else 0
+
+    meta = json.dumps(metadata or {}, default=str).encode()
+    offset = _align(SIGNAL_HEADER.size + COLUMN_ENTRY.size * len(arrays) + len(meta))
+
+    entries = []
+    for name, values in arrays.items():
+        if values.ndim not in (1, 2):
+            raise ArchiveError(f"Spalte {name}: nur 1D/2D-Arrays unterstützt")
+        width = values.shape[1] if values.ndim == 2 else 0
+        entries.append(COLUMN_ENTRY.pack(name.encode()[:32], values.dtype.str.encode(), width, offset, values.nbytes))
+        offset = _align(offset + values.nbytes)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(SIGNAL_HEADER.pack(SIGNAL_MAGIC, VERSION, len(arrays), len(meta), sample_count))
+        f.writelines(entries)
+        f.write(meta)
+        for values in arrays.values():
+            f.seek(_align(f.tell()))
+            f.write(values.tobytes())
+        f.truncate(_align(f.tell()))
+    os.replace(tmp_path, path)
+    return sample_count
+
+
+class ArchivedTest:
+    """
+    Lesezugriff auf die Spaltendatei eines Tests.
+
+    channel() liefert schreibgeschützte np.memmap-Views; es wird nur der
+    Dateibereich des angefragten Kanals gemappt.
+    """
+
+    def __init__(self, path: str, record: Optional[np.void] = None):
+        """
+        Öffnet die Datei und liest Spalten-Verzeichnis und Metadaten.
+
+        Args:
+                path: Pfad zur .sta-Datei
+                record: Zugehöriger Index-Record (optional)
+        """
+        self.path = path
+        self.record = record
+        self._channels: Dict[str, np.memmap] = {}
+
+        with open(path, "rb") as f:
+            raw = f.read(SIGNAL_HEADER.size)
+            if len(raw) < SIGNAL_HEADER.size:
+                raise ArchiveError(f"{path}: Datei zu kurz")
+            magic, version, column_count, meta_len, self.sample_count = SIGNAL_HEADER.unpack(raw)
+            if magic != SIGNAL_MAGIC or version != VERSION:
+                raise ArchiveError(f"{path}: Keine gültige Archivdatei")
+
+            self.columns: Dict[str, tuple] = {}
+            for _ in range(column_count):
+                name, dtype, width, offset, nbytes = COLUMN_ENTRY.unpack(f.read(COLUMN_ENTRY.size))
+                shape = (self.sample_count, width) if width else (self.sample_count,)
+                self.columns[name.rstrip(b"\0").decode()] = (np.dtype(dtype.rstrip(b"\0").decode()), shape, offset)
+            self.metadata: Dict[str, Any] = json.loads(f.read(meta_len) or b"{}")
+
+    @property
+    def test_id(self) -> str:
+        return self.metadata.get("test_id", os.path.basename(self.path)[:-len(SIGNAL_SUFFIX)])
+
+    def channel_names(self) -> List[str]:
+        return list(self.columns)
+
+    def channel(self, name: str) -> np.ndarray:
+        """
+        Liefert einen Kanal als schreibgeschützten Memory-Map-View.
+
+        Args:
+                name: Spaltenname
+
+        Returns:
+                np.memmap (ohne Kopie)
+        """
+        if name not in self._channels:
+            if name not in self.columns:
+                raise KeyError(f"Unbekannter Kanal: {name}")
+            dtype, shape, offset = self.columns[name]
+            if not self.sample_count:
+                return np.empty(shape, dtype=dtype)
+            self._channels[name] = np.memmap(self.path, dtype=dtype, mode="r", offset=offset, shape=shape)
+        return self._channels[name]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.channel(name)
+
+
+class TestArchive:
+    """
+    Archiv aller Tests mit Index und Spaltendateien pro Test.
+
+    Der Index wird nur angehängt; ein späterer Eintrag derselben test_id
+    ersetzt den früheren. Lesende Prozesse (GUI) sehen neue Einträge nach
+    refresh() bzw. automatisch bei query()/get().
+    """
+
+    __test__ = False  # Kein pytest-Testfall trotz Namenspräfix
+
+    def __init__(self, root: str):
+        """
+        Öffnet oder erstellt ein Archiv.
+
+        Args:
+                root: Archiv-Verzeichnis
+        """
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_FILE)
+        self._lock = threading.Lock()
+
+        self._index = np.empty(0, dtype=INDEX_DTYPE)
+        self._index_size = -1
+        self._current = np.empty(0, dtype=bool)  # False für ersetzte Einträge
+        self._rows: Dict[bytes, int] = {}
+
+        self.tests_stored = 0
+        self.bytes_stored = 0
+
+        os.makedirs(os.path.join(root, SIGNAL_DIR), exist_ok=True)
+        if not os.path.exists(self.index_path):
+            with open(self.index_path, "wb") as f:
+                f.write(INDEX_HEADER.pack(INDEX_MAGIC, VERSION, INDEX_DTYPE.itemsize))
+        self.refresh()
+
+    def __len__(self) -> int:
+        self.refresh()
+        return int(self._current.sum())
+
+    def __contains__(self, test_id: str) -> bool:
+        self.refresh()
+        return _key(test_id) in self._rows
+
+    def store(
+        self,
+        test_id: str,
+        columns: Dict[str, np.ndarray],
+        position: str = "",
+        vehicle_type: str = "",
+        timestamp: Optional[float] = None,
+        min_phase_shift: float = float("nan"),
+        passed: Optional[bool] = None,
+        evaluation: str = "",
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Speichert Signale und Ergebnis eines Tests.
+
+        Args:
+                test_id: Test-ID (max. 40 Bytes im Index)
+                columns: Signalspalten (z.B. time, platform_position, tire_force)
+                position: Radposition
+                vehicle_type: Fahrzeugklasse (z.B. "M1")
+                timestamp: Testzeitpunkt (Standard: jetzt)
+                min_phase_shift: φmin in Grad
+                passed: EGEA-Bewertung bestanden (None = unbekannt)
+                evaluation: Bewertungstext (z.B. "GOOD")
+                metadata: Weitere Ergebnisdaten (JSON)
+
+        Returns:
+                Pfad der Spaltendatei
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        path = self._signal_path(test_id, timestamp)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        meta = dict(metadata or {})
+        meta.update({
+            "test_id": test_id,
+            "position": position,
+            "vehicle_type": vehicle_type,
+            "timestamp": timestamp,
+            "min_phase_shift": min_phase_shift,
+            "passed": passed,
+            "evaluation": evaluation,
+        })
+        sample_count = write_signal_file(path, columns, meta)
+
+        record = np.zeros(1, dtype=INDEX_DTYPE)
+        record["test_id"] = _key(test_id)
+        record["position"] = position.encode()[:12]
+        record["vehicle_type"] = vehicle_type.encode()[:12]
+        record["evaluation"] = evaluation.encode()[:12]
+        record["timestamp"] = timestamp
+        record["min_phase_shift"] = min_phase_shift
+        record["sample_count"] = sample_count
+        record["passed"] = PASSED_UNKNOWN if passed is None else int(bool(passed))
+
+        with self._lock:
+            with open(self.index_path, "r+b") as f:
+                # Unvollständigen Record eines abgebrochenen Schreibvorgangs verwerfen
+                size = f.seek(0, os.SEEK_END)
+                excess = (size - INDEX_HEADER.size) % INDEX_DTYPE.itemsize
+                if excess:
+                    logger.warning(f"{self.index_path}: Unvollständigen Index-Record verworfen")
+                    f.truncate(size - excess)
+                    f.seek(size - excess)
+                f.write(record.tobytes())
+        self.tests_stored += 1
+        self.bytes_stored += os.path.getsize(path)
+        return path
+
+    def refresh(self) -> None:
+        """Mappt den Index neu, wenn er gewachsen ist"""
+        size = os.path.getsize(self.index_path)
+        if size == self._index_size:
+            return
+
+        with self._lock:
+            with open(self.index_path, "rb") as f:
+                magic, version, record_size = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+            if magic != INDEX_MAGIC or record_size != INDEX_DTYPE.itemsize:
+                raise ArchiveError(f"{self.index_path}: Ungültiger Index")
+
+            count = (size - INDEX_HEADER.size) // INDEX_DTYPE.itemsize
+            if count:
+                index = np.memmap(self.index_path, dtype=INDEX_DTYPE, mode="r", offset=INDEX_HEADER.size, shape=(count,))
+            else:
+                index = np.empty(0, dtype=INDEX_DTYPE)
+
+            # Nur neue Einträge in die ID-Zuordnung übernehmen
+            known = len(self._current)
+            current = np.ones(count, dtype=bool)
+            current[:known] = self._current
+            for row, test_id in enumerate(index["test_id"][known:].tolist(), start=known):
+                previous = self._rows.get(test_id)
+                if previous is not None:
+                    current[previous] = False
+                self._rows[test_id] = row
+
+            self._index = index
+            self._current = current
+            self._index_size = size
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        position: Optional[str] = None,
+        vehicle_type: Optional[str] = None,
+        passed: Optional[bool] = None,
+    ) -> np.ndarray:
+        """
+        Filtert den Index vektorisiert.
+
+        Args:
+                start: Frühester Zeitpunkt (inklusive)
+                end: Spätester Zeitpunkt (inklusive)
+                position: Radposition
+                vehicle_type: Fahrzeugklasse
+                passed: Nur bestandene (True) bzw. nicht bestandene (False) Tests
+
+        Returns:
+                Index-Records (INDEX_DTYPE) in Speicherreihenfolge
+        """
+        self.refresh()
+        index = self._index
+        mask = self._current.copy()
+        if start is not None:
+            mask &= index["timestamp"] >= start
+        if end is not None:
+            mask &= index["timestamp"] <= end
+        if position is not None:
+            mask &= index["position"] == position.encode()
+        if vehicle_type is not None:
+            mask &= index["vehicle_type"] == vehicle_type.encode()
+        if passed is not None:
+            mask &= index["passed"] == int(passed)
+        return index[mask]
+
+    def list_tests(self, limit: Optional[int] = None, **filters) -> List[Dict[str, Any]]:
+        """
+        Liefert die Kennwerte gefilterter Tests, neueste zuerst.
+
+        Args:
+                limit: Maximale Anzahl Einträge (None = alle)
+                **filters: Filter wie bei query()
+
+        Returns:
+                Liste von Dicts (siehe record_to_dict)
+        """
+        records = self.query(**filters)
+        records = records[np.argsort(records["timestamp"], kind="stable")[::-1]]
+        if limit is not None:
+            records = records[:max(0, limit)]
+        return [record_to_dict(record) for record in records]
+
+    def record(self, test_id: str) -> Optional[np.void]:
+        """Liefert den aktuellen Index-Record einer test_id"""
+        self.refresh()
+        row = self._rows.get(_key(test_id))
+        return None if row is None else self._index[row]
+
+    def get(self, test_id: str) -> Optional[ArchivedTest]:
+        """
+        Öffnet die Signale eines Tests.
+
+        Returns:
+                ArchivedTest oder None, wenn die test_id unbekannt ist
+        """
+        record = self.record(test_id)
+        if record is None:
+            return None
+        path = self._signal_path(test_id, float(record["timestamp"]))
+        try:
+            return ArchivedTest(path, record)
+        except (OSError, ArchiveError) as e:
+            logger.error(f"Archivierter Test {test_id} nicht lesbar: {e}")
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Statistiken zum Archiv zurück"""
+        self.refresh()
+        return {
+            "tests": int(self._current.sum()),
+            "index_entries": len(self._index),
+            "index_bytes": self._index_size,
+            "tests_stored": self.tests_stored,
+            "bytes_stored": self.bytes_stored,
+        }
+
+    def _signal_path(self, test_id: str, timestamp: float) -> str:
+        month = time.strftime("%Y-%m", time.gmtime(timestamp))
+        return os.path.join(self.root, SIGNAL_DIR, month, _file_name(test_id))
@@ -4,7 +4,18 @@ CAN Package for Fahrwerkstester Common Library
 This package provides CAN interface implementations and utilities for the Fahrwerkstester system.
 """
 
-from common.suspension_core.can.can_interface import CanInterface
+from common.suspension_core.can.can_interface import CanFrameBatch, CanInterface
+from common.suspension_core.can.capture import CaptureReader, CaptureWriter
 from common.suspension_core.can.interface_factory import create_can_interface
+from common.suspension_core.can.replay import ReplayCanInterface
+from common.suspension_core.can.session_store import SessionFrameStore
 
-__all__ = ["CanInterface", "create_can_interface"]
\ No newline at end of file
+__all__ = [
+    "CanFrameBatch",
+    "CanInterface",
+    "CaptureReader",
+    "CaptureWriter",
+    "ReplayCanInterface",
+    "SessionFrameStore",
+    "create_can_interface",
+]
\ No newline at end of file
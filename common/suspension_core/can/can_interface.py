@@ -3,15 +3,141 @@ CAN-Interface-Modul für die Verbindung mit CAN-Bussen.
 
 Dieses Modul bietet eine einheitliche Schnittstelle für die Verbindung mit dem CAN-Bus,
 mit Funktionen wie automatischer Baudratenerkennung, Fehlerbehandlung und Wiederverbindung.
+
+Empfangene Frames werden blockweise gelesen: der Empfangsthread leert den Bus in
+einen vorab allokierten CanFrameBatch (bis batch_size Frames oder batch_timeout)
+und ruft Batch-Callbacks einmal pro Block auf. Einzel-Callbacks werden über einen
+Adapter weiterhin pro Frame bedient.
 """
 
 import can
 import logging
+import os
 import time
 import threading
+from array import array
+
+import numpy as np
+
+from .capture import CaptureWriter
 
 logger = logging.getLogger(__name__)
 
+# Zähler verworfener Frames des Netzwerk-Interfaces (Kernel/Treiber)
+KERNEL_DROP_COUNTERS = ("rx_dropped", "rx_over_errors", "rx_fifo_errors", "rx_missed_errors", "rx_errors")
+
+
+class CanFrameBatch:
+    """
+    Vorab allokierter Block empfangener CAN-Frames.
+
+    Die Spalten liegen in festen Puffern und sind als NumPy-Views abrufbar
+    (timestamps, arbitration_ids, dlc, data, is_extended_id); zusätzlich bleiben
+    die can.Message-Objekte in messages erhalten. Der Empfangsthread verwendet
+    den Block wieder - Callbacks, die Daten über ihren Aufruf hinaus behalten,
+    müssen copy() verwenden.
+    """
+
+    FRAME_SIZE = 8  # Bytes Nutzdaten pro CAN-Frame
+
+    def __init__(self, capacity=256):
+        """
+        Initialisiert den Block.
+
+        Args:
+            capacity (int): Maximale Anzahl Frames
+        """
+        self.capacity = max(1, int(capacity))
+
+        self._timestamps = array("d", bytes(8 * self.capacity))
+        self._arbitration_ids = array("I", bytes(4 * self.capacity))
+        self._dlc = bytearray(self.capacity)
+        self._data = bytearray(self.FRAME_SIZE * self.capacity)
+        self._extended = bytearray(self.capacity)
+
+        # Views auf die Puffer (einmalig erzeugt, keine Kopie)
+        self._timestamps_view = np.frombuffer(self._timestamps, dtype=np.float64)
+        self._arbitration_ids_view = np.frombuffer(self._arbitration_ids, dtype=np.uint32)
+        self._dlc_view = np.frombuffer(self._dlc, dtype=np.uint8)
+        self._data_view = np.frombuffer(self._data, dtype=np.uint8).reshape(self.capacity, self.FRAME_SIZE)
+        self._extended_view = np.frombuffer(self._extended, dtype=np.bool_)
+
+        self.messages = []
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def full(self):
+        return self.count >= self.capacity
+
+    @property
+    def timestamps(self):
+        return self._timestamps_view[:self.count]
+
+    @property
+    def arbitration_ids(self):
+        return self._arbitration_ids_view[:self.count]
+
+    @property
+    def dlc(self):
+        return self._dlc_view[:self.count]
+
+    @property
+    def data(self):
+        """Nutzdaten mit Form (count, 8); Bytes hinter dlc sind 0"""
+        return self._data_view[:self.count]
+
+    @property
+    def is_extended_id(self):
+        return self._extended_view[:self.count]
+
+    def clear(self):
+        """Leert den Block für den nächsten Empfang"""
+        self.messages.clear()
+        self.count = 0
+
+    def append(self, msg):
+        """
+        Übernimmt einen Frame.
+
+        Args:
+            msg (can.Message): Empfangene Nachricht
+
+        Returns:
+            bool: False, wenn der Block voll ist
+        """
+        i = self.count
+        if i >= self.capacity:
+            return False
+
+        length = min(len(msg.data), self.FRAME_SIZE)
+        offset = i * self.FRAME_SIZE
+        self._data[offset:offset + length] = msg.data[:length]
+        if length < self.FRAME_SIZE:
+            self._data[offset + length:offset + self.FRAME_SIZE] = bytes(self.FRAME_SIZE - length)
+
+        self._timestamps[i] = msg.timestamp
+        self._arbitration_ids[i] = msg.arbitration_id
+        self._dlc[i] = length
+        self._extended[i] = msg.is_extended_id
+        self.messages.append(msg)
+        self.count = i + 1
+        return True
+
+    def copy(self):
+        """
+        Kopiert den Block (für Verwendung nach Ende des Callbacks).
+
+        Returns:
+            CanFrameBatch: Block mit Kapazität count
+        """
+        other = CanFrameBatch(self.count)
+        for msg in self.messages:
+            other.append(msg)
+        return other
+
 
 class CanInterface:
     """
@@ -35,6 +161,8 @@ class CanInterface:
         baudrates=None,
         baudrate=None,  # Optional: Einzelne Baudrate
         protocol="asa",
+        batch_size=256,
+        batch_timeout=0.005,
         **kwargs,
     ):
         """
@@ -46,9 +174,12 @@ class CanInterface:
             baudrates (list): Liste der zu testenden Baudraten
             baudrate (int): Einzelne Baudrate (Alternative zu baudrates)
             protocol (str): Zu verwendendes Protokoll ("asa" oder "eusama")
+            batch_size (int): Maximale Frames pro Empfangsblock (1 = einzeln)
+            batch_timeout (float): Maximale Wartezeit in Sekunden, bis ein angefangener Block ausgeliefert wird
             **kwargs: Weitere Parameter für die CAN-Bus-Initialisierung
         """
         self.channel = channel
+        self.protocol = protocol
 
         # Verwenden einer einzelnen Baudrate, falls angegeben
         if baudrate is not None:
@@ -70,8 +201,26 @@ class CanInterface:
         self.receive_thread = None
         self.stop_event = threading.Event()
         self.message_callbacks = []
+        self.batch_callbacks = []
         self.kwargs = kwargs
 
+        # Blockweiser Empfang: bis batch_size Frames oder batch_timeout Sekunden
+        self.batch_size = max(1, int(batch_size))
+        self.batch_timeout = max(0.0, float(batch_timeout))
+        self._batch = CanFrameBatch(self.batch_size)
+
+        # Empfangsstatistik
+        self.frames_received = 0
+        self.batches_received = 0
+        self.full_batches = 0
+        self.max_batch_fill = 0
+        self.receive_errors = 0
+        self.callback_errors = 0
+        self._drop_baseline = {}
+
+        # Binäre Aufzeichnung (siehe start_capture)
+        self.capture = None
+
         if auto_detect_baud:
             self.connect_with_auto_detect()
 
@@ -106,7 +255,7 @@ class CanInterface:
 
             # Alte Verbindung schließen, wenn vorhanden
             if self.interface:
-                self.shutdown()
+                self.shutdown(keep_capture=True)
 
                 # Sicherstellen, dass der Bus auch bei höheren Baudraten korrekt initialisiert wird
                 time.sleep(0.5)
@@ -127,6 +276,9 @@ class CanInterface:
                     f"CAN-Verbindung erfolgreich hergestellt mit {baudrate} bps"
                 )
 
+                # Drop-Zähler ab Verbindungsaufbau zählen
+                self._drop_baseline = self._read_kernel_counters()
+
                 # Empfangsthread starten
                 self.start_receiver()
                 return True
@@ -278,6 +430,93 @@ class CanInterface:
             logger.warning(f"Callback {callback.__name__} nicht gefunden")
             return False
 
+    def add_batch_callback(self, callback):
+        """
+        Fügt einen Callback für Empfangsblöcke hinzu.
+
+        Der Callback wird einmal pro Block mit einem CanFrameBatch aufgerufen.
+        Der Block wird danach wiederverwendet (bei Bedarf batch.copy()).
+
+        Args:
+                callback (callable): Callback-Funktion callback(batch)
+
+        Returns:
+                bool: True, wenn der Callback erfolgreich hinzugefügt wurde, sonst False
+        """
+        name = getattr(callback, "__name__", repr(callback))
+        if callback not in self.batch_callbacks:
+            self.batch_callbacks.append(callback)
+            logger.debug(f"Batch-Callback {name} hinzugefügt")
+            return True
+        else:
+            logger.warning(f"Batch-Callback {name} bereits registriert")
+            return False
+
+    def remove_batch_callback(self, callback):
+        """
+        Entfernt einen Callback für Empfangsblöcke.
+
+        Args:
+                callback (callable): Zu entfernender Callback
+
+        Returns:
+                bool: True, wenn der Callback erfolgreich entfernt wurde, sonst False
+        """
+        name = getattr(callback, "__name__", repr(callback))
+        if callback in self.batch_callbacks:
+            self.batch_callbacks.remove(callback)
+            logger.debug(f"Batch-Callback {name} entfernt")
+            return True
+        else:
+            logger.warning(f"Batch-Callback {name} nicht gefunden")
+            return False
+
+    def get_receive_stats(self):
+        """
+        Gibt Empfangsstatistik und Drop-Zähler zurück.
+
+        full_batches zählt Blöcke, die bis zur Kapazität gefüllt waren - ein
+        dauerhaft hoher Anteil bedeutet, dass der Bus schneller liefert als
+        der Empfangsthread abholt.
+
+        Returns:
+                dict: Statistik inkl. Kernel-Zählern seit Verbindungsaufbau
+        """
+        return {
+            "frames_received": self.frames_received,
+            "batches_received": self.batches_received,
+            "avg_batch_fill": self.frames_received / self.batches_received if self.batches_received else 0.0,
+            "max_batch_fill": self.max_batch_fill,
+            "full_batches": self.full_batches,
+            "batch_size": self.batch_size,
+            "batch_timeout_ms": self.batch_timeout * 1000,
+            "receive_errors": self.receive_errors,
+            "callback_errors": self.callback_errors,
+            "drops": self.get_drop_counters(),
+        }
+
+    def get_drop_counters(self):
+        """
+        Liest die Drop-Zähler des Netzwerk-Interfaces (SocketCAN/sysfs).
+
+        Returns:
+                dict: Zähler seit Verbindungsaufbau; leer, wenn nicht verfügbar
+        """
+        counters = self._read_kernel_counters()
+        return {name: value - self._drop_baseline.get(name, 0) for name, value in counters.items()}
+
+    def _read_kernel_counters(self):
+        """Liest /sys/class/net/<channel>/statistics (nur Linux)"""
+        counters = {}
+        base = os.path.join("/sys/class/net", str(self.channel), "statistics")
+        for name in KERNEL_DROP_COUNTERS:
+            try:
+                with open(os.path.join(base, name)) as f:
+                    counters[name] = int(f.read().strip())
+            except (OSError, ValueError):
+                continue
+        return counters
+
     def start_receiver(self):
         """Startet den Empfangsthread."""
         if not self.receive_thread or not self.receive_thread.is_alive():
@@ -295,25 +534,117 @@ class CanInterface:
 
     def _receive_loop(self):
         """Empfangsschleife für den Empfangsthread."""
-        logger.info("CAN-Empfangsthread gestartet")
+        logger.info(
+            f"CAN-Empfangsthread gestartet (Blöcke bis {self.batch_size} Frames / "
+            f"{self.batch_timeout * 1000:.1f} ms)"
+        )
+        batch = self._batch
         while not self.stop_event.is_set() and self.connected:
             try:
-                msg = self.recv_message(timeout=0.1)
-                if msg:
-                    # Alle Callbacks aufrufen
-                    for callback in self.message_callbacks:
-                        try:
-                            callback(msg)
-                        except Exception as e:
-                            logger.error(f"Fehler im Callback {callback.__name__}: {e}")
+                if self._fill_batch(batch, timeout=0.1):
+                    self._dispatch_batch(batch)
             except Exception as e:
+                self.receive_errors += 1
                 logger.error(f"Fehler in der Empfangsschleife: {e}")
                 time.sleep(0.1)  # Kurze Pause bei Fehlern
         logger.info("CAN-Empfangsthread beendet")
 
+    def _fill_batch(self, batch, timeout):
+        """
+        Leert den Bus in einen Block.
+
+        Wartet bis zu timeout auf den ersten Frame und liest danach ohne
+        weitere Wartezeit, solange Frames anstehen - höchstens bis der Block
+        voll ist oder batch_timeout seit dem ersten Frame verstrichen ist.
+
+        Returns:
+                int: Anzahl Frames im Block
+        """
+        batch.clear()
+        bus = self.interface
+
+        msg = bus.recv(timeout=timeout)
+        if msg is None:
+            return 0
+
+        deadline = time.monotonic() + self.batch_timeout
+        batch.append(msg)
+
+        while not batch.full:
+            msg = bus.recv(timeout=max(0.0, deadline - time.monotonic()))
+            if msg is None:
+                break
+            batch.append(msg)
+
+        return batch.count
+
+    def _dispatch_batch(self, batch):
+        """Ruft Batch-Callbacks einmal und Einzel-Callbacks pro Frame auf"""
+        self.frames_received += batch.count
+        self.batches_received += 1
+        self.max_batch_fill = max(self.max_batch_fill, batch.count)
+        if batch.full:
+            self.full_batches += 1
+
+        for callback in self.batch_callbacks:
+            try:
+                callback(batch)
+            except Exception as e:
+                self.callback_errors += 1
+                logger.error(f"Fehler im Batch-Callback {getattr(callback, '__name__', callback)}: {e}")
+
+        if self.message_callbacks:
+            self._frame_callback_adapter(batch)
+
+    def _frame_callback_adapter(self, batch):
+        """Stellt einen Block an die bisherigen Einzel-Callbacks zu"""
+        callbacks = tuple(self.message_callbacks)
+        for msg in batch.messages:
+            for callback in callbacks:
+                try:
+                    callback(msg)
+                except Exception as e:
+                    self.callback_errors += 1
+                    logger.error(f"Fehler im Callback {callback.__name__}: {e}")
+
+    def start_capture(self, directory, site="", **kwargs):
+        """
+        Startet die binäre Aufzeichnung aller empfangenen Frames.
+
+        Die Frames werden blockweise an einen CaptureWriter übergeben, der in
+        einem eigenen Thread schreibt - der Empfang wird nicht ausgebremst.
+
+        Args:
+                directory (str): Zielverzeichnis der Aufzeichnungsdateien
+                site (str): Standort/Prüfstand für Header und Dateinamen
+                **kwargs: Weitere Parameter für CaptureWriter (max_bytes, max_seconds, ...)
+
+        Returns:
+                CaptureWriter: Der aktive Writer
+        """
+        if self.capture:
+            return self.capture
+
+        bitrate = self.current_baudrate or self.baudrates[0]
+        self.capture = CaptureWriter(directory, bitrate=bitrate, protocol=self.protocol, site=site, **kwargs)
+        self.capture.start()
+        self.add_batch_callback(self.capture.write_batch)
+        return self.capture
+
+    def stop_capture(self):
+        """Beendet die binäre Aufzeichnung und schreibt den Puffer."""
+        if not self.capture:
+            return
+        self.remove_batch_callback(self.capture.write_batch)
+        self.capture.stop()
+        self.capture = None
+
     def log_message(self, msg, log_file=None):
         """
-        Protokolliert eine CAN-Nachricht.
+        Protokolliert eine CAN-Nachricht als Textzeile.
+
+        Nur für gelegentliches Debugging - für dauerhafte Aufzeichnung
+        start_capture() verwenden.
 
         Args:
                 msg (can.Message): Zu protokollierende Nachricht
@@ -339,10 +670,17 @@ class CanInterface:
         # In Logger ausgeben
         logger.debug(f"CAN: {log_entry}")
 
-    def shutdown(self):
-        """Beendet die CAN-Verbindung."""
+    def shutdown(self, keep_capture=False):
+        """
+        Beendet die CAN-Verbindung.
+
+        Args:
+                keep_capture (bool): Aufzeichnung weiterlaufen lassen (bei Wiederverbindung)
+        """
         logger.info("Beende CAN-Verbindung...")
         self.stop_receiver()
+        if not keep_capture:
+            self.stop_capture()
         if self.interface:
             try:
                 self.interface.shutdown()
@@ -0,0 +1,508 @@
+# suspension_core/can/capture.py
+"""
+Binäre Aufzeichnung von CAN-Frames.
+
+Dateiformat (Little Endian, nur anhängend geschrieben):
+
+    Datei-Header   FILE_HEADER (Magic "SCAP", Version, Record-Größe, Bitrate,
+                   Erstellungszeit, Protokoll, Standort)
+    Block*         BLOCK_HEADER (Magic "SIDX", Anzahl, Blocknummer, erster und
+                   letzter Zeitstempel) gefolgt von Anzahl * RECORD_DTYPE
+
+Jeder Block-Header dient gleichzeitig als Index-Eintrag: ein Leser springt von
+Header zu Header und findet Zeitbereiche, ohne die Frames zu lesen. Ein beim
+Absturz abgeschnittener letzter Block wird bis zum letzten vollständigen
+Record gelesen.
+
+CaptureWriter puffert Frames im Speicher und schreibt sie in einem eigenen
+Thread blockweise; Dateien werden nach Größe oder Alter rotiert.
+"""
+
+import logging
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import can
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SCAP"
+BLOCK_MAGIC = b"SIDX"
+VERSION = 1
+FILE_SUFFIX = ".scap"
+
+# Magic, Version, Record-Größe, Bitrate, Erstellungszeit, Protokoll, Standort
+FILE_HEADER = struct.Struct("<4sHHId16s64s")
+# Magic, Anzahl Records, Blocknummer, erster Zeitstempel, letzter Zeitstempel
+BLOCK_HEADER = struct.Struct("<4sIIdd")
+
+# Ein Frame: Zeitstempel, CAN-ID, DLC, Flags, 2 Byte Reserve, 8 Byte Nutzdaten
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("arbitration_id", "<u4"),
+    ("dlc", "u1"),
+    ("flags", "u1"),
+    ("reserved", "V2"),
+    ("data", "u1", (8,)),
+])
+RECORD_STRUCT = struct.Struct("<dIBB2x8s")
+
+FLAG_EXTENDED = 0x01
+FLAG_REMOTE = 0x02
+FLAG_ERROR = 0x04
+
+
+class CaptureFormatError(ValueError):
+    """Datei ist keine gültige CAN-Aufzeichnung"""
+
+
+@dataclass
+class CaptureHeader:
+    """Kopfdaten einer Aufzeichnungsdatei"""
+
+    version: int
+    bitrate: int
+    created: float
+    protocol: str
+    site: str
+
+
+@dataclass
+class CaptureBlock:
+    """Index-Eintrag eines Blocks"""
+
+    offset: int  # Dateiposition des ersten Records
+    count: int
+    sequence: int
+    first_timestamp: float
+    last_timestamp: float
+
+
+def message_to_record(msg) -> bytes:
+    """
+    Packt eine CAN-Nachricht in einen Record.
+
+    Args:
+            msg: can.Message
+
+    Returns:
+            RECORD_DTYPE.itemsize Bytes
+    """
+    flags = (
+        (FLAG_EXTENDED if msg.is_extended_id else 0)
+        | (FLAG_REMOTE if msg.is_remote_frame else 0)
+        | (FLAG_ERROR if msg.is_error_frame else 0)
+    )
+    data = bytes(msg.data[:8])
+    return RECORD_STRUCT.pack(msg.timestamp, msg.arbitration_id, len(data), flags, data)
+
+
+def batch_to_records(batch) -> bytes:
+    """
+    Packt einen CanFrameBatch spaltenweise in Records.
+
+    Args:
+            batch: CanFrameBatch
+
+    Returns:
+            len(batch) * RECORD_DTYPE.itemsize Bytes
+    """
+    records = np.zeros(len(batch), dtype=RECORD_DTYPE)
+    records["timestamp"] = batch.timestamps
+    records["arbitration_id"] = batch.arbitration_ids
+    records["dlc"] = batch.dlc
+    records["flags"] = batch.is_extended_id * FLAG_EXTENDED
+    records["data"] = batch.data
+    return records.tobytes()
+
+
+def records_to_messages(records: np.ndarray, timestamp_offset: float = 0.0) -> List[can.Message]:
+    """
+    Wandelt Records in can.Message-Objekte.
+
+    Args:
+            records: Array mit RECORD_DTYPE
+            timestamp_offset: Wird auf jeden Zeitstempel addiert
+
+    Returns:
+            Liste von can.Message
+    """
+    timestamps = (records["timestamp"] + timestamp_offset).tolist()
+    ids = records["arbitration_id"].tolist()
+    dlcs = records["dlc"].tolist()
+    flags = records["flags"].tolist()
+    payloads = records["data"].tobytes()
+
+    messages = []
+    for i in range(len(records)):
+        offset = i * 8
+        messages.append(can.Message(
+            timestamp=timestamps[i],
+            arbitration_id=ids[i],
+            is_extended_id=bool(flags[i] & FLAG_EXTENDED),
+            is_remote_frame=bool(flags[i] & FLAG_REMOTE),
+            is_error_frame=bool(flags[i] & FLAG_ERROR),
+            dlc=dlcs[i],
+            data=payloads[offset:offset + dlcs[i]],
+        ))
+    return messages
+
+
+class CaptureWriter:
+    """
+    Schreibt CAN-Frames gepuffert in rotierende Aufzeichnungsdateien.
+
+    write()/write_batch() packen die Frames nur in einen Puffer und kehren
+    sofort zurück; ein Hintergrund-Thread schreibt spätestens alle
+    flush_interval Sekunden. Läuft der Puffer über max_pending Frames,
+    werden neue Frames verworfen und gezählt.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        bitrate: int = 1000000,
+        protocol: str = "eusama",
+        site: str = "",
+        max_bytes: int = 64 * 1024 * 1024,
+        max_seconds: float = 3600.0,
+        block_records: int = 1024,
+        flush_interval: float = 1.0,
+        max_pending: int = 200000,
+        prefix: str = "can",
+    ):
+        """
+        Initialisiert den Writer.
+
+        Args:
+                directory: Zielverzeichnis (wird angelegt)
+                bitrate: CAN-Bitrate für den Datei-Header
+                protocol: Protokollname für den Datei-Header
+                site: Standort/Prüfstand für Header und Dateinamen
+                max_bytes: Rotation ab dieser Dateigröße
+                max_seconds: Rotation ab diesem Dateialter
+                block_records: Maximale Frames pro Block
+                flush_interval: Maximale Pufferzeit in Sekunden
+                max_pending: Maximale Frames im Puffer
+                prefix: Präfix der Dateinamen
+        """
+        self.directory = directory
+        self.bitrate = bitrate
+        self.protocol = protocol
+        self.site = site
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.block_records = max(1, block_records)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.prefix = prefix
+
+        self._lock = threading.Lock()
+        self._pending: List[bytes] = []
+        self._pending_count = 0
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._file = None
+        self._file_opened = 0.0
+        self._file_index = 0
+        self._block_sequence = 0
+        self.current_path: Optional[str] = None
+        self.files: List[str] = []
+
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.bytes_written = 0
+        self.blocks_written = 0
+        self.write_errors = 0
+
+    def start(self):
+        """Startet den Schreib-Thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._writer_loop, name="can-capture", daemon=True)
+        self._thread.start()
+        logger.info(f"CAN-Aufzeichnung gestartet: {self.directory}")
+
+    def stop(self):
+        """Schreibt den restlichen Puffer und schließt die Datei"""
+        if self._thread:
+            self._stop_event.set()
+            self._wakeup.set()
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        self._close_file()
+        logger.info(f"CAN-Aufzeichnung beendet: {self.frames_written} Frames in {len(self.files)} Dateien")
+
+    def write(self, msg) -> bool:
+        """
+        Puffert eine einzelne Nachricht.
+
+        Returns:
+                False, wenn der Puffer voll war
+        """
+        return self._enqueue(message_to_record(msg), 1)
+
+    def write_batch(self, batch) -> bool:
+        """
+        Puffert einen CanFrameBatch (als Batch-Callback verwendbar).
+
+        Returns:
+                False, wenn der Puffer voll war
+        """
+        if not len(batch):
+            return True
+        return self._enqueue(batch_to_records(batch), len(batch))
+
+    def flush(self):
+        """Weckt den Schreib-Thread für sofortiges Schreiben"""
+        self._wakeup.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Statistiken zur Aufzeichnung zurück"""
+        with self._lock:
+            pending = self._pending_count
+        return {
+            "frames_written": self.frames_written,
+            "frames_dropped": self.frames_dropped,
+            "frames_pending": pending,
+            "bytes_written": self.bytes_written,
+            "blocks_written": self.blocks_written,
+            "write_errors": self.write_errors,
+            "files": len(self.files),
+            "current_file": self.current_path,
+        }
+
+    def _enqueue(self, records: bytes, count: int) -> bool:
+        with self._lock:
+            if self._pending_count + count > self.max_pending:
+                self.frames_dropped += count
+                return False
+            self._pending.append(records)
+            self._pending_count += count
+            wake = self._pending_count >= self.block_records
+        if wake:
+            self._wakeup.set()
+        return True
+
+    def _writer_loop(self):
+        while not self._stop_event.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._write_pending()
+        self._write_pending()
+
+    def _write_pending(self):
+        with self._lock:
+            chunks, self._pending = self._pending, []
+            self._pending_count = 0
+        if not chunks:
+            self._rotate_if_needed()
+            return
+
+        records = np.frombuffer(b"".join(chunks), dtype=RECORD_DTYPE)
+        try:
+            for start in range(0, len(records), self.block_records):
+                self._rotate_if_needed()
+                if self._file is None:
+                    self._open_file()
+                self._write_block(records[start:start + self.block_records])
+            self._file.flush()
+        except OSError as e:
+            self.write_errors += 1
+            logger.error(f"Fehler beim Schreiben der CAN-Aufzeichnung: {e}")
+
+    def _write_block(self, records: np.ndarray):
+        header = BLOCK_HEADER.pack(
+            BLOCK_MAGIC, len(records), self._block_sequence,
+            float(records["timestamp"][0]), float(records["timestamp"][-1]),
+        )
+        self._file.write(header)
+        self._file.write(records.tobytes())
+        self._block_sequence += 1
+        self.blocks_written += 1
+        self.frames_written += len(records)
+        self.bytes_written += len(header) + records.nbytes
+
+    def _rotate_if_needed(self):
+        if self._file is None:
+            return
+        too_big = self._file.tell() >= self.max_bytes
+        too_old = time.monotonic() - self._file_opened >= self.max_seconds
+        if too_big or too_old:
+            self._close_file()
+
+    def _open_file(self):
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        name = "_".join(part for part in (self.prefix, self.site, stamp, f"{self._file_index:04d}") if part)
+        path = os.path.join(self.directory, name + FILE_SUFFIX)
+        self._file_index += 1
+
+        self._file = open(path, "xb", buffering=1024 * 1024)
+        self._file.write(FILE_HEADER.pack(
+            MAGIC, VERSION, RECORD_DTYPE.itemsize, self.bitrate, time.time(),
+            self.protocol.encode()[:16], self.site.encode()[:64],
+        ))
+        self._file_opened = time.monotonic()
+        self._block_sequence = 0
+        self.current_path = path
+        self.files.append(path)
+        logger.info(f"Neue CAN-Aufzeichnungsdatei: {path}")
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError as e:
+                logger.error(f"Fehler beim Schließen der CAN-Aufzeichnung: {e}")
+            self._file = None
+            self.current_path = None
+
+
+class CaptureReader:
+    """Liest eine Aufzeichnungsdatei über ihren Block-Index"""
+
+    def __init__(self, path: str):
+        """
+        Öffnet die Datei und liest Header und Block-Index.
+
+        Args:
+                path: Pfad zur .scap-Datei
+
+        Raises:
+                CaptureFormatError: Bei ungültigem Header
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            raw = f.read(FILE_HEADER.size)
+            if len(raw) < FILE_HEADER.size:
+                raise CaptureFormatError(f"{path}: Datei zu kurz")
+            magic, version, record_size, bitrate, created, protocol, site = FILE_HEADER.unpack(raw)
+            if magic != MAGIC:
+                raise CaptureFormatError(f"{path}: Ungültige Magic {magic!r}")
+            if version != VERSION or record_size != RECORD_DTYPE.itemsize:
+                raise CaptureFormatError(f"{path}: Nicht unterstützte Version {version}")
+
+            self.header = CaptureHeader(
+                version=version,
+                bitrate=bitrate,
+                created=created,
+                protocol=protocol.rstrip(b"\0").decode(errors="replace"),
+                site=site.rstrip(b"\0").decode(errors="replace"),
+            )
+            self.index = self._read_index(f)
+
+    def __len__(self) -> int:
+        return sum(block.count for block in self.index)
+
+    @property
+    def time_range(self) -> Tuple[Optional[float], Optional[float]]:
+        if not self.index:
+            return None, None
+        return self.index[0].first_timestamp, self.index[-1].last_timestamp
+
+    def read(self, start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """
+        Liest alle Records, optional beschränkt auf [start, end].
+
+        Blöcke außerhalb des Zeitbereichs werden über den Index übersprungen.
+
+        Returns:
+                Array mit RECORD_DTYPE
+        """
+        parts = []
+        with open(self.path, "rb") as f:
+            for block in self.index:
+                if start is not None and block.last_timestamp < start:
+                    continue
+                if end is not None and block.first_timestamp > end:
+                    continue
+                f.seek(block.offset)
+                parts.append(np.frombuffer(f.read(block.count * RECORD_DTYPE.itemsize), dtype=RECORD_DTYPE))
+
+        records = np.concatenate(parts) if parts else np.empty(0, dtype=RECORD_DTYPE)
+        if start is not None:
+            records = records[records["timestamp"] >= start]
+        if end is not None:
+            records = records[records["timestamp"] <= end]
+        return records
+
+    def messages(self, start: Optional[float] = None, end: Optional[float] = None) -> Iterator[can.Message]:
+        """Liefert die Frames als can.Message"""
+        for block in self.index:
+            if start is not None and block.last_timestamp < start:
+                continue
+            if end is not None and block.first_timestamp > end:
+                continue
+            with open(self.path, "rb") as f:
+                f.seek(block.offset)
+                records = np.frombuffer(f.read(block.count * RECORD_DTYPE.itemsize), dtype=RECORD_DTYPE)
+            for msg in records_to_messages(records):
+                if (start is None or msg.timestamp >= start) and (end is None or msg.timestamp <= end):
+                    yield msg
+
+    def _read_index(self, f) -> List[CaptureBlock]:
+        index = []
+        size = os.fstat(f.fileno()).st_size
+        offset = FILE_HEADER.size
+        while offset + BLOCK_HEADER.size <= size:
+            f.seek(offset)
+            magic, count, sequence, first, last = BLOCK_HEADER.unpack(f.read(BLOCK_HEADER.size))
+            if magic != BLOCK_MAGIC:
+                logger.warning(f"{self.path}: Ungültiger Block bei Offset {offset}, Rest ignoriert")
+                break
+            data_offset = offset + BLOCK_HEADER.size
+            available = (size - data_offset) // RECORD_DTYPE.itemsize
+            if available < count:
+                # Abgeschnittener letzter Block (z.B. nach Stromausfall)
+                logger.warning(f"{self.path}: Letzter Block unvollständig ({available}/{count} Frames)")
+                if available:
+                    f.seek(data_offset + (available - 1) * RECORD_DTYPE.itemsize)
+                    last = struct.unpack("<d", f.read(8))[0]
+                    index.append(CaptureBlock(data_offset, available, sequence, first, last))
+                break
+            index.append(CaptureBlock(data_offset, count, sequence, first, last))
+            offset = data_offset + count * RECORD_DTYPE.itemsize
+        return index
+
+
+def load_capture(paths) -> Tuple[np.ndarray, Optional[CaptureHeader]]:
+    """
+    Liest eine oder mehrere Aufzeichnungsdateien (z.B. rotierte Teile).
+
+    Args:
+            paths: Pfad, Verzeichnis oder Liste von Pfaden; Verzeichnisse
+                   werden nach Dateinamen sortiert vollständig gelesen
+
+    Returns:
+            (Records in Dateireihenfolge, Header der ersten Datei)
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.endswith(FILE_SUFFIX)
+            ))
+        else:
+            files.append(path)
+
+    header = None
+    parts = []
+    for path in files:
+        reader = CaptureReader(path)
+        header = header or reader.header
+        parts.append(reader.read())
+
+    records = np.concatenate(parts) if parts else np.empty(0, dtype=RECORD_DTYPE)
+    return records, header
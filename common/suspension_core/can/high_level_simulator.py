@@ -10,10 +10,13 @@ import queue
 import random
 import threading
 import time
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional
 
 import numpy as np
 
+from ..clock import Clock, get_clock
+from ..egea.utils.sweep_synthesizer import SweepModel, SweepSynthesizer
+
 
 # Dummy-Klasse zum Nachbilden der can.Message Schnittstelle bei Bedarf
 class DummyMessage:
@@ -45,8 +48,14 @@ class DataSimulator:
     Daten statt mit rohen CAN-Frames.
     """
 
-    def __init__(self):
-        """Initialisiert den High-Level-Simulator."""
+    def __init__(self, clock: Optional[Clock] = None):
+        """
+        Initialisiert den High-Level-Simulator.
+
+        Args:
+            clock: Zeitquelle für Zeitstempel und Sample-Takt (Standard: prozessweite Uhr)
+        """
+        self.clock = clock or get_clock()
         self.vehicle_present = False
         self.test_running = False
         self.test_side = None
@@ -218,7 +227,7 @@ class DataSimulator:
             data = {
                 "event": "vehicle_detected",
                 "weights": weights,
-                "timestamp": time.time(),
+                "timestamp": self.clock.time(),
                 "vehicle_info": self.vehicle_info,
             }
 
@@ -233,7 +242,7 @@ class DataSimulator:
                     "rear_left": random.uniform(0, 10),
                     "rear_right": random.uniform(0, 10),
                 },
-                "timestamp": time.time(),
+                "timestamp": self.clock.time(),
             }
             self.logger.info("Fahrzeug hat Plattform verlassen")
 
@@ -319,7 +328,7 @@ class DataSimulator:
             "event": "test_stopped",
             "side": self.test_side,
             "method": self.test_method,
-            "timestamp": time.time(),
+            "timestamp": self.clock.time(),
         }
         message = DummyMessage(interpreted_data=data)
         self._process_message(message)
@@ -436,7 +445,7 @@ class DataSimulator:
                     "event": "test_completed",
                     "side": side,
                     "method": "phase_shift",
-                    "timestamp": time.time(),
+                    "timestamp": self.clock.time(),
                     "min_phase_shift": self.current_min_phase,
                     "min_phase_freq": self.min_phase_frequency,
                     "duration": runtime,
@@ -477,51 +486,42 @@ class DataSimulator:
             f"_generate_phase_shift_data aufgerufen: side={side}, runtime={runtime}, start_time={start_time}"
         )
 
-        # Parameter für den Frequenzsweep (EGEA-konform)
-        freq_start = 25.0  # Hz - Startfrequenz
-        freq_end = 6.0  # Hz - Endfrequenz
-        platform_amplitude = 3.0  # mm - Standardamplitude der Plattform
-
-        # Debug-Info ausgeben
-        self.logger.info(f"Starte Frequenzsweep {freq_start}Hz → {freq_end}Hz über {runtime}s")
-
-        # Ausgangsfrequenz und -amplitude
-        freq_start = 25.0  # Hz
-        freq_end = 6.0  # Hz
-        amplitude = 3.0  # mm (Plattformamplitude)
-
-        # Simuliere Frequenzsweep von hoch nach niedrig
-        elapsed = 0
+        # Kompletten Frequenzsweep (EGEA-konform, 25Hz → 6Hz) vorab als Block erzeugen:
+        # konstante Phasenverschiebung, höhere Kraftamplitude zum Sweepende (Resonanz)
+        model = SweepModel(
+            duration=runtime,
+            static_force=0.0,
+            force_amplitude=500.0,
+            resonance_freq=6.0,
+            resonance_gain=0.6,
+            min_phase=self.phase_shift_value,
+            phase_boost=0.0,
+        )
         n_samples = int(runtime / sample_interval)
+        sweep = SweepSynthesizer(model, sample_rate=1.0 / sample_interval).generate(
+            n_samples * sample_interval
+        )
 
-        while elapsed < runtime and self.test_running:
-            # Aktuelle Frequenz berechnen (linearer Sweep)
-            progress = elapsed / runtime
-            current_freq = freq_start - progress * (freq_start - freq_end)
-
-            # Zeit für den aktuellen Datenpunkt
-            t = elapsed
+        self.logger.info(
+            f"Starte Frequenzsweep {model.freq_start}Hz → {model.freq_end}Hz über {runtime}s"
+        )
 
-            # Plattformbewegung simulieren (Sinuswelle)
-            platform_pos = amplitude * np.sin(2 * np.pi * current_freq * t)
+        for i in range(len(sweep)):
+            if not self.test_running:
+                break
 
-            # Reifenkraft simulieren (mit Phasenverschiebung)
-            phase_rad = np.radians(self.phase_shift_value)
-            force_amplitude = 500 + 300 * (
-                1.0 - (current_freq - 6.0) / 20.0
-            )  # Höhere Amplitude bei Resonanz
-            tire_force = force_amplitude * np.sin(2 * np.pi * current_freq * t - phase_rad)
+            elapsed = float(sweep.elapsed[i])
 
             # Test-Daten-Nachricht
             data = {
                 "event": "test_data",
                 "type": "phase_shift",
                 "side": side,
-                "timestamp": time.time(),
+                "timestamp": self.clock.time(),
                 "elapsed": elapsed,
-                "frequency": current_freq,
-                "platform_position": platform_pos,
-                "tire_force": tire_force,
+                "frequency": float(sweep.frequency[i]),
+                "platform_position": float(sweep.platform_position[i]),
+                "tire_force": float(sweep.tire_force[i]),
                 "static_weight": 400.0,  # Konstantes Gewicht als Referenz
                 "phase_shift": self.phase_shift_value,
             }
@@ -535,9 +535,9 @@ class DataSimulator:
 
             # Warten bis zum nächsten Sample
             next_sample_time = start_time + elapsed
-            sleep_time = max(0, next_sample_time - time.time())
+            sleep_time = max(0, next_sample_time - self.clock.time())
             if sleep_time > 0:
-                time.sleep(sleep_time)
+                self.clock.sleep(sleep_time)
 
     def _generate_resonance_data(self, side, runtime, start_time, sample_interval):
         """
@@ -570,7 +570,7 @@ class DataSimulator:
                 "event": "test_data",
                 "type": "resonance",
                 "side": side,
-                "timestamp": time.time(),
+                "timestamp": self.clock.time(),
                 "elapsed": elapsed,
                 "oscillation": oscillation,
                 "damping_ratio": damping_ratio,
@@ -586,9 +586,9 @@ class DataSimulator:
 
             # Warten bis zum nächsten Sample
             next_sample_time = start_time + elapsed
-            sleep_time = max(0, next_sample_time - time.time())
+            sleep_time = max(0, next_sample_time - self.clock.time())
             if sleep_time > 0:
-                time.sleep(sleep_time)
+                self.clock.sleep(sleep_time)
 
     def _send_test_result(self, side):
         """
@@ -607,7 +607,7 @@ class DataSimulator:
                 "event": "test_result",
                 "type": "phase_shift",
                 "side": side,
-                "timestamp": time.time(),
+                "timestamp": self.clock.time(),
                 "min_phase_shift": min_phase,
                 "min_phase_freq": random.uniform(12, 14),  # Hz
                 "static_weight": 400.0,
@@ -631,7 +631,7 @@ class DataSimulator:
                 "event": "test_result",
                 "type": "resonance",
                 "side": side,
-                "timestamp": time.time(),
+                "timestamp": self.clock.time(),
                 "effectiveness": effectiveness,
                 "amplitude": random.uniform(5, 15),  # mm
                 "weight": 400.0,
@@ -15,7 +15,8 @@ import threading
 import time
 from typing import Any, Callable, Dict, List, Optional
 
-import numpy as np
+from ..clock import Clock, get_clock
+from ..egea.utils.sweep_synthesizer import SweepModel, SweepSynthesizer
 
 try:
     import can
@@ -40,8 +41,15 @@ class HybridSimulator:
     RAW_DATA_RIGHT_ID = 0x08AAAA61
     MOTOR_STATUS_ID = 0x08AAAA66
 
-    def __init__(self):
-        """Initialisiert den sauberen Hybrid-Simulator."""
+    def __init__(self, clock: Optional[Clock] = None):
+        """
+        Initialisiert den sauberen Hybrid-Simulator.
+
+        Args:
+            clock: Zeitquelle (Standard: prozessweite Uhr, siehe suspension_core.clock)
+        """
+        self.clock = clock or get_clock()
+
         # Test-Zustand (saubere Kontrolle)
         self.test_active = False  # ← Wie im raspi_can_simulator
         self.current_side = "left"
@@ -76,6 +84,7 @@ class HybridSimulator:
             "marginal": {"min_phase": 32.0, "resonance_freq": 12.8},
             "bad": {"min_phase": 25.0, "resonance_freq": 12.0},
         }
+        self._synthesizer: Optional[SweepSynthesizer] = None
 
         logger.info("Sauberer HybridSimulator initialisiert - KEINE leeren Messages!")
 
@@ -98,6 +107,7 @@ class HybridSimulator:
         """Setzt Dämpfungsqualität."""
         if quality in self.damping_params:
             self.damping_quality = quality
+            self._synthesizer = None
             logger.info(f"Dämpfungsqualität: {quality}")
 
     def set_generate_low_level(self, enable: bool):
@@ -135,8 +145,9 @@ class HybridSimulator:
         # Test-Parameter setzen
         self.current_side = side
         self.test_duration = duration
-        self.test_start_time = time.time()
+        self.test_start_time = self.clock.time()
         self.simulation_time = 0.0
+        self._synthesizer = None
         self.test_active = True  # ← Saubere Kontrolle
 
         logger.info(f"Test gestartet: {side}, {duration}s")
@@ -159,12 +170,12 @@ class HybridSimulator:
         Selbst-beendend, KEINE kontinuierlichen Background-Threads.
         """
         try:
-            start_time = time.time()
+            start_time = self.clock.time()
             last_message_time = 0
             message_interval = 0.05  # 20 Hz für GUI-Updates
 
-            while self.test_active and (time.time() - start_time) < duration:
-                current_time = time.time()
+            while self.test_active and (self.clock.time() - start_time) < duration:
+                current_time = self.clock.time()
 
                 # Messages in Intervallen generieren
                 if current_time - last_message_time >= message_interval:
@@ -178,7 +189,7 @@ class HybridSimulator:
                     last_message_time = current_time
 
                 # Kurze Pause
-                time.sleep(0.01)
+                self.clock.sleep(0.01)
 
             # Test automatisch beenden
             self.test_active = False
@@ -200,7 +211,7 @@ class HybridSimulator:
         if not self.test_active:
             return []  # ← SAUBER: Keine Messages wenn Test nicht aktiv
 
-        current_time = time.time()
+        current_time = self.clock.time()
         elapsed = current_time - self.test_start_time
 
         # Test beenden wenn Dauer erreicht
@@ -208,26 +219,13 @@ class HybridSimulator:
             self.test_active = False
             return []  # ← SAUBER: Keine Messages nach Testende
 
-        # Aktuelle Frequenz berechnen
-        progress = elapsed / self.test_duration
-        frequency = self.freq_start - progress * (self.freq_start - self.freq_end)
-
-        # Phasenverschiebung berechnen
-        damping = self.damping_params[self.damping_quality]
-        resonance_freq = damping["resonance_freq"]
-        min_phase = damping["min_phase"]
-
-        freq_factor = abs(frequency - resonance_freq) / 10.0
-        phase_shift = min_phase + 15.0 * np.exp(-2 * freq_factor)
-        phase_rad = np.radians(phase_shift)
-
-        # Signale berechnen
-        platform_pos = self.platform_amplitude * np.sin(2 * np.pi * frequency * elapsed)
+        # Signale über das gemeinsame Sweep-Modell berechnen
+        sample = self._sweep_synthesizer().samples(elapsed)
+        frequency = float(sample.frequency[0])
+        phase_shift = float(sample.phase_shift[0])
+        platform_pos = float(sample.platform_position[0])
+        tire_force = float(sample.tire_force[0])
         static_weight = 512
-        force_amplitude = 100 * (1.0 + 0.5 * np.exp(-freq_factor))
-        tire_force = static_weight + force_amplitude * np.sin(
-            2 * np.pi * frequency * elapsed - phase_rad
-        )
 
         messages = []
 
@@ -250,26 +248,16 @@ class HybridSimulator:
 
         # 2. LOW-LEVEL CAN Messages (wenn aktiviert)
         if self.generate_low_level:
-            # DMS-Werte generieren
-            dms1 = int(max(0, min(1023, static_weight + platform_pos * 20)))
-            dms2 = int(max(0, min(1023, static_weight + platform_pos * 18)))
-            dms3 = int(max(0, min(1023, tire_force)))
-            dms4 = int(max(0, min(1023, tire_force * 0.95)))
-
-            # CAN-Message für DMS-Daten
+            # CAN-Message für DMS-Daten (4 × 16 Bit, Big-Endian)
             can_id = (
                 self.RAW_DATA_LEFT_ID if self.current_side == "left" else self.RAW_DATA_RIGHT_ID
             )
-            dms_data = bytearray(8)
-            dms_values = [dms1, dms2, dms3, dms4]
-            for i, dms in enumerate(dms_values):
-                dms_data[i * 2] = (dms >> 8) & 0xFF
-                dms_data[i * 2 + 1] = dms & 0xFF
+            dms_data = sample.dms[0].astype(">u2").tobytes()
 
             can_message_data = {
                 "type": "low_level",
                 "id": can_id,
-                "data": bytes(dms_data),
+                "data": dms_data,
                 "extended": True,
                 "timestamp": current_time,
             }
@@ -291,6 +279,21 @@ class HybridSimulator:
 
         return messages
 
+    def _sweep_synthesizer(self) -> SweepSynthesizer:
+        """Liefert den Synthesizer für Testdauer und Dämpfungsqualität."""
+        if self._synthesizer is None:
+            damping = self.damping_params[self.damping_quality]
+            model = SweepModel(
+                freq_start=self.freq_start,
+                freq_end=self.freq_end,
+                duration=self.test_duration,
+                platform_amplitude=self.platform_amplitude,
+                resonance_freq=damping["resonance_freq"],
+                min_phase=damping["min_phase"],
+            )
+            self._synthesizer = SweepSynthesizer(model)
+        return self._synthesizer
+
     def _process_and_send_message(self, msg_data: Dict[str, Any]):
         """Verarbeitet und sendet Messages an Callbacks."""
         try:
@@ -343,7 +346,7 @@ class HybridSimulator:
             "side": side,
             "method": "phase_shift",
             "duration": duration,
-            "timestamp": time.time(),
+            "timestamp": self.clock.time(),
         }
 
         self._process_and_send_message(completion_data)
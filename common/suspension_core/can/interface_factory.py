@@ -28,6 +28,19 @@ def create_can_interface(config=None, simulation_type="low_level", simulation_pr
 
     use_simulator = config.get(["can", "use_simulator"], True)  # Immer True für den Simulator
 
+    # Aufzeichnung abspielen statt Bus/Simulator, wenn konfiguriert
+    replay_file = config.get(["can", "replay", "file"], None)
+    if replay_file:
+        from suspension_core.can.replay import ReplayCanInterface
+
+        logger.info(f"Verwende CAN-Wiedergabe aus {replay_file}")
+        return ReplayCanInterface(
+            replay_file,
+            speed=config.get(["can", "replay", "speed"], 1.0),
+            loop=config.get(["can", "replay", "loop"], False),
+            batch_size=config.get(["can", "receive_batch_size"], 256),
+        )
+
     # Auf Windows automatisch den Simulator verwenden
     if sys.platform == "win32":
         use_simulator = True
@@ -43,12 +56,24 @@ def create_can_interface(config=None, simulation_type="low_level", simulation_pr
             protocol = config.get(["can", "protocol"], "eusama")
 
             logger.info(f"Verwende echtes CAN-Interface auf Kanal {channel}")
-            return CanInterface(
+            can_interface = CanInterface(
                 channel=channel,
                 baudrate=baudrate,
                 protocol=protocol,
                 auto_detect_baud=config.get(["can", "auto_detect_baud"], True),
+                batch_size=config.get(["can", "receive_batch_size"], 256),
+                batch_timeout=config.get(["can", "receive_batch_timeout_ms"], 5) / 1000.0,
             )
+
+            # Binäre Aufzeichnung aller Frames (für Reklamationen und Wiedergabe)
+            if config.get(["can", "capture", "enabled"], False):
+                can_interface.start_capture(
+                    config.get(["can", "capture", "directory"], "captures"),
+                    site=config.get(["can", "capture", "site"], ""),
+                    max_bytes=config.get(["can", "capture", "max_file_mb"], 64) * 1024 * 1024,
+                    max_seconds=config.get(["can", "capture", "max_file_minutes"], 60) * 60,
+                )
+            return can_interface
         except Exception as e:
             logger.error(f"Fehler beim Initialisieren des echten CAN-Interface: {e}")
             logger.warning("Falle zurück auf Simulator")
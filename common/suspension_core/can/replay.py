@@ -0,0 +1,161 @@
+# suspension_core/can/replay.py
+"""
+Wiedergabe binärer CAN-Aufzeichnungen.
+
+ReplayCanInterface verhält sich wie ein CanInterface (Einzel- und
+Batch-Callbacks, Empfangsstatistik), liest die Frames aber aus .scap-Dateien.
+Die Wiedergabe läuft in Echtzeit (speed=1), beschleunigt (speed=N) oder so
+schnell wie möglich (speed=0). Die Zeitstempel der ausgelieferten Frames
+stammen immer aus der Aufzeichnung (plus festem timestamp_offset), nicht von
+der Wanduhr - zwei Wiedergaben liefern damit identische Daten an die
+EGEA-Pipeline.
+"""
+
+import logging
+import threading
+import time
+
+import numpy as np
+
+from .can_interface import CanInterface
+from .capture import load_capture, records_to_messages
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayCanInterface(CanInterface):
+    """CAN-Interface, das eine Aufzeichnung statt eines Busses abspielt"""
+
+    def __init__(
+        self,
+        paths,
+        speed=1.0,
+        loop=False,
+        timestamp_offset=0.0,
+        batch_size=256,
+        autostart=True,
+        **kwargs,
+    ):
+        """
+        Initialisiert die Wiedergabe.
+
+        Args:
+                paths: Aufzeichnungsdatei, Verzeichnis rotierter Dateien oder Liste
+                speed (float): Wiedergabefaktor (1 = Echtzeit, 0 = maximal schnell)
+                loop (bool): Am Ende von vorn beginnen (Zeitstempel laufen weiter)
+                timestamp_offset (float): Wird auf alle Zeitstempel addiert
+                batch_size (int): Maximale Frames pro Block
+                autostart (bool): Wiedergabe sofort starten (wie connect beim CanInterface)
+                **kwargs: Weitere Parameter für CanInterface
+        """
+        self.records, self.capture_header = load_capture(paths)
+        protocol = self.capture_header.protocol if self.capture_header else "eusama"
+        bitrate = self.capture_header.bitrate if self.capture_header else 1000000
+
+        super().__init__(
+            channel="replay",
+            auto_detect_baud=False,
+            baudrate=bitrate,
+            protocol=protocol,
+            batch_size=batch_size,
+            **kwargs,
+        )
+
+        self.speed = max(0.0, float(speed or 0.0))
+        self.loop = loop
+        self.timestamp_offset = timestamp_offset
+        self.finished = threading.Event()
+
+        timestamps = self.records["timestamp"]
+        self._relative = timestamps - timestamps[0] if len(timestamps) else timestamps
+        # Abstand beim Wiederholen: Dauer plus mittlerer Frame-Abstand
+        if len(timestamps) > 1:
+            self._period = float(self._relative[-1]) * len(timestamps) / (len(timestamps) - 1)
+        else:
+            self._period = 0.0
+        self._position = 0
+        self._cycle = 0
+        self._start = 0.0
+
+        logger.info(
+            f"CAN-Wiedergabe: {len(self.records)} Frames, {self._period:.1f} s, "
+            f"Geschwindigkeit {'max' if not self.speed else f'{self.speed:g}x'}"
+        )
+
+        if autostart:
+            self.connect(bitrate)
+
+    def connect(self, baudrate=None):
+        """Startet die Wiedergabe von vorn"""
+        self.stop_receiver()
+        self._position = 0
+        self._cycle = 0
+        self._start = time.monotonic()
+        self.finished.clear()
+        self.connected = True
+        self.current_baudrate = baudrate or self.baudrates[0]
+        self.start_receiver()
+        return True
+
+    def wait(self, timeout=None):
+        """
+        Wartet auf das Ende der Wiedergabe.
+
+        Returns:
+                bool: True, wenn alle Frames ausgeliefert wurden
+        """
+        return self.finished.wait(timeout)
+
+    def send_message(self, arbitration_id, data, is_extended_id=False, **kwargs):
+        """Gesendete Frames werden bei der Wiedergabe verworfen"""
+        logger.debug(f"Wiedergabe: Sendeframe 0x{arbitration_id:X} verworfen")
+        return self.connected
+
+    def recv_message(self, timeout=1.0):
+        """Frames werden nur über Callbacks ausgeliefert"""
+        return None
+
+    def get_replay_stats(self):
+        """Gibt den Fortschritt der Wiedergabe zurück"""
+        stats = self.get_receive_stats()
+        stats.update({
+            "frames_total": len(self.records),
+            "position": self._position,
+            "cycle": self._cycle,
+            "speed": self.speed,
+            "finished": self.finished.is_set(),
+        })
+        return stats
+
+    def _fill_batch(self, batch, timeout):
+        batch.clear()
+        if self._position >= len(self.records):
+            if not self.loop or not len(self.records):
+                self.connected = False
+                self.finished.set()
+                return 0
+            self._position = 0
+            self._cycle += 1
+
+        cycle_offset = self._cycle * self._period
+        position = self._position
+        end = min(position + batch.capacity, len(self.records))
+
+        if self.speed:
+            due = self._start + (self._relative[position] + cycle_offset) / self.speed
+            wait = due - time.monotonic()
+            if wait > timeout:
+                self.stop_event.wait(timeout)
+                return 0
+            if wait > 0:
+                self.stop_event.wait(wait)
+            # Alle bereits fälligen Frames in einen Block
+            elapsed = (time.monotonic() - self._start) * self.speed - cycle_offset
+            due_end = int(np.searchsorted(self._relative, elapsed, side="right"))
+            end = max(position + 1, min(end, due_end))
+
+        offset = self.timestamp_offset + cycle_offset
+        for msg in records_to_messages(self.records[position:end], offset):
+            batch.append(msg)
+        self._position = end
+        return batch.count
@@ -0,0 +1,183 @@
+"""
+Session-Speicher für die CAN-Frames eines laufenden Tests
+
+Wird von der Hardware Bridge (hardware_bridge.py, enhanced_hardware_bridge.py)
+pro Test-Session angelegt: feste Arrays statt einer Liste von Message-Dicts,
+thread-sicheres Schreiben aus dem CAN-Empfang, schrittweises Dekodieren über
+take_pending(). session_dataset_columns() bereitet die dekodierten Samples
+einer Session für die Chunk-Übertragung auf.
+"""
+
+import logging
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Spalten eines Datasets bei der Chunk-Übertragung: (Feld, array-Typecode)
+DATASET_COLUMNS = (
+    ("timestamp", "d"),
+    ("platform_position", "f"),
+    ("tire_force", "f"),
+    ("frequency", "f"),
+    ("phase_shift", "f"),
+)
+
+# Felder, an denen ein Rohdaten-Sample erkannt wird (Status-Nachrichten haben sie nicht)
+SAMPLE_FIELDS = ("platform_position", "tire_force")
+
+
+def _matches_position(sample_position: Optional[str], position: Optional[str]) -> bool:
+    """Prüft, ob ein Sample zur Testposition gehört ("left" passt zu "front_left")"""
+    if not sample_position or not position or position == "unknown":
+        return True
+    return sample_position == position or sample_position.endswith("_" + position)
+
+
+def session_dataset_columns(raw_data: Iterable[Dict[str, Any]],
+                            position: Optional[str] = None) -> Dict[str, array]:
+    """
+    Baut die Spalten eines Datasets aus den dekodierten Nachrichten einer Session
+
+    Übernommen werden nur Rohdaten-Samples der getesteten Position; Motorstatus,
+    TOP-Meldungen und Samples der Gegenseite werden übersprungen.
+
+    Args:
+        raw_data: Dekodierte Nachrichten der Session (alle Typen, beide Seiten)
+        position: Testposition der Session (z.B. "front_left")
+
+    Returns:
+        Spalten nach DATASET_COLUMNS als typisierte Arrays
+    """
+    samples = [
+        msg for msg in raw_data
+        if all(field in msg for field in SAMPLE_FIELDS) and _matches_position(msg.get("position"), position)
+    ]
+    return {
+        name: array(typecode, (msg.get(name) or 0.0 for msg in samples))
+        for name, typecode in DATASET_COLUMNS
+    }
+
+
+class SessionFrameStore:
+    """
+    Vorab dimensionierter Speicher für die CAN-Frames einer Test-Session
+
+    Jeder Frame wird beim Empfang genau einmal in feste Arrays geschrieben.
+    Ist die Kapazität erreicht, werden weitere Frames verworfen und gezählt;
+    die ersten Frames eines Tests gehen nie verloren.
+    """
+
+    FRAME_SIZE = 8  # Bytes Nutzdaten pro CAN-Frame
+    SOURCES = ("hardware", "simulator")
+
+    def __init__(self, capacity: int):
+        """
+        Initialisiert den Speicher
+
+        Args:
+            capacity: Maximale Anzahl Frames der Session
+        """
+        self.capacity = max(1, int(capacity))
+
+        self.timestamps = array("d", bytes(8 * self.capacity))
+        self.arbitration_ids = array("I", bytes(4 * self.capacity))
+        self.payloads = bytearray(self.FRAME_SIZE * self.capacity)
+        self.lengths = bytearray(self.capacity)
+        self.sources = bytearray(self.capacity)
+
+        self.count = 0  # Geschriebene Frames
+        self.decoded_count = 0  # Davon bereits dekodiert
+        self.overflow = 0  # Verworfene Frames nach Erreichen der Kapazität
+        self.closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        """Belegter Speicher in Bytes"""
+        return (
+            len(self.timestamps) * self.timestamps.itemsize
+            + len(self.arbitration_ids) * self.arbitration_ids.itemsize
+            + len(self.payloads)
+            + len(self.lengths)
+            + len(self.sources)
+        )
+
+    def append(self, timestamp: float, arbitration_id: int, data, source: str) -> bool:
+        """
+        Schreibt einen Frame (thread-sicher)
+
+        Args:
+            timestamp: Empfangszeitpunkt
+            arbitration_id: CAN-ID
+            data: Nutzdaten (max. 8 Bytes)
+            source: "hardware" oder "simulator"
+
+        Returns:
+            True wenn gespeichert, False bei Überlauf oder geschlossener Session
+        """
+        length = min(len(data), self.FRAME_SIZE)
+
+        with self._lock:
+            if self.closed:
+                return False
+
+            i = self.count
+            if i >= self.capacity:
+                self.overflow += 1
+                if self.overflow == 1:
+                    logger.warning(
+                        f"Session-Speicher voll ({self.capacity} Frames) - weitere Frames werden verworfen"
+                    )
+                return False
+
+            offset = i * self.FRAME_SIZE
+            self.payloads[offset:offset + length] = bytes(data[:length])
+            self.lengths[i] = length
+            self.timestamps[i] = timestamp
+            self.arbitration_ids[i] = arbitration_id
+            self.sources[i] = self.SOURCES.index(source) if source in self.SOURCES else 0
+            self.count = i + 1
+
+        return True
+
+    def close(self):
+        """Nimmt keine weiteren Frames mehr an"""
+        with self._lock:
+            self.closed = True
+
+    def take_pending(self) -> List[Dict[str, Any]]:
+        """
+        Liefert alle noch nicht dekodierten Frames im bisherigen Message-Format
+
+        Returns:
+            Liste von Dicts mit source, timestamp, arbitration_id, data, is_extended_id
+        """
+        with self._lock:
+            start, stop = self.decoded_count, self.count
+            self.decoded_count = stop
+
+        frames = []
+        for i in range(start, stop):
+            offset = i * self.FRAME_SIZE
+            frames.append(
+                {
+                    "source": self.SOURCES[self.sources[i]],
+                    "timestamp": self.timestamps[i],
+                    "arbitration_id": self.arbitration_ids[i],
+                    "data": list(self.payloads[offset:offset + self.lengths[i]]),
+                    "is_extended_id": True,
+                }
+            )
+        return frames
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Füllstand und Überlauf zurück"""
+        return {
+            "capacity": self.capacity,
+            "frames": self.count,
+            "decoded": self.decoded_count,
+            "overflow": self.overflow,
+            "utilization": self.count / self.capacity,
+        }
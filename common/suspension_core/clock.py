@@ -0,0 +1,278 @@
+"""
+Injizierbare Uhr für Simulatoren und Services
+
+Alle Simulatoren, die Hardware Bridge und der Pi Processing Service lesen die
+Zeit und warten über ein Clock-Objekt statt direkt über time.time(),
+time.sleep(), Event.wait() oder asyncio.sleep(). Damit laufen komplette
+Pipeline-Tests wahlweise
+
+- in Echtzeit (RealTimeClock, Produktion),
+- N-fach beschleunigt (ScaledClock, Zeitstempel und Wartezeiten skaliert) oder
+- schrittweise (SteppedClock): jede Wartezeit kehrt sofort zurück und rückt
+  eine virtuelle Uhr um genau diese Dauer vor. Zeitstempel sind damit
+  deterministisch, ein 30-s-Test dauert nur noch so lange wie die Rechenzeit.
+
+Die prozessweite Standarduhr wird über set_clock() oder die
+Umgebungsvariable SUSPENSION_CLOCK gewählt ("realtime", "scaled:20",
+"stepped"), sodass auch separat gestartete Services im selben Modus laufen.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Awaitable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOCK_ENV_VAR = "SUSPENSION_CLOCK"
+
+# Startzeitpunkt der virtuellen Uhr (fest, damit Zeitstempel reproduzierbar sind)
+STEPPED_EPOCH = 1_700_000_000.0
+
+
+class Clock:
+    """
+    Uhr in Echtzeit und Basisklasse der übrigen Modi
+
+    Abgeleitete Uhren überschreiben time()/monotonic() sowie to_real()
+    (Umrechnung Simulationsdauer → echte Wartezeit) und _elapse()
+    (Fortschreiben der Uhr nach einer abgelaufenen Wartezeit).
+    """
+
+    mode = "realtime"
+
+    def __init__(self):
+        self.sleeps = 0
+        self.simulated_wait = 0.0
+
+    def time(self) -> float:
+        """Aktuelle Zeit in Sekunden seit Epoche"""
+        return time.time()
+
+    def monotonic(self) -> float:
+        """Monotone Zeit in Sekunden (für Intervalle und Timeouts)"""
+        return time.monotonic()
+
+    def to_real(self, seconds: float) -> float:
+        """Rechnet eine Simulationsdauer in echte Wartezeit um"""
+        return seconds
+
+    def _elapse(self, seconds: float) -> None:
+        """Wird nach jeder abgelaufenen Wartezeit aufgerufen"""
+
+    def _record(self, seconds: float) -> None:
+        self.sleeps += 1
+        self.simulated_wait += seconds
+
+    def sleep(self, seconds: float) -> None:
+        """Wartet seconds Simulationszeit (ersetzt time.sleep)"""
+        seconds = max(0.0, seconds)
+        time.sleep(self.to_real(seconds))
+        self._record(seconds)
+        self._elapse(seconds)
+
+    def wait(self, event: threading.Event, timeout: Optional[float] = None) -> bool:
+        """
+        Wartet auf ein Event mit Timeout in Simulationszeit (ersetzt Event.wait)
+
+        Args:
+            event: Event, z.B. ein Stop-Event
+            timeout: Timeout in Sekunden Simulationszeit (None = unbegrenzt, echt)
+
+        Returns:
+            True wenn das Event gesetzt ist
+        """
+        if timeout is None:
+            return event.wait()
+        timeout = max(0.0, timeout)
+        if event.wait(self.to_real(timeout)):
+            return True
+        self._record(timeout)
+        self._elapse(timeout)
+        return event.is_set()
+
+    def idle_timeout(self, seconds: float, minimum: float = 0.05) -> float:
+        """
+        Echte Wartezeit für Idle-Polling (Heartbeats, Queue-Timeouts)
+
+        Solche Wartezeiten rücken die Uhr nicht vor, damit im Stepped-Modus
+        nur die eigentliche Simulation die Zeit bestimmt.
+
+        Args:
+            seconds: Intervall in Sekunden Simulationszeit
+            minimum: Untergrenze der echten Wartezeit (kein Busy-Waiting)
+
+        Returns:
+            Echte Wartezeit in Sekunden
+        """
+        return max(self.to_real(seconds), minimum)
+
+    async def async_sleep(self, seconds: float) -> None:
+        """Wartet seconds Simulationszeit (ersetzt asyncio.sleep)"""
+        seconds = max(0.0, seconds)
+        await asyncio.sleep(self.to_real(seconds))
+        self._record(seconds)
+        self._elapse(seconds)
+
+    async def wait_for(self, awaitable: Awaitable, timeout: float) -> Any:
+        """
+        asyncio.wait_for mit Timeout in Simulationszeit
+
+        Raises:
+            asyncio.TimeoutError: wenn der Timeout abgelaufen ist
+        """
+        timeout = max(0.0, timeout)
+        try:
+            return await asyncio.wait_for(awaitable, self.to_real(timeout))
+        except asyncio.TimeoutError:
+            self._record(timeout)
+            self._elapse(timeout)
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Modus und Wartestatistik zurück"""
+        return {
+            "mode": self.mode,
+            "sleeps": self.sleeps,
+            "simulated_wait": self.simulated_wait,
+            "time": self.time(),
+        }
+
+
+class RealTimeClock(Clock):
+    """Wanduhr (Standard in Produktion)"""
+
+
+class ScaledClock(Clock):
+    """
+    N-fach beschleunigte Uhr
+
+    Zeit läuft ab Erzeugung factor-mal schneller als die Wanduhr, alle
+    Wartezeiten werden durch factor geteilt.
+    """
+
+    mode = "scaled"
+
+    def __init__(self, factor: float):
+        """
+        Initialisiert die Uhr
+
+        Args:
+            factor: Beschleunigungsfaktor (> 0, 1.0 = Echtzeit)
+        """
+        if factor <= 0:
+            raise ValueError(f"Beschleunigungsfaktor muss positiv sein: {factor}")
+        super().__init__()
+        self.factor = float(factor)
+        self._origin = time.time()
+        self._origin_monotonic = time.monotonic()
+
+    def time(self) -> float:
+        return self._origin + (time.time() - self._origin) * self.factor
+
+    def monotonic(self) -> float:
+        return self._origin_monotonic + (time.monotonic() - self._origin_monotonic) * self.factor
+
+    def to_real(self, seconds: float) -> float:
+        return seconds / self.factor
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats["factor"] = self.factor
+        return stats
+
+
+class SteppedClock(Clock):
+    """
+    Virtuelle Uhr ohne echte Wartezeiten
+
+    Jede Wartezeit rückt die Uhr sofort um ihre Dauer vor. Bei einem
+    einzelnen Simulations-Thread sind alle Zeitstempel deterministisch; warten
+    mehrere Threads gleichzeitig, addieren sich ihre Wartezeiten.
+    """
+
+    mode = "stepped"
+
+    def __init__(self, start: float = STEPPED_EPOCH):
+        """
+        Initialisiert die Uhr
+
+        Args:
+            start: Anfangszeit in Sekunden seit Epoche
+        """
+        super().__init__()
+        self.start = start
+        self._now = start
+        self._lock = threading.Lock()
+
+    def time(self) -> float:
+        return self._now
+
+    def monotonic(self) -> float:
+        return self._now - self.start
+
+    def to_real(self, seconds: float) -> float:
+        return 0.0
+
+    def _elapse(self, seconds: float) -> None:
+        with self._lock:
+            self._now += seconds
+
+    def advance(self, seconds: float) -> None:
+        """Rückt die Uhr manuell vor (z.B. in Tests)"""
+        self._elapse(max(0.0, seconds))
+
+
+def create_clock(spec: Optional[str] = None) -> Clock:
+    """
+    Erstellt eine Uhr aus einer Kurzbeschreibung
+
+    Args:
+        spec: "realtime", "scaled:<Faktor>" oder "stepped[:<Startzeit>]"
+
+    Returns:
+        Clock-Instanz
+    """
+    mode, _, argument = (spec or "realtime").strip().lower().partition(":")
+
+    if mode in ("", "realtime", "real"):
+        return RealTimeClock()
+    if mode == "scaled":
+        return ScaledClock(float(argument or 1.0))
+    if mode == "stepped":
+        return SteppedClock(float(argument) if argument else STEPPED_EPOCH)
+
+    raise ValueError(f"Unbekannter Uhr-Modus: {spec} (realtime, scaled:<N>, stepped)")
+
+
+_default_clock: Optional[Clock] = None
+_default_clock_lock = threading.Lock()
+
+
+def get_clock() -> Clock:
+    """Liefert die prozessweite Standarduhr (SUSPENSION_CLOCK oder Echtzeit)"""
+    global _default_clock
+
+    if _default_clock is None:
+        with _default_clock_lock:
+            if _default_clock is None:
+                spec = os.environ.get(CLOCK_ENV_VAR)
+                try:
+                    _default_clock = create_clock(spec)
+                except ValueError as e:
+                    logger.warning(f"{CLOCK_ENV_VAR} ignoriert: {e}")
+                    _default_clock = RealTimeClock()
+                if _default_clock.mode != "realtime":
+                    logger.info(f"Uhr-Modus: {spec}")
+
+    return _default_clock
+
+
+def set_clock(clock: Optional[Clock]) -> None:
+    """Setzt die prozessweite Standarduhr (None = beim nächsten Zugriff neu bestimmen)"""
+    global _default_clock
+
+    with _default_clock_lock:
+        _default_clock = clock
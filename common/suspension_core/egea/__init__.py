@@ -7,6 +7,11 @@ for phase shift analysis and related signal processing.
 
 # Export the main classes for easy importing
 from .processors.phase_shift_processor import EGEAPhaseShiftProcessor
+from .processors.incremental_analyzer import IncrementalPhaseShiftAnalyzer
+from .utils.filter_bank import EGEAFilterBank, get_filter_bank
+from .utils.analysis_cache import EGEAAnalysisCache, get_analysis_cache
+from .utils.sweep_synthesizer import SweepModel, SweepSynthesizer
+from .utils.quarter_car import QuarterCarEngine, QuarterCarParameters, parameter_grid
 
 # Alias for backwards compatibility and cleaner imports
 PhaseShiftProcessor = EGEAPhaseShiftProcessor
@@ -14,4 +19,14 @@ PhaseShiftProcessor = EGEAPhaseShiftProcessor
 __all__ = [
     'EGEAPhaseShiftProcessor',
     'PhaseShiftProcessor',
+    'IncrementalPhaseShiftAnalyzer',
+    'EGEAFilterBank',
+    'get_filter_bank',
+    'EGEAAnalysisCache',
+    'get_analysis_cache',
+    'SweepModel',
+    'SweepSynthesizer',
+    'QuarterCarEngine',
+    'QuarterCarParameters',
+    'parameter_grid',
 ]
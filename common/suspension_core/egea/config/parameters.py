@@ -50,6 +50,9 @@ class EGEAParameters:
     PASS_MUL_PH: int = 2  # PassMulPh - Durchlassbereich Multiplikator
     STOP_MUL_PH: int = 4  # StopMulPh - Sperrbereich Multiplikator  
     EPS_PH: float = 0.01  # EpsPh - Filter Epsilon
+    FILTER_FREQ_STEP: float = 1.0  # Hz - fstep, ein Phasenfilter pro Frequenzschritt
+    FILTER_BANK_MIN_FREQ: float = 5.0  # Hz - Untere Grenze der vorberechneten Filter
+    FILTER_BANK_MAX_FREQ: float = 25.0  # Hz - Obere Grenze der vorberechneten Filter
     
     # Relative Kriterien (5.6)
     RC_RFA_MAX: float = 30.0  # % - Relatives Kriterium für RFAmax
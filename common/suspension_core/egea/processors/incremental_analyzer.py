@@ -0,0 +1,359 @@
+"""
+Inkrementelle EGEA-Phasenverschiebungsanalyse
+Liefert Perioden bereits während des laufenden Tests
+"""
+
+import dataclasses
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from ...egea.models.results import PhaseShiftPeriod, PhaseShiftResult
+from ...egea.processors.phase_shift_processor import EGEAPhaseShiftProcessor
+
+logger = logging.getLogger(__name__)
+
+# Relative TOP-Prominenz: Anteil der Standardabweichung der Plattformposition
+# (wie der Standard von EGEASignalProcessor.find_platform_tops)
+RELATIVE_PROMINENCE = 0.1
+
+
+class IncrementalPhaseShiftAnalyzer:
+	"""
+	Streaming-Variante von EGEAPhaseShiftProcessor.calculate_phase_shift_advanced
+
+	Samples werden blockweise mit feed() übergeben. Der Analyzer hält nur einen
+	kleinen Übertragspuffer ab dem letzten Plattform-TOP und analysiert jeden
+	Zyklus, sobald der nachfolgende TOP feststeht. Ein TOP gilt als feststehend,
+	wenn nach ihm mindestens `guard` Samples eingegangen sind, d.h. weder die
+	Prominenzberechnung (wlen) noch der Mindestabstand ihn noch verändern können.
+
+	Ohne absolute Prominenz gilt RELATIVE_PROMINENCE × laufende Standardabweichung
+	der Plattformposition, sodass Rauschwellen nicht als TOPs zählen.
+
+	finalize() liefert dasselbe PhaseShiftResult wie die Batch-Analyse mit den
+	TOPs des Analyzers (platform_tops als platform_peaks übergeben).
+	"""
+
+	def __init__(self,
+	             static_weight: float,
+	             sample_rate: float,
+	             processor: Optional[EGEAPhaseShiftProcessor] = None,
+	             min_distance: Optional[int] = None,
+	             prominence: Optional[float] = None,
+	             wlen: Optional[int] = None,
+	             on_period: Optional[Callable[[PhaseShiftPeriod], None]] = None):
+		"""
+		Initialisiert den Analyzer
+
+		Args:
+			static_weight: Statisches Radgewicht (Fst)
+			sample_rate: Nominelle Abtastrate für die TOP-Parameter
+			processor: EGEAPhaseShiftProcessor (Standard: neue Instanz)
+			min_distance: Mindestabstand der TOPs (Standard: fs / (2 * MaxCalcFreq))
+			prominence: Absolute Mindest-Prominenz der TOPs (Standard: relativ zur Amplitude)
+			wlen: Fenster der Prominenzberechnung (Standard: längster Zyklus fs / MinCalcFreq)
+			on_period: Callback für jede neu abgeschlossene Periode
+		"""
+		self.processor = processor or EGEAPhaseShiftProcessor()
+		self.params = self.processor.params
+		self.static_weight = static_weight
+		self.sample_rate = sample_rate
+		self.on_period = on_period
+
+		defaults = self.default_top_parameters(self.params, sample_rate)
+		self.min_distance = min_distance if min_distance is not None else defaults["min_distance"]
+		self.prominence = prominence
+		self.wlen = wlen if wlen is not None else defaults["wlen"]
+		self.guard = self.wlen // 2 + 2 * self.min_distance + 1
+
+		# Zyklen oberhalb dieser Länge liegen sicher unter MinCalcFreq und werden nicht gepuffert
+		self.max_cycle_samples = int(2 * sample_rate / self.params.MIN_CALC_FREQ)
+
+		self.periods: List[PhaseShiftPeriod] = []
+		self.reset()
+
+	@staticmethod
+	def default_top_parameters(params, sample_rate: float) -> Dict[str, Any]:
+		"""
+		Standard-TOP-Parameter für eine Abtastrate
+
+		Auch für find_platform_tops im Batch-Pfad; prominence None bedeutet dort
+		wie im Analyzer RELATIVE_PROMINENCE × Standardabweichung der Plattformposition.
+
+		Args:
+			params: EGEAParameters
+			sample_rate: Nominelle Abtastrate
+
+		Returns:
+			Dict mit min_distance, prominence und wlen
+		"""
+		return {
+			"min_distance": max(1, int(sample_rate / (2 * params.MAX_CALC_FREQ))),
+			"prominence": None,
+			"wlen": int(sample_rate / params.MIN_CALC_FREQ),
+		}
+
+	def reset(self) -> None:
+		"""Setzt den Analyzer für einen neuen Test zurück"""
+		# Übertragspuffer; _offset ist der globale Index von _time[0]
+		self._time = np.empty(0)
+		self._platform = np.empty(0)
+		self._force = np.empty(0)
+		self._offset = 0
+
+		# Noch nicht zusammengeführte Blöcke
+		self._pending: List[tuple] = []
+		self._pending_count = 0
+
+		self.sample_count = 0
+		self.top_count = 0
+		self._last_top: Optional[int] = None
+		self._settled_until = 0
+		self._fs: Optional[float] = None
+		self._force_min = np.inf
+		self._force_max = -np.inf
+
+		# Laufende Statistik der Plattformposition für die relative Prominenz
+		self._platform_count = 0
+		self._platform_mean = 0.0
+		self._platform_m2 = 0.0
+
+		self._tops: List[int] = []
+		self.periods = []
+		self.min_period: Optional[PhaseShiftPeriod] = None
+		self.rfa_max_period: Optional[PhaseShiftPeriod] = None
+
+	@property
+	def min_phase_shift(self) -> Optional[float]:
+		"""Laufendes φmin"""
+		return self.min_period.phase_shift if self.min_period is not None else None
+
+	@property
+	def platform_tops(self) -> NDArray[np.int64]:
+		"""Bisher feststehende TOPs als Sample-Indizes des gesamten Tests"""
+		return np.asarray(self._tops, dtype=np.int64)
+
+	@property
+	def current_prominence(self) -> float:
+		"""Für die TOP-Suche verwendete Prominenz"""
+		if self.prominence is not None:
+			return self.prominence
+		if self._platform_count < 2:
+			return 0.0
+		return RELATIVE_PROMINENCE * float(np.sqrt(self._platform_m2 / self._platform_count))
+
+	@property
+	def rfa_max_value(self) -> Optional[float]:
+		"""Laufendes RFAmax"""
+		return self.rfa_max_period.rfa_max if self.rfa_max_period is not None else None
+
+	def feed(self,
+	         time_array: ArrayLike,
+	         platform_position: ArrayLike,
+	         tire_force: ArrayLike) -> List[PhaseShiftPeriod]:
+		"""
+		Übergibt einen Block neuer Samples
+
+		Args:
+			time_array: Zeitstempel
+			platform_position: Plattformposition
+			tire_force: Reifenkraft
+
+		Returns:
+			Perioden, die durch diesen Block abgeschlossen wurden
+		"""
+		time_array = np.atleast_1d(np.asarray(time_array, dtype=np.float64))
+		platform_position = np.atleast_1d(np.asarray(platform_position, dtype=np.float64))
+		tire_force = np.atleast_1d(np.asarray(tire_force, dtype=np.float64))
+
+		if not (len(time_array) == len(platform_position) == len(tire_force)):
+			raise ValueError("time_array, platform_position and tire_force must have equal length")
+
+		if len(time_array) == 0:
+			return []
+
+		self._pending.append((time_array, platform_position, tire_force))
+		self._pending_count += len(time_array)
+		self.sample_count += len(time_array)
+		self._force_min = min(self._force_min, float(np.min(tire_force)))
+		self._force_max = max(self._force_max, float(np.max(tire_force)))
+		self._update_platform_statistics(platform_position)
+
+		# TOP-Suche erst, wenn genug neue Samples für einen weiteren TOP vorliegen
+		if self._pending_count < self.min_distance:
+			return []
+
+		self._merge_pending()
+		return self._advance(final=False)
+
+	def finalize(self) -> PhaseShiftResult:
+		"""
+		Wertet die restlichen Samples aus und liefert das Gesamtergebnis
+
+		Returns:
+			PhaseShiftResult wie calculate_phase_shift_advanced
+		"""
+		self._merge_pending()
+
+		if self.sample_count == 0:
+			return PhaseShiftResult(
+				periods=[],
+				static_weight=self.static_weight,
+				f_under_flag=True,
+				f_over_flag=False
+			)
+
+		# Unterflow/Overflow wie im Batch-Pfad, aus Minimum und Maximum der Reifenkraft
+		f_under_flag, f_over_flag = self.processor.signal_processor.detect_signal_overflow_underflow(
+			np.array([self._force_min, self._force_max]), self.static_weight
+		)
+
+		if self.sample_count < 2:
+			return PhaseShiftResult(
+				periods=[],
+				static_weight=self.static_weight,
+				f_under_flag=bool(f_under_flag),
+				f_over_flag=bool(f_over_flag)
+			)
+
+		try:
+			self._advance(final=True)
+		except Exception as e:
+			logger.error(f"Incremental phase shift finalization failed: {e}")
+
+		return self.processor._build_phase_shift_result(
+			list(self.periods), self.static_weight, f_under_flag, f_over_flag
+		)
+
+	def get_status(self) -> Dict[str, Any]:
+		"""Gibt den laufenden Analysezustand zurück"""
+		return {
+			"sample_count": self.sample_count,
+			"top_count": self.top_count,
+			"period_count": len(self.periods),
+			"buffer_size": len(self._time) + self._pending_count,
+			"min_phase_shift": self.min_phase_shift,
+			"min_phase_frequency": self.min_period.frequency if self.min_period else None,
+			"rfa_max_value": self.rfa_max_value,
+			"rfa_max_frequency": self.rfa_max_period.frequency if self.rfa_max_period else None,
+		}
+
+	def _update_platform_statistics(self, platform_position: NDArray[np.float64]) -> None:
+		"""Führt Mittelwert und Quadratsumme blockweise fort (Chan et al.)"""
+		count = len(platform_position)
+		mean = float(np.mean(platform_position))
+		m2 = float(np.sum((platform_position - mean) ** 2))
+
+		total = self._platform_count + count
+		delta = mean - self._platform_mean
+		self._platform_m2 += m2 + delta * delta * self._platform_count * count / total
+		self._platform_mean += delta * count / total
+		self._platform_count = total
+
+	def _merge_pending(self) -> None:
+		"""Hängt die gesammelten Blöcke an den Übertragspuffer an"""
+		if not self._pending:
+			return
+
+		times, platforms, forces = zip(*self._pending)
+		self._time = np.concatenate((self._time,) + times)
+		self._platform = np.concatenate((self._platform,) + platforms)
+		self._force = np.concatenate((self._force,) + forces)
+		self._pending = []
+		self._pending_count = 0
+
+		if self._fs is None and len(self._time) >= 2 and self._offset == 0:
+			# Filter-Abtastrate wie im Batch-Pfad aus den ersten beiden Samples
+			self._fs = 1.0 / (self._time[1] - self._time[0])
+
+	def _advance(self, final: bool) -> List[PhaseShiftPeriod]:
+		"""Übernimmt feststehende TOPs und analysiert die abgeschlossenen Zyklen"""
+		if self._fs is None or len(self._time) < 2:
+			return []
+
+		limit = self.sample_count if final else self.sample_count - self.guard
+		if limit <= self._settled_until:
+			return []
+
+		peaks = self.processor.signal_processor.find_platform_tops(
+			self._platform, self.min_distance, self.current_prominence, self.wlen
+		) + self._offset
+		new_tops = peaks[(peaks >= self._settled_until) & (peaks < limit)]
+		self._settled_until = limit
+
+		new_periods = []
+		if len(new_tops) > 0:
+			new_periods = self._analyze_tops(new_tops)
+			self._last_top = int(new_tops[-1])
+
+		self._trim()
+		return new_periods
+
+	def _analyze_tops(self, new_tops: NDArray[np.int64]) -> List[PhaseShiftPeriod]:
+		"""Analysiert alle Zyklen, die mit den neuen TOPs enden"""
+		first_index = self.top_count
+		self.top_count += len(new_tops)
+		self._tops.extend(new_tops.tolist())
+
+		if self._last_top is not None:
+			tops = np.concatenate(([self._last_top], new_tops))
+			first_index -= 1
+		else:
+			tops = new_tops
+
+		# An überlangen Zyklen (< MinCalcFreq, Anfang evtl. verworfen) auftrennen
+		breaks = np.flatnonzero(np.diff(tops) > self.max_cycle_samples) + 1
+		new_periods = []
+
+		for run_start, run in zip(np.concatenate(([0], breaks)), np.split(tops, breaks)):
+			if len(run) < 2:
+				continue
+
+			periods = self.processor._analyze_periods_vectorized(
+				self._platform, self._force, self._time, self.static_weight,
+				run - self._offset, self._fs
+			)
+			index_offset = first_index + int(run_start)
+			new_periods.extend(
+				dataclasses.replace(p, period_index=p.period_index + index_offset) for p in periods
+			)
+
+		for period in new_periods:
+			self._register_period(period)
+
+		return new_periods
+
+	def _register_period(self, period: PhaseShiftPeriod) -> None:
+		"""Übernimmt eine Periode und aktualisiert φmin/RFAmax"""
+		self.periods.append(period)
+
+		if period.is_valid:
+			if self.min_period is None or period.phase_shift < self.min_period.phase_shift:
+				self.min_period = period
+			if period.rfa_max > (self.rfa_max_period.rfa_max if self.rfa_max_period else 0.0):
+				self.rfa_max_period = period
+
+		if self.on_period is not None:
+			try:
+				self.on_period(period)
+			except Exception as e:
+				logger.error(f"Period callback failed: {e}")
+
+	def _trim(self) -> None:
+		"""Verwirft Samples, die für keinen offenen Zyklus mehr benötigt werden"""
+		# Kontext für die TOP-Suche ab _settled_until und Daten des offenen Zyklus
+		keep_from = self._settled_until - self.guard
+		if self._last_top is not None and self.sample_count - self._last_top <= self.max_cycle_samples:
+			keep_from = min(keep_from, self._last_top)
+
+		drop = keep_from - self._offset
+		if drop <= 0:
+			return
+
+		self._time = self._time[drop:]
+		self._platform = self._platform[drop:]
+		self._force = self._force[drop:]
+		self._offset += drop
@@ -15,9 +15,15 @@ from ...egea.models.results import (
 	VehicleType, TestResult
 )
 from ...egea.utils.signal_processing import EGEASignalProcessor
+from ...egea.utils.analysis_cache import EGEAAnalysisCache, array_digest, get_analysis_cache
 
 logger = logging.getLogger(__name__)
 
+# Auswahl der Analyse-Engine für calculate_phase_shift_advanced
+ENGINE_VECTORIZED = "vectorized"  # Alle Perioden gemeinsam mit NumPy-Arrayoperationen
+ENGINE_PER_PERIOD = "per_period"  # Referenzpfad: jede Periode einzeln
+ENGINES = (ENGINE_VECTORIZED, ENGINE_PER_PERIOD)
+
 
 class EGEAPhaseShiftProcessor:
 	"""
@@ -29,11 +35,57 @@ class EGEAPhaseShiftProcessor:
 	- Reifensteifigkeit nach EGEA-Formel (3.20)
 	- Dynamische Kalibrierung (3.10)
 	- Signal Overflow/Underflow Detection (3.16)
+
+	Die Phasenverschiebung kann über zwei Engines berechnet werden, die
+	identische Ergebnisse liefern:
+	- "vectorized": Zyklusgrenzen, Frequenzen, RFst-Validierung, Min/Max-Kraft
+	  und Fref-Kreuzungen für alle Perioden gleichzeitig (Standard)
+	- "per_period": Referenzimplementierung, analysiert jede Periode einzeln
+
+	Ergebnisse von calculate_phase_shift_advanced und process_complete_test
+	werden im prozessweit geteilten Analyse-Cache abgelegt (Schlüssel: Digest
+	der Eingangsarrays und Parameter).
 	"""
 
-	def __init__(self):
+	def __init__(self,
+	             engine: str = ENGINE_VECTORIZED,
+	             cache: Optional[EGEAAnalysisCache] = None,
+	             use_cache: bool = True):
+		"""
+		Args:
+			engine: "vectorized" oder "per_period"
+			cache: Eigener Analyse-Cache (Standard: get_analysis_cache())
+			use_cache: False deaktiviert das Caching
+		"""
+		if engine not in ENGINES:
+			raise ValueError(f"Unknown phase shift engine: {engine} (expected one of {ENGINES})")
+
 		self.params = EGEAParameters()
 		self.signal_processor = EGEASignalProcessor()
+		self.engine = engine
+		self.cache = (cache or get_analysis_cache()) if use_cache else None
+
+	def settings_digest(self) -> str:
+		"""
+		Digest über alle ergebnisrelevanten Einstellungen für den Cache-Schlüssel
+
+		Erfasst die EGEA-Parameter von Processor und Signalprozessor (inklusive
+		zur Laufzeit geänderter Instanzwerte) sowie die Filterbank-Einstellungen,
+		damit geänderte Parameter keine veralteten Ergebnisse liefern.
+
+		Returns:
+			Hex-Digest (siehe array_digest)
+		"""
+		filter_bank = self.signal_processor.filter_bank
+		return array_digest(
+			(),
+			params=sorted((name, getattr(self.params, name)) for name in self.params.get_all_parameters()),
+			filter_params=sorted(
+				(name, getattr(self.signal_processor.params, name))
+				for name in self.signal_processor.params.get_all_parameters()
+			),
+			filter_bank=(filter_bank.min_freq, filter_bank.max_freq, filter_bank.freq_step),
+		)
 
 	def perform_dynamic_calibration(self,
 	                                platform_force_signal: NDArray[np.float64],
@@ -110,7 +162,9 @@ class EGEAPhaseShiftProcessor:
 	                                   platform_position: NDArray[np.float64],
 	                                   tire_force: NDArray[np.float64],
 	                                   time_array: NDArray[np.float64],
-	                                   static_weight: float) -> PhaseShiftResult:
+	                                   static_weight: float,
+	                                   engine: Optional[str] = None,
+	                                   platform_peaks: Optional[NDArray[np.int64]] = None) -> PhaseShiftResult:
 		"""
 		Erweiterte EGEA-konforme Phasenverschiebungsberechnung
 
@@ -119,22 +173,70 @@ class EGEAPhaseShiftProcessor:
 			tire_force: Reifenkraftsignal
 			time_array: Zeitarray
 			static_weight: Statisches Radgewicht (Fst)
+			engine: "vectorized" oder "per_period" (Standard: self.engine)
+			platform_peaks: Bereits bestimmte Plattform-TOPs (Standard: find_platform_tops)
 
 		Returns:
 			PhaseShiftResult mit vollständigen EGEA-Daten
 		"""
+		engine = engine or self.engine
+		if engine not in ENGINES:
+			raise ValueError(f"Unknown phase shift engine: {engine} (expected one of {ENGINES})")
+
 		try:
-			# Abtastrate berechnen
-			fs = 1.0 / (time_array[1] - time_array[0])
+			key = None
+			if self.cache is not None:
+				key = array_digest(
+					(platform_position, tire_force, time_array, platform_peaks),
+					kind="phase_shift", static_weight=float(static_weight), engine=engine,
+					settings=self.settings_digest()
+				)
+				cached = self.cache.get(key)
+				if cached is not None:
+					return cached
 
-			# Signal Overflow/Underflow Detection
-			f_under_flag, f_over_flag = self.signal_processor.detect_signal_overflow_underflow(
-				tire_force, static_weight
+			result = self._calculate_phase_shift(
+				platform_position, tire_force, time_array, static_weight, engine, platform_peaks
+			)
+			if key is not None:
+				self.cache.put(key, result)
+			return result
+
+		except Exception as e:
+			logger.error(f"Phase shift calculation failed: {e}")
+			return PhaseShiftResult(
+				periods=[],
+				static_weight=static_weight,
+				f_under_flag=True,
+				f_over_flag=False
 			)
 
-			# Plattform-TOPs identifizieren (korrekte TOPp(i) Berechnung)
+	def _calculate_phase_shift(self,
+	                           platform_position: NDArray[np.float64],
+	                           tire_force: NDArray[np.float64],
+	                           time_array: NDArray[np.float64],
+	                           static_weight: float,
+	                           engine: str,
+	                           platform_peaks: Optional[NDArray[np.int64]]) -> PhaseShiftResult:
+		"""Berechnung für calculate_phase_shift_advanced (ohne Cache, Fehler werden weitergereicht)"""
+		# Abtastrate berechnen
+		fs = 1.0 / (time_array[1] - time_array[0])
+
+		# Signal Overflow/Underflow Detection
+		f_under_flag, f_over_flag = self.signal_processor.detect_signal_overflow_underflow(
+			tire_force, static_weight
+		)
+
+		# Plattform-TOPs identifizieren (korrekte TOPp(i) Berechnung)
+		if platform_peaks is None:
 			platform_peaks = self.signal_processor.find_platform_tops(platform_position)
 
+		if engine == ENGINE_VECTORIZED:
+			periods = self._analyze_periods_vectorized(
+				platform_position, tire_force, time_array, static_weight,
+				platform_peaks, fs
+			)
+		else:
 			periods = []
 
 			# Jeden Zyklus analysieren
@@ -147,70 +249,205 @@ class EGEAPhaseShiftProcessor:
 				if period_result is not None:
 					periods.append(period_result)
 
-			# Ergebnisse zusammenstellen
-			if not periods:
-				return PhaseShiftResult(
-					periods=[],
-					static_weight=static_weight,
-					f_under_flag=f_under_flag,
-					f_over_flag=f_over_flag
-				)
-
-			# Minimale Phasenverschiebung bestimmen
-			valid_periods = [p for p in periods if p.is_valid]
+		return self._build_phase_shift_result(periods, static_weight, f_under_flag, f_over_flag)
 
-			if not valid_periods:
-				return PhaseShiftResult(
-					periods=periods,
-					static_weight=static_weight,
-					f_under_flag=f_under_flag,
-					f_over_flag=f_over_flag
-				)
+	def _build_phase_shift_result(self,
+	                              periods: List[PhaseShiftPeriod],
+	                              static_weight: float,
+	                              f_under_flag: bool,
+	                              f_over_flag: bool) -> PhaseShiftResult:
+		"""
+		Stellt das PhaseShiftResult aus den analysierten Perioden zusammen
 
-			# φmin und zugehörige Frequenz
-			min_period = min(valid_periods, key=lambda p: p.phase_shift)
-			min_phase_shift = min_period.phase_shift
-			min_phase_frequency = min_period.frequency
-
-			# φmax bei 18Hz (falls vorhanden)
-			max_phase_shift = None
-			for period in valid_periods:
-				if abs(period.frequency - 18.0) < 0.5:  # Toleranz von ±0.5Hz
-					max_phase_shift = period.phase_shift
-					break
-
-			# RFAmax berechnen
-			rfa_max_value = None
-			rfa_max_frequency = None
-			max_rfa = 0.0
-
-			for period in valid_periods:
-				if period.rfa_max > max_rfa:
-					max_rfa = period.rfa_max
-					rfa_max_value = period.rfa_max
-					rfa_max_frequency = period.frequency
+		Args:
+			periods: Analysierte Perioden (aufsteigend nach period_index)
+			static_weight: Statisches Gewicht
+			f_under_flag: Signal Unterflow
+			f_over_flag: Signal Overflow
 
+		Returns:
+			PhaseShiftResult mit φmin, φmax(18Hz) und RFAmax
+		"""
+		# Ergebnisse zusammenstellen
+		if not periods:
 			return PhaseShiftResult(
-				periods=periods,
-				min_phase_shift=min_phase_shift,
-				min_phase_frequency=min_phase_frequency,
-				max_phase_shift=max_phase_shift,
+				periods=[],
 				static_weight=static_weight,
 				f_under_flag=f_under_flag,
-				f_over_flag=f_over_flag,
-				rfa_max_value=rfa_max_value,
-				rfa_max_frequency=rfa_max_frequency
+				f_over_flag=f_over_flag
 			)
 
-		except Exception as e:
-			logger.error(f"Phase shift calculation failed: {e}")
+		# Minimale Phasenverschiebung bestimmen
+		valid_periods = [p for p in periods if p.is_valid]
+
+		if not valid_periods:
 			return PhaseShiftResult(
-				periods=[],
+				periods=periods,
 				static_weight=static_weight,
-				f_under_flag=True,
-				f_over_flag=False
+				f_under_flag=f_under_flag,
+				f_over_flag=f_over_flag
+			)
+
+		# φmin und zugehörige Frequenz
+		min_period = min(valid_periods, key=lambda p: p.phase_shift)
+		min_phase_shift = min_period.phase_shift
+		min_phase_frequency = min_period.frequency
+
+		# φmax bei 18Hz (falls vorhanden)
+		max_phase_shift = None
+		for period in valid_periods:
+			if abs(period.frequency - 18.0) < 0.5:  # Toleranz von ±0.5Hz
+				max_phase_shift = period.phase_shift
+				break
+
+		# RFAmax berechnen
+		rfa_max_value = None
+		rfa_max_frequency = None
+		max_rfa = 0.0
+
+		for period in valid_periods:
+			if period.rfa_max > max_rfa:
+				max_rfa = period.rfa_max
+				rfa_max_value = period.rfa_max
+				rfa_max_frequency = period.frequency
+
+		return PhaseShiftResult(
+			periods=periods,
+			min_phase_shift=min_phase_shift,
+			min_phase_frequency=min_phase_frequency,
+			max_phase_shift=max_phase_shift,
+			static_weight=static_weight,
+			f_under_flag=f_under_flag,
+			f_over_flag=f_over_flag,
+			rfa_max_value=rfa_max_value,
+			rfa_max_frequency=rfa_max_frequency
+		)
+
+	def _analyze_periods_vectorized(self,
+	                                platform_position: NDArray[np.float64],
+	                                tire_force: NDArray[np.float64],
+	                                time_array: NDArray[np.float64],
+	                                static_weight: float,
+	                                platform_peaks: NDArray[np.int64],
+	                                fs: float) -> List[PhaseShiftPeriod]:
+		"""
+		Analysiert alle Perioden eines Tests gleichzeitig
+
+		Liefert dieselben Perioden wie _analyze_single_period für jeden Zyklus.
+		Zyklusgrenzen, Frequenzen, RFst-Validierung und Min/Max-Kraft werden über
+		das gesamte Signal mit reduceat berechnet. Filterung und Fref-Suche laufen
+		pro Gruppe gleich langer Zyklen mit gleichem Filter-Frequenzschritt als
+		2D-Array.
+
+		Args:
+			platform_position: Plattformposition
+			tire_force: Reifenkraft
+			time_array: Zeit
+			static_weight: Statisches Gewicht
+			platform_peaks: Indices der Plattform-TOPs
+			fs: Abtastrate
+
+		Returns:
+			Gültige Perioden aufsteigend nach period_index
+		"""
+		peaks = np.asarray(platform_peaks, dtype=np.int64)
+		if len(peaks) < 2:
+			return []
+
+		starts = peaks[:-1]
+		ends = peaks[1:]
+		lengths = ends - starts
+		period_indices = np.arange(1, len(peaks))
+
+		# Frequenz aller Zyklen
+		cycle_durations = time_array[ends] - time_array[starts]
+		with np.errstate(divide='ignore'):
+			frequencies = np.where(cycle_durations > 0, 1.0 / cycle_durations, 0.0)
+
+		# Kraftwerte aller Zyklen (Zyklen sind zusammenhängend: [TOP(i-1), TOP(i)))
+		bounded_force = tire_force[:peaks[-1]]
+		max_forces = np.maximum.reduceat(bounded_force, starts)
+		min_forces = np.minimum.reduceat(bounded_force, starts)
+		delta_forces = max_forces - min_forces
+
+		# Nur relevante Frequenzen
+		valid = (frequencies >= self.params.MIN_CALC_FREQ) & (frequencies <= self.params.MAX_CALC_FREQ)
+
+		# RFstFMin/RFstFMax Validierung
+		f_max_limits = max_forces - delta_forces * (self.params.RFST_FMAX / 100.0)
+		f_min_limits = min_forces + delta_forces * (self.params.RFST_FMIN / 100.0)
+		valid &= (f_min_limits < static_weight) & (static_weight < f_max_limits)
+
+		candidates = np.flatnonzero(valid)
+		if len(candidates) == 0:
+			return []
+
+		# Gruppen gleicher Länge und gleichen Frequenzschritts teilen sich Filter und Array-Form
+		filter_steps = np.array([
+			self.signal_processor.filter_bank.quantize_frequency(f) for f in frequencies[candidates]
+		])
+		group_keys, group_ids = np.unique(
+			np.column_stack([lengths[candidates], filter_steps]),
+			axis=0, return_inverse=True
+		)
+		group_ids = group_ids.reshape(-1)
+
+		phase_shifts = np.full(len(peaks) - 1, np.nan)
+		fref_times = np.full(len(peaks) - 1, np.nan)
+		top_p_times = np.full(len(peaks) - 1, np.nan)
+
+		for group_id in range(len(group_keys)):
+			members = candidates[group_ids == group_id]
+			length = lengths[members[0]]
+			frequency = frequencies[members]
+
+			sample_idx = starts[members, None] + np.arange(length)
+			cycle_time = time_array[sample_idx]
+			cycle_force = tire_force[sample_idx]
+			cycle_platform = platform_position[sample_idx]
+
+			# EGEA-konforme Signalfilterung (zeilenweise)
+			filtered_force = self.signal_processor.apply_egea_phase_filter(
+				cycle_force, fs, frequency[0]
 			)
 
+			# Echte TOPp(i) Position
+			rows = np.arange(len(members))
+			platform_peak_in_cycle = np.argmax(cycle_platform, axis=1)
+			top_p = cycle_time[rows, platform_peak_in_cycle] - cycle_time[:, 0]
+
+			# Fref aller Zyklen der Gruppe in einem Aufruf (Zeilen aneinandergehängt)
+			fref = self.signal_processor.calculate_fref_cycles(
+				filtered_force.ravel(), cycle_time.ravel(), static_weight,
+				np.arange(len(members) + 1) * length
+			)
+			fref_relative = fref - cycle_time[:, 0]
+
+			phase_shift_rad = (fref_relative - top_p) * frequency * 2 * np.pi
+			phase_shift_deg = np.degrees(phase_shift_rad) % 360
+			phase_shift_deg = np.where(phase_shift_deg > 180, 360 - phase_shift_deg, phase_shift_deg)
+
+			phase_shifts[members] = phase_shift_deg
+			fref_times[members] = fref_relative
+			top_p_times[members] = top_p
+
+		periods = []
+		for idx in np.flatnonzero(~np.isnan(fref_times)):
+			periods.append(PhaseShiftPeriod(
+				period_index=int(period_indices[idx]),
+				frequency=frequencies[idx],
+				phase_shift=phase_shifts[idx],
+				fref=fref_times[idx],
+				top_p=top_p_times[idx],
+				max_force=max_forces[idx],
+				min_force=min_forces[idx],
+				delta_force=delta_forces[idx],
+				static_weight=static_weight,
+				is_valid=True
+			))
+
+		return periods
+
 	def _analyze_single_period(self,
 	                           platform_position: NDArray[np.float64],
 	                           tire_force: NDArray[np.float64],
@@ -483,6 +720,18 @@ class EGEAPhaseShiftProcessor:
 		error_messages = []
 
 		try:
+			key = None
+			if self.cache is not None:
+				key = array_digest(
+					(platform_position, tire_force, time_array, platform_force),
+					kind="complete_test", static_weight=float(static_weight), wheel_id=wheel_id,
+					vehicle_type=vehicle_type.value, platform_mass=float(platform_mass), engine=self.engine,
+					settings=self.settings_digest()
+				)
+				cached = self.cache.get(key)
+				if cached is not None:
+					return cached
+
 			# Dynamische Kalibrierung (falls Plattformkraft verfügbar)
 			dynamic_calibration = DynamicCalibrationResult(is_valid=True)
 			if platform_force is not None:
@@ -525,6 +774,8 @@ class EGEAPhaseShiftProcessor:
 				error_messages=error_messages
 			)
 
+			if key is not None:
+				self.cache.put(key, result)
 			return result
 
 		except Exception as e:
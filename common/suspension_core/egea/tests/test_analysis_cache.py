@@ -0,0 +1,144 @@
+"""
+Unit Tests für den EGEA-Analyse-Cache
+Testet Schlüsselbildung, LRU-/Byte-Verdrängung, Festplattenablage und Processor-Integration
+"""
+
+import tempfile
+import unittest
+
+import numpy as np
+
+from ...egea.config.parameters import EGEAParameters
+from ...egea.processors.phase_shift_processor import EGEAPhaseShiftProcessor, ENGINE_PER_PERIOD
+from ...egea.utils.analysis_cache import EGEAAnalysisCache, array_digest
+from ...egea.utils.filter_bank import EGEAFilterBank, get_filter_bank
+from ...egea.utils.signal_processing import create_egea_test_signals
+
+
+class TestArrayDigest(unittest.TestCase):
+    """Test Schlüsselbildung über Array-Puffer"""
+
+    def test_digest_depends_on_content_dtype_and_params(self):
+        data = np.arange(1000, dtype=np.float64)
+        key = array_digest((data,), static_weight=500.0)
+
+        self.assertEqual(key, array_digest((data.copy(),), static_weight=500.0))
+        self.assertNotEqual(key, array_digest((data.astype(np.float32),), static_weight=500.0))
+        self.assertNotEqual(key, array_digest((data,), static_weight=501.0))
+
+        changed = data.copy()
+        changed[500] += 1e-9
+        self.assertNotEqual(key, array_digest((changed,), static_weight=500.0))
+
+    def test_non_contiguous_views(self):
+        data = np.arange(2000, dtype=np.float64)
+        self.assertEqual(array_digest((data[::2],)), array_digest((np.ascontiguousarray(data[::2]),)))
+        self.assertNotEqual(array_digest((data, None)), array_digest((data,)))
+
+
+class TestEGEAAnalysisCache(unittest.TestCase):
+    """Test Verdrängung und Festplattenablage"""
+
+    def test_lru_and_byte_budget(self):
+        cache = EGEAAnalysisCache(max_entries=3, max_bytes=10_000)
+        for i in range(3):
+            cache.put(f"k{i}", [i])
+        cache.get("k0")  # k0 wird zuletzt verwendet
+        cache.put("k3", [3])
+
+        self.assertIsNone(cache.get("k1"))
+        self.assertEqual(cache.get("k0"), [0])
+
+        cache.put("big", np.zeros(1000))  # ~8 KB verdrängt ältere Einträge
+        stats = cache.get_stats()
+        self.assertLessEqual(stats["bytes_held"], 10_000)
+        self.assertGreaterEqual(stats["evictions"], 2)
+
+        cache.put("too_big", np.zeros(5000))  # größer als das Budget: nicht gecacht
+        self.assertIsNone(cache.get("too_big"))
+
+    def test_hits_are_independent_copies(self):
+        cache = EGEAAnalysisCache()
+        cache.put("k", {"values": [1, 2, 3]})
+        cache.get("k")["values"].append(4)
+        self.assertEqual(cache.get("k"), {"values": [1, 2, 3]})
+        self.assertEqual(cache.get_stats()["hit_rate"], 1.0)
+
+    def test_persistence_across_instances(self):
+        with tempfile.TemporaryDirectory() as directory:
+            EGEAAnalysisCache(persist_dir=directory).put("k", {"phi": 38.5})
+
+            restarted = EGEAAnalysisCache(persist_dir=directory)
+            self.assertEqual(restarted.get("k"), {"phi": 38.5})
+            self.assertEqual(restarted.get_stats()["disk_hits"], 1)
+
+
+class TestProcessorCaching(unittest.TestCase):
+    """Test Cache-Nutzung in EGEAPhaseShiftProcessor"""
+
+    def setUp(self):
+        self.cache = EGEAAnalysisCache()
+        self.processor = EGEAPhaseShiftProcessor(cache=self.cache)
+        self.time, self.platform_pos, self.tire_force = create_egea_test_signals(duration=10.0, fs=1000.0)
+
+    def test_repeated_analysis_hits_cache(self):
+        first = self.processor.calculate_phase_shift_advanced(
+            self.platform_pos, self.tire_force, self.time, 500.0
+        )
+        second = self.processor.calculate_phase_shift_advanced(
+            self.platform_pos, self.tire_force, self.time, 500.0
+        )
+        self.assertEqual(first.min_phase_shift, second.min_phase_shift)
+        self.assertEqual(len(first.periods), len(second.periods))
+        self.assertEqual(self.cache.hits, 1)
+
+        # Anderes statisches Gewicht bzw. andere Engine: neuer Eintrag
+        self.processor.calculate_phase_shift_advanced(self.platform_pos, self.tire_force, self.time, 400.0)
+        self.processor.calculate_phase_shift_advanced(
+            self.platform_pos, self.tire_force, self.time, 500.0, engine=ENGINE_PER_PERIOD
+        )
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_changed_parameters_miss_cache(self):
+        first = self.processor.calculate_phase_shift_advanced(
+            self.platform_pos, self.tire_force, self.time, 500.0
+        )
+        settings = self.processor.settings_digest()
+
+        # Geänderte EGEA-Parameter bzw. Filtereinstellungen: kein veraltetes Ergebnis
+        self.processor.params.MIN_CALC_FREQ = 10.0
+        self.assertNotEqual(self.processor.settings_digest(), settings)
+        self.processor.calculate_phase_shift_advanced(self.platform_pos, self.tire_force, self.time, 500.0)
+        self.assertEqual(self.cache.hits, 0)
+
+        self.processor.signal_processor.filter_bank = EGEAFilterBank(freq_step=0.5)
+        self.processor.calculate_phase_shift_advanced(self.platform_pos, self.tire_force, self.time, 500.0)
+        self.assertEqual(self.cache.hits, 0)
+        self.assertEqual(self.cache.misses, 3)
+
+        # Gleiche Einstellungen wie beim ersten Aufruf: Treffer
+        self.processor.params.MIN_CALC_FREQ = EGEAParameters.MIN_CALC_FREQ
+        self.processor.signal_processor.filter_bank = get_filter_bank()
+        self.assertEqual(self.processor.settings_digest(), settings)
+        again = self.processor.calculate_phase_shift_advanced(
+            self.platform_pos, self.tire_force, self.time, 500.0
+        )
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(again.min_phase_shift, first.min_phase_shift)
+
+    def test_complete_test_cached(self):
+        first = self.processor.process_complete_test(self.platform_pos, self.tire_force, self.time, 500.0, "FL")
+        hits = self.cache.hits
+        second = self.processor.process_complete_test(self.platform_pos, self.tire_force, self.time, 500.0, "FL")
+        self.assertEqual(self.cache.hits, hits + 1)
+        self.assertEqual(first.overall_pass, second.overall_pass)
+
+    def test_cache_disabled(self):
+        processor = EGEAPhaseShiftProcessor(use_cache=False)
+        self.assertIsNone(processor.cache)
+        result = processor.calculate_phase_shift_advanced(self.platform_pos, self.tire_force, self.time, 500.0)
+        self.assertIsNotNone(result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,7 +13,10 @@ from typing import Tuple
 # Import der zu testenden Module
 from ...egea.config.parameters import EGEAParameters
 from ...egea.models.results import VehicleType, PhaseShiftResult, ForceAnalysisResult, RigidityResult
-from ...egea.processors.phase_shift_processor import EGEAPhaseShiftProcessor
+from ...egea.processors.phase_shift_processor import (
+    EGEAPhaseShiftProcessor, ENGINE_PER_PERIOD, ENGINE_VECTORIZED
+)
+from ...egea.processors.incremental_analyzer import IncrementalPhaseShiftAnalyzer
 from ...egea.utils.signal_processing import create_egea_test_signals
 
 
@@ -127,6 +130,185 @@ class TestEGEAPhaseShiftProcessor(unittest.TestCase):
         self.assertIsInstance(overall_pass, bool)
 
 
+class TestEGEAVectorizedEngine(unittest.TestCase):
+    """Vektorisierte Engine muss identisch zum Periode-für-Periode-Pfad rechnen"""
+    
+    def setUp(self):
+        self.processor = EGEAPhaseShiftProcessor()
+        self.fs = 1000.0
+        
+        np.random.seed(42)
+        self.time, self.platform_pos, self.tire_force = create_egea_test_signals(
+            duration=15.0, fs=self.fs, start_freq=20.0, end_freq=5.0
+        )
+        # Abtastratenbasierter Peak-Abstand, damit alle Zyklen im Sweep erkannt werden
+        self.peaks = self.processor.signal_processor.find_platform_tops(
+            self.platform_pos, min_distance=int(self.fs / (2 * EGEAParameters.MAX_CALC_FREQ))
+        )
+    
+    def _per_period(self, static_weight):
+        periods = []
+        for i in range(1, len(self.peaks)):
+            period = self.processor._analyze_single_period(
+                self.platform_pos, self.tire_force, self.time, static_weight,
+                self.peaks[i - 1], self.peaks[i], i, self.fs
+            )
+            if period is not None:
+                periods.append(period)
+        return periods
+    
+    def test_periods_identical_to_per_period_path(self):
+        """Alle Perioden stimmen Feld für Feld überein"""
+        for static_weight in (450.0, 500.0, 520.0):
+            expected = self._per_period(static_weight)
+            actual = self.processor._analyze_periods_vectorized(
+                self.platform_pos, self.tire_force, self.time, static_weight,
+                self.peaks, self.fs
+            )
+            
+            self.assertGreater(len(expected), 0)
+            self.assertEqual(actual, expected)
+    
+    def test_engine_selection(self):
+        """Beide Engines liefern über die öffentliche API dasselbe Ergebnis"""
+        # Kurzes Fenster: der Standard-Peak-Abstand skaliert mit der Signallänge
+        window = slice(3000, 4000)
+        args = (self.platform_pos[window], self.tire_force[window], self.time[window], 500.0)
+        
+        vectorized = self.processor.calculate_phase_shift_advanced(*args)
+        per_period = self.processor.calculate_phase_shift_advanced(*args, engine=ENGINE_PER_PERIOD)
+        reference = EGEAPhaseShiftProcessor(engine=ENGINE_PER_PERIOD).calculate_phase_shift_advanced(*args)
+        
+        self.assertEqual(self.processor.engine, ENGINE_VECTORIZED)
+        self.assertGreater(len(vectorized.periods), 0)
+        self.assertEqual(vectorized, per_period)
+        self.assertEqual(reference, per_period)
+    
+    def test_unknown_engine_rejected(self):
+        """Unbekannte Engine wird abgelehnt"""
+        with self.assertRaises(ValueError):
+            EGEAPhaseShiftProcessor(engine="gpu")
+        with self.assertRaises(ValueError):
+            self.processor.calculate_phase_shift_advanced(
+                self.platform_pos, self.tire_force, self.time, 500.0, engine="gpu"
+            )
+
+
+class TestIncrementalPhaseShiftAnalyzer(unittest.TestCase):
+    """Inkrementelle Analyse muss das Batch-Ergebnis reproduzieren"""
+    
+    def setUp(self):
+        self.processor = EGEAPhaseShiftProcessor()
+        self.fs = 1000.0
+        
+        np.random.seed(42)
+        self.time, self.platform_pos, self.tire_force = create_egea_test_signals(
+            duration=15.0, fs=self.fs, start_freq=20.0, end_freq=5.0
+        )
+    
+    def _batch(self, analyzer):
+        peaks = self.processor.signal_processor.find_platform_tops(
+            self.platform_pos, analyzer.min_distance, analyzer.prominence, analyzer.wlen
+        )
+        return self.processor.calculate_phase_shift_advanced(
+            self.platform_pos, self.tire_force, self.time, analyzer.static_weight,
+            platform_peaks=peaks
+        )
+    
+    def _stream(self, analyzer, chunk_size):
+        emitted = []
+        for i in range(0, len(self.time), chunk_size):
+            window = slice(i, i + chunk_size)
+            emitted.extend(analyzer.feed(
+                self.time[window], self.platform_pos[window], self.tire_force[window]
+            ))
+        return emitted
+    
+    def test_final_result_equals_batch(self):
+        """finalize() liefert unabhängig von der Blockgröße das Batch-Ergebnis"""
+        for static_weight in (450.0, 500.0):
+            expected = self._batch(IncrementalPhaseShiftAnalyzer(static_weight, self.fs))
+            self.assertGreater(len(expected.periods), 0)
+            
+            for chunk_size in (1, 37, 1000):
+                analyzer = IncrementalPhaseShiftAnalyzer(static_weight, self.fs, processor=self.processor)
+                emitted = self._stream(analyzer, chunk_size)
+                result = analyzer.finalize()
+                
+                self.assertEqual(result, expected)
+                self.assertEqual(emitted, expected.periods)
+    
+    def test_periods_emitted_while_streaming(self):
+        """Perioden werden spätestens etwa einen Zyklus nach ihrem Ende geliefert"""
+        received = []
+        analyzer = IncrementalPhaseShiftAnalyzer(500.0, self.fs, on_period=received.append)
+        expected = self._batch(analyzer)
+        
+        self._stream(analyzer, 10)
+        
+        # Bis auf die Perioden im letzten Guard-Fenster ist alles vor finalize() publiziert
+        self.assertGreater(len(received), 0)
+        self.assertEqual(received, expected.periods[:len(received)])
+        self.assertLessEqual(analyzer.guard, self.fs / EGEAParameters.MIN_CALC_FREQ)
+        
+        self.assertAlmostEqual(
+            analyzer.min_phase_shift,
+            min(p.phase_shift for p in received)
+        )
+        
+        # Übertragspuffer bleibt klein
+        self.assertLess(analyzer.get_status()["buffer_size"], 3 * analyzer.max_cycle_samples)
+    
+    def test_platform_noise_does_not_add_tops(self):
+        """Rauschwellen auf der Plattformposition zählen nicht als TOPs"""
+        clean = IncrementalPhaseShiftAnalyzer(500.0, self.fs, processor=self.processor)
+        self._stream(clean, 100)
+        clean.finalize()
+        
+        noise = 0.01 * np.ptp(self.platform_pos)
+        self.platform_pos = self.platform_pos + np.random.normal(0, noise, len(self.platform_pos))
+        noisy = IncrementalPhaseShiftAnalyzer(500.0, self.fs, processor=self.processor)
+        self._stream(noisy, 100)
+        result = noisy.finalize()
+        
+        self.assertLessEqual(abs(len(noisy.platform_tops) - len(clean.platform_tops)), 2)
+        self.assertGreater(noisy.current_prominence, 0.0)
+        
+        # Batch-Pfad mit denselben TOP-Parametern findet dieselben TOPs
+        params = IncrementalPhaseShiftAnalyzer.default_top_parameters(self.processor.params, self.fs)
+        np.testing.assert_array_equal(
+            self.processor.signal_processor.find_platform_tops(self.platform_pos, **params),
+            noisy.platform_tops
+        )
+        self.assertEqual(result, self._batch(noisy))
+    
+    def test_empty_stream(self):
+        """Ohne Samples kein Ergebnis"""
+        result = IncrementalPhaseShiftAnalyzer(500.0, self.fs).finalize()
+        
+        self.assertEqual(len(result.periods), 0)
+        self.assertIsNone(result.min_phase_shift)
+    
+    def test_signal_flags_follow_data(self):
+        """Unterflow/Overflow stammen aus den Daten, auch bei zu kurzen Tests"""
+        analyzer = IncrementalPhaseShiftAnalyzer(500.0, self.fs, processor=self.processor)
+        analyzer.feed([0.0], [0.0], [500.0])
+        result = analyzer.finalize()
+        self.assertFalse(result.f_under_flag)
+        self.assertFalse(result.f_over_flag)
+        
+        self.tire_force = self.tire_force.copy()
+        self.tire_force[5000] = 0.0
+        analyzer = IncrementalPhaseShiftAnalyzer(500.0, self.fs, processor=self.processor)
+        self._stream(analyzer, 100)
+        result = analyzer.finalize()
+        expected = self._batch(analyzer)
+        self.assertTrue(result.f_under_flag)
+        self.assertEqual(
+            (result.f_under_flag, result.f_over_flag), (expected.f_under_flag, expected.f_over_flag)
+        )
+
+
 class TestEGEABenchmarks(unittest.TestCase):
     """Performance und Benchmark Tests"""
     
@@ -0,0 +1,100 @@
+"""
+Unit Tests für das Viertelfahrzeugmodell
+Testet Integrationsgenauigkeit, Batch-Simulation und Wiedererkennung durch den EGEA-Prozessor
+"""
+
+import unittest
+
+import numpy as np
+
+from ...egea.processors.phase_shift_processor import EGEAPhaseShiftProcessor
+from ...egea.utils.quarter_car import QuarterCarEngine, QuarterCarParameters, parameter_grid
+from ...egea.utils.sweep_synthesizer import SweepModel
+
+
+class TestQuarterCarParameters(unittest.TestCase):
+    """Test Parameterableitung und Frequenzgang"""
+
+    def test_damping_ratio_round_trip(self):
+        params = QuarterCarParameters.from_damping_ratio(0.3, sprung_mass=400.0)
+        self.assertAlmostEqual(params.damping_ratio, 0.3)
+        self.assertEqual(params.sprung_mass, 400.0)
+        self.assertAlmostEqual(params.static_weight, 440.0 * 9.81)
+
+    def test_phase_minimum_grows_with_damping(self):
+        frequencies = np.linspace(6.0, 18.0, 241)
+        minima = [QuarterCarParameters.from_damping_ratio(d).phase_shift(frequencies).min()
+                  for d in (0.1, 0.2, 0.3, 0.4)]
+        self.assertTrue(np.all(np.diff(minima) > 0))
+
+    def test_parameter_grid(self):
+        grid = parameter_grid(damping_ratio=[0.1, 0.2, 0.3], tire_stiffness=[180e3, 220e3])
+        self.assertEqual(len(grid["damping"]), 6)
+        self.assertEqual(len(grid["sprung_mass"]), 6)
+        ratios = grid["damping"] / (2 * np.sqrt(grid["spring_stiffness"] * grid["sprung_mass"]))
+        np.testing.assert_allclose(np.unique(ratios), [0.1, 0.2, 0.3])
+
+        with self.assertRaises(ValueError):
+            QuarterCarEngine().simulate({"unknown": [1.0]}, np.zeros(10))
+
+
+class TestQuarterCarEngine(unittest.TestCase):
+    """Test RK4-Integration gegen den analytischen Frequenzgang"""
+
+    def test_steady_state_matches_frequency_response(self):
+        params = QuarterCarParameters()
+        engine = QuarterCarEngine(sample_rate=1000.0)
+        t = np.arange(8000) / 1000.0
+        result = engine.simulate(params, 0.003 * np.sin(2 * np.pi * 12.0 * t))
+
+        # Lock-in auf den eingeschwungenen Teil
+        steady = slice(4000, None)
+        dynamic = result.tire_force[0, steady] - result.static_weight[0]
+        measured = 2 * np.mean(dynamic * np.exp(-2j * np.pi * 12.0 * t[steady])) * 1j
+        expected = 0.003 * params.force_response(12.0)
+
+        self.assertLess(abs(measured - expected) / abs(expected), 0.01)
+
+    def test_batch_matches_single_runs_and_substeps(self):
+        model = SweepModel(duration=2.0)
+        batch = [QuarterCarParameters.from_damping_ratio(d) for d in (0.1, 0.4)]
+
+        combined = QuarterCarEngine(sample_rate=1000.0).simulate_sweep(batch, model)
+        single = QuarterCarEngine(sample_rate=1000.0).simulate_sweep(batch[1], model)
+        fine = QuarterCarEngine(sample_rate=250.0, substeps=4).simulate_sweep(batch[1], model)
+
+        self.assertEqual(combined.tire_force.shape, (2, 2000))
+        np.testing.assert_allclose(combined.tire_force[1], single.tire_force[0])
+        self.assertFalse(np.allclose(combined.tire_force[0], combined.tire_force[1]))
+        np.testing.assert_allclose(fine.tire_force[0], single.tire_force[0, ::4], rtol=1e-6)
+        np.testing.assert_allclose(single.frequency, model.freq_start + (model.freq_end - model.freq_start) * single.time / 2.0)
+
+
+class TestProcessorRecovery(unittest.TestCase):
+    """Test EGEA-Prozessor auf simulierten Sweeps"""
+
+    def test_processor_phase_follows_model(self):
+        model = SweepModel(freq_start=25.0, freq_end=6.0, duration=20.0)
+        damping_ratios = (0.15, 0.3)
+        result = QuarterCarEngine(sample_rate=1000.0).simulate_sweep(
+            parameter_grid(damping_ratio=damping_ratios), model
+        )
+        processor = EGEAPhaseShiftProcessor(use_cache=False)
+        peaks = processor.signal_processor.find_platform_tops(result.platform_position, min_distance=30)
+
+        for row, damping_ratio in enumerate(damping_ratios):
+            analysis = processor.calculate_phase_shift_advanced(
+                result.platform_position, result.tire_force[row], result.time,
+                result.static_weight[row], platform_peaks=peaks
+            )
+            params = QuarterCarParameters.from_damping_ratio(damping_ratio)
+
+            # Oberhalb der Radeigenfrequenz (φ > 90°) folgt die Messung dem Modell
+            periods = [p for p in analysis.periods if 14.0 <= p.frequency <= 18.0]
+            self.assertGreater(len(periods), 10)
+            errors = [p.phase_shift - params.phase_shift(p.frequency) for p in periods]
+            self.assertLess(np.max(np.abs(errors)), 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
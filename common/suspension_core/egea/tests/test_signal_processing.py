@@ -8,6 +8,7 @@ import numpy as np
 
 # Import der zu testenden Module
 from ...egea.utils.signal_processing import EGEASignalProcessor, create_egea_test_signals
+from ...egea.utils.filter_bank import EGEAFilterBank
 
 
 class TestEGEASignalProcessor(unittest.TestCase):
@@ -106,5 +107,134 @@ class TestEGEASignalProcessor(unittest.TestCase):
         self.assertTrue(f_under_test)
 
 
+
+
+def _reference_crossings(force_signal, time_array, static_weight):
+    """Ursprüngliche Schleifen-Implementierung als Referenz"""
+    crossings = []
+    for i in range(1, len(force_signal)):
+        prev_force = force_signal[i-1]
+        curr_force = force_signal[i]
+        if ((prev_force < static_weight < curr_force) or 
+            (prev_force > static_weight > curr_force)):
+            fraction = (static_weight - prev_force) / (curr_force - prev_force)
+            crossing_time = time_array[i-1] + fraction * (time_array[i] - time_array[i-1])
+            crossings.append((crossing_time, 'up' if curr_force > prev_force else 'down'))
+    return crossings
+
+
+class TestStaticWeightCrossings(unittest.TestCase):
+    """Test vektorisierte Kreuzungserkennung"""
+    
+    def setUp(self):
+        self.processor = EGEASignalProcessor()
+        np.random.seed(7)
+        self.time, self.platform_pos, self.tire_force = create_egea_test_signals(
+            duration=30.0, fs=1000.0, start_freq=20.0, end_freq=5.0
+        )
+        self.static_weight = 500.0
+        self.peaks = self.processor.find_platform_tops(self.platform_pos, min_distance=27)
+    
+    def test_crossing_times_match_reference(self):
+        """Up/Down-Arrays entsprechen exakt der Schleifen-Implementierung"""
+        reference = _reference_crossings(self.tire_force, self.time, self.static_weight)
+        up_times, down_times = self.processor.find_static_weight_crossing_times(
+            self.tire_force, self.time, self.static_weight
+        )
+        
+        self.assertEqual(up_times.dtype, np.float64)
+        self.assertEqual(up_times.tolist(), [t for t, d in reference if d == 'up'])
+        self.assertEqual(down_times.tolist(), [t for t, d in reference if d == 'down'])
+        self.assertEqual(
+            self.processor.find_static_weight_crossings(self.tire_force, self.time, self.static_weight),
+            reference
+        )
+    
+    def test_fref_cycles_match_per_cycle(self):
+        """Fref aller Zyklen in einem Aufruf entspricht calculate_fref pro Zyklus"""
+        fref_cycles = self.processor.calculate_fref_cycles(
+            self.tire_force, self.time, self.static_weight, self.peaks
+        )
+        
+        self.assertEqual(len(fref_cycles), len(self.peaks) - 1)
+        for i in range(len(self.peaks) - 1):
+            cycle = slice(self.peaks[i], self.peaks[i + 1])
+            expected = self.processor.calculate_fref(
+                self.tire_force[cycle], self.time[cycle], self.static_weight,
+                self.time[cycle][0], self.time[cycle][-1]
+            )
+            if expected is None:
+                self.assertTrue(np.isnan(fref_cycles[i]))
+            else:
+                self.assertEqual(fref_cycles[i], expected)
+    
+    def test_fref_fallback_single_direction(self):
+        """Nur Kreuzungen einer Richtung: Mittelpunkt der ersten beiden"""
+        force = np.array([0.0, 2.0, 1.0, 0.0, 2.0, 1.0])
+        t = np.arange(len(force), dtype=np.float64)
+        
+        self.assertEqual(self.processor.calculate_fref(force, t, 1.0, 0.0, 5.0), 2.0)
+        np.testing.assert_array_equal(
+            self.processor.calculate_fref_cycles(force, t, 1.0, [0, 6]), [2.0]
+        )
+
+
+class TestEGEAFilterBank(unittest.TestCase):
+    """Test vorberechnete Filterkoeffizienten"""
+    
+    def setUp(self):
+        self.bank = EGEAFilterBank()
+        self.fs = 1000.0
+    
+    def test_range_built_lazily_once(self):
+        """Erster Zugriff entwirft den ganzen 5-25 Hz Bereich, danach nur Hits"""
+        self.assertEqual(self.bank.get_stats()["designs"], 0)
+        
+        self.bank.get_phase_filter(self.fs, 12.3)
+        designs_after_first = self.bank.get_stats()["designs"]
+        self.assertEqual(designs_after_first, 21)  # 5, 6, ..., 25 Hz
+        
+        for frequency in np.linspace(5.0, 25.0, 200):
+            self.bank.get_phase_filter(self.fs, frequency)
+        
+        stats = self.bank.get_stats()
+        self.assertEqual(stats["designs"], designs_after_first)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 200)
+    
+    def test_quantized_steps_share_filter(self):
+        """Frequenzen im selben Schritt liefern dieselben Koeffizienten"""
+        first = self.bank.get_phase_filter(self.fs, 11.8)
+        second = self.bank.get_phase_filter(self.fs, 12.2)
+        other = self.bank.get_phase_filter(self.fs, 14.0)
+        
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertAlmostEqual(first.cutoff, 12.0 * 2 / (self.fs / 2))
+    
+    def test_lru_eviction(self):
+        """Begrenzter Cache verdrängt älteste Einträge"""
+        bank = EGEAFilterBank(max_size=25)
+        bank.get_phase_filter(1000.0, 10.0)
+        bank.get_phase_filter(2000.0, 10.0)
+        
+        stats = bank.get_stats()
+        self.assertLessEqual(stats["size"], 25)
+        self.assertGreater(stats["evictions"], 0)
+    
+    def test_processor_uses_bank(self):
+        """Filterung im Prozessor nutzt die Filterbank"""
+        processor = EGEASignalProcessor(filter_bank=self.bank)
+        test_signal = np.random.normal(0, 1, 1000)
+        
+        processor.apply_egea_phase_filter(test_signal, self.fs, 10.0)
+        processor.apply_egea_phase_filter(test_signal, self.fs, 10.2)
+        processor.apply_force_amplitude_filter(test_signal, self.fs)
+        processor.apply_force_amplitude_filter(test_signal, self.fs)
+        
+        stats = self.bank.get_stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 2)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
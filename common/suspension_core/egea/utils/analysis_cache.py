@@ -0,0 +1,266 @@
+"""
+Ergebnis-Cache für wiederholte EGEA-Analysen
+
+Schlüssel ist ein Digest über die Puffer der Eingangsarrays (ohne Kopie bei
+zusammenhängenden Arrays) plus alle Parameter, die das Ergebnis beeinflussen.
+Ergebnisse werden serialisiert gehalten: die Größe ist damit exakt bekannt
+(Byte-Budget) und jeder Treffer liefert eine eigene Kopie, die der Aufrufer
+verändern darf. Optional werden Einträge zusätzlich auf der Festplatte
+abgelegt, sodass erneute Auswertungen archivierter Tests oder wiedergegebener
+Aufzeichnungen auch über Prozessgrenzen hinweg entfallen.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import xxhash
+
+    def _new_digest():
+        return xxhash.xxh3_128()
+
+    DIGEST_NAME = "xxh3"
+except ImportError:
+    def _new_digest():
+        return hashlib.blake2b(digest_size=16)
+
+    DIGEST_NAME = "b2b"
+
+
+def array_digest(arrays: Sequence[Optional[np.ndarray]], **params: Any) -> str:
+    """
+    Berechnet einen Digest über Arrays und Parameter.
+
+    Zusammenhängende Arrays werden direkt über ihren Puffer gelesen;
+    dtype und Form fließen mit ein.
+
+    Args:
+        arrays: Eingangsarrays (None erlaubt)
+        **params: Weitere ergebnisrelevante Parameter (repr-stabil)
+
+    Returns:
+        Hex-Digest mit Algorithmus-Präfix
+    """
+    digest = _new_digest()
+    for array in arrays:
+        if array is None:
+            digest.update(b"\0none")
+            continue
+        array = np.asarray(array)
+        if not array.flags.c_contiguous:
+            array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(memoryview(array).cast("B"))
+    for name in sorted(params):
+        digest.update(f"|{name}={params[name]!r}".encode())
+    return f"{DIGEST_NAME}-{digest.hexdigest()}"
+
+
+class EGEAAnalysisCache:
+    """
+    LRU-Cache mit Byte-Budget für Analyseergebnisse
+
+    Features:
+    - Verdrängung nach Anzahl (max_entries) und Größe (max_bytes)
+    - Optionale Ablage auf der Festplatte (persist_dir)
+    - Thread-sicher (GUI-Worker teilen sich eine Instanz)
+    """
+
+    FILE_SUFFIX = ".pkl"
+
+    def __init__(self,
+                 max_entries: int = 256,
+                 max_bytes: int = 64 * 1024 * 1024,
+                 persist_dir: Optional[str] = None):
+        """
+        Initialisiert den Cache
+
+        Args:
+            max_entries: Maximale Anzahl Einträge im Speicher
+            max_bytes: Maximale Größe aller serialisierten Einträge
+            persist_dir: Verzeichnis für die Festplattenablage (None = nur Speicher)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.persist_dir = None
+
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_held = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_errors = 0
+
+        if persist_dir:
+            self.enable_persistence(persist_dir)
+
+    def enable_persistence(self, directory: str) -> None:
+        """Aktiviert die Ablage auf der Festplatte"""
+        os.makedirs(directory, exist_ok=True)
+        self.persist_dir = directory
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Liefert ein Ergebnis aus dem Cache
+
+        Args:
+            key: Schlüssel (siehe array_digest)
+
+        Returns:
+            Eigene Kopie des Ergebnisses oder None
+        """
+        with self._lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+
+        if data is None and self.persist_dir:
+            data = self._read_disk(key)
+            if data is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._insert(key, data)
+
+        if data is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        return pickle.loads(data)
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Legt ein Ergebnis ab
+
+        Args:
+            key: Schlüssel
+            value: Picklebares Ergebnis
+        """
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Analyseergebnis nicht cachebar: {e}")
+            return
+
+        with self._lock:
+            self._insert(key, data)
+
+        if self.persist_dir:
+            self._write_disk(key, data)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Liefert das gecachte Ergebnis oder berechnet und speichert es
+
+        Args:
+            key: Schlüssel
+            compute: Berechnung bei Cache-Miss
+
+        Returns:
+            Ergebnis
+        """
+        result = self.get(key)
+        if result is None:
+            result = compute()
+            self.put(key, result)
+        return result
+
+    def clear(self) -> None:
+        """Leert den Speicher-Cache und setzt die Statistiken zurück (Festplatte bleibt)"""
+        with self._lock:
+            self._cache.clear()
+            self.bytes_held = 0
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.disk_errors = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Cache-Statistiken zurück"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._cache),
+                "max_size": self.max_entries,
+                "bytes_held": self.bytes_held,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups > 0 else 0.0,
+                "evictions": self.evictions,
+                "persistent": self.persist_dir is not None,
+                "digest": DIGEST_NAME,
+            }
+
+    def _insert(self, key: str, data: bytes) -> None:
+        """Fügt einen Eintrag ein und verdrängt nach LRU (Lock muss gehalten werden)"""
+        if len(data) > self.max_bytes:
+            return
+
+        previous = self._cache.pop(key, None)
+        if previous is not None:
+            self.bytes_held -= len(previous)
+
+        self._cache[key] = data
+        self.bytes_held += len(data)
+
+        while len(self._cache) > self.max_entries or self.bytes_held > self.max_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self.bytes_held -= len(evicted)
+            self.evictions += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.persist_dir, key + self.FILE_SUFFIX)
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self.disk_errors += 1
+            logger.warning(f"Cache-Eintrag {key} nicht lesbar: {e}")
+            return None
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.disk_errors += 1
+            logger.warning(f"Cache-Eintrag {key} nicht speicherbar: {e}")
+
+
+# Gemeinsame Instanz für alle EGEAPhaseShiftProcessor-Instanzen eines Prozesses
+_default_analysis_cache: Optional[EGEAAnalysisCache] = None
+_default_analysis_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> EGEAAnalysisCache:
+    """Liefert den prozessweit geteilten Analyse-Cache"""
+    global _default_analysis_cache
+
+    if _default_analysis_cache is None:
+        with _default_analysis_cache_lock:
+            if _default_analysis_cache is None:
+                _default_analysis_cache = EGEAAnalysisCache()
+
+    return _default_analysis_cache
@@ -0,0 +1,244 @@
+"""
+Vorberechnete Filterkoeffizienten für die EGEA-Signalverarbeitung
+
+Nach Annex 1 wird für jeden Frequenzschritt fstep ein eigener Tiefpass für die
+Phasenanalyse entworfen. Da pro Abtastrate nur wenige Frequenzschritte vorkommen,
+werden die Koeffizienten für den gesamten Bereich 5-25 Hz einmal pro Abtastrate
+berechnet und anschließend aus einem LRU-Cache geliefert.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.signal import butter
+
+from ...egea.config.parameters import EGEAParameters
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FilterCoefficients:
+    """Koeffizienten eines Filters in ba- und SOS-Darstellung"""
+    b: NDArray[np.float64]
+    a: NDArray[np.float64]
+    sos: NDArray[np.float64]
+    cutoff: float  # Normierte Grenzfrequenz (1.0 = Nyquist)
+
+
+class EGEAFilterBank:
+    """
+    Filterbank für EGEA-Phasen- und Kraftamplitudenfilter
+
+    Features:
+    - Schlüssel: (Abtastrate, quantisierter Frequenzschritt)
+    - Alle Phasenfilter für 5-25 Hz werden beim ersten Zugriff auf eine
+      Abtastrate gemeinsam entworfen (lazy)
+    - LRU-Cache mit Hit/Miss-Zählern
+    - Thread-sicher (GUI-Worker teilen sich eine Instanz)
+    """
+
+    PHASE_FILTER_ORDER = 3  # Empirisch bestimmt für eps=0.01
+    FORCE_FILTER_ORDER = 4  # Höhere Ordnung für steilere Flanken
+    FORCE_PASS_FREQ = 50.0  # Hz - Durchlassbereich 0-50 Hz
+    FS_RESOLUTION = 1e-3  # Hz - Abtastraten innerhalb dieser Auflösung teilen sich Filter
+
+    def __init__(self,
+                 max_size: int = 512,
+                 min_freq: Optional[float] = None,
+                 max_freq: Optional[float] = None,
+                 freq_step: Optional[float] = None):
+        """
+        Initialisiert die Filterbank
+
+        Args:
+            max_size: Maximale Anzahl gecachter Filter
+            min_freq: Untere Grenze des vorberechneten Bereichs (Standard: 5 Hz)
+            max_freq: Obere Grenze des vorberechneten Bereichs (Standard: 25 Hz)
+            freq_step: Quantisierung der Frequenzschritte (Standard: 1 Hz)
+        """
+        self.params = EGEAParameters()
+        self.max_size = max_size
+        self.min_freq = min_freq if min_freq is not None else self.params.FILTER_BANK_MIN_FREQ
+        self.max_freq = max_freq if max_freq is not None else self.params.FILTER_BANK_MAX_FREQ
+        self.freq_step = freq_step if freq_step is not None else self.params.FILTER_FREQ_STEP
+
+        self._cache: "OrderedDict[Hashable, FilterCoefficients]" = OrderedDict()
+        self._prepared_rates = set()
+        self._lock = threading.Lock()
+
+        # Statistiken
+        self.hits = 0
+        self.misses = 0
+        self.designs = 0
+        self.evictions = 0
+
+    def quantize_frequency(self, frequency: float) -> float:
+        """Rundet eine Frequenz auf den nächsten Filter-Frequenzschritt"""
+        return round(float(frequency) / self.freq_step) * self.freq_step
+
+    def _rate_key(self, fs: float) -> float:
+        return round(float(fs) / self.FS_RESOLUTION) * self.FS_RESOLUTION
+
+    def get_phase_filter(self, fs: float, frequency_step: float) -> FilterCoefficients:
+        """
+        Liefert den Phasenfilter für einen Frequenzschritt (Annex 1)
+
+        Args:
+            fs: Abtastrate
+            frequency_step: Aktuelle Frequenz, wird auf freq_step quantisiert
+
+        Returns:
+            FilterCoefficients des Tiefpasses 0 - fstep*PassMulPh
+        """
+        rate = self._rate_key(fs)
+        step = self.quantize_frequency(frequency_step)
+
+        with self._lock:
+            if rate not in self._prepared_rates:
+                # Erster Zugriff auf diese Abtastrate: gesamten Bereich entwerfen (zählt als Miss)
+                self._prepare_rate(rate)
+                coefficients = self._cache.get(("phase", rate, step))
+                if coefficients is not None:
+                    self.misses += 1
+                    return coefficients
+
+            return self._get("phase", rate, step)
+
+    def prepare(self, fs: float) -> None:
+        """
+        Berechnet alle Filter einer Abtastrate vorab, z.B. beim Service-Start
+
+        Args:
+            fs: Erwartete Abtastrate
+        """
+        rate = self._rate_key(fs)
+
+        with self._lock:
+            if rate not in self._prepared_rates:
+                self._prepare_rate(rate)
+            self._get("force", rate, None)
+
+    def get_force_amplitude_filter(self, fs: float) -> FilterCoefficients:
+        """
+        Liefert den Kraftamplitudenfilter (Annex 1, Durchlass 0-50 Hz)
+
+        Args:
+            fs: Abtastrate
+
+        Returns:
+            FilterCoefficients
+        """
+        rate = self._rate_key(fs)
+
+        with self._lock:
+            return self._get("force", rate, None)
+
+    def _get(self, kind: str, rate: float, step: Optional[float]) -> FilterCoefficients:
+        """LRU-Lookup, entwirft den Filter bei einem Miss (Lock muss gehalten werden)"""
+        key = (kind, rate, step)
+        coefficients = self._cache.get(key)
+
+        if coefficients is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return coefficients
+
+        self.misses += 1
+        coefficients = self._design(kind, rate, step)
+        self._store(key, coefficients)
+        return coefficients
+
+    def _prepare_rate(self, rate: float) -> None:
+        """Entwirft alle Phasenfilter des Bereichs für eine Abtastrate"""
+        steps = np.arange(self.min_freq, self.max_freq + self.freq_step / 2, self.freq_step)
+
+        for frequency in steps:
+            step = self.quantize_frequency(frequency)
+            key = ("phase", rate, step)
+            if key not in self._cache:
+                self._store(key, self._design("phase", rate, step))
+
+        self._prepared_rates.add(rate)
+        logger.debug(f"Filterbank für fs={rate}Hz vorberechnet: {len(steps)} Phasenfilter")
+
+    def _store(self, key: Hashable, coefficients: FilterCoefficients) -> None:
+        self._cache[key] = coefficients
+        self._cache.move_to_end(key)
+
+        while len(self._cache) > self.max_size:
+            evicted_key, _ = self._cache.popitem(last=False)
+            self.evictions += 1
+            # Eine verdrängte Abtastrate muss beim nächsten Zugriff neu vorbereitet werden
+            self._prepared_rates.discard(evicted_key[1])
+
+    def _design(self, kind: str, rate: float, step: Optional[float]) -> FilterCoefficients:
+        """Entwirft einen Butterworth-Tiefpass"""
+        nyquist = rate / 2.0
+
+        if kind == "phase":
+            pass_freq = step * self.params.PASS_MUL_PH  # 0 - fstep*2 Hz
+            cutoff = min(pass_freq / nyquist, 0.99)
+            order = self.PHASE_FILTER_ORDER
+        else:
+            cutoff = self.FORCE_PASS_FREQ / nyquist
+            if cutoff >= 1.0:
+                logger.warning("Pass frequency exceeds Nyquist, using 0.8*Nyquist")
+                cutoff = 0.8
+            order = self.FORCE_FILTER_ORDER
+
+        b, a = butter(order, cutoff, btype='low')
+        sos = butter(order, cutoff, btype='low', output='sos')
+        self.designs += 1
+
+        for array in (b, a, sos):
+            array.setflags(write=False)
+
+        return FilterCoefficients(b=b, a=a, sos=sos, cutoff=cutoff)
+
+    def clear(self) -> None:
+        """Leert den Cache und setzt die Statistiken zurück"""
+        with self._lock:
+            self._cache.clear()
+            self._prepared_rates.clear()
+            self.hits = 0
+            self.misses = 0
+            self.designs = 0
+            self.evictions = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Cache-Statistiken zurück"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._cache),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+                "designs": self.designs,
+                "evictions": self.evictions,
+                "sample_rates": sorted(self._prepared_rates),
+            }
+
+
+# Gemeinsame Instanz für alle EGEASignalProcessor-Instanzen eines Prozesses
+_default_filter_bank: Optional[EGEAFilterBank] = None
+_default_filter_bank_lock = threading.Lock()
+
+
+def get_filter_bank() -> EGEAFilterBank:
+    """Liefert die prozessweit geteilte Filterbank"""
+    global _default_filter_bank
+
+    if _default_filter_bank is None:
+        with _default_filter_bank_lock:
+            if _default_filter_bank is None:
+                _default_filter_bank = EGEAFilterBank()
+
+    return _default_filter_bank
@@ -0,0 +1,349 @@
+"""
+Viertelfahrzeugmodell für die EGEA-Simulation
+
+Zwei-Massen-Schwinger (Aufbau- und Radmasse, Feder, Dämpfer, Reifensteifigkeit),
+angeregt durch die Plattformbewegung. Die Integration erfolgt mit festem
+Zeitschritt (klassisches Runge-Kutta 4. Ordnung) und ist über beliebig viele
+Parametersätze vektorisiert: ein Aufruf simuliert tausende Kombinationen,
+z.B. für Validierungsdatensätze oder um zu prüfen, wie genau der
+EGEA-Prozessor die Dämpfung wiedererkennt.
+
+Da das Modell linear ist, wird ein RK4-Schritt einmal pro Parametersatz als
+Übergangsmatrix ausgewertet (Zustand und Anregung an Schrittanfang, -mitte
+und -ende). Die Zeitschleife besteht danach nur aus einer Matrixmultiplikation
+pro Schritt für alle Parametersätze gleichzeitig.
+"""
+
+import math
+from dataclasses import dataclass, fields
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .sweep_synthesizer import SweepModel, SweepSynthesizer
+
+GRAVITY = 9.81  # m/s²
+
+
+@dataclass(frozen=True)
+class QuarterCarParameters:
+    """Parameter des Viertelfahrzeugs (SI-Einheiten)"""
+    sprung_mass: float = 350.0          # kg (Aufbauanteil des Rades)
+    unsprung_mass: float = 40.0         # kg (Rad, Bremse, Achsanteil)
+    spring_stiffness: float = 20000.0   # N/m
+    damping: float = 1400.0             # Ns/m (Stoßdämpfer)
+    tire_stiffness: float = 200000.0    # N/m (200 N/mm)
+    tire_damping: float = 50.0          # Ns/m
+
+    @classmethod
+    def from_damping_ratio(cls, damping_ratio: float, **kwargs) -> "QuarterCarParameters":
+        """
+        Erstellt Parameter mit vorgegebenem Dämpfungsmaß des Aufbaus
+
+        Args:
+            damping_ratio: Dämpfungsmaß D = c / (2·√(k·m_s))
+            **kwargs: Weitere Parameter (überschreiben die Standardwerte)
+
+        Returns:
+            QuarterCarParameters
+        """
+        base = cls(**kwargs)
+        damping = 2.0 * damping_ratio * math.sqrt(base.spring_stiffness * base.sprung_mass)
+        return cls(**{**kwargs, "damping": damping})
+
+    @property
+    def damping_ratio(self) -> float:
+        """Dämpfungsmaß des Aufbaus"""
+        return self.damping / (2.0 * math.sqrt(self.spring_stiffness * self.sprung_mass))
+
+    @property
+    def static_weight(self) -> float:
+        """Statische Radlast in N"""
+        return (self.sprung_mass + self.unsprung_mass) * GRAVITY
+
+    @property
+    def wheel_hop_frequency(self) -> float:
+        """Näherung der Radeigenfrequenz in Hz"""
+        return math.sqrt((self.spring_stiffness + self.tire_stiffness) / self.unsprung_mass) / (2.0 * math.pi)
+
+    def force_response(self, frequency: Union[float, NDArray[np.float64]]) -> NDArray[np.complex128]:
+        """
+        Frequenzgang dynamische Reifenkraft / Plattformweg in N/m
+
+        Args:
+            frequency: Frequenz(en) in Hz
+
+        Returns:
+            Komplexer Frequenzgang
+        """
+        s = 2j * np.pi * np.asarray(frequency, dtype=np.float64)
+        suspension = self.spring_stiffness + self.damping * s
+        tire = self.tire_stiffness + self.tire_damping * s
+        body = suspension / (self.sprung_mass * s * s + suspension)
+        wheel = tire / (self.unsprung_mass * s * s + suspension * (1.0 - body) + tire)
+        return tire * (1.0 - wheel)
+
+    def phase_shift(self, frequency: Union[float, NDArray[np.float64]]) -> NDArray[np.float64]:
+        """
+        Phasenverschiebung φ im EGEA-Sinn (0-180°)
+
+        Zeitversatz vom Plattform-TOP bis zum Kraftminimum: 180° minus dem
+        Voreilwinkel der dynamischen Reifenkraft gegenüber dem Plattformweg.
+        Geringere Dämpfung ergibt ein kleineres φmin nahe der Radeigenfrequenz.
+
+        Args:
+            frequency: Frequenz(en) in Hz
+
+        Returns:
+            Phasenverschiebung in Grad
+        """
+        return 180.0 - np.degrees(np.abs(np.angle(self.force_response(frequency))))
+
+
+ParameterBatch = Union[QuarterCarParameters, Sequence[QuarterCarParameters], Dict[str, NDArray[np.float64]]]
+
+
+def parameter_grid(**values) -> Dict[str, NDArray[np.float64]]:
+    """
+    Kreuzprodukt von Parameterwerten als flache Arrays
+
+    Nicht angegebene Parameter erhalten die Standardwerte. Zusätzlich kann
+    damping_ratio statt damping angegeben werden.
+
+    Args:
+        **values: Parametername → Werte (Skalar oder Sequenz)
+
+    Returns:
+        Dict Parametername → Array (alle gleich lang)
+    """
+    names = list(values)
+    grids = np.meshgrid(*[np.atleast_1d(np.asarray(values[name], dtype=np.float64)) for name in names],
+                        indexing="ij")
+    batch = {name: grid.ravel() for name, grid in zip(names, grids)}
+
+    damping_ratio = batch.pop("damping_ratio", None)
+    arrays = _parameter_arrays(batch)
+    if damping_ratio is not None:
+        arrays["damping"] = 2.0 * damping_ratio * np.sqrt(arrays["spring_stiffness"] * arrays["sprung_mass"])
+    return arrays
+
+
+def _parameter_arrays(parameters: ParameterBatch) -> Dict[str, NDArray[np.float64]]:
+    """Wandelt Parametersätze in gleich lange Arrays (ein Eintrag pro Parametersatz)"""
+    names = [f.name for f in fields(QuarterCarParameters)]
+
+    if isinstance(parameters, QuarterCarParameters):
+        parameters = [parameters]
+    if isinstance(parameters, dict):
+        unknown = set(parameters) - set(names)
+        if unknown:
+            raise ValueError(f"Unbekannte Viertelfahrzeug-Parameter: {sorted(unknown)}")
+        defaults = QuarterCarParameters()
+        values = [np.atleast_1d(np.asarray(parameters.get(name, getattr(defaults, name)), dtype=np.float64))
+                  for name in names]
+        return dict(zip(names, (np.array(v, dtype=np.float64) for v in np.broadcast_arrays(*values))))
+
+    return {name: np.array([getattr(p, name) for p in parameters], dtype=np.float64) for name in names}
+
+
+@dataclass
+class QuarterCarResult:
+    """Simulationsergebnis eines Parameter-Batches"""
+    time: NDArray[np.float64]               # (N,) s
+    platform_position: NDArray[np.float64]  # (N,) m
+    frequency: Optional[NDArray[np.float64]]  # (N,) Hz (nur bei Sweep-Anregung)
+    tire_force: NDArray                     # (B, N) N (statische Last + dynamischer Anteil)
+    static_weight: NDArray[np.float64]      # (B,) N
+    parameters: Dict[str, NDArray[np.float64]]  # Parametername → (B,)
+
+    @property
+    def batch_size(self) -> int:
+        return self.tire_force.shape[0]
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+
+class QuarterCarEngine:
+    """
+    Vektorisierte Simulation des Viertelfahrzeugs auf der EGEA-Plattform
+
+    Features:
+    - RK4 mit festem Zeitschritt, optional mit Unterschritten pro Ausgabesample
+    - Beliebig viele Parametersätze pro Aufruf (gemeinsame Anregung)
+    - Anregung als EGEA-Sweep (analytisch) oder als aufgezeichneter Plattformweg
+    """
+
+    def __init__(self, sample_rate: float = 1000.0, substeps: int = 1,
+                 dtype: np.dtype = np.float64):
+        """
+        Initialisiert die Engine
+
+        Args:
+            sample_rate: Ausgabe-Abtastrate in Hz
+            substeps: Integrationsschritte pro Ausgabesample
+            dtype: Datentyp der Reifenkraft (float32 halbiert den Speicher großer Batches)
+        """
+        if sample_rate <= 0 or substeps < 1:
+            raise ValueError("sample_rate muss positiv und substeps mindestens 1 sein")
+        self.sample_rate = sample_rate
+        self.substeps = int(substeps)
+        self.dtype = dtype
+
+    @property
+    def step(self) -> float:
+        """Integrationsschrittweite in s"""
+        return 1.0 / (self.sample_rate * self.substeps)
+
+    def simulate_sweep(self, parameters: ParameterBatch,
+                       model: Optional[SweepModel] = None,
+                       duration: Optional[float] = None) -> QuarterCarResult:
+        """
+        Simuliert einen EGEA-Frequenzsweep
+
+        Args:
+            parameters: Ein oder mehrere Parametersätze (siehe parameter_grid)
+            model: Sweepmodell (Frequenzverlauf und Plattformamplitude in mm)
+            duration: Simulationsdauer in s (None = Sweepdauer)
+
+        Returns:
+            QuarterCarResult
+        """
+        synthesizer = SweepSynthesizer(model, sample_rate=self.sample_rate)
+        duration = synthesizer.model.duration if duration is None else duration
+        count = int(round(duration * self.sample_rate))
+
+        # Anregung analytisch auf dem Halbschritt-Raster (Schrittanfang, -mitte, -ende)
+        half_times = np.arange(2 * max(count - 1, 0) * self.substeps + 1) * (0.5 * self.step)
+        amplitude = synthesizer.model.platform_amplitude / 1000.0  # mm → m
+        carrier = synthesizer.carrier_phase(half_times)
+        position = amplitude * np.sin(carrier)
+        velocity = amplitude * np.cos(carrier) * 2.0 * np.pi * synthesizer.frequency(half_times)
+
+        result = self._integrate(_parameter_arrays(parameters), position, velocity)
+        result.frequency = synthesizer.frequency(result.time)
+        return result
+
+    def simulate(self, parameters: ParameterBatch,
+                 platform_position: NDArray[np.float64]) -> QuarterCarResult:
+        """
+        Simuliert eine beliebige Plattformanregung (z.B. aufgezeichnete Tests)
+
+        Args:
+            parameters: Ein oder mehrere Parametersätze
+            platform_position: Plattformweg in m mit der Ausgabe-Abtastrate
+
+        Returns:
+            QuarterCarResult
+        """
+        samples = np.asarray(platform_position, dtype=np.float64)
+        sample_times = np.arange(len(samples)) / self.sample_rate
+        velocity = np.gradient(samples, 1.0 / self.sample_rate) if len(samples) > 1 else np.zeros_like(samples)
+
+        half_times = np.arange(2 * max(len(samples) - 1, 0) * self.substeps + 1) * (0.5 * self.step)
+        return self._integrate(
+            _parameter_arrays(parameters),
+            np.interp(half_times, sample_times, samples),
+            np.interp(half_times, sample_times, velocity),
+        )
+
+    def _integrate(self, params: Dict[str, NDArray[np.float64]],
+                   position: NDArray[np.float64], velocity: NDArray[np.float64]) -> QuarterCarResult:
+        """
+        Integriert alle Parametersätze über die Anregung
+
+        Args:
+            params: Parameter-Arrays (B,)
+            position: Plattformweg auf dem Halbschritt-Raster (2M+1,)
+            velocity: Plattformgeschwindigkeit auf dem Halbschritt-Raster (2M+1,)
+
+        Returns:
+            QuarterCarResult (Ausgabe bei jedem substeps-ten Schritt)
+        """
+        steps = (len(position) - 1) // 2
+        count = steps // self.substeps + 1
+        transition, input_matrix = self._step_matrices(params)
+
+        # Anregung pro Schritt: [z, v] an Schrittanfang, -mitte und -ende
+        excitation = np.empty((steps, 6))
+        for k, offset in enumerate((0, 1, 2)):
+            excitation[:, 2 * k] = position[offset:offset + 2 * steps:2]
+            excitation[:, 2 * k + 1] = velocity[offset:offset + 2 * steps:2]
+
+        tire_stiffness = params["tire_stiffness"]
+        tire_damping = params["tire_damping"]
+        static_weight = (params["sprung_mass"] + params["unsprung_mass"]) * GRAVITY
+
+        # Zustand [z_s, v_s, z_u, v_u] relativ zur statischen Ruhelage, Start in Ruhe
+        state = np.zeros((len(static_weight), 4))
+        force = np.empty((count, len(static_weight)), dtype=self.dtype)
+        force[0] = static_weight + tire_stiffness * position[0] + tire_damping * velocity[0]
+
+        for step in range(steps):
+            state = np.einsum("bij,bj->bi", transition, state) + input_matrix @ excitation[step]
+            if (step + 1) % self.substeps == 0:
+                index = 2 * (step + 1)
+                force[(step + 1) // self.substeps] = (
+                    static_weight
+                    + tire_stiffness * (position[index] - state[:, 2])
+                    + tire_damping * (velocity[index] - state[:, 3])
+                )
+
+        output_index = np.arange(count) * 2 * self.substeps
+        return QuarterCarResult(
+            time=np.arange(count) / self.sample_rate,
+            platform_position=position[output_index],
+            frequency=None,
+            tire_force=force.T.copy(),
+            static_weight=static_weight,
+            parameters=params,
+        )
+
+    def _step_matrices(self, params: Dict[str, NDArray[np.float64]]):
+        """
+        RK4-Schritt als lineare Abbildung pro Parametersatz
+
+        Returns:
+            (Übergangsmatrix (B,4,4), Eingangsmatrix (B,4,6))
+        """
+        ms, mu = params["sprung_mass"], params["unsprung_mass"]
+        k, c = params["spring_stiffness"], params["damping"]
+        kt, ct = params["tire_stiffness"], params["tire_damping"]
+        batch = len(ms)
+
+        system = np.zeros((batch, 4, 4))
+        system[:, 0, 1] = 1.0
+        system[:, 1, 0] = -k / ms
+        system[:, 1, 1] = -c / ms
+        system[:, 1, 2] = k / ms
+        system[:, 1, 3] = c / ms
+        system[:, 2, 3] = 1.0
+        system[:, 3, 0] = k / mu
+        system[:, 3, 1] = c / mu
+        system[:, 3, 2] = -(k + kt) / mu
+        system[:, 3, 3] = -(c + ct) / mu
+
+        inputs = np.zeros((batch, 4, 2))
+        inputs[:, 3, 0] = kt / mu
+        inputs[:, 3, 1] = ct / mu
+
+        h = self.step
+
+        def rk4(x, u_start, u_mid, u_end):
+            k1 = system @ x + inputs @ u_start
+            k2 = system @ (x + 0.5 * h * k1) + inputs @ u_mid
+            k3 = system @ (x + 0.5 * h * k2) + inputs @ u_mid
+            k4 = system @ (x + h * k3) + inputs @ u_end
+            return x + h / 6.0 * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+
+        zero_state = np.zeros((batch, 4, 2))
+        zero_input = np.zeros((2, 4))
+        unit_input = np.eye(2)
+        transition = rk4(np.broadcast_to(np.eye(4), (batch, 4, 4)), zero_input, zero_input, zero_input)
+        input_matrix = np.concatenate([
+            rk4(zero_state, unit_input, 0 * unit_input, 0 * unit_input),
+            rk4(zero_state, 0 * unit_input, unit_input, 0 * unit_input),
+            rk4(zero_state, 0 * unit_input, 0 * unit_input, unit_input),
+        ], axis=2)
+        return transition, input_matrix
@@ -5,12 +5,13 @@ Basiert auf SPECSUS2018 Annex 1 und Kaiser-Reed Filter
 
 import numpy as np
 from numpy.typing import NDArray
-from scipy.signal import butter, filtfilt, find_peaks, hilbert
+from scipy.signal import filtfilt, find_peaks, hilbert
 from scipy.interpolate import interp1d
 from typing import List, Tuple, Optional, Dict
 import logging
 
 from ...egea.config.parameters import EGEAParameters
+from ...egea.utils.filter_bank import EGEAFilterBank, get_filter_bank
 
 
 logger = logging.getLogger(__name__)
@@ -20,10 +21,14 @@ class EGEASignalProcessor:
     """
     EGEA-konforme Signalverarbeitung nach SPECSUS2018
     Implementiert Kaiser-Reed Filter (Annex 1)
+    
+    Filterkoeffizienten kommen aus einer Filterbank, standardmäßig der
+    prozessweit geteilten Instanz.
     """
     
-    def __init__(self):
+    def __init__(self, filter_bank: Optional[EGEAFilterBank] = None):
         self.params = EGEAParameters()
+        self.filter_bank = filter_bank or get_filter_bank()
     
     def apply_egea_phase_filter(self, 
                                signal: NDArray[np.float64], 
@@ -45,30 +50,12 @@ class EGEASignalProcessor:
             Gefiltertes Signal
         """
         try:
-            # EGEA Parameter (Annex 1)
-            pass_mul_ph = self.params.PASS_MUL_PH  # 2
-            stop_mul_ph = self.params.STOP_MUL_PH  # 4
-            eps_ph = self.params.EPS_PH  # 0.01
-            
-            # Frequenzbereiche berechnen
-            pass_freq = frequency_step * pass_mul_ph  # 0 - fstep*2 Hz
-            stop_freq = frequency_step * stop_mul_ph  # fstep*4 Hz aufwärts
-            
-            # Nyquist-Frequenz
-            nyquist = fs / 2.0
-            
-            # Normalisierte Frequenzen
-            low_pass = min(pass_freq / nyquist, 0.99)
-            
-            # Nearly equal ripple approximation filter (Kaiser-Reed Method 1)
-            # Butterworth-Filter als Approximation
-            order = 3  # Empirisch bestimmt für eps=0.01
-            
-            b, a = butter(order, low_pass, btype='low')
-            filtered_signal = filtfilt(b, a, signal)
+            # Koeffizienten für den quantisierten Frequenzschritt aus der Filterbank
+            coefficients = self.filter_bank.get_phase_filter(fs, frequency_step)
+            filtered_signal = filtfilt(coefficients.b, coefficients.a, signal)
             
             logger.debug(f"Applied EGEA filter for {frequency_step}Hz: "
-                        f"pass={pass_freq}Hz, stop={stop_freq}Hz")
+                        f"cutoff={coefficients.cutoff:.4f}*Nyquist")
             
             return filtered_signal
             
@@ -84,19 +71,8 @@ class EGEASignalProcessor:
         Whole signal, ε = 0.01, pass band 0-50 Hz, stop band 130 Hz up
         """
         try:
-            nyquist = fs / 2.0
-            pass_freq = 50.0 / nyquist
-            stop_freq = 130.0 / nyquist
-            
-            # Prüfe Frequenzgrenzen
-            if pass_freq >= 1.0:
-                logger.warning("Pass frequency exceeds Nyquist, using 0.8*Nyquist")
-                pass_freq = 0.8
-            
-            order = 4  # Höhere Ordnung für steilere Flanken
-            b, a = butter(order, pass_freq, btype='low')
-            
-            return filtfilt(b, a, signal)
+            coefficients = self.filter_bank.get_force_amplitude_filter(fs)
+            return filtfilt(coefficients.b, coefficients.a, signal)
             
         except Exception as e:
             logger.error(f"Force amplitude filter error: {e}")
@@ -104,13 +80,17 @@ class EGEASignalProcessor:
     
     def find_platform_tops(self, 
                           platform_position: NDArray[np.float64], 
-                          min_distance: Optional[int] = None) -> NDArray[np.int64]:
+                          min_distance: Optional[int] = None,
+                          prominence: Optional[float] = None,
+                          wlen: Optional[int] = None) -> NDArray[np.int64]:
         """
         Findet TOP-Positionen der Plattform (3.11)
         
         Args:
             platform_position: Plattformpositionssignal
             min_distance: Minimaler Abstand zwischen Peaks
+            prominence: Mindest-Prominenz (Standard: 10% der Standardabweichung)
+            wlen: Fensterlänge der Prominenzberechnung in Samples (Standard: gesamtes Signal)
             
         Returns:
             Indices der TOP-Positionen
@@ -119,10 +99,14 @@ class EGEASignalProcessor:
             # Mindestabstand basierend auf minimaler Frequenz
             min_distance = int(len(platform_position) / (self.params.MAX_CALC_FREQ * 2))
         
+        if prominence is None:
+            prominence = np.std(platform_position) * 0.1
+        
         peaks, properties = find_peaks(
             platform_position,
             distance=min_distance,
-            prominence=np.std(platform_position) * 0.1
+            prominence=prominence,
+            wlen=wlen
         )
         
         return peaks.astype(np.int64)
@@ -142,26 +126,61 @@ class EGEASignalProcessor:
         Returns:
             Liste von (time, direction) Tupeln, direction = 'up'|'down'
         """
-        crossings = []
+        _, is_up, crossing_times = self._static_weight_crossings(
+            force_signal, time_array, static_weight
+        )
+        directions = np.where(is_up, 'up', 'down')
         
-        for i in range(1, len(force_signal)):
-            prev_force = force_signal[i-1]
-            curr_force = force_signal[i]
+        return list(zip(crossing_times.tolist(), directions.tolist()))
+    
+    def find_static_weight_crossing_times(self, 
+                                        force_signal: NDArray[np.float64],
+                                        time_array: NDArray[np.float64], 
+                                        static_weight: float) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        Findet alle Kreuzungen mit dem statischen Gewicht als typisierte Arrays
+        
+        Args:
+            force_signal: Kraftsignal
+            time_array: Zeitarray  
+            static_weight: Statisches Gewicht (Fst)
             
-            # Prüfe auf Kreuzung
-            if ((prev_force < static_weight < curr_force) or 
-                (prev_force > static_weight > curr_force)):
-                
-                # Lineare Interpolation für genauen Zeitpunkt
-                fraction = (static_weight - prev_force) / (curr_force - prev_force)
-                crossing_time = time_array[i-1] + fraction * (time_array[i] - time_array[i-1])
-                
-                # Bestimme Richtung
-                direction = 'up' if curr_force > prev_force else 'down'
-                
-                crossings.append((crossing_time, direction))
-        
-        return crossings
+        Returns:
+            (up_times, down_times) - aufsteigend sortierte Kreuzungszeitpunkte
+        """
+        _, is_up, crossing_times = self._static_weight_crossings(
+            force_signal, time_array, static_weight
+        )
+        
+        return crossing_times[is_up], crossing_times[~is_up]
+    
+    @staticmethod
+    def _static_weight_crossings(force_signal: NDArray[np.float64],
+                                 time_array: NDArray[np.float64],
+                                 static_weight: float) -> Tuple[NDArray[np.int64], NDArray[np.bool_], NDArray[np.float64]]:
+        """
+        Vorzeichenwechsel von (F - Fst) mit linear interpolierten Zeitpunkten
+        
+        Returns:
+            (indices, is_up, crossing_times) - Index i bezeichnet die Kreuzung
+            zwischen Sample i und i+1
+        """
+        force_signal = np.asarray(force_signal, dtype=np.float64)
+        time_array = np.asarray(time_array, dtype=np.float64)
+        
+        prev_force = force_signal[:-1]
+        curr_force = force_signal[1:]
+        
+        up = (prev_force < static_weight) & (static_weight < curr_force)
+        down = (prev_force > static_weight) & (static_weight > curr_force)
+        indices = np.flatnonzero(up | down)
+        
+        # Lineare Interpolation für alle Kreuzungen gemeinsam
+        prev_at = prev_force[indices]
+        fraction = (static_weight - prev_at) / (curr_force[indices] - prev_at)
+        crossing_times = time_array[indices] + fraction * (time_array[indices + 1] - time_array[indices])
+        
+        return indices, up[indices], crossing_times
     
     def calculate_fref(self, 
                       force_signal: NDArray[np.float64],
@@ -183,22 +202,95 @@ class EGEASignalProcessor:
             Fref-Zeit oder None wenn nicht berechenbar
         """
         # Finde alle Kreuzungen im Zyklus
-        crossings = self.find_static_weight_crossings(force_signal, time_array, static_weight)
+        up_crossings, down_crossings = self.find_static_weight_crossing_times(
+            force_signal, time_array, static_weight
+        )
         
-        if len(crossings) < 2:
+        if len(up_crossings) + len(down_crossings) < 2:
             return None
         
-        # Separiere up und down crossings
-        down_crossings = [t for t, direction in crossings if direction == 'down']
-        up_crossings = [t for t, direction in crossings if direction == 'up']
-        
-        if not down_crossings or not up_crossings:
-            # Fallback: Verwende erste zwei Kreuzungen
-            return (crossings[0][0] + crossings[1][0]) / 2.0
+        if len(down_crossings) == 0 or len(up_crossings) == 0:
+            # Fallback: Verwende erste zwei Kreuzungen (alle in einer Richtung)
+            crossings = up_crossings if len(up_crossings) else down_crossings
+            return (crossings[0] + crossings[1]) / 2.0
         
         # Verwende erste down- und up-Kreuzung
         return (down_crossings[0] + up_crossings[0]) / 2.0
     
+    def calculate_fref_cycles(self, 
+                             force_signal: NDArray[np.float64],
+                             time_array: NDArray[np.float64],
+                             static_weight: float,
+                             cycle_bounds: NDArray[np.int64]) -> NDArray[np.float64]:
+        """
+        Berechnet Fref für alle Zyklen eines Signals in einem Aufruf (3.7)
+        
+        Zyklus i umfasst die Samples [cycle_bounds[i], cycle_bounds[i+1]) und
+        liefert dasselbe Ergebnis wie calculate_fref auf diesem Ausschnitt.
+        Kreuzungen über eine Zyklusgrenze hinweg zählen zu keinem Zyklus.
+        
+        Args:
+            force_signal: Kraftsignal
+            time_array: Zeitarray
+            static_weight: Statisches Gewicht
+            cycle_bounds: Aufsteigende Zyklusgrenzen (z.B. Plattform-TOPs)
+            
+        Returns:
+            Fref-Zeit pro Zyklus, NaN wenn nicht berechenbar
+        """
+        bounds = np.asarray(cycle_bounds, dtype=np.int64)
+        cycle_count = max(len(bounds) - 1, 0)
+        fref = np.full(cycle_count, np.nan)
+        
+        if cycle_count == 0:
+            return fref
+        
+        indices, is_up, crossing_times = self._static_weight_crossings(
+            force_signal, time_array, static_weight
+        )
+        
+        # Kreuzung zwischen Sample i und i+1 gehört zu Zyklus c, wenn beide darin liegen
+        cycles = np.searchsorted(bounds, indices, side='right') - 1
+        in_cycle = (cycles >= 0) & (cycles < cycle_count)
+        in_cycle &= indices + 1 < bounds[np.clip(cycles + 1, 0, cycle_count)]
+        
+        cycles = cycles[in_cycle]
+        is_up = is_up[in_cycle]
+        crossing_times = crossing_times[in_cycle]
+        
+        first_up = self._nth_crossing_per_cycle(cycles[is_up], crossing_times[is_up], cycle_count)
+        first_down = self._nth_crossing_per_cycle(cycles[~is_up], crossing_times[~is_up], cycle_count)
+        first_any = self._nth_crossing_per_cycle(cycles, crossing_times, cycle_count)
+        second_any = self._nth_crossing_per_cycle(cycles, crossing_times, cycle_count, n=1)
+        
+        # Erste down- und up-Kreuzung, sonst die ersten beiden Kreuzungen
+        both = ~np.isnan(first_up) & ~np.isnan(first_down)
+        fref[both] = (first_down[both] + first_up[both]) / 2.0
+        
+        fallback = ~both & ~np.isnan(second_any)
+        fref[fallback] = (first_any[fallback] + second_any[fallback]) / 2.0
+        
+        return fref
+    
+    @staticmethod
+    def _nth_crossing_per_cycle(cycle_ids: NDArray[np.int64],
+                                crossing_times: NDArray[np.float64],
+                                cycle_count: int,
+                                n: int = 0) -> NDArray[np.float64]:
+        """
+        Zeitpunkt der n-ten Kreuzung jedes Zyklus (NaN wenn nicht vorhanden)
+        
+        cycle_ids muss aufsteigend sortiert sein, was für zeitlich sortierte
+        Kreuzungen immer gilt.
+        """
+        result = np.full(cycle_count, np.nan)
+        present = np.flatnonzero(np.bincount(cycle_ids, minlength=cycle_count) > n)
+        
+        if len(present):
+            result[present] = crossing_times[np.searchsorted(cycle_ids, present) + n]
+        
+        return result
+    
     def validate_rfst_conditions(self, 
                                 force_signal: NDArray[np.float64],
                                 static_weight: float) -> bool:
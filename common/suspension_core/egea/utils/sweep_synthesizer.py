@@ -0,0 +1,211 @@
+"""
+Blockweise Signalsynthese für den EGEA-Frequenzsweep
+
+Gemeinsames Sweep- und Phasenmodell aller Simulatoren (EGEA-Simulator,
+Hybrid-, High-Level- und CAN-Simulator). Statt pro Sample mit math.sin auf
+Skalaren zu rechnen, werden ganze Blöcke von N Samples als NumPy-Arrays
+erzeugt: Plattformposition, Reifenkraft, Phasenverschiebung, Frequenz und
+4 DMS-Kanäle.
+
+Die Trägerphase ist das Integral der Momentanfrequenz (linearer Sweep,
+danach konstante Endfrequenz). Der frühere Ansatz sin(2π·f(t)·t) verzerrt die
+Frequenz: dessen Momentanfrequenz ist f(t) + t·f'(t), bei einem 25→6 Hz
+Sweep also deutlich unter der Sollfrequenz bis in negative Werte.
+Die Phase ist geschlossen berechnet, daher sind Blöcke unabhängig
+voneinander und beliebige Zeitpunkte (z.B. Wanduhrzeit) möglich.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+DMS_MAX = 1023
+
+
+@dataclass(frozen=True)
+class SweepModel:
+    """
+    Parameter des Sweep- und Dämpfungsmodells
+
+    Phasenverschiebung: min_phase + phase_boost · exp(-2·|f - f_res| / 10)
+    Kraftamplitude: force_amplitude · (1 + resonance_gain · exp(-|f - f_res| / 10))
+    """
+    freq_start: float = 25.0          # Hz
+    freq_end: float = 6.0             # Hz
+    duration: float = 30.0            # s (Sweepdauer, danach konstante Endfrequenz)
+    platform_amplitude: float = 3.0   # mm
+    static_force: float = 512.0       # Ruhewert der Kraft (AD-Mittelwert 0-1023)
+    force_amplitude: float = 100.0
+    resonance_freq: float = 11.8      # Hz
+    resonance_gain: float = 0.5
+    min_phase: float = 38.0           # Grad
+    phase_boost: float = 15.0         # Grad (0 = konstante Phasenverschiebung)
+    dms_platform_gains: tuple = (20.0, 18.0)   # DMS1/DMS2 pro mm Plattformweg
+    dms_force_gains: tuple = (1.0, 0.95)       # DMS3/DMS4 relativ zur Reifenkraft
+    dms_noise: float = 0.0            # Standardabweichung des DMS-Rauschens (AD-Counts)
+
+
+@dataclass
+class SweepBlock:
+    """Block synthetisierter Samples (alle Arrays gleicher Länge)"""
+    elapsed: NDArray[np.float64]            # s seit Teststart
+    frequency: NDArray[np.float64]          # Hz
+    platform_position: NDArray[np.float64]  # mm
+    tire_force: NDArray[np.float64]
+    phase_shift: NDArray[np.float64]        # Grad
+    dms: NDArray[np.uint16]                 # (N, 4), 0-1023
+
+    def __len__(self) -> int:
+        return len(self.elapsed)
+
+
+class SweepSynthesizer:
+    """
+    Erzeugt EGEA-Sweepsignale blockweise als NumPy-Arrays
+
+    Features:
+    - Phasenrichtige Integration über den Frequenzsweep (geschlossene Form)
+    - Zustandslose Blöcke für beliebige Zeitpunkte (samples)
+    - Fortlaufende Blöcke fester Abtastrate (next_block) und ganze Tests (generate)
+    """
+
+    def __init__(self, model: Optional[SweepModel] = None,
+                 sample_rate: float = 1000.0,
+                 seed: Optional[int] = None):
+        """
+        Initialisiert den Synthesizer
+
+        Args:
+            model: Sweep- und Dämpfungsmodell (None = Standardmodell)
+            sample_rate: Abtastrate für next_block/generate in Hz
+            seed: Seed für das DMS-Rauschen
+        """
+        self.model = model or SweepModel()
+        self.sample_rate = sample_rate
+        self._rng = np.random.default_rng(seed)
+        self._next_index = 0
+
+    def with_model(self, **changes) -> "SweepSynthesizer":
+        """Gibt einen Synthesizer mit geänderten Modellparametern zurück"""
+        return SweepSynthesizer(replace(self.model, **changes), self.sample_rate)
+
+    def reset(self) -> None:
+        """Setzt next_block auf den Teststart zurück"""
+        self._next_index = 0
+
+    def frequency(self, elapsed: Union[float, NDArray[np.float64]]) -> NDArray[np.float64]:
+        """Momentanfrequenz (linearer Sweep, danach Endfrequenz)"""
+        m = self.model
+        progress = np.clip(np.asarray(elapsed, dtype=np.float64) / m.duration, 0.0, 1.0)
+        return m.freq_start + progress * (m.freq_end - m.freq_start)
+
+    def carrier_phase(self, elapsed: Union[float, NDArray[np.float64]]) -> NDArray[np.float64]:
+        """
+        Trägerphase in rad: 2π · ∫ f(τ) dτ von 0 bis t
+
+        Args:
+            elapsed: Zeit(en) seit Teststart in s
+
+        Returns:
+            Phase in rad
+        """
+        m = self.model
+        t = np.asarray(elapsed, dtype=np.float64)
+        slope = (m.freq_end - m.freq_start) / m.duration
+        sweep_t = np.minimum(t, m.duration)
+        cycles = m.freq_start * sweep_t + 0.5 * slope * sweep_t * sweep_t
+        cycles = cycles + m.freq_end * np.maximum(t - m.duration, 0.0)
+        return 2.0 * np.pi * cycles
+
+    def phase_shift(self, frequency: Union[float, NDArray[np.float64]]) -> NDArray[np.float64]:
+        """Phasenverschiebung Kraft gegen Plattform in Grad"""
+        m = self.model
+        distance = np.abs(np.asarray(frequency, dtype=np.float64) - m.resonance_freq) / 10.0
+        return m.min_phase + m.phase_boost * np.exp(-2.0 * distance)
+
+    def samples(self, elapsed: Union[float, NDArray[np.float64]]) -> SweepBlock:
+        """
+        Synthetisiert Samples zu beliebigen Zeitpunkten
+
+        Args:
+            elapsed: Zeit(en) seit Teststart in s (Skalar oder Array)
+
+        Returns:
+            SweepBlock
+        """
+        m = self.model
+        t = np.atleast_1d(np.asarray(elapsed, dtype=np.float64))
+
+        frequency = self.frequency(t)
+        carrier = self.carrier_phase(t)
+        phase_shift = self.phase_shift(frequency)
+
+        platform = m.platform_amplitude * np.sin(carrier)
+        gain = 1.0 + m.resonance_gain * np.exp(-np.abs(frequency - m.resonance_freq) / 10.0)
+        force = m.static_force + m.force_amplitude * gain * np.sin(carrier - np.radians(phase_shift))
+
+        return SweepBlock(
+            elapsed=t,
+            frequency=frequency,
+            platform_position=platform,
+            tire_force=force,
+            phase_shift=phase_shift,
+            dms=self.dms_values(platform, force),
+        )
+
+    def dms_values(self, platform_position: NDArray[np.float64],
+                   tire_force: NDArray[np.float64]) -> NDArray[np.uint16]:
+        """
+        Bildet Plattformweg und Reifenkraft auf die 4 DMS-Kanäle ab
+
+        Args:
+            platform_position: Plattformweg in mm
+            tire_force: Reifenkraft (AD-Bereich)
+
+        Returns:
+            Array (N, 4) mit DMS-Werten 0-1023
+        """
+        m = self.model
+        dms = np.empty((len(platform_position), 4), dtype=np.float64)
+        dms[:, 0] = m.static_force + platform_position * m.dms_platform_gains[0]
+        dms[:, 1] = m.static_force + platform_position * m.dms_platform_gains[1]
+        dms[:, 2] = tire_force * m.dms_force_gains[0]
+        dms[:, 3] = tire_force * m.dms_force_gains[1]
+        if m.dms_noise > 0:
+            dms += self._rng.normal(0.0, m.dms_noise, dms.shape)
+        np.clip(dms, 0, DMS_MAX, out=dms)
+        return dms.astype(np.uint16)
+
+    def block(self, start: float, count: int) -> SweepBlock:
+        """
+        Synthetisiert count Samples ab start mit der eingestellten Abtastrate
+
+        Args:
+            start: Startzeit seit Teststart in s
+            count: Anzahl Samples
+
+        Returns:
+            SweepBlock
+        """
+        return self.samples(start + np.arange(count) / self.sample_rate)
+
+    def next_block(self, count: int) -> SweepBlock:
+        """Synthetisiert die nächsten count Samples eines fortlaufenden Tests"""
+        block = self.samples((self._next_index + np.arange(count)) / self.sample_rate)
+        self._next_index += count
+        return block
+
+    def generate(self, duration: Optional[float] = None) -> SweepBlock:
+        """
+        Synthetisiert einen kompletten Test
+
+        Args:
+            duration: Testdauer in s (None = Sweepdauer des Modells)
+
+        Returns:
+            SweepBlock mit duration · sample_rate Samples
+        """
+        duration = self.model.duration if duration is None else duration
+        return self.block(0.0, int(round(duration * self.sample_rate)))
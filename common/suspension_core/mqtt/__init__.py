@@ -1,6 +1,11 @@
 # Import the MqttHandler and new service components
 from .handler import MqttHandler
 from .service import MqttServiceBase, MqttTopics, SimpleMqttService
+from .binary_format import SampleBatch, SampleBatchWriter, encode_sample_batch, decode_sample_batch
+from .topic_router import TopicRouter
+from .ingest_queue import MessageIngestQueue
+from .chunked_transfer import ChunkedDatasetSender, ChunkedDatasetReceiver, ReceivedDataset
+from .local_broker import LocalBroker
 
 # Create an instance of the MqttHandler for backward compatibility
 _handler = MqttHandler()
@@ -11,6 +16,16 @@ __all__ = [
     "MqttServiceBase", 
     "MqttTopics",
     "SimpleMqttService",
+    "SampleBatch",
+    "SampleBatchWriter",
+    "encode_sample_batch",
+    "decode_sample_batch",
+    "TopicRouter",
+    "MessageIngestQueue",
+    "ChunkedDatasetSender",
+    "ChunkedDatasetReceiver",
+    "ReceivedDataset",
+    "LocalBroker",
     # Legacy functions for backward compatibility
     "add_callback",
     "remove_callback",
@@ -0,0 +1,316 @@
+"""
+Binäres, gebündeltes Wire-Format für hochfrequente Mess-Topics.
+
+Statt eines JSON-Objekts pro Sample werden N Samples in einem Frame mit
+festem Little-Endian-Layout übertragen:
+
+    Header  <4sBBHIffI>  magic, version, reserved, field_mask, sequence,
+                         sample_rate, static_weight, sample_count
+    test_id              u8 Länge + UTF-8
+    position             u8 Länge + UTF-8
+    Spalten              je vorhandenem Feld sample_count Werte (spaltenweise)
+
+Die Aushandlung erfolgt über das Topic-Suffix "/bin" und zusätzlich über die
+Magic-Bytes am Frame-Anfang. Legacy-JSON-Konsumenten bleiben unberührt; wer
+Batches nicht direkt verarbeiten kann, erhält sie als einzelne Sample-Dicts.
+"""
+
+import logging
+import math
+import struct
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SFB1"
+VERSION = 1
+BINARY_TOPIC_SUFFIX = "/bin"
+
+_HEADER = struct.Struct("<4sBBHIffI")
+
+# Feste Feldreihenfolge: (Name im Sample-Dict, dtype, Breite)
+FIELDS = (
+    ("elapsed", "<f8", 1),
+    ("platform_position", "<f4", 1),
+    ("tire_force", "<f4", 1),
+    ("frequency", "<f4", 1),
+    ("phase_shift", "<f4", 1),
+    ("dms_values", "<f4", 4),
+)
+FIELD_NAMES = tuple(name for name, _, _ in FIELDS)
+
+# Topics, für die das Binärformat angeboten wird
+BINARY_CAPABLE_TOPICS = (
+    "suspension/measurements/processed",
+    "suspension/measurements/raw",
+    "suspension/raw_data/complete",
+    "suspension/can/raw",
+    "suspension/sensors/raw",
+    "suspension/hardware/raw",
+)
+
+
+class BinaryFrameError(ValueError):
+    """Fehler beim Dekodieren eines Binär-Frames"""
+    pass
+
+
+@dataclass
+class SampleBatch:
+    """
+    Dekodierter Binär-Frame mit N Samples eines Tests
+
+    Die Spalten sind Views auf den Frame-Puffer (keine Kopie).
+    """
+
+    test_id: str
+    position: str
+    sequence: int
+    sample_rate: float
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)
+    static_weight: Optional[float] = None
+
+    def __len__(self) -> int:
+        for values in self.columns.values():
+            return len(values)
+        return 0
+
+    def to_samples(self) -> List[Dict[str, Any]]:
+        """
+        Expandiert den Batch in Sample-Dicts im Legacy-JSON-Format
+
+        Returns:
+            Liste von Dicts mit test_id, position, elapsed, tire_force, ...
+        """
+        base = {"test_id": self.test_id, "position": self.position}
+        if self.static_weight is not None:
+            base["static_weight"] = self.static_weight
+
+        columns = {name: values.tolist() for name, values in self.columns.items()}
+        samples = []
+        for i in range(len(self)):
+            sample = dict(base)
+            for name, values in columns.items():
+                sample[name] = values[i]
+            samples.append(sample)
+        return samples
+
+
+def binary_topic(topic: str) -> str:
+    """Liefert das Binär-Topic zu einem Basis-Topic"""
+    return topic if is_binary_topic(topic) else topic + BINARY_TOPIC_SUFFIX
+
+
+def base_topic(topic: str) -> str:
+    """Liefert das Basis-Topic zu einem Binär-Topic"""
+    return topic[:-len(BINARY_TOPIC_SUFFIX)] if is_binary_topic(topic) else topic
+
+
+def is_binary_topic(topic: str) -> bool:
+    """Prüft, ob ein Topic das Binär-Suffix trägt"""
+    return topic.endswith(BINARY_TOPIC_SUFFIX)
+
+
+def is_binary_capable(topic: str) -> bool:
+    """Prüft, ob für ein Topic Binär-Frames angeboten werden"""
+    return base_topic(topic) in BINARY_CAPABLE_TOPICS
+
+
+def is_binary_frame(payload: Any) -> bool:
+    """Prüft die Magic-Bytes eines Payloads"""
+    return isinstance(payload, (bytes, bytearray, memoryview)) and bytes(payload[:4]) == MAGIC
+
+
+def encode_sample_batch(test_id: str,
+                        position: str,
+                        columns: Dict[str, Sequence[float]],
+                        sequence: int = 0,
+                        sample_rate: float = 0.0,
+                        static_weight: Optional[float] = None) -> bytes:
+    """
+    Kodiert Samples spaltenweise in einen Binär-Frame
+
+    Args:
+        test_id: Test-ID
+        position: Radposition
+        columns: Spalten nach Feldnamen (siehe FIELDS); "elapsed" ist Pflicht
+        sequence: Laufende Frame-Nummer des Publishers
+        sample_rate: Abtastrate in Hz
+        static_weight: Statisches Gewicht (optional)
+
+    Returns:
+        Frame als bytes
+    """
+    if "elapsed" not in columns:
+        raise ValueError("Binary sample batch requires an 'elapsed' column")
+
+    count = len(columns["elapsed"])
+    field_mask = 0
+    parts = []
+
+    for bit, (name, dtype, width) in enumerate(FIELDS):
+        if name not in columns:
+            continue
+
+        values = np.asarray(columns[name], dtype=dtype)
+        expected = (count, width) if width > 1 else (count,)
+        if values.shape != expected:
+            raise ValueError(f"Column '{name}' has shape {values.shape}, expected {expected}")
+
+        field_mask |= 1 << bit
+        parts.append(values.tobytes())
+
+    test_id_bytes = test_id.encode("utf-8")[:255]
+    position_bytes = position.encode("utf-8")[:255]
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, 0, field_mask, sequence & 0xFFFFFFFF, sample_rate,
+        static_weight if static_weight is not None else math.nan, count
+    )
+
+    return b"".join([
+        header,
+        bytes([len(test_id_bytes)]), test_id_bytes,
+        bytes([len(position_bytes)]), position_bytes,
+        *parts,
+    ])
+
+
+def decode_sample_batch(payload: bytes) -> SampleBatch:
+    """
+    Dekodiert einen Binär-Frame
+
+    Args:
+        payload: Frame-Bytes
+
+    Returns:
+        SampleBatch mit Spalten-Views auf den Frame
+
+    Raises:
+        BinaryFrameError: Bei falscher Magic, Version oder Länge
+    """
+    try:
+        magic, version, _, field_mask, sequence, sample_rate, static_weight, count = \
+            _HEADER.unpack_from(payload, 0)
+    except struct.error as e:
+        raise BinaryFrameError(f"Truncated frame header: {e}") from e
+
+    if magic != MAGIC:
+        raise BinaryFrameError("Invalid frame magic")
+    if version != VERSION:
+        raise BinaryFrameError(f"Unsupported frame version: {version}")
+
+    offset = _HEADER.size
+    strings = []
+    for _ in range(2):
+        if offset >= len(payload):
+            raise BinaryFrameError("Truncated frame identifiers")
+        length = payload[offset]
+        strings.append(bytes(payload[offset + 1:offset + 1 + length]).decode("utf-8"))
+        offset += 1 + length
+
+    columns = {}
+    for bit, (name, dtype, width) in enumerate(FIELDS):
+        if not field_mask & (1 << bit):
+            continue
+
+        size = count * width * np.dtype(dtype).itemsize
+        if offset + size > len(payload):
+            raise BinaryFrameError(f"Truncated column '{name}'")
+
+        values = np.frombuffer(payload, dtype=dtype, count=count * width, offset=offset) \
+            if count > 0 else np.empty(0, dtype=dtype)
+        columns[name] = values.reshape(count, width) if width > 1 else values
+        offset += size
+
+    if offset != len(payload):
+        raise BinaryFrameError(f"Frame length mismatch: expected {offset} bytes, got {len(payload)}")
+
+    return SampleBatch(
+        test_id=strings[0],
+        position=strings[1],
+        sequence=sequence,
+        sample_rate=sample_rate,
+        columns=columns,
+        static_weight=None if math.isnan(static_weight) else static_weight,
+    )
+
+
+class SampleBatchWriter:
+    """
+    Sammelt einzelne Samples und publiziert sie als Binär-Frames
+
+    Für Publisher, die bisher ein JSON-Objekt pro Sample senden: add() nimmt
+    dasselbe Sample-Dict entgegen, nach batch_size Samples wird ein Frame über
+    publish_fn(topic, frame_bytes) verschickt.
+    """
+
+    def __init__(self,
+                 publish_fn: Callable[[str, bytes], Any],
+                 topic: str,
+                 test_id: str,
+                 position: str,
+                 sample_rate: float = 0.0,
+                 batch_size: int = 50,
+                 static_weight: Optional[float] = None):
+        """
+        Initialisiert den Writer
+
+        Args:
+            publish_fn: Publish-Funktion (topic, payload)
+            topic: Basis-Topic (das Suffix "/bin" wird ergänzt)
+            test_id: Test-ID
+            position: Radposition
+            sample_rate: Abtastrate in Hz
+            batch_size: Samples pro Frame
+            static_weight: Statisches Gewicht (optional)
+        """
+        self.publish_fn = publish_fn
+        self.topic = binary_topic(topic)
+        self.test_id = test_id
+        self.position = position
+        self.sample_rate = sample_rate
+        self.batch_size = max(1, batch_size)
+        self.static_weight = static_weight
+
+        self.sequence = 0
+        self._pending: Dict[str, list] = {name: [] for name in FIELD_NAMES}
+        self._count = 0
+
+    def add(self, sample: Dict[str, Any]) -> None:
+        """Fügt ein Sample hinzu und publiziert bei vollem Batch"""
+        for name in FIELD_NAMES:
+            if name == "dms_values":
+                values = sample.get(name)
+                self._pending[name].append(
+                    list(values[:4]) + [math.nan] * (4 - len(values[:4])) if values else [math.nan] * 4
+                )
+            else:
+                self._pending[name].append(sample.get(name, 0.0))
+
+        if self.static_weight is None and "static_weight" in sample:
+            self.static_weight = sample["static_weight"]
+
+        self._count += 1
+        if self._count >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Publiziert alle gesammelten Samples"""
+        if self._count == 0:
+            return
+
+        frame = encode_sample_batch(
+            self.test_id, self.position, self._pending,
+            sequence=self.sequence, sample_rate=self.sample_rate,
+            static_weight=self.static_weight,
+        )
+
+        self._pending = {name: [] for name in FIELD_NAMES}
+        self._count = 0
+        self.sequence += 1
+
+        self.publish_fn(self.topic, frame)
@@ -0,0 +1,668 @@
+"""
+Chunk-Übertragung kompletter Test-Datasets über MQTT.
+
+Statt eines einzelnen, mehrere Megabyte großen JSON-Objekts auf
+"suspension/raw_data/complete" wird ein Dataset in drei Phasen übertragen:
+
+    manifest   JSON: transfer_id, Spalten (Name, dtype), Anzahl Samples,
+               Chunk-Größe und -Anzahl, Metadaten des Datasets
+    chunk      Binär-Frame pro Block von chunk_size Samples:
+               Header  <4sBBHIIII>  magic, version, reserved, id_length,
+                                    sequence, sample_offset, sample_count, crc32
+               transfer_id          UTF-8
+               Spalten              spaltenweise in Manifest-Reihenfolge
+    commit     JSON: transfer_id, chunk_count (alle Chunks gesendet)
+
+Der Empfänger schreibt die Chunks in vorab allokierte Arrays, prüft die
+CRC32 und fordert fehlende oder beschädigte Chunks über "retransmit" erneut
+an. Nach vollständigem Empfang bestätigt er mit "ack"; erst dann gibt der
+Sender das Dataset frei.
+"""
+
+import asyncio
+import logging
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..clock import Clock, get_clock
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SFC1"
+VERSION = 1
+
+MANIFEST_TOPIC = "suspension/raw_data/complete/manifest"
+CHUNK_TOPIC = "suspension/raw_data/complete/chunk"
+COMMIT_TOPIC = "suspension/raw_data/complete/commit"
+RETRANSMIT_TOPIC = "suspension/raw_data/complete/retransmit"
+ACK_TOPIC = "suspension/raw_data/complete/ack"
+
+STATUS_COMPLETE = "complete"
+STATUS_FAILED = "failed"
+
+_HEADER = struct.Struct("<4sBBHIIII")
+
+
+class ChunkFrameError(ValueError):
+    """Fehler beim Dekodieren eines Chunk-Frames"""
+    pass
+
+
+def is_chunk_frame(payload: Any) -> bool:
+    """Prüft die Magic-Bytes eines Payloads"""
+    return isinstance(payload, (bytes, bytearray, memoryview)) and bytes(payload[:4]) == MAGIC
+
+
+def encode_chunk(transfer_id: str,
+                 sequence: int,
+                 sample_offset: int,
+                 columns: Sequence[np.ndarray]) -> bytes:
+    """
+    Kodiert einen Chunk
+
+    Args:
+        transfer_id: ID der Übertragung
+        sequence: Chunk-Nummer
+        sample_offset: Index des ersten Samples im Dataset
+        columns: Spalten-Ausschnitte in Manifest-Reihenfolge (gleiche Länge)
+
+    Returns:
+        Frame als bytes
+    """
+    count = len(columns[0]) if columns else 0
+    body = b"".join(np.ascontiguousarray(values).tobytes() for values in columns)
+    transfer_id_bytes = transfer_id.encode("utf-8")
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, 0, len(transfer_id_bytes), sequence, sample_offset, count,
+        zlib.crc32(body)
+    )
+    return b"".join([header, transfer_id_bytes, body])
+
+
+def decode_chunk_header(payload: bytes) -> Tuple[str, int, int, int, memoryview]:
+    """
+    Dekodiert Header und prüft die CRC eines Chunks
+
+    Args:
+        payload: Frame-Bytes
+
+    Returns:
+        (transfer_id, sequence, sample_offset, sample_count, body)
+
+    Raises:
+        ChunkFrameError: Bei falscher Magic, Version, Länge oder CRC
+    """
+    try:
+        magic, version, _, id_length, sequence, sample_offset, count, crc = \
+            _HEADER.unpack_from(payload, 0)
+    except struct.error as e:
+        raise ChunkFrameError(f"Truncated chunk header: {e}") from e
+
+    if magic != MAGIC:
+        raise ChunkFrameError("Invalid chunk magic")
+    if version != VERSION:
+        raise ChunkFrameError(f"Unsupported chunk version: {version}")
+
+    offset = _HEADER.size + id_length
+    if offset > len(payload):
+        raise ChunkFrameError("Truncated chunk transfer id")
+
+    view = memoryview(payload)
+    transfer_id = bytes(view[_HEADER.size:offset]).decode("utf-8")
+    body = view[offset:]
+    if zlib.crc32(body) != crc:
+        raise ChunkFrameError(f"CRC mismatch in chunk {sequence} of transfer '{transfer_id}'")
+
+    return transfer_id, sequence, sample_offset, count, body
+
+
+@dataclass
+class OutgoingTransfer:
+    """Zum Senden vorbereitetes Dataset (bleibt bis zum Ack erhalten)"""
+
+    transfer_id: str
+    columns: Dict[str, np.ndarray]
+    metadata: Dict[str, Any]
+    chunk_size: int
+    created: float = field(default_factory=time.monotonic)
+    retransmitted: int = 0
+
+    @property
+    def total_samples(self) -> int:
+        for values in self.columns.values():
+            return len(values)
+        return 0
+
+    @property
+    def chunk_count(self) -> int:
+        return -(-self.total_samples // self.chunk_size)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(values.nbytes for values in self.columns.values())
+
+    def manifest(self) -> Dict[str, Any]:
+        """Manifest-Nachricht"""
+        return {
+            "transfer_id": self.transfer_id,
+            "columns": [[name, values.dtype.str] for name, values in self.columns.items()],
+            "total_samples": self.total_samples,
+            "total_bytes": self.nbytes,
+            "chunk_size": self.chunk_size,
+            "chunk_count": self.chunk_count,
+            "metadata": self.metadata,
+        }
+
+    def chunk(self, sequence: int) -> bytes:
+        """Kodiert den Chunk mit der Nummer sequence"""
+        start = sequence * self.chunk_size
+        stop = min(start + self.chunk_size, self.total_samples)
+        return encode_chunk(
+            self.transfer_id, sequence, start,
+            [values[start:stop] for values in self.columns.values()]
+        )
+
+    def commit(self) -> Dict[str, Any]:
+        """Commit-Nachricht"""
+        return {"transfer_id": self.transfer_id, "chunk_count": self.chunk_count}
+
+
+class ChunkedDatasetSender:
+    """
+    Sendet Datasets als Manifest, Chunks und Commit
+
+    Gesendete Datasets bleiben bis zum Ack des Empfängers (maximal
+    max_retained Stück) für Wiederholungen erhalten. handle_retransmit und
+    handle_ack können aus dem MQTT-Thread aufgerufen werden.
+    """
+
+    def __init__(self,
+                 publish_fn: Callable[[str, Any], Any],
+                 chunk_size: int = 1000,
+                 max_retained: int = 4):
+        """
+        Initialisiert den Sender
+
+        Args:
+            publish_fn: Publish-Funktion (topic, payload)
+            chunk_size: Samples pro Chunk
+            max_retained: Maximale Anzahl unbestätigter Datasets
+        """
+        self.publish_fn = publish_fn
+        self.chunk_size = max(1, int(chunk_size))
+        self.max_retained = max(1, int(max_retained))
+
+        self._transfers: "OrderedDict[str, OutgoingTransfer]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistiken
+        self.transfers_sent = 0
+        self.transfers_acknowledged = 0
+        self.transfers_failed = 0
+        self.chunks_sent = 0
+        self.chunks_retransmitted = 0
+        self.bytes_sent = 0
+        self.last_send_ms = 0.0
+        self.last_throughput_kbps = 0.0
+
+    def prepare(self, transfer_id: str, columns: Dict[str, Sequence], metadata: Dict[str, Any]) -> OutgoingTransfer:
+        """
+        Bereitet ein Dataset vor und hält es für Wiederholungen vor
+
+        Args:
+            transfer_id: Eindeutige ID (z.B. Test-ID)
+            columns: Spalten gleicher Länge (Listen oder Arrays)
+            metadata: Metadaten des Datasets (JSON-serialisierbar)
+
+        Returns:
+            OutgoingTransfer
+        """
+        arrays = {}
+        for name, values in columns.items():
+            array = np.asarray(values)
+            arrays[name] = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+
+        lengths = {len(values) for values in arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns of transfer '{transfer_id}' have different lengths: {sorted(lengths)}")
+
+        transfer = OutgoingTransfer(transfer_id, arrays, metadata, self.chunk_size)
+
+        with self._lock:
+            self._transfers[transfer_id] = transfer
+            while len(self._transfers) > self.max_retained:
+                dropped, _ = self._transfers.popitem(last=False)
+                logger.warning(f"Unbestätigte Übertragung verworfen: {dropped}")
+
+        return transfer
+
+    def messages(self, transfer: OutgoingTransfer) -> Iterator[Tuple[str, Any]]:
+        """Liefert (topic, payload) für Manifest, alle Chunks und Commit"""
+        yield MANIFEST_TOPIC, transfer.manifest()
+        for sequence in range(transfer.chunk_count):
+            yield CHUNK_TOPIC, transfer.chunk(sequence)
+        yield COMMIT_TOPIC, transfer.commit()
+
+    def send(self, transfer_id: str, columns: Dict[str, Sequence], metadata: Dict[str, Any]) -> OutgoingTransfer:
+        """
+        Sendet ein Dataset vollständig (blockierend)
+
+        Returns:
+            OutgoingTransfer
+        """
+        transfer = self.prepare(transfer_id, columns, metadata)
+        start = time.perf_counter()
+        for topic, payload in self.messages(transfer):
+            self._publish(topic, payload)
+        self._record_send(transfer, time.perf_counter() - start)
+        return transfer
+
+    async def send_async(self, transfer_id: str, columns: Dict[str, Sequence],
+                         metadata: Dict[str, Any]) -> OutgoingTransfer:
+        """
+        Sendet ein Dataset und gibt den Event-Loop nach jedem Chunk frei
+
+        Returns:
+            OutgoingTransfer
+        """
+        transfer = self.prepare(transfer_id, columns, metadata)
+        start = time.perf_counter()
+        for topic, payload in self.messages(transfer):
+            self._publish(topic, payload)
+            await asyncio.sleep(0)
+        self._record_send(transfer, time.perf_counter() - start)
+        return transfer
+
+    def handle_retransmit(self, request: Dict[str, Any]) -> int:
+        """
+        Sendet angeforderte Chunks erneut
+
+        Args:
+            request: {"transfer_id", "missing": [sequence, ...]}; ohne
+                     "missing" (z.B. Manifest verloren) wird alles wiederholt
+
+        Returns:
+            Anzahl wiederholter Chunks
+        """
+        transfer_id = request.get("transfer_id")
+        with self._lock:
+            transfer = self._transfers.get(transfer_id)
+
+        if transfer is None:
+            logger.warning(f"Wiederholung für unbekannte Übertragung angefordert: {transfer_id}")
+            return 0
+
+        missing = request.get("missing")
+        if missing is None:
+            self._publish(MANIFEST_TOPIC, transfer.manifest())
+            missing = range(transfer.chunk_count)
+
+        count = 0
+        for sequence in missing:
+            if 0 <= sequence < transfer.chunk_count:
+                self._publish(CHUNK_TOPIC, transfer.chunk(sequence))
+                count += 1
+        self._publish(COMMIT_TOPIC, transfer.commit())
+
+        transfer.retransmitted += count
+        self.chunks_retransmitted += count
+        logger.info(f"Übertragung {transfer_id}: {count} Chunks wiederholt")
+        return count
+
+    def handle_ack(self, ack: Dict[str, Any]):
+        """
+        Gibt ein bestätigtes (oder endgültig fehlgeschlagenes) Dataset frei
+
+        Args:
+            ack: {"transfer_id", "status", "stats"}
+        """
+        with self._lock:
+            transfer = self._transfers.pop(ack.get("transfer_id"), None)
+
+        if transfer is None:
+            return
+
+        if ack.get("status") == STATUS_COMPLETE:
+            self.transfers_acknowledged += 1
+        else:
+            self.transfers_failed += 1
+            logger.error(f"Übertragung {transfer.transfer_id} vom Empfänger verworfen: {ack.get('reason')}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Sende-Statistiken zurück"""
+        return {
+            "chunk_size": self.chunk_size,
+            "pending_transfers": len(self._transfers),
+            "transfers_sent": self.transfers_sent,
+            "transfers_acknowledged": self.transfers_acknowledged,
+            "transfers_failed": self.transfers_failed,
+            "chunks_sent": self.chunks_sent,
+            "chunks_retransmitted": self.chunks_retransmitted,
+            "bytes_sent": self.bytes_sent,
+            "last_send_ms": self.last_send_ms,
+            "last_throughput_kbps": self.last_throughput_kbps,
+        }
+
+    def _publish(self, topic: str, payload: Any):
+        self.publish_fn(topic, payload)
+        if topic == CHUNK_TOPIC:
+            self.chunks_sent += 1
+            self.bytes_sent += len(payload)
+
+    def _record_send(self, transfer: OutgoingTransfer, elapsed: float):
+        self.transfers_sent += 1
+        self.last_send_ms = elapsed * 1000
+        self.last_throughput_kbps = transfer.nbytes / 1024 / elapsed if elapsed > 0 else 0.0
+
+
+@dataclass
+class ReceivedDataset:
+    """Vollständig empfangenes Dataset"""
+
+    transfer_id: str
+    columns: Dict[str, np.ndarray]
+    metadata: Dict[str, Any]
+    stats: Dict[str, Any]
+
+    def __len__(self) -> int:
+        for values in self.columns.values():
+            return len(values)
+        return 0
+
+
+class _IncomingTransfer:
+    """Empfangszustand einer Übertragung"""
+
+    def __init__(self, manifest: Dict[str, Any], now: Callable[[], float] = time.monotonic):
+        self._now = now  # Zeitquelle für Retransmit-Timeouts (Simulationszeit)
+        self.transfer_id = manifest["transfer_id"]
+        self.metadata = manifest.get("metadata") or {}
+        self.total_samples = int(manifest["total_samples"])
+        self.chunk_size = int(manifest["chunk_size"])
+        self.chunk_count = int(manifest["chunk_count"])
+
+        # Zielspeicher vorab allokieren
+        self.columns = {
+            name: np.empty(self.total_samples, dtype=np.dtype(dtype))
+            for name, dtype in manifest["columns"]
+        }
+        self.received = np.zeros(self.chunk_count, dtype=bool)
+        self.received_count = 0
+
+        self.committed = False
+        self.started = time.monotonic()
+        self.last_activity = now()
+        self.last_chunk = self.started
+        self.bytes = 0
+        self.duplicates = 0
+        self.crc_errors = 0
+        self.retransmit_requests = 0
+
+    @property
+    def complete(self) -> bool:
+        return self.received_count == self.chunk_count
+
+    def missing(self) -> List[int]:
+        return np.flatnonzero(~self.received).tolist()
+
+    def store(self, sequence: int, sample_offset: int, count: int, body: memoryview):
+        """Kopiert die Spalten eines Chunks an ihre Position"""
+        if sequence >= self.chunk_count or sample_offset + count > self.total_samples:
+            raise ChunkFrameError(f"Chunk {sequence} outside of transfer '{self.transfer_id}'")
+
+        expected = sum(count * values.itemsize for values in self.columns.values())
+        if len(body) != expected:
+            raise ChunkFrameError(f"Chunk {sequence} has {len(body)} bytes, expected {expected}")
+
+        offset = 0
+        for values in self.columns.values():
+            values[sample_offset:sample_offset + count] = np.frombuffer(
+                body, dtype=values.dtype, count=count, offset=offset
+            )
+            offset += count * values.itemsize
+
+        self.received[sequence] = True
+        self.received_count += 1
+        self.bytes += len(body)
+        self.last_chunk = time.monotonic()
+        self.last_activity = self._now()
+
+
+class ChunkedDatasetReceiver:
+    """
+    Setzt übertragene Datasets wieder zusammen
+
+    Fehlende Chunks werden nach dem Commit bzw. nach retransmit_timeout
+    ohne Fortschritt erneut angefordert; nach max_retransmits erfolglosen
+    Anforderungen gilt die Übertragung als fehlgeschlagen.
+    """
+
+    def __init__(self,
+                 publish_fn: Callable[[str, Any], Any],
+                 retransmit_timeout: float = 2.0,
+                 max_retransmits: int = 3,
+                 clock: Optional[Clock] = None):
+        """
+        Initialisiert den Empfänger
+
+        Args:
+            publish_fn: Publish-Funktion (topic, payload) für Retransmit und Ack
+            retransmit_timeout: Sekunden ohne Fortschritt bis zur erneuten Anforderung
+            max_retransmits: Maximale Anforderungen pro Übertragung
+            clock: Zeitquelle der Timeouts (Standard: prozessweite Uhr)
+        """
+        self.publish_fn = publish_fn
+        self.clock = clock or get_clock()
+        self.retransmit_timeout = retransmit_timeout
+        self.max_retransmits = max_retransmits
+
+        self._transfers: Dict[str, _IncomingTransfer] = {}
+        # Zuletzt abgeschlossene Übertragungen (verspätete Commits ignorieren)
+        self._finished: Deque[str] = deque(maxlen=32)
+
+        # Statistiken
+        self.transfers_completed = 0
+        self.transfers_failed = 0
+        self.chunks_received = 0
+        self.duplicates = 0
+        self.crc_errors = 0
+        self.retransmit_requests = 0
+        self.last_reassembly_ms = 0.0
+        self.last_throughput_kbps = 0.0
+        self._reassembly_total_ms = 0.0
+
+    def on_manifest(self, manifest: Dict[str, Any]):
+        """
+        Beginnt eine Übertragung und allokiert den Zielspeicher
+
+        Args:
+            manifest: Manifest-Nachricht
+        """
+        transfer = _IncomingTransfer(manifest, self.clock.monotonic)
+        if transfer.transfer_id in self._transfers:
+            logger.info(f"Übertragung {transfer.transfer_id} neu begonnen")
+        self._transfers[transfer.transfer_id] = transfer
+
+        logger.info(
+            f"Übertragung {transfer.transfer_id}: {transfer.total_samples} Samples "
+            f"in {transfer.chunk_count} Chunks angekündigt"
+        )
+
+    def on_chunk(self, payload: bytes) -> Optional[ReceivedDataset]:
+        """
+        Übernimmt einen Chunk
+
+        Args:
+            payload: Chunk-Frame
+
+        Returns:
+            ReceivedDataset, wenn die Übertragung damit vollständig ist
+        """
+        try:
+            transfer_id, sequence, sample_offset, count, body = decode_chunk_header(payload)
+        except ChunkFrameError as e:
+            # Beschädigter Chunk fehlt weiterhin und wird nachgefordert
+            self.crc_errors += 1
+            logger.warning(f"Chunk verworfen: {e}")
+            return None
+
+        transfer = self._transfers.get(transfer_id)
+        if transfer is None:
+            logger.debug(f"Chunk für unbekannte Übertragung ignoriert: {transfer_id}")
+            return None
+
+        if sequence < transfer.chunk_count and transfer.received[sequence]:
+            transfer.duplicates += 1
+            self.duplicates += 1
+            return None
+
+        try:
+            transfer.store(sequence, sample_offset, count, body)
+        except ChunkFrameError as e:
+            transfer.crc_errors += 1
+            self.crc_errors += 1
+            logger.warning(f"Chunk verworfen: {e}")
+            return None
+
+        self.chunks_received += 1
+
+        if transfer.committed and transfer.complete:
+            return self._finish(transfer)
+        return None
+
+    def on_commit(self, commit: Dict[str, Any]) -> Optional[ReceivedDataset]:
+        """
+        Schließt eine Übertragung ab oder fordert fehlende Chunks an
+
+        Args:
+            commit: Commit-Nachricht
+
+        Returns:
+            ReceivedDataset, wenn alle Chunks vorliegen
+        """
+        transfer_id = commit.get("transfer_id")
+        transfer = self._transfers.get(transfer_id)
+
+        if transfer is None:
+            if transfer_id in self._finished:
+                return None
+
+            # Manifest verloren: komplette Übertragung anfordern
+            logger.warning(f"Commit ohne Manifest für Übertragung {transfer_id}")
+            self._request(transfer_id, None)
+            return None
+
+        transfer.committed = True
+        transfer.last_activity = self.clock.monotonic()
+
+        if transfer.complete:
+            return self._finish(transfer)
+
+        self._request_missing(transfer)
+        return None
+
+    def check_timeouts(self) -> List[str]:
+        """
+        Fordert Chunks für stockende Übertragungen erneut an
+
+        Returns:
+            IDs der dabei endgültig fehlgeschlagenen Übertragungen
+        """
+        now = self.clock.monotonic()
+        failed = []
+
+        for transfer in list(self._transfers.values()):
+            if now - transfer.last_activity < self.retransmit_timeout:
+                continue
+            if not self._request_missing(transfer):
+                failed.append(transfer.transfer_id)
+
+        return failed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Empfangs-Statistiken zurück"""
+        return {
+            "active_transfers": len(self._transfers),
+            "transfers_completed": self.transfers_completed,
+            "transfers_failed": self.transfers_failed,
+            "chunks_received": self.chunks_received,
+            "duplicates": self.duplicates,
+            "crc_errors": self.crc_errors,
+            "retransmit_requests": self.retransmit_requests,
+            "last_reassembly_ms": self.last_reassembly_ms,
+            "avg_reassembly_ms": self._reassembly_total_ms / self.transfers_completed
+            if self.transfers_completed else 0.0,
+            "last_throughput_kbps": self.last_throughput_kbps,
+        }
+
+    def _request_missing(self, transfer: _IncomingTransfer) -> bool:
+        """Fordert fehlende Chunks an; False wenn die Übertragung aufgegeben wurde"""
+        if transfer.retransmit_requests >= self.max_retransmits:
+            self._fail(transfer, f"{len(transfer.missing())} chunks missing after "
+                                 f"{transfer.retransmit_requests} retransmit requests")
+            return False
+
+        transfer.retransmit_requests += 1
+        transfer.last_activity = self.clock.monotonic()
+        self._request(transfer.transfer_id, transfer.missing())
+        return True
+
+    def _request(self, transfer_id: str, missing: Optional[List[int]]):
+        self.retransmit_requests += 1
+        self.publish_fn(RETRANSMIT_TOPIC, {"transfer_id": transfer_id, "missing": missing})
+        logger.info(
+            f"Übertragung {transfer_id}: "
+            f"{'alle' if missing is None else len(missing)} Chunks erneut angefordert"
+        )
+
+    def _finish(self, transfer: _IncomingTransfer) -> ReceivedDataset:
+        del self._transfers[transfer.transfer_id]
+        self._finished.append(transfer.transfer_id)
+
+        now = time.monotonic()
+        reassembly_ms = (now - transfer.started) * 1000
+        transfer_time = transfer.last_chunk - transfer.started
+        throughput_kbps = transfer.bytes / 1024 / transfer_time if transfer_time > 0 else 0.0
+
+        stats = {
+            "samples": transfer.total_samples,
+            "chunks": transfer.chunk_count,
+            "bytes": transfer.bytes,
+            "duplicates": transfer.duplicates,
+            "crc_errors": transfer.crc_errors,
+            "retransmit_requests": transfer.retransmit_requests,
+            "reassembly_ms": reassembly_ms,
+            "throughput_kbps": throughput_kbps,
+        }
+
+        self.transfers_completed += 1
+        self.last_reassembly_ms = reassembly_ms
+        self.last_throughput_kbps = throughput_kbps
+        self._reassembly_total_ms += reassembly_ms
+
+        self.publish_fn(ACK_TOPIC, {
+            "transfer_id": transfer.transfer_id, "status": STATUS_COMPLETE, "stats": stats
+        })
+        logger.info(
+            f"Übertragung {transfer.transfer_id} vollständig: {transfer.total_samples} Samples, "
+            f"{throughput_kbps:.0f} KB/s, {reassembly_ms:.1f} ms"
+        )
+
+        return ReceivedDataset(transfer.transfer_id, transfer.columns, transfer.metadata, stats)
+
+    def _fail(self, transfer: _IncomingTransfer, reason: str):
+        del self._transfers[transfer.transfer_id]
+        self._finished.append(transfer.transfer_id)
+        self.transfers_failed += 1
+        self.publish_fn(ACK_TOPIC, {
+            "transfer_id": transfer.transfer_id, "status": STATUS_FAILED, "reason": reason
+        })
+        logger.error(f"Übertragung {transfer.transfer_id} fehlgeschlagen: {reason}")
@@ -5,7 +5,8 @@ Dieses Modul bietet eine robuste MQTT-Client-Implementierung mit:
 - Automatischer Wiederverbindung
 - Thread-sicherer Nachrichtenverarbeitung
 - Topic-spezifischen Callbacks
-- Wildcard-Unterstützung
+- Wildcard-Unterstützung über einen Topic-Trie (siehe topic_router)
+- Binärem Batch-Format für Mess-Topics (siehe binary_format)
 """
 
 import json
@@ -14,10 +15,23 @@ import queue
 import random
 import threading
 import time
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 import paho.mqtt.client as mqtt
 
+from .binary_format import (
+    SampleBatch,
+    base_topic,
+    binary_topic,
+    decode_sample_batch,
+    encode_sample_batch,
+    is_binary_capable,
+    is_binary_frame,
+    is_binary_topic,
+)
+from .chunked_transfer import is_chunk_frame
+from .topic_router import TopicRouter
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,6 +43,7 @@ class MqttClient:
     - Automatische Wiederverbindung bei Verbindungsverlust
     - Thread-sichere Operationen
     - JSON-Serialisierung/Deserialisierung
+    - Binäre Sample-Batches auf "<topic>/bin" (opt-in)
     - Topic-basierte Callback-Verwaltung
     - Wildcard-Unterstützung für Topics
     """
@@ -43,6 +58,7 @@ class MqttClient:
         clean_session: bool = True,
         reconnect_interval: float = 5.0,
         max_reconnect_interval: float = 60.0,
+        client_factory: Optional[Callable[..., Any]] = None,
     ):
         """
         Initialisiert den MQTT-Client.
@@ -56,6 +72,8 @@ class MqttClient:
                 clean_session: Ob die Session beim Verbinden bereinigt werden soll
                 reconnect_interval: Initiales Wiederverbindungsintervall in Sekunden
                 max_reconnect_interval: Maximales Wiederverbindungsintervall in Sekunden
+                client_factory: Erzeugt den Transport-Client (Standard: paho mqtt.Client,
+                        z.B. LocalBroker.create_client für Tests ohne Broker)
         """
         # Verbindungsparameter
         self.broker = broker
@@ -63,6 +81,7 @@ class MqttClient:
         self.username = username
         self.password = password
         self.clean_session = clean_session
+        self.client_factory = client_factory
 
         # Client-ID generieren wenn nicht angegeben
         self.client_id = (
@@ -82,6 +101,8 @@ class MqttClient:
 
         # Callback-Verwaltung
         self.callbacks: Dict[str, list] = {}
+        self._router = TopicRouter()  # Zustellung inkl. Wildcards
+        self._batch_callbacks = set()  # Callbacks, die SampleBatch direkt verarbeiten
         self._callback_lock = threading.RLock()
 
         # Thread-Management
@@ -94,6 +115,9 @@ class MqttClient:
             "messages_received": 0,
             "connection_attempts": 0,
             "successful_connections": 0,
+            "binary_frames_sent": 0,
+            "binary_frames_received": 0,
+            "binary_samples_received": 0,
         }
 
     def connect(self, timeout: float = 5.0) -> bool:
@@ -119,7 +143,8 @@ class MqttClient:
 
         try:
             # MQTT-Client erstellen
-            self.client = mqtt.Client(
+            factory = self.client_factory or mqtt.Client
+            self.client = factory(
                 client_id=self.client_id, clean_session=self.clean_session, protocol=mqtt.MQTTv311
             )
 
@@ -184,7 +209,7 @@ class MqttClient:
 
         Args:
                 topic: MQTT-Topic
-                payload: Nachricht (wird automatisch zu JSON konvertiert wenn Dict)
+                payload: Nachricht (Dict/Liste als JSON, bytes unverändert)
                 qos: Quality of Service Level (0, 1 oder 2)
                 retain: Ob die Nachricht vom Broker gespeichert werden soll
 
@@ -199,6 +224,8 @@ class MqttClient:
             # Payload vorbereiten
             if isinstance(payload, (dict, list)):
                 payload_str = json.dumps(payload)
+            elif isinstance(payload, (bytes, bytearray)):
+                payload_str = payload
             else:
                 payload_str = str(payload)
 
@@ -216,16 +243,66 @@ class MqttClient:
             logger.error(f"Fehler beim Publizieren auf {topic}: {e}")
             return False
 
+    def publish_batch(
+        self,
+        topic: str,
+        test_id: str,
+        position: str,
+        columns: Dict[str, Sequence[float]],
+        sequence: int = 0,
+        sample_rate: float = 0.0,
+        static_weight: Optional[float] = None,
+        qos: int = 1,
+    ) -> bool:
+        """
+        Veröffentlicht mehrere Samples als Binär-Frame auf "<topic>/bin".
+
+        Args:
+                topic: Basis-Topic
+                test_id: Test-ID
+                position: Radposition
+                columns: Spalten nach Feldnamen (elapsed, tire_force, ...)
+                sequence: Laufende Frame-Nummer
+                sample_rate: Abtastrate in Hz
+                static_weight: Statisches Gewicht (optional)
+                qos: Quality of Service Level
+
+        Returns:
+                bool: True bei erfolgreicher Veröffentlichung
+        """
+        try:
+            frame = encode_sample_batch(
+                test_id, position, columns, sequence, sample_rate, static_weight
+            )
+        except Exception as e:
+            logger.error(f"Fehler beim Kodieren des Binär-Frames für {topic}: {e}")
+            return False
+
+        if not self.publish(binary_topic(topic), frame, qos=qos):
+            return False
+
+        self.stats["binary_frames_sent"] += 1
+        return True
+
     def subscribe(
-        self, topic: str, callback: Optional[Callable[[str, Any], None]] = None, qos: int = 1
+        self,
+        topic: str,
+        callback: Optional[Callable[[str, Any], None]] = None,
+        qos: int = 1,
+        accepts_batches: bool = False,
     ) -> bool:
         """
         Abonniert ein Topic mit optionalem Callback.
 
+        Für Mess-Topics wird zusätzlich "<topic>/bin" abonniert. Binär-Frames
+        werden unter dem Basis-Topic zugestellt: als SampleBatch, wenn der
+        Callback accepts_batches=True angibt, sonst als einzelne Sample-Dicts.
+
         Args:
                 topic: MQTT-Topic (unterstützt Wildcards + und #)
                 callback: Funktion die bei Nachrichten aufgerufen wird
                 qos: Quality of Service Level
+                accepts_batches: Callback verarbeitet SampleBatch direkt
 
         Returns:
                 bool: True bei erfolgreichem Abonnement
@@ -237,20 +314,18 @@ class MqttClient:
         try:
             # Callback registrieren wenn angegeben
             if callback:
-                with self._callback_lock:
-                    if topic not in self.callbacks:
-                        self.callbacks[topic] = []
-                    if callback not in self.callbacks[topic]:
-                        self.callbacks[topic].append(callback)
+                self.add_callback(topic, callback, accepts_batches)
 
-            # Topic abonnieren
-            result = self.client.subscribe(topic, qos)
+            # Topic abonnieren (inkl. Binär-Variante)
+            for broker_topic in self._broker_topics(topic):
+                result = self.client.subscribe(broker_topic, qos)
 
-            if result[0] == mqtt.MQTT_ERR_SUCCESS:
-                logger.info(f"Topic abonniert: {topic}")
-                return True
-            logger.error(f"Fehler beim Abonnieren von {topic}: {result[0]}")
-            return False
+                if result[0] != mqtt.MQTT_ERR_SUCCESS:
+                    logger.error(f"Fehler beim Abonnieren von {broker_topic}: {result[0]}")
+                    return False
+                logger.info(f"Topic abonniert: {broker_topic}")
+
+            return True
 
         except Exception as e:
             logger.error(f"Fehler beim Abonnieren von {topic}: {e}")
@@ -271,13 +346,15 @@ class MqttClient:
             return False
 
         try:
-            # Topic abmelden
-            result = self.client.unsubscribe(topic)
+            # Topic abmelden (inkl. Binär-Variante)
+            result = self.client.unsubscribe(self._broker_topics(topic))
 
             # Callbacks entfernen
             with self._callback_lock:
                 if topic in self.callbacks:
-                    del self.callbacks[topic]
+                    for callback in self.callbacks.pop(topic):
+                        self._batch_callbacks.discard(callback)
+                self._router.remove(topic)
 
             if result[0] == mqtt.MQTT_ERR_SUCCESS:
                 logger.info(f"Abonnement beendet: {topic}")
@@ -289,19 +366,25 @@ class MqttClient:
             logger.error(f"Fehler beim Beenden des Abonnements von {topic}: {e}")
             return False
 
-    def add_callback(self, topic: str, callback: Callable[[str, Any], None]):
+    def add_callback(
+        self, topic: str, callback: Callable[[str, Any], None], accepts_batches: bool = False
+    ):
         """
         Fügt einen Callback für ein Topic hinzu.
 
         Args:
                 topic: MQTT-Topic
                 callback: Callback-Funktion
+                accepts_batches: Callback verarbeitet SampleBatch direkt
         """
         with self._callback_lock:
             if topic not in self.callbacks:
                 self.callbacks[topic] = []
             if callback not in self.callbacks[topic]:
                 self.callbacks[topic].append(callback)
+                self._router.add(topic, callback)
+            if accepts_batches:
+                self._batch_callbacks.add(callback)
 
     def remove_callback(self, topic: str, callback: Callable[[str, Any], None]):
         """
@@ -314,8 +397,11 @@ class MqttClient:
         with self._callback_lock:
             if topic in self.callbacks and callback in self.callbacks[topic]:
                 self.callbacks[topic].remove(callback)
+                self._router.remove(topic, callback)
                 if not self.callbacks[topic]:
                     del self.callbacks[topic]
+                if not any(callback in callbacks for callbacks in self.callbacks.values()):
+                    self._batch_callbacks.discard(callback)
 
     def is_connected(self) -> bool:
         """
@@ -333,7 +419,9 @@ class MqttClient:
         Returns:
                 Dict mit Statistiken
         """
-        return self.stats.copy()
+        stats = self.stats.copy()
+        stats["routed_topics_cached"] = self._router.get_stats()["cached_topics"]
+        return stats
 
     def _on_connect(self, client, userdata, flags, rc):
         """Callback für erfolgreiche Verbindung."""
@@ -371,34 +459,41 @@ class MqttClient:
     def _on_message(self, client, userdata, msg):
         """Callback für empfangene Nachrichten."""
         try:
-            # Payload dekodieren
-            payload_str = msg.payload.decode("utf-8")
+            topic = msg.topic
 
-            # JSON parsen wenn möglich
-            try:
-                if payload_str.startswith("{") or payload_str.startswith("["):
-                    payload = json.loads(payload_str)
-                else:
+            if is_binary_frame(msg.payload):
+                # Binär-Frame: unter dem Basis-Topic zustellen
+                payload = decode_sample_batch(msg.payload)
+                topic = base_topic(topic)
+                self.stats["binary_frames_received"] += 1
+                self.stats["binary_samples_received"] += len(payload)
+            elif is_chunk_frame(msg.payload):
+                # Dataset-Chunk: Empfänger prüft CRC und setzt zusammen
+                payload = bytes(msg.payload)
+            else:
+                # Payload dekodieren
+                payload_str = msg.payload.decode("utf-8")
+
+                # JSON parsen wenn möglich
+                try:
+                    if payload_str.startswith("{") or payload_str.startswith("["):
+                        payload = json.loads(payload_str)
+                    else:
+                        payload = payload_str
+                except json.JSONDecodeError:
                     payload = payload_str
-            except json.JSONDecodeError:
-                payload = payload_str
 
             # Statistik aktualisieren
             self.stats["messages_received"] += 1
 
-            # Callbacks ausführen
-            topic = msg.topic
-            with self._callback_lock:
-                # Direkte Topic-Matches
-                if topic in self.callbacks:
-                    for callback in self.callbacks[topic]:
-                        self._execute_callback(callback, topic, payload)
+            # Callbacks ausführen (exakte Matches zuerst, dann Wildcards)
+            for _, callback in self._router.match(topic):
+                self._execute_callback(callback, topic, payload)
 
-                # Wildcard-Matches prüfen
-                for pattern, callbacks in self.callbacks.items():
-                    if self._topic_matches(pattern, topic) and pattern != topic:
-                        for callback in callbacks:
-                            self._execute_callback(callback, topic, payload)
+            # Explizit auf "<topic>/bin" registrierte Callbacks
+            if msg.topic != topic:
+                for callback in self._router.handlers(msg.topic):
+                    self._execute_callback(callback, msg.topic, payload)
 
         except Exception as e:
             logger.error(f"Fehler bei Nachrichtenverarbeitung: {e}")
@@ -406,50 +501,28 @@ class MqttClient:
     def _execute_callback(self, callback: Callable, topic: str, payload: Any):
         """Führt einen Callback sicher aus."""
         try:
-            callback(topic, payload)
+            if isinstance(payload, SampleBatch) and callback not in self._batch_callbacks:
+                # Legacy-Callback: Batch als einzelne Sample-Dicts zustellen
+                for sample in payload.to_samples():
+                    callback(topic, sample)
+            else:
+                callback(topic, payload)
         except Exception as e:
             logger.error(f"Fehler in Callback für {topic}: {e}")
 
-    def _topic_matches(self, pattern: str, topic: str) -> bool:
-        """
-        Prüft ob ein Topic einem Pattern mit Wildcards entspricht.
-
-        Args:
-                pattern: Topic-Pattern (kann + und # enthalten)
-                topic: Tatsächliches Topic
-
-        Returns:
-                bool: True wenn Pattern passt
-        """
-        pattern_parts = pattern.split("/")
-        topic_parts = topic.split("/")
-
-        for i, pattern_part in enumerate(pattern_parts):
-            # Multi-level wildcard
-            if pattern_part == "#":
-                return True
-
-            # Nicht genug Topic-Teile
-            if i >= len(topic_parts):
-                return False
-
-            # Single-level wildcard
-            if pattern_part == "+":
-                continue
-
-            # Exakte Übereinstimmung
-            if pattern_part != topic_parts[i]:
-                return False
-
-        # Pattern und Topic müssen gleich lang sein (außer bei #)
-        return len(pattern_parts) == len(topic_parts)
+    def _broker_topics(self, topic: str) -> List[str]:
+        """Liefert die beim Broker zu abonnierenden Topics (inkl. Binär-Variante)."""
+        if is_binary_capable(topic) and not is_binary_topic(topic):
+            return [topic, binary_topic(topic)]
+        return [topic]
 
     def _restore_subscriptions(self):
         """Stellt Abonnements nach Wiederverbindung wieder her."""
         with self._callback_lock:
             for topic in self.callbacks:
                 try:
-                    self.client.subscribe(topic)
+                    for broker_topic in self._broker_topics(topic):
+                        self.client.subscribe(broker_topic)
                     logger.info(f"Abonnement wiederhergestellt: {topic}")
                 except Exception as e:
                     logger.error(f"Fehler beim Wiederherstellen von {topic}: {e}")
@@ -7,7 +7,7 @@ mit spezifischen Funktionen für die Fahrwerkstester-Kommunikation.
 
 import logging
 import time
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 from .client import MqttClient
 
@@ -175,34 +175,67 @@ class MqttHandler:
 
         Args:
             topic: MQTT-Topic
-            message: Nachricht als Dictionary
+            message: Nachricht als Dictionary (oder bereits kodierter Binär-Frame)
             retain: Retain-Flag
 
         Returns:
             bool: True bei Erfolg
         """
-        # Timestamp hinzufügen wenn nicht vorhanden
-        if "timestamp" not in message:
-            message["timestamp"] = time.time()
+        if isinstance(message, dict):
+            # Timestamp hinzufügen wenn nicht vorhanden
+            if "timestamp" not in message:
+                message["timestamp"] = time.time()
 
-        # App-Type hinzufügen wenn nicht vorhanden
-        if "source" not in message:
-            message["source"] = self.app_type
+            # App-Type hinzufügen wenn nicht vorhanden
+            if "source" not in message:
+                message["source"] = self.app_type
 
         return self.mqtt_client.publish(topic, message, retain=retain)
 
-    def subscribe(self, topic: str, callback: Optional[Callable] = None):
+    def publish_samples(
+        self,
+        topic: str,
+        test_id: str,
+        position: str,
+        columns: Dict[str, Sequence[float]],
+        sequence: int = 0,
+        sample_rate: float = 0.0,
+        static_weight: Optional[float] = None,
+    ) -> bool:
+        """
+        Veröffentlicht mehrere Samples als Binär-Frame auf "<topic>/bin".
+
+        Args:
+            topic: Basis-Topic (z.B. Messdaten)
+            test_id: Test-ID
+            position: Radposition
+            columns: Spalten nach Feldnamen (elapsed, platform_position, tire_force, ...)
+            sequence: Laufende Frame-Nummer
+            sample_rate: Abtastrate in Hz
+            static_weight: Statisches Gewicht (optional)
+
+        Returns:
+            bool: True bei Erfolg
+        """
+        return self.mqtt_client.publish_batch(
+            topic, test_id, position, columns, sequence, sample_rate, static_weight
+        )
+
+    def subscribe(
+        self, topic: str, callback: Optional[Callable] = None, accepts_batches: bool = False
+    ):
         """
         Abonniert ein Topic.
 
         Args:
             topic: MQTT-Topic
             callback: Optionaler Callback für dieses Topic
+            accepts_batches: Callback verarbeitet Binär-Frames als SampleBatch
         """
         if callback is None and self.on_message is not None:
             callback = lambda t, m: self.on_message(t, m)
 
-        self.mqtt_client.subscribe(topic, callback)
+        self.mqtt_client.subscribe(topic, callback, accepts_batches=accepts_batches)
 
     def unsubscribe(self, topic: str):
         """
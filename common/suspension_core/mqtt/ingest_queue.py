@@ -0,0 +1,281 @@
+"""
+Thread-sichere, begrenzte Eingangs-Queue zwischen paho-Callbacks und asyncio.
+
+paho ruft Callbacks in seinem Netzwerk-Thread auf. Nachrichten werden dort
+unter einem Lock in Queues pro Topic-Klasse eingereiht; der Event-Loop wird nur
+geweckt, wenn der Consumer tatsächlich wartet (loop.call_soon_threadsafe).
+
+Bei voller Queue entscheidet die Policy der Topic-Klasse:
+- drop_oldest: älteste Nachricht verwerfen (Telemetrie)
+- drop_newest: neue Nachricht verwerfen
+- never_drop:  nie verwerfen (Kommandos, Test-Status); dafür wird die älteste
+               verwerfbare Nachricht einer anderen Klasse entfernt
+Die Reihenfolge über alle Klassen bleibt erhalten.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from itertools import count
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from .topic_router import TopicRouter
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+NEVER_DROP = "never_drop"
+POLICIES = (DROP_OLDEST, DROP_NEWEST, NEVER_DROP)
+
+CLASS_TELEMETRY = "telemetry"
+CLASS_CONTROL = "control"
+CLASS_DEFAULT = "default"
+
+# Topic-Pattern -> Klasse (exakte Topics haben Vorrang vor Wildcards)
+DEFAULT_TOPIC_CLASSES = {
+    "suspension/measurements/#": CLASS_TELEMETRY,
+    "suspension/raw_data/#": CLASS_TELEMETRY,
+    "suspension/+/raw": CLASS_TELEMETRY,
+    "suspension/test/results/live": CLASS_TELEMETRY,
+    "suspension/system/heartbeat": CLASS_TELEMETRY,
+    "suspension/+/command": CLASS_CONTROL,
+    "suspension/test/#": CLASS_CONTROL,
+    "suspension/hardware/motor": CLASS_CONTROL,
+    "suspension/hardware/lamp": CLASS_CONTROL,
+    "suspension/hardware/calibration": CLASS_CONTROL,
+    # Manifest und Commit einer Dataset-Übertragung (Chunks sind wiederholbar)
+    "suspension/raw_data/complete/manifest": CLASS_CONTROL,
+    "suspension/raw_data/complete/commit": CLASS_CONTROL,
+}
+
+DEFAULT_POLICIES = {
+    CLASS_TELEMETRY: DROP_OLDEST,
+    CLASS_CONTROL: NEVER_DROP,
+    CLASS_DEFAULT: DROP_OLDEST,
+}
+
+_Entry = Tuple[int, float, str, Any]  # (Sequenz, Einreihzeit, Topic, Payload)
+
+
+class MessageIngestQueue:
+    """
+    Begrenzte Queue für MQTT-Nachrichten aus fremden Threads
+
+    Features:
+    - put() aus beliebigem Thread, get() im Event-Loop
+    - Gesamtkapazität mit Verwerf-Policy pro Topic-Klasse
+    - Zähler für verworfene Nachrichten und Wartezeit (Lag) pro Nachricht
+    """
+
+    def __init__(self,
+                 capacity: int = 10000,
+                 policies: Optional[Dict[str, str]] = None,
+                 topic_classes: Optional[Dict[str, str]] = None):
+        """
+        Initialisiert die Queue
+
+        Args:
+            capacity: Maximale Anzahl wartender Nachrichten
+            policies: Policy pro Klasse (ergänzt DEFAULT_POLICIES)
+            topic_classes: Topic-Pattern -> Klasse (ergänzt DEFAULT_TOPIC_CLASSES)
+        """
+        self.capacity = max(1, int(capacity))
+
+        self.policies = {**DEFAULT_POLICIES, **(policies or {})}
+        for name, policy in self.policies.items():
+            if policy not in POLICIES:
+                raise ValueError(f"Unknown drop policy for class '{name}': {policy} (expected one of {POLICIES})")
+
+        self._classifier = TopicRouter()
+        for pattern, name in {**DEFAULT_TOPIC_CLASSES, **(topic_classes or {})}.items():
+            self._classifier.set(pattern, name)
+
+        self._queues: Dict[str, Deque[_Entry]] = {name: deque() for name in self.policies}
+        self._size = 0
+        self._sequence = count()
+        self._lock = threading.Lock()
+
+        # Consumer-Seite (im Event-Loop erzeugt)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._not_empty: Optional[asyncio.Event] = None
+        self._waiting = False
+
+        # Statistiken
+        self.enqueued = 0
+        self.dropped: Dict[str, int] = {name: 0 for name in self.policies}
+        self.overflow = 0  # never_drop-Nachrichten über der Kapazität
+        self.high_watermark = 0
+        self._lag_total = 0.0
+        self._lag_count = 0
+        self._lag_max = 0.0
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def classify(self, topic: str) -> str:
+        """
+        Ermittelt die Klasse eines Topics
+
+        Args:
+            topic: Konkretes MQTT-Topic
+
+        Returns:
+            Klassenname (CLASS_DEFAULT, wenn kein Pattern passt)
+        """
+        routes = self._classifier.match(topic)
+        return routes[0][1] if routes else CLASS_DEFAULT
+
+    def put(self, topic: str, message: Any) -> bool:
+        """
+        Reiht eine Nachricht ein (thread-sicher, blockiert nicht)
+
+        Args:
+            topic: MQTT-Topic
+            message: Payload
+
+        Returns:
+            True wenn eingereiht, False wenn verworfen
+        """
+        name = self.classify(topic)
+        wake = False
+
+        with self._lock:
+            if name not in self._queues:
+                self._queues[name] = deque()
+                self.dropped[name] = 0
+
+            if self._size >= self.capacity and not self._make_room(name):
+                return False
+
+            self._queues[name].append((next(self._sequence), time.monotonic(), topic, message))
+            self._size += 1
+            self.enqueued += 1
+            self.high_watermark = max(self.high_watermark, self._size)
+
+            if self._waiting:
+                self._waiting = False
+                wake = True
+
+        if wake:
+            try:
+                self._loop.call_soon_threadsafe(self._not_empty.set)
+            except RuntimeError:
+                # Event-Loop bereits geschlossen
+                pass
+
+        return True
+
+    def get_nowait(self) -> Tuple[str, Any]:
+        """
+        Entnimmt die älteste Nachricht ohne zu warten
+
+        Raises:
+            asyncio.QueueEmpty: Wenn keine Nachricht wartet
+        """
+        with self._lock:
+            entry = self._pop()
+        if entry is None:
+            raise asyncio.QueueEmpty()
+        return self._record(entry)
+
+    async def get(self) -> Tuple[str, Any]:
+        """
+        Wartet auf die nächste Nachricht (Reihenfolge wie eingereiht)
+
+        Returns:
+            (topic, message)
+        """
+        if self._not_empty is None:
+            self._loop = asyncio.get_running_loop()
+            self._not_empty = asyncio.Event()
+
+        while True:
+            with self._lock:
+                entry = self._pop()
+                if entry is None:
+                    self._not_empty.clear()
+                    self._waiting = True
+
+            if entry is not None:
+                return self._record(entry)
+
+            await self._not_empty.wait()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Füllstand, verworfene Nachrichten und Lag zurück"""
+        with self._lock:
+            sizes = {name: len(queue) for name, queue in self._queues.items()}
+            oldest = min((queue[0][1] for queue in self._queues.values() if queue), default=None)
+
+        return {
+            "capacity": self.capacity,
+            "size": self._size,
+            "sizes": sizes,
+            "high_watermark": self.high_watermark,
+            "enqueued": self.enqueued,
+            "dropped": dict(self.dropped),
+            "dropped_total": sum(self.dropped.values()),
+            "overflow": self.overflow,
+            "lag_ms": (time.monotonic() - oldest) * 1000 if oldest is not None else 0.0,
+            "avg_lag_ms": self._lag_total / self._lag_count * 1000 if self._lag_count else 0.0,
+            "max_lag_ms": self._lag_max * 1000,
+        }
+
+    def _make_room(self, name: str) -> bool:
+        """Schafft Platz für eine Nachricht der Klasse name (Lock gehalten)"""
+        policy = self.policies.get(name, DROP_OLDEST)
+
+        if policy == DROP_NEWEST:
+            self.dropped[name] += 1
+            return False
+
+        if policy == DROP_OLDEST and self._queues[name]:
+            victim = name
+        else:
+            victim = self._oldest_droppable()
+
+        if victim is not None:
+            self._queues[victim].popleft()
+            self._size -= 1
+            self.dropped[victim] += 1
+            return True
+
+        if policy == NEVER_DROP:
+            self.overflow += 1
+            return True
+
+        self.dropped[name] += 1
+        return False
+
+    def _oldest_droppable(self) -> Optional[str]:
+        """Klasse mit der ältesten verwerfbaren Nachricht"""
+        oldest = None
+        for name, queue in self._queues.items():
+            if queue and self.policies.get(name, DROP_OLDEST) != NEVER_DROP:
+                if oldest is None or queue[0][0] < self._queues[oldest][0][0]:
+                    oldest = name
+        return oldest
+
+    def _pop(self) -> Optional[_Entry]:
+        """Entnimmt die älteste Nachricht über alle Klassen (Lock gehalten)"""
+        head = None
+        for queue in self._queues.values():
+            if queue and (head is None or queue[0][0] < head[0][0]):
+                head = queue
+
+        if head is None:
+            return None
+
+        self._size -= 1
+        return head.popleft()
+
+    def _record(self, entry: _Entry) -> Tuple[str, Any]:
+        _, enqueued_at, topic, message = entry
+        lag = time.monotonic() - enqueued_at
+        self._lag_total += lag
+        self._lag_count += 1
+        self._lag_max = max(self._lag_max, lag)
+        return topic, message
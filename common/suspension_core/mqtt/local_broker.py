@@ -0,0 +1,279 @@
+"""
+In-Process-Broker als Ersatz für Mosquitto in Last- und Integrationstests.
+
+LocalBroker stellt Nachrichten zwischen MqttClient-Instanzen im selben Prozess
+zu, ohne Netzwerk und ohne externen Broker. Die Clients erhalten statt des
+paho-Clients einen LocalBrokerClient mit derselben Teilmenge der paho-API
+(connect, loop_start, publish, subscribe, ...). Die Zustellung läuft wie bei
+paho in einem eigenen Thread; ein Broker-Thread für alle Clients bildet den
+Broker als gemeinsamen Engpass ab.
+
+Beispiel:
+    broker = LocalBroker()
+    handler = MqttHandler(app_type="gui")
+    broker.attach(handler)
+    handler.connect()
+"""
+
+import itertools
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+from .topic_router import TopicRouter
+
+logger = logging.getLogger(__name__)
+
+# paho-Rückgabecodes (MQTT_ERR_SUCCESS, MQTT_ERR_NO_CONN, MQTT_ERR_QUEUE_SIZE)
+RC_SUCCESS = 0
+RC_NO_CONN = 4
+RC_QUEUE_SIZE = 15
+
+
+@dataclass
+class LocalMessage:
+    """Zugestellte Nachricht (Attribute wie paho.mqtt.client.MQTTMessage)"""
+
+    topic: str
+    payload: bytes
+    qos: int = 0
+    retain: bool = False
+
+
+@dataclass
+class _PublishResult:
+    """Rückgabe von publish() (wie paho MQTTMessageInfo)"""
+
+    rc: int
+    mid: int
+
+
+class LocalBrokerClient:
+    """
+    paho-kompatibler Client, der über einen LocalBroker kommuniziert
+
+    Wird von MqttClient.connect() über dessen client_factory erzeugt.
+    """
+
+    def __init__(self, broker: "LocalBroker", client_id: str = "", **kwargs):
+        self.broker = broker
+        self.client_id = client_id
+        self.connected = False
+        self.on_connect = None
+        self.on_disconnect = None
+        self.on_message = None
+        self._mid = itertools.count(1)
+
+    def username_pw_set(self, username: str, password: Optional[str] = None):
+        """Authentifizierung wird vom lokalen Broker ignoriert"""
+
+    def connect(self, host: str = "localhost", port: int = 1883, keepalive: int = 60) -> int:
+        return RC_SUCCESS
+
+    def reconnect(self) -> int:
+        self.loop_start()
+        return RC_SUCCESS
+
+    def loop_start(self):
+        """Meldet den Client beim Broker an und ruft on_connect auf"""
+        if self.connected:
+            return
+        self.connected = True
+        if self.on_connect:
+            self.on_connect(self, None, {}, RC_SUCCESS)
+
+    def loop_stop(self):
+        """Kein eigener Netzwerk-Thread vorhanden"""
+
+    def disconnect(self) -> int:
+        if self.connected:
+            self.connected = False
+            self.broker._detach(self)
+            if self.on_disconnect:
+                self.on_disconnect(self, None, RC_SUCCESS)
+        return RC_SUCCESS
+
+    def publish(self, topic: str, payload: Any = None, qos: int = 0, retain: bool = False) -> _PublishResult:
+        if not self.connected:
+            return _PublishResult(RC_NO_CONN, 0)
+        if payload is None:
+            payload = b""
+        elif isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        elif not isinstance(payload, bytes):
+            payload = bytes(payload)
+        rc = RC_SUCCESS if self.broker._publish(LocalMessage(topic, payload, qos, retain)) else RC_QUEUE_SIZE
+        return _PublishResult(rc, next(self._mid))
+
+    def subscribe(self, topic: str, qos: int = 0):
+        self.broker._subscribe(self, topic)
+        return RC_SUCCESS, next(self._mid)
+
+    def unsubscribe(self, topic: Union[str, List[str]]):
+        for pattern in [topic] if isinstance(topic, str) else topic:
+            self.broker._unsubscribe(self, pattern)
+        return RC_SUCCESS, next(self._mid)
+
+
+class LocalBroker:
+    """
+    MQTT-Broker im eigenen Prozess
+
+    Features:
+    - Topic-Wildcards (+, #) über den TopicRouter
+    - Retained Messages
+    - Begrenzte Zustell-Queue mit Verwurf bei Überlauf (wie max_queued_messages)
+    - Durchsatz- und Füllstandsstatistik (get_stats)
+    """
+
+    def __init__(self, capacity: int = 100000):
+        """
+        Initialisiert den Broker
+
+        Args:
+            capacity: Maximale Anzahl unzugestellter Nachrichten
+        """
+        self.capacity = capacity
+        self._queue: "queue.Queue[Optional[LocalMessage]]" = queue.Queue(maxsize=capacity)
+        self._router = TopicRouter()
+        self._retained: Dict[str, LocalMessage] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # Statistiken
+        self.messages_in = 0
+        self.messages_out = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.dropped = 0
+        self.high_watermark = 0
+        self._started = time.monotonic()
+
+    def create_client(self, client_id: str = "", **kwargs) -> LocalBrokerClient:
+        """Client-Factory für MqttClient (Signatur wie paho.mqtt.client.Client)"""
+        self.start()
+        return LocalBrokerClient(self, client_id, **kwargs)
+
+    def attach(self, target: Any) -> None:
+        """
+        Leitet einen MqttClient, MqttHandler oder Service auf diesen Broker um
+
+        Muss vor connect() bzw. start_mqtt() aufgerufen werden.
+
+        Args:
+            target: MqttClient, MqttHandler (mqtt_client) oder MqttServiceBase (mqtt)
+        """
+        client = getattr(target, "mqtt", target)
+        client = getattr(client, "mqtt_client", client)
+        client.client_factory = self.create_client
+
+    def start(self) -> None:
+        """Startet den Zustell-Thread (idempotent)"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._started = time.monotonic()
+            self._thread = threading.Thread(target=self._deliver_loop, name="local-broker", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stellt ausstehende Nachrichten zu und beendet den Zustell-Thread"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        self._queue.put(None)
+        if self._thread:
+            self._thread.join(timeout)
+
+    def pending(self) -> int:
+        """Anzahl noch nicht zugestellter Nachrichten"""
+        return self._queue.qsize()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Durchsatz, Verwürfe und Queue-Füllstand zurück"""
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        return {
+            "messages_in": self.messages_in,
+            "messages_out": self.messages_out,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "dropped": self.dropped,
+            "pending": self.pending(),
+            "high_watermark": self.high_watermark,
+            "messages_per_second": self.messages_in / elapsed,
+            "bytes_per_second": self.bytes_in / elapsed,
+            "subscriptions": len(self._router),
+        }
+
+    def _publish(self, message: LocalMessage) -> bool:
+        with self._lock:
+            self.messages_in += 1
+            self.bytes_in += len(message.payload)
+            if message.retain:
+                if message.payload:
+                    self._retained[message.topic] = message
+                else:
+                    self._retained.pop(message.topic, None)
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            logger.debug(f"Broker-Queue voll, Nachricht auf {message.topic} verworfen")
+            return False
+        size = self._queue.qsize()
+        if size > self.high_watermark:
+            self.high_watermark = size
+        return True
+
+    def _subscribe(self, client: LocalBrokerClient, pattern: str) -> None:
+        with self._lock:
+            if client not in self._router.handlers(pattern):
+                self._router.add(pattern, client)
+            retained = [
+                message for topic, message in self._retained.items()
+                if any(handler is client for _, handler in self._router.match(topic))
+            ]
+        for message in retained:
+            self._send(client, message)
+
+    def _unsubscribe(self, client: LocalBrokerClient, pattern: str) -> None:
+        with self._lock:
+            self._router.remove(pattern, client)
+
+    def _detach(self, client: LocalBrokerClient) -> None:
+        with self._lock:
+            for pattern in self._router.patterns():
+                if client in self._router.handlers(pattern):
+                    self._router.remove(pattern, client)
+
+    def _deliver_loop(self) -> None:
+        while True:
+            message = self._queue.get()
+            if message is None:
+                if not self._running:
+                    break
+                continue
+
+            with self._lock:
+                # Jeder Client erhält eine Nachricht nur einmal (überlappende Abos)
+                clients = list(dict.fromkeys(client for _, client in self._router.match(message.topic)))
+
+            for client in clients:
+                self._send(client, message)
+
+    def _send(self, client: LocalBrokerClient, message: LocalMessage) -> None:
+        if not client.connected or client.on_message is None:
+            return
+        try:
+            client.on_message(client, None, message)
+            self.messages_out += 1
+            self.bytes_out += len(message.payload)
+        except Exception as e:
+            logger.error(f"Fehler bei der Zustellung an {client.client_id}: {e}")
@@ -20,10 +20,15 @@ from abc import ABC, abstractmethod
 import asyncio
 import logging
 import time
-from typing import Dict, Any, Optional, Callable, Union
+from typing import Dict, Any, Optional, Callable, Sequence, Union
 
+from .binary_format import SampleBatch
+from .chunked_transfer import ACK_TOPIC, CHUNK_TOPIC, COMMIT_TOPIC, MANIFEST_TOPIC, RETRANSMIT_TOPIC
 from .handler import MqttHandler
+from .ingest_queue import MessageIngestQueue
+from .topic_router import TopicRouter
 from ..config.manager import ConfigManager
+from ..tracing import STAGE_MQTT_PUBLISH, STAGE_MQTT_RECEIVE, TRACE_TOPIC, get_tracer, trace_id_of
 
 logger = logging.getLogger(__name__)
 
@@ -53,9 +58,17 @@ class MqttTopics:
     MEASUREMENT_PROCESSED = "suspension/measurements/processed"
     RESULTS_PROCESSED = "suspension/results/processed"
     TEST_RESULTS_FINAL = "suspension/test/results/final"
+    TEST_RESULTS_LIVE = "suspension/test/results/live"  # Per-Zyklus-Ergebnisse während des Tests
+    ARCHIVE_RESULTS = "suspension/processing/archive"  # Antworten auf Archiv-Abfragen
 
     # Spezielle Processing-Topics
     RAW_DATA_COMPLETE = "suspension/raw_data/complete"  # Für Pi Processing Service
+    # Chunk-Übertragung kompletter Datasets (siehe chunked_transfer)
+    RAW_DATA_MANIFEST = MANIFEST_TOPIC
+    RAW_DATA_CHUNK = CHUNK_TOPIC
+    RAW_DATA_COMMIT = COMMIT_TOPIC
+    RAW_DATA_RETRANSMIT = RETRANSMIT_TOPIC
+    RAW_DATA_ACK = ACK_TOPIC
 
     # === TEST-LIFECYCLE ===
     TEST_STATUS = "suspension/test/status"
@@ -155,19 +168,28 @@ class MqttServiceBase(ABC):
         # MQTT-Handler mit standardisierter Konfiguration
         self.mqtt = self._create_mqtt_handler()
 
-        # Async-Support für Message-Processing
-        self._message_queue = asyncio.Queue()
+        # Async-Support für Message-Processing: begrenzte Queue, befüllt aus dem paho-Thread
+        self._message_queue = MessageIngestQueue(
+            capacity=self.config.get("mqtt.message_queue.capacity", 10000),
+            policies=self.config.get("mqtt.message_queue.policies"),
+            topic_classes=self.config.get("mqtt.message_queue.topic_classes"),
+        )
         self._running = False
         self._tasks = []
 
         # Callback-Registry für Topic-Handler
         self._topic_handlers: Dict[str, Callable] = {}
+        self._handler_router = TopicRouter()  # Zuordnung inkl. Wildcards
+        self._batch_topics = set()  # Topics, deren Handler SampleBatch direkt verarbeiten
 
         # Service-Status
         self._status = "initializing"
         self._start_time = None
         self._heartbeat_interval = self.config.get("mqtt.heartbeat_interval", 30.0)
 
+        # Latenz-Tracing (aktiv mit SUSPENSION_TRACING=1)
+        self.tracer = get_tracer(service_name)
+
         self.logger.info(f"Service {service_name} initialized")
 
     def _create_mqtt_handler(self) -> MqttHandler:
@@ -276,18 +298,27 @@ class MqttServiceBase(ABC):
         self,
         topic: str,
         handler: Union[Callable, Callable[[str, Dict[str, Any]], None]],
+        accepts_batches: bool = False,
     ):
         """
         Registriert Handler für spezifisches MQTT-Topic
 
         Args:
-            topic: MQTT-Topic zum Abonnieren
+            topic: MQTT-Topic zum Abonnieren (unterstützt Wildcards + und #)
             handler: Handler-Funktion (kann sync oder async sein)
+            accepts_batches: Handler verarbeitet Binär-Frames als SampleBatch,
+                sonst werden sie als einzelne Sample-Dicts zugestellt
         """
         self._topic_handlers[topic] = handler
+        self._handler_router.set(topic, handler)
+        if accepts_batches:
+            self._batch_topics.add(topic)
+        else:
+            self._batch_topics.discard(topic)
 
-        # Sync Callback-Wrapper für MQTT-Library registrieren
-        self.mqtt.subscribe(topic, self._sync_callback_wrapper)
+        # Sync Callback-Wrapper für MQTT-Library registrieren (Batches werden
+        # erst im Processing-Loop bei Bedarf expandiert)
+        self.mqtt.subscribe(topic, self._sync_callback_wrapper, accepts_batches=True)
 
         self.logger.debug(f"Registered handler for topic: {topic}")
 
@@ -295,8 +326,10 @@ class MqttServiceBase(ABC):
         """
         Bridge zwischen sync MQTT-Callbacks und async Service-Handlers
 
-        Diese Methode wird von der MQTT-Library synchron aufgerufen und
-        leitet Messages an die async Message-Queue weiter.
+        Diese Methode wird von der MQTT-Library synchron im Netzwerk-Thread
+        aufgerufen und reiht Messages thread-sicher in die begrenzte
+        Message-Queue ein. Bei voller Queue greift die Drop-Policy der
+        Topic-Klasse (siehe MessageIngestQueue).
 
         Args:
             topic: MQTT-Topic
@@ -304,8 +337,13 @@ class MqttServiceBase(ABC):
         """
         try:
             if self._running:
-                # Message in async Queue einreihen für Processing
-                asyncio.create_task(self._message_queue.put((topic, message)))
+                if self.tracer.enabled:
+                    count = len(message) if isinstance(message, SampleBatch) else 1
+                    self.tracer.stamp(trace_id_of(message), STAGE_MQTT_RECEIVE, count)
+
+                # Message thread-sicher einreihen für Processing
+                if not self._message_queue.put(topic, message):
+                    self.logger.debug(f"Message queue full, dropped message on {topic}")
         except Exception as e:
             self.logger.error(f"Error in sync callback wrapper for {topic}: {e}")
 
@@ -325,21 +363,29 @@ class MqttServiceBase(ABC):
                     self._message_queue.get(), timeout=1.0
                 )
 
-                # Entsprechenden Handler finden und aufrufen
-                handler = self._topic_handlers.get(topic)
-                if handler:
+                # Passende Handler (exakt und über Wildcards) finden und aufrufen
+                routes = self._handler_router.match(topic)
+                if not routes:
+                    self.logger.warning(f"No handler registered for topic: {topic}")
+
+                for pattern, handler in routes:
                     try:
-                        # Handler aufrufen (async oder sync)
-                        if asyncio.iscoroutinefunction(handler):
-                            await handler(topic, message)
+                        if isinstance(message, SampleBatch) and pattern not in self._batch_topics:
+                            # Legacy-Handler: Batch als einzelne Sample-Dicts
+                            messages = message.to_samples()
                         else:
-                            handler(topic, message)
+                            messages = [message]
+
+                        # Handler aufrufen (async oder sync)
+                        for item in messages:
+                            if asyncio.iscoroutinefunction(handler):
+                                await handler(topic, item)
+                            else:
+                                handler(topic, item)
                     except Exception as e:
-                        self.logger.error(f"Error in topic handler for {topic}: {e}")
+                        self.logger.error(f"Error in topic handler for {pattern}: {e}")
                         # Optional: Error-Recovery oder Benachrichtigung
                         await self._handle_handler_error(topic, message, e)
-                else:
-                    self.logger.warning(f"No handler registered for topic: {topic}")
 
             except asyncio.TimeoutError:
                 # Timeout ist normal, weitermachen
@@ -382,6 +428,8 @@ class MqttServiceBase(ABC):
         while self._running:
             try:
                 await self.publish_heartbeat()
+                if self.tracer.enabled:
+                    await self.publish(TRACE_TOPIC, self.tracer.export())
                 await asyncio.sleep(self._heartbeat_interval)
             except Exception as e:
                 self.logger.error(f"Error in heartbeat loop: {e}")
@@ -409,6 +457,60 @@ class MqttServiceBase(ABC):
             self.logger.error(f"Error publishing to {topic}: {e}")
             return False
 
+    async def publish_samples(
+        self,
+        topic: str,
+        test_id: str,
+        position: str,
+        columns: Dict[str, Sequence[float]],
+        sequence: int = 0,
+        sample_rate: float = 0.0,
+        static_weight: Optional[float] = None,
+    ) -> bool:
+        """
+        Publiziert mehrere Samples als Binär-Frame auf "<topic>/bin"
+
+        Args:
+            topic: Basis-Topic (z.B. MqttTopics.RAW_DATA_COMPLETE)
+            test_id: Test-ID
+            position: Radposition
+            columns: Spalten nach Feldnamen (elapsed, platform_position, tire_force, ...)
+            sequence: Laufende Frame-Nummer
+            sample_rate: Abtastrate in Hz
+            static_weight: Statisches Gewicht (optional)
+
+        Returns:
+            True wenn erfolgreich, False bei Fehlern
+        """
+        try:
+            success = self.mqtt.publish_samples(
+                topic, test_id, position, columns, sequence, sample_rate, static_weight
+            )
+            if success and self.tracer.enabled:
+                count = len(next(iter(columns.values()), ()))
+                self.tracer.stamp(test_id, STAGE_MQTT_PUBLISH, count)
+            if not success:
+                self.logger.warning(f"MQTT batch publish failed for topic: {topic}")
+            return success
+        except Exception as e:
+            self.logger.error(f"Error publishing samples to {topic}: {e}")
+            return False
+
+    async def publish_trace(self, trace_id: str) -> bool:
+        """
+        Schließt den Trace eines Tests ab und publiziert ihn auf TRACE_TOPIC
+
+        Args:
+            trace_id: Test-ID
+
+        Returns:
+            True wenn ein Trace publiziert wurde
+        """
+        record = self.tracer.complete(trace_id)
+        if record is None:
+            return False
+        return await self.publish(TRACE_TOPIC, record)
+
     async def publish_status(
         self, status: str, details: Optional[Dict[str, Any]] = None
     ):
@@ -446,6 +548,7 @@ class MqttServiceBase(ABC):
             "status": self._status,
             "uptime": time.time() - self._start_time if self._start_time else 0,
             "message_queue_size": self._message_queue.qsize(),
+            "message_queue": self._message_queue.get_stats(),
             **(custom_data or {}),
         }
 
@@ -0,0 +1,266 @@
+"""
+Topic-Trie für die Zuordnung von MQTT-Nachrichten zu Subscriptions.
+
+Die Subscriptions werden einmalig in einen Trie über die Topic-Ebenen
+eingetragen; Wildcards (+ und #) sind eigene Knoten. Die aufgelösten
+Handler pro konkretem Topic werden gecacht, so dass wiederkehrende Topics
+ohne String-Splitting und ohne Durchlaufen aller Patterns zugestellt werden.
+Jede Änderung der Subscriptions verwirft den Cache.
+"""
+
+import threading
+from itertools import count
+from typing import Any, Dict, List, Optional, Tuple
+
+SINGLE_LEVEL_WILDCARD = "+"
+MULTI_LEVEL_WILDCARD = "#"
+
+Route = Tuple[str, Any]
+
+
+class _Node:
+    """Knoten des Topic-Tries (eine Topic-Ebene)"""
+
+    __slots__ = ("children", "pattern", "handlers", "order")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.pattern: Optional[str] = None
+        self.handlers: Tuple[Any, ...] = ()
+        self.order = 0
+
+
+class TopicRouter:
+    """
+    Trie-basierter Router für MQTT-Topic-Patterns
+
+    Features:
+    - Wildcards + (eine Ebene) und # (beliebig viele Ebenen, auch keine)
+    - Cache der aufgelösten Handler pro konkretem Topic
+    - Exakte Subscriptions vor Wildcards, sonst in Registrierungsreihenfolge
+    - Jeder Handler höchstens einmal pro Topic
+    - Lesen ohne Lock, Änderungen thread-sicher
+    """
+
+    def __init__(self, cache_size: int = 4096):
+        """
+        Initialisiert den Router
+
+        Args:
+            cache_size: Maximale Anzahl gecachter Topics
+        """
+        self.cache_size = cache_size
+
+        self._root = _Node()
+        self._patterns: Dict[str, _Node] = {}
+        self._cache: Dict[str, Tuple[Route, ...]] = {}
+        self._generation = 0
+        self._sequence = count()
+        self._lock = threading.Lock()
+
+        # Statistiken
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def __contains__(self, pattern: str) -> bool:
+        return pattern in self._patterns
+
+    def patterns(self) -> List[str]:
+        """Liefert alle registrierten Patterns"""
+        return list(self._patterns)
+
+    def handlers(self, pattern: str) -> Tuple[Any, ...]:
+        """Liefert die Handler eines Patterns"""
+        node = self._patterns.get(pattern)
+        return node.handlers if node is not None else ()
+
+    def add(self, pattern: str, handler: Any) -> None:
+        """
+        Registriert einen Handler für ein Topic-Pattern
+
+        Args:
+            pattern: Topic oder Pattern mit Wildcards
+            handler: Beliebiges Objekt (z. B. Callback)
+        """
+        with self._lock:
+            self._add(pattern, handler)
+
+    def set(self, pattern: str, handler: Any) -> None:
+        """
+        Ersetzt alle Handler eines Patterns durch einen einzelnen Handler
+
+        Args:
+            pattern: Topic oder Pattern mit Wildcards
+            handler: Neuer Handler
+        """
+        with self._lock:
+            self._remove(pattern, None)
+            self._add(pattern, handler)
+
+    def remove(self, pattern: str, handler: Any = None) -> bool:
+        """
+        Entfernt einen Handler oder alle Handler eines Patterns
+
+        Args:
+            pattern: Registriertes Pattern
+            handler: Zu entfernender Handler (None = alle)
+
+        Returns:
+            True wenn etwas entfernt wurde
+        """
+        with self._lock:
+            return self._remove(pattern, handler)
+
+    def clear(self) -> None:
+        """Entfernt alle Subscriptions"""
+        with self._lock:
+            self._root = _Node()
+            self._patterns.clear()
+            self._invalidate()
+
+    def match(self, topic: str) -> Tuple[Route, ...]:
+        """
+        Liefert alle (pattern, handler) für ein konkretes Topic
+
+        Args:
+            topic: Topic einer empfangenen Nachricht
+
+        Returns:
+            Tupel von (pattern, handler), exakte Subscription zuerst
+        """
+        routes = self._cache.get(topic)
+        if routes is not None:
+            self.cache_hits += 1
+            return routes
+
+        self.cache_misses += 1
+        generation = self._generation
+        routes = self._resolve(topic)
+
+        with self._lock:
+            # Nur cachen, wenn sich die Subscriptions zwischenzeitlich nicht geändert haben
+            if generation == self._generation:
+                if len(self._cache) >= self.cache_size:
+                    self._cache.clear()
+                self._cache[topic] = routes
+
+        return routes
+
+    def get_stats(self) -> Dict[str, int]:
+        """Gibt Statistiken des Routers zurück"""
+        return {
+            "patterns": len(self._patterns),
+            "cached_topics": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+    def _add(self, pattern: str, handler: Any) -> None:
+        node = self._patterns.get(pattern)
+        if node is None:
+            node = self._root
+            for level in pattern.split("/"):
+                child = node.children.get(level)
+                if child is None:
+                    child = node.children[level] = _Node()
+                node = child
+            node.pattern = pattern
+            node.order = next(self._sequence)
+            self._patterns[pattern] = node
+
+        if handler not in node.handlers:
+            # Copy-on-write, damit laufende match()-Aufrufe konsistent bleiben
+            node.handlers = node.handlers + (handler,)
+        self._invalidate()
+
+    def _remove(self, pattern: str, handler: Any) -> bool:
+        node = self._patterns.get(pattern)
+        if node is None:
+            return False
+
+        if handler is not None:
+            if handler not in node.handlers:
+                return False
+            node.handlers = tuple(h for h in node.handlers if h != handler)
+            if node.handlers:
+                self._invalidate()
+                return True
+
+        node.handlers = ()
+        node.pattern = None
+        del self._patterns[pattern]
+        self._prune(pattern.split("/"))
+        self._invalidate()
+        return True
+
+    def _prune(self, levels: List[str]) -> None:
+        """Entfernt leere Knoten entlang eines Pfads"""
+        path = [self._root]
+        for level in levels:
+            child = path[-1].children.get(level)
+            if child is None:
+                return
+            path.append(child)
+
+        for parent, level in zip(reversed(path[:-1]), reversed(levels)):
+            child = parent.children[level]
+            if child.children or child.pattern is not None:
+                return
+            del parent.children[level]
+
+    def _invalidate(self) -> None:
+        self._generation += 1
+        self._cache = {}
+
+    def _resolve(self, topic: str) -> Tuple[Route, ...]:
+        """Durchläuft den Trie für ein konkretes Topic"""
+        levels = topic.split("/")
+        matched: List[_Node] = []
+        nodes = [self._root]
+
+        for level in levels:
+            next_nodes = []
+            for node in nodes:
+                children = node.children
+                if not children:
+                    continue
+
+                multi = children.get(MULTI_LEVEL_WILDCARD)
+                if multi is not None and multi.pattern is not None:
+                    matched.append(multi)
+
+                child = children.get(level)
+                if child is not None:
+                    next_nodes.append(child)
+
+                single = children.get(SINGLE_LEVEL_WILDCARD)
+                if single is not None:
+                    next_nodes.append(single)
+
+            nodes = next_nodes
+            if not nodes:
+                break
+
+        for node in nodes:
+            if node.pattern is not None:
+                matched.append(node)
+
+            # "a/#" passt auch auf "a"
+            multi = node.children.get(MULTI_LEVEL_WILDCARD)
+            if multi is not None and multi.pattern is not None:
+                matched.append(multi)
+
+        matched.sort(key=lambda n: (n.pattern != topic, n.order))
+
+        # Ein Handler, der über mehrere Patterns passt, wird nur einmal zugestellt
+        routes: List[Route] = []
+        seen: List[Any] = []
+        for node in matched:
+            for handler in node.handlers:
+                if handler not in seen:
+                    seen.append(handler)
+                    routes.append((node.pattern, handler))
+        return tuple(routes)
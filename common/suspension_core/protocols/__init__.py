@@ -26,6 +26,7 @@ from .messages import (
 from .base_protocol import BaseProtocol
 from .protocol_factory import create_protocol
 from .eusama_protocol import EusamaProtocol
+from .eusama_decoder import EusamaDecoder, RAW_SAMPLE_DTYPE
 
 __all__ = [
     'MessageType',
@@ -46,4 +47,6 @@ __all__ = [
     'BaseProtocol',
     'create_protocol',
     'EusamaProtocol',
+    'EusamaDecoder',
+    'RAW_SAMPLE_DTYPE',
 ]
\ No newline at end of file
@@ -0,0 +1,241 @@
+# suspension_core/protocols/eusama_decoder.py
+"""
+Dekoder für EUSAMA-CAN-Frames.
+
+Einzelne Frames werden mit vorkompilierten struct.Struct-Layouts dekodiert,
+Rohdaten-Frames lassen sich zusätzlich als Batch in ein NumPy-Structured-Array
+überführen (ein np.frombuffer über die aneinandergehängten Nutzdaten statt
+Bit-Shifts pro Frame). Die Zuordnung erfolgt über ein Dict nach Arbitration-ID.
+"""
+
+import logging
+import struct
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Nachrichtentypen (entsprechen den Callback-Kategorien von EusamaProtocol)
+RAW_DATA = "raw_data"
+MOTOR_STATUS = "motor_status"
+TOP_POSITION = "top_position"
+
+# Seiten-Index in Batches -> Position
+SIDE_LEFT = 0
+SIDE_RIGHT = 1
+SIDE_POSITIONS = ("front_left", "front_right")
+
+# Phasenverschiebung: 0-255 entspricht 0-90°
+PHASE_SCALE = 90.0 / 255.0
+
+# Rohdaten: Plattformposition (u16), Reifenkraft (u16), Frequenz (u8), Phase (u8), 2 Byte Reserve
+RAW_DATA_STRUCT = struct.Struct("<HHBB2x")
+RAW_DATA_WIRE_DTYPE = np.dtype([
+    ("platform_position", "<u2"),
+    ("tire_force", "<u2"),
+    ("frequency", "u1"),
+    ("phase_raw", "u1"),
+    ("reserved", "V2"),
+])
+
+# Dekodierte Rohdaten-Samples eines Batches
+RAW_SAMPLE_DTYPE = np.dtype([
+    ("timestamp", "f8"),
+    ("side", "u1"),
+    ("platform_position", "u2"),
+    ("tire_force", "u2"),
+    ("frequency", "u1"),
+    ("phase_shift", "f8"),
+])
+
+_STATUS_STRUCT = struct.Struct("<B")
+
+# Mindestlänge der Nutzdaten pro Nachrichtentyp
+_MIN_LENGTH = {RAW_DATA: RAW_DATA_STRUCT.size, MOTOR_STATUS: 8, TOP_POSITION: _STATUS_STRUCT.size}
+
+
+class EusamaDecoder:
+    """
+    Dekodiert EUSAMA-Frames einzeln oder als Batch.
+
+    Die Arbitration-IDs werden einmalig in eine Dispatch-Tabelle
+    (ID -> Nachrichtentyp, Seite) eingetragen.
+    """
+
+    def __init__(self, base_id: int = 0x08AAAA60):
+        """
+        Initialisiert den Dekoder.
+
+        Args:
+                base_id: Basis-ID des Protokolls (ASCII 'EUS' << 5)
+        """
+        self.base_id = base_id
+        self.raw_data_left_id = base_id + 0
+        self.raw_data_right_id = base_id + 1
+        self.motor_status_id = base_id + 6
+        self.top_position_id = base_id + 7
+
+        # Arbitration-ID -> (Nachrichtentyp, Seite)
+        self.dispatch: Dict[int, Tuple[str, Optional[int]]] = {
+            self.raw_data_left_id: (RAW_DATA, SIDE_LEFT),
+            self.raw_data_right_id: (RAW_DATA, SIDE_RIGHT),
+            self.motor_status_id: (MOTOR_STATUS, None),
+            self.top_position_id: (TOP_POSITION, None),
+        }
+
+        self._parsers = {
+            RAW_DATA: self._parse_raw_data,
+            MOTOR_STATUS: self._parse_motor_status,
+            TOP_POSITION: self._parse_top_position,
+        }
+
+    def message_type(self, arbitration_id: int) -> Optional[str]:
+        """
+        Liefert den Nachrichtentyp einer Arbitration-ID.
+
+        Returns:
+                Nachrichtentyp oder None für fremde IDs
+        """
+        entry = self.dispatch.get(arbitration_id)
+        return entry[0] if entry else None
+
+    def decode(self, msg) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Dekodiert einen einzelnen Frame.
+
+        Args:
+                msg: CAN-Nachricht (arbitration_id, data, timestamp)
+
+        Returns:
+                (Nachrichtentyp, Daten-Dict); (None, None) für fremde IDs,
+                (Nachrichtentyp, None) für zu kurze Frames
+        """
+        return self.decode_payload(msg.arbitration_id, msg.data, msg.timestamp)
+
+    def decode_payload(self, arbitration_id: int, data, timestamp: Optional[float] = None
+                       ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Dekodiert die Nutzdaten eines Frames.
+
+        Args:
+                arbitration_id: CAN-ID
+                data: Nutzdaten (bytes, bytearray oder Liste von Bytes)
+                timestamp: Zeitstempel für Rohdaten (optional)
+
+        Returns:
+                Wie decode()
+        """
+        entry = self.dispatch.get(arbitration_id)
+        if entry is None:
+            return None, None
+
+        message_type, side = entry
+        if len(data) < _MIN_LENGTH[message_type]:
+            logger.warning(f"EUSAMA: Ungültige {message_type}-Nachricht (zu kurz)")
+            return message_type, None
+
+        if isinstance(data, list):
+            data = bytes(data)
+        return message_type, self._parsers[message_type](data, timestamp, side)
+
+    def decode_raw_batch(self, messages: Iterable) -> np.ndarray:
+        """
+        Dekodiert alle Rohdaten-Frames einer Nachrichtenfolge in ein Structured Array.
+
+        Frames anderer IDs und zu kurze Frames werden übersprungen.
+
+        Args:
+                messages: CAN-Nachrichten in Empfangsreihenfolge
+
+        Returns:
+                Array mit RAW_SAMPLE_DTYPE (Spalten timestamp, side,
+                platform_position, tire_force, frequency, phase_shift)
+        """
+        size = RAW_DATA_STRUCT.size
+        raw_ids = (self.raw_data_left_id, self.raw_data_right_id)
+
+        frames = [msg for msg in messages if msg.arbitration_id in raw_ids]
+        valid = [msg for msg in frames if len(msg.data) >= size]
+        if len(valid) != len(frames):
+            logger.warning(f"EUSAMA: {len(frames) - len(valid)} ungültige Rohdaten-Nachrichten (zu kurz)")
+
+        payload = b"".join([msg.data if len(msg.data) == size else msg.data[:size] for msg in valid])
+        timestamps = [msg.timestamp for msg in valid]
+        sides = [msg.arbitration_id == raw_ids[1] for msg in valid]
+
+        return self.decode_raw_payloads(payload, timestamps, sides)
+
+    @staticmethod
+    def decode_raw_payloads(payload: bytes, timestamps, sides) -> np.ndarray:
+        """
+        Dekodiert aneinandergehängte 8-Byte-Rohdaten-Nutzdaten.
+
+        Args:
+                payload: N * 8 Bytes Nutzdaten
+                timestamps: N Zeitstempel
+                sides: N Seiten (SIDE_LEFT/SIDE_RIGHT)
+
+        Returns:
+                Array mit RAW_SAMPLE_DTYPE
+        """
+        wire = np.frombuffer(payload, dtype=RAW_DATA_WIRE_DTYPE)
+
+        batch = np.empty(len(wire), dtype=RAW_SAMPLE_DTYPE)
+        batch["timestamp"] = timestamps
+        batch["side"] = sides
+        batch["platform_position"] = wire["platform_position"]
+        batch["tire_force"] = wire["tire_force"]
+        batch["frequency"] = wire["frequency"]
+        batch["phase_shift"] = wire["phase_raw"] * PHASE_SCALE
+        return batch
+
+    @staticmethod
+    def batch_to_dicts(batch: np.ndarray) -> list:
+        """
+        Wandelt einen Rohdaten-Batch in Dicts im bisherigen Callback-Format.
+
+        Args:
+                batch: Array mit RAW_SAMPLE_DTYPE
+
+        Returns:
+                Liste von Dicts mit platform_position, tire_force, frequency,
+                phase_shift, timestamp und position
+        """
+        columns = {name: batch[name].tolist() for name in RAW_SAMPLE_DTYPE.names}
+        return [
+            {
+                "platform_position": columns["platform_position"][i],
+                "tire_force": columns["tire_force"][i],
+                "frequency": columns["frequency"][i],
+                "phase_shift": columns["phase_shift"][i],
+                "timestamp": columns["timestamp"][i],
+                "position": SIDE_POSITIONS[columns["side"][i]],
+            }
+            for i in range(len(batch))
+        ]
+
+    # Parser für einzelne Frames
+    @staticmethod
+    def _parse_raw_data(data, timestamp, side):
+        platform_position, tire_force, frequency, phase_raw = RAW_DATA_STRUCT.unpack_from(data)
+        return {
+            "platform_position": platform_position,
+            "tire_force": tire_force,
+            "frequency": frequency,
+            "phase_shift": phase_raw * PHASE_SCALE,
+            "timestamp": timestamp,
+            "position": SIDE_POSITIONS[side],
+        }
+
+    @staticmethod
+    def _parse_motor_status(data, timestamp, side):
+        # Bit 0: Links, Bit 1: Rechts
+        (motor_status,) = _STATUS_STRUCT.unpack_from(data)
+        return {"left_running": bool(motor_status & 0x01), "right_running": bool(motor_status & 0x02)}
+
+    @staticmethod
+    def _parse_top_position(data, timestamp, side):
+        # Bit 0: Links, Bit 1: Rechts
+        (top_position,) = _STATUS_STRUCT.unpack_from(data)
+        return {"left_top": bool(top_position & 0x01), "right_top": bool(top_position & 0x02)}
@@ -1,5 +1,6 @@
 # suspension_core/protocols/eusama_protocol.py
 from .base_protocol import BaseProtocol
+from .eusama_decoder import EusamaDecoder, RAW_DATA
 import logging
 
 logger = logging.getLogger(__name__)
@@ -51,7 +52,10 @@ class EusamaProtocol(BaseProtocol):
                 can_interface: Eine Instanz der CanInterface-Klasse
         """
         self.can_interface = can_interface
-        self.callbacks = {"raw_data": [], "motor_status": [], "top_position": []}
+        self.decoder = EusamaDecoder(self.BASE_ID)
+
+        # "raw_batch"-Callbacks erhalten Rohdaten als Structured Array (RAW_SAMPLE_DTYPE)
+        self.callbacks = {"raw_data": [], "raw_batch": [], "motor_status": [], "top_position": []}
 
     def send_motor_command(self, side, duration):
         """
@@ -132,59 +136,89 @@ class EusamaProtocol(BaseProtocol):
 
         def on_message(msg):
             """Callback für empfangene CAN-Nachrichten"""
-            can_id = msg.arbitration_id
-
-            # Rohdaten der linken Seite
-            if can_id == self.RAW_DATA_LEFT_ID:
-                data = self._parse_raw_data(msg)
-                if data:
-                    data["position"] = "front_left"  # Position hinzufügen
-                    for callback in self.callbacks["raw_data"]:
-                        try:
-                            callback(data)
-                        except Exception as e:
-                            logger.error(f"EUSAMA: Fehler im Callback: {e}")
-
-            # Rohdaten der rechten Seite
-            elif can_id == self.RAW_DATA_RIGHT_ID:
-                data = self._parse_raw_data(msg)
-                if data:
-                    data["position"] = "front_right"  # Position hinzufügen
-                    for callback in self.callbacks["raw_data"]:
-                        try:
-                            callback(data)
-                        except Exception as e:
-                            logger.error(f"EUSAMA: Fehler im Callback: {e}")
-
-            # Motorstatus
-            elif can_id == self.MOTOR_STATUS_ID:
-                data = self._parse_motor_status(msg)
-                for callback in self.callbacks["motor_status"]:
-                    try:
-                        callback(data)
-                    except Exception as e:
-                        logger.error(f"EUSAMA: Fehler im Callback: {e}")
-
-            # Oberste Position der Platte
-            elif can_id == self.TOP_POSITION_ID:
-                data = self._parse_top_position(msg)
-                for callback in self.callbacks["top_position"]:
-                    try:
-                        callback(data)
-                    except Exception as e:
-                        logger.error(f"EUSAMA: Fehler im Callback: {e}")
-
-        # Callback für alle CAN-Nachrichten registrieren
-        self.can_interface.add_message_callback(on_message)
+            if msg.arbitration_id not in self.decoder.dispatch:
+                return
+
+            if self.decoder.message_type(msg.arbitration_id) == RAW_DATA and self.callbacks["raw_batch"]:
+                self.process_frames((msg,))
+                return
+
+            message_type, data = self.decoder.decode(msg)
+            if data is not None:
+                self._dispatch(message_type, data)
+
+        def on_batch(batch):
+            """Callback für Empfangsblöcke (CanInterface mit Batch-Empfang)"""
+            self.process_frames(batch.messages)
+
+        # Blockweise registrieren, wenn die Schnittstelle es unterstützt
+        if hasattr(self.can_interface, "add_batch_callback"):
+            self.can_interface.add_batch_callback(on_batch)
+        else:
+            self.can_interface.add_message_callback(on_message)
         logger.info("EUSAMA: Callbacks registriert")
         return True
 
+    def decode_message(self, arbitration_id, data):
+        """
+        Dekodiert die Nutzdaten einer CAN-Nachricht.
+
+        Args:
+                arbitration_id: CAN-ID
+                data: Nutzdaten
+
+        Returns:
+                Dictionary mit den extrahierten Daten oder None
+        """
+        return self.decoder.decode_payload(arbitration_id, data)[1]
+
+    def process_frames(self, messages):
+        """
+        Verarbeitet einen Block empfangener CAN-Nachrichten.
+
+        Rohdaten werden gemeinsam dekodiert und als ein Structured Array an die
+        "raw_batch"-Callbacks übergeben; "raw_data"-Callbacks erhalten weiterhin
+        ein Dict pro Frame. Übrige Nachrichten werden einzeln verarbeitet.
+
+        Args:
+                messages: CAN-Nachrichten in Empfangsreihenfolge
+
+        Returns:
+                Anzahl dekodierter Rohdaten-Samples
+        """
+        messages = list(messages)
+        batch = self.decoder.decode_raw_batch(messages)
+
+        if len(batch):
+            self._dispatch("raw_batch", batch)
+            if self.callbacks["raw_data"]:
+                for data in self.decoder.batch_to_dicts(batch):
+                    self._dispatch(RAW_DATA, data)
+
+        for msg in messages:
+            message_type = self.decoder.message_type(msg.arbitration_id)
+            if message_type is None or message_type == RAW_DATA:
+                continue
+            message_type, data = self.decoder.decode(msg)
+            if data is not None:
+                self._dispatch(message_type, data)
+
+        return len(batch)
+
+    def _dispatch(self, message_type, data):
+        """Ruft alle Callbacks eines Nachrichtentyps auf."""
+        for callback in self.callbacks[message_type]:
+            try:
+                callback(data)
+            except Exception as e:
+                logger.error(f"EUSAMA: Fehler im Callback: {e}")
+
     def add_callback(self, message_type, callback):
         """
         Fügt einen Callback für einen bestimmten Nachrichtentyp hinzu.
 
         Args:
-                message_type: Art der Nachricht ("raw_data", "motor_status", "top_position")
+                message_type: Art der Nachricht ("raw_data", "raw_batch", "motor_status", "top_position")
                 callback: Callback-Funktion
 
         Returns:
@@ -325,80 +359,3 @@ class EusamaProtocol(BaseProtocol):
             "data": data,
             "is_extended_id": True,
         }
-
-    # Private Methoden zur Verarbeitung von CAN-Nachrichten
-    def _parse_raw_data(self, msg):
-        """
-        Verarbeitet eine Rohdaten-Nachricht.
-
-        Args:
-                msg: CAN-Nachricht
-
-        Returns:
-                Dictionary mit den extrahierten Daten
-        """
-        if len(msg.data) < 8:
-            logger.warning("EUSAMA: Ungültige Rohdaten-Nachricht (zu kurz)")
-            return None
-
-        # Plattformposition (0-1023)
-        platform_position = (msg.data[1] << 8) | msg.data[0]
-
-        # Reifenkraft (0-1023)
-        tire_force = (msg.data[3] << 8) | msg.data[2]
-
-        # Frequenz (0-255 Hz)
-        frequency = msg.data[4]
-
-        # Phasenverschiebung (0-255 entspricht 0-90°)
-        phase_shift = msg.data[5] * (90.0 / 255.0)
-
-        return {
-            "platform_position": platform_position,
-            "tire_force": tire_force,
-            "frequency": frequency,
-            "phase_shift": phase_shift,
-            "timestamp": msg.timestamp,
-        }
-
-    def _parse_motor_status(self, msg):
-        """
-        Verarbeitet eine Motorstatus-Nachricht.
-
-        Args:
-                msg: CAN-Nachricht
-
-        Returns:
-                Dictionary mit den extrahierten Daten
-        """
-        if len(msg.data) < 8:
-            logger.warning("EUSAMA: Ungültige Motorstatus-Nachricht (zu kurz)")
-            return None
-
-        # Motorstatus (Bit 0: Links, Bit 1: Rechts)
-        motor_status = msg.data[0]
-        left_running = bool(motor_status & self.MOTOR_MASK_LEFT)
-        right_running = bool(motor_status & self.MOTOR_MASK_RIGHT)
-
-        return {"left_running": left_running, "right_running": right_running}
-
-    def _parse_top_position(self, msg):
-        """
-        Verarbeitet eine Top-Position-Nachricht.
-
-        Args:
-                msg: CAN-Nachricht
-
-        Returns:
-                Dictionary mit den extrahierten Daten
-        """
-        if len(msg.data) < 1:
-            logger.warning("EUSAMA: Ungültige Top-Position-Nachricht (zu kurz)")
-            return None
-
-        # Top-Position-Status (Bit 0: Links, Bit 1: Rechts)
-        top_position = msg.data[0]
-        left_top = bool(top_position & self.TOP_POS_LEFT)
-        right_top = bool(top_position & self.TOP_POS_RIGHT)
-
-        return {"left_top": left_top, "right_top": right_top}
\ No newline at end of file
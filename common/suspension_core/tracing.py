@@ -0,0 +1,378 @@
+"""
+Latenz-Tracing über die gesamte Pipeline
+
+Jede Station stempelt für einen Test (trace_id = test_id) monotone
+Zeitstempel je Stufe:
+
+    CAN-Empfang → Protokoll-Dekodierung → MQTT-Publish → MQTT-Empfang →
+    Queue-Eintritt → Queue-Austritt → Analyse-Start → Analyse-Ende →
+    Ergebnis-Publish → GUI-Darstellung
+
+Pro Stufe werden erster und letzter Stempel sowie die Anzahl gezählt (Stufen
+mit vielen Samples wie CAN-Empfang ergeben so eine Spanne). Mit complete()
+wird ein Trace abgeschlossen: die Abstände zwischen aufeinanderfolgenden
+Stufen fließen in Histogramme pro Stufe ein. Services publizieren
+Histogramme und die letzten Traces auf TRACE_TOPIC; tools/trace_waterfall.py
+setzt daraus den Wasserfall eines Tests über alle Prozesse zusammen.
+
+Ist das Tracing deaktiviert (Standard, aktivieren mit SUSPENSION_TRACING=1),
+kehrt stamp() nach einer Attributabfrage zurück.
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENV_VAR = "SUSPENSION_TRACING"
+TRACE_TOPIC = "suspension/diagnostics/trace"
+
+# Stufen in Pipeline-Reihenfolge
+STAGE_CAN_RECEIVE = "can_receive"
+STAGE_PROTOCOL_DECODE = "protocol_decode"
+STAGE_MQTT_PUBLISH = "mqtt_publish"
+STAGE_MQTT_RECEIVE = "mqtt_receive"
+STAGE_QUEUE_ENTER = "queue_enter"
+STAGE_QUEUE_EXIT = "queue_exit"
+STAGE_ANALYSIS_START = "analysis_start"
+STAGE_ANALYSIS_END = "analysis_end"
+STAGE_RESULT_PUBLISH = "result_publish"
+STAGE_GUI_RENDER = "gui_render"
+
+STAGES = (
+    STAGE_CAN_RECEIVE,
+    STAGE_PROTOCOL_DECODE,
+    STAGE_MQTT_PUBLISH,
+    STAGE_MQTT_RECEIVE,
+    STAGE_QUEUE_ENTER,
+    STAGE_QUEUE_EXIT,
+    STAGE_ANALYSIS_START,
+    STAGE_ANALYSIS_END,
+    STAGE_RESULT_PUBLISH,
+    STAGE_GUI_RENDER,
+)
+_STAGE_ORDER = {stage: index for index, stage in enumerate(STAGES)}
+
+# Obere Bucket-Grenzen der Histogramme in ms (letzter Bucket: darüber)
+HISTOGRAM_BOUNDS_MS = (
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0,
+    250.0, 500.0, 1000.0, 2500.0, 5000.0, 10000.0, 30000.0,
+)
+
+
+class StageHistogram:
+    """Histogramm mit festen, logarithmisch gestuften Buckets"""
+
+    __slots__ = ("buckets", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, value_ms: float) -> None:
+        self.buckets[bisect.bisect_left(HISTOGRAM_BOUNDS_MS, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def percentile(self, q: float) -> float:
+        """Obere Bucket-Grenze, unter der q Prozent der Werte liegen (höchstens das Maximum)"""
+        if not self.count:
+            return 0.0
+        target = q / 100.0 * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= target and bucket:
+                return min(HISTOGRAM_BOUNDS_MS[index], self.max_ms) if index < len(HISTOGRAM_BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": list(self.buckets),
+        }
+
+
+class Tracer:
+    """
+    Sammelt Stufen-Zeitstempel pro Trace und aggregiert Histogramme
+
+    Features:
+    - Spanne (erster/letzter Stempel, Anzahl) pro Stufe und Trace
+    - Begrenzte Anzahl offener Traces (älteste werden verworfen)
+    - Histogramme der Stufenabstände abgeschlossener Traces
+    - Export als JSON-fähiges Dict für TRACE_TOPIC
+    """
+
+    def __init__(self, service: str = "unknown", enabled: bool = False,
+                 max_traces: int = 256, keep_completed: int = 50):
+        """
+        Initialisiert den Tracer
+
+        Args:
+            service: Name des Prozesses im Export (z.B. "pi_processing")
+            enabled: Tracing aktiv
+            max_traces: Maximale Anzahl gleichzeitig offener Traces
+            keep_completed: Anzahl abgeschlossener Traces im Export
+        """
+        self.service = service
+        self.enabled = enabled
+        self.max_traces = max_traces
+        self._active: "OrderedDict[str, Dict[str, List[float]]]" = OrderedDict()
+        self._completed: Deque[Dict[str, Any]] = deque(maxlen=keep_completed)
+        self._histograms: Dict[str, StageHistogram] = {}
+        self._lock = threading.Lock()
+
+        # Statistiken
+        self.stamps = 0
+        self.completed = 0
+        self.evicted = 0
+
+    def stamp(self, trace_id: Optional[str], stage: str, count: int = 1,
+              timestamp: Optional[float] = None) -> None:
+        """
+        Stempelt eine Stufe eines Traces
+
+        Args:
+            trace_id: Test-ID (None wird ignoriert)
+            stage: Stufe (STAGE_*)
+            count: Anzahl Samples/Frames, die der Stempel abdeckt
+            timestamp: Monotoner Zeitpunkt (Standard: jetzt)
+        """
+        if not self.enabled or not trace_id:
+            return
+        now = time.monotonic() if timestamp is None else timestamp
+
+        with self._lock:
+            self.stamps += 1
+            spans = self._active.get(trace_id)
+            if spans is None:
+                if len(self._active) >= self.max_traces:
+                    self._active.popitem(last=False)
+                    self.evicted += 1
+                spans = self._active[trace_id] = {}
+            span = spans.get(stage)
+            if span is None:
+                spans[stage] = [now, now, count]
+            else:
+                span[1] = now
+                span[2] += count
+
+    def complete(self, trace_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Schließt einen Trace ab und übernimmt die Stufenabstände in die Histogramme
+
+        Args:
+            trace_id: Test-ID
+
+        Returns:
+            Trace-Record (siehe export_trace) oder None
+        """
+        if not self.enabled or not trace_id:
+            return None
+
+        with self._lock:
+            spans = self._active.pop(trace_id, None)
+            if not spans:
+                return None
+
+            ordered = sorted(spans.items(), key=lambda item: (_STAGE_ORDER.get(item[0], len(STAGES)), item[1][0]))
+            previous = None
+            for stage, (start, _, _) in ordered:
+                if previous is not None:
+                    self._histogram(stage).add((start - previous) * 1000)
+                previous = start
+            self._histogram("total").add((max(span[1] for span in spans.values()) - ordered[0][1][0]) * 1000)
+
+            record = {
+                "trace_id": trace_id,
+                "service": self.service,
+                "spans": {
+                    stage: {"start": start, "end": end, "count": count}
+                    for stage, (start, end, count) in ordered
+                },
+            }
+            self._completed.append(record)
+            self.completed += 1
+
+        return self.export_trace(record)
+
+    def trace(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """Gibt einen offenen oder abgeschlossenen Trace zurück"""
+        with self._lock:
+            spans = self._active.get(trace_id)
+            if spans is not None:
+                return self.export_trace({
+                    "trace_id": trace_id,
+                    "service": self.service,
+                    "spans": {
+                        stage: {"start": start, "end": end, "count": count}
+                        for stage, (start, end, count) in spans.items()
+                    },
+                })
+            for record in reversed(self._completed):
+                if record["trace_id"] == trace_id:
+                    return self.export_trace(record)
+        return None
+
+    def export_trace(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Trace-Nachricht für TRACE_TOPIC (clock_offset: Wanduhr minus monotone Uhr)"""
+        return {"type": "trace", "clock_offset": _clock_offset(), **record}
+
+    def export(self) -> Dict[str, Any]:
+        """
+        Zusammenfassung für TRACE_TOPIC
+
+        Returns:
+            Dict mit Histogrammen pro Stufe und den letzten abgeschlossenen Traces
+        """
+        with self._lock:
+            histograms = {stage: histogram.to_dict() for stage, histogram in self._histograms.items()}
+            traces = list(self._completed)
+            active = len(self._active)
+
+        return {
+            "type": "summary",
+            "service": self.service,
+            "timestamp": time.time(),
+            "clock_offset": _clock_offset(),
+            "histograms": histograms,
+            "traces": traces,
+            "active_traces": active,
+        }
+
+    def reset(self) -> None:
+        """Verwirft alle Traces und Histogramme"""
+        with self._lock:
+            self._active.clear()
+            self._completed.clear()
+            self._histograms.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Zustand und Zähler des Tracers zurück"""
+        return {
+            "enabled": self.enabled,
+            "stamps": self.stamps,
+            "active_traces": len(self._active),
+            "completed": self.completed,
+            "evicted": self.evicted,
+        }
+
+    def _histogram(self, stage: str) -> StageHistogram:
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            histogram = self._histograms[stage] = StageHistogram()
+        return histogram
+
+
+def _clock_offset() -> float:
+    return time.time() - time.monotonic()
+
+
+def trace_id_of(message: Any) -> Optional[str]:
+    """Liefert die Test-ID einer Nachricht (Dict oder SampleBatch)"""
+    if isinstance(message, dict):
+        return message.get("test_id")
+    return getattr(message, "test_id", None)
+
+
+def format_waterfall(trace_id: str, records: Iterable[Dict[str, Any]], width: int = 40) -> str:
+    """
+    Formatiert die Trace-Records eines Tests als Wasserfall
+
+    Records verschiedener Prozesse werden über clock_offset auf die Wanduhr
+    umgerechnet (auf demselben Rechner exakt, sonst bis auf den Uhrenversatz).
+
+    Args:
+        trace_id: Test-ID
+        records: Trace-Records (type "trace") oder Zusammenfassungen (type "summary")
+        width: Breite des Balkenbereichs in Zeichen
+
+    Returns:
+        Mehrzeiliger Text
+    """
+    spans = []
+    for record in records:
+        candidates = record.get("traces", []) if record.get("type") == "summary" else [record]
+        offset = record.get("clock_offset", 0.0)
+        for trace in candidates:
+            if trace.get("trace_id") != trace_id:
+                continue
+            for stage, span in trace.get("spans", {}).items():
+                key = (stage, trace.get("service", record.get("service", "?")))
+                spans.append((key, span["start"] + offset, span["end"] + offset, span["count"]))
+
+    if not spans:
+        return f"Keine Trace-Daten für {trace_id}"
+
+    # Doppelte Exporte desselben Prozesses zusammenfassen
+    merged: Dict[tuple, tuple] = {}
+    for key, start, end, count in spans:
+        merged[key] = (start, end, count)
+
+    rows = sorted(merged.items(), key=lambda item: (_STAGE_ORDER.get(item[0][0], len(STAGES)), item[1][0]))
+    origin = min(start for start, _, _ in merged.values())
+    total = max(end for _, end, _ in merged.values()) - origin
+    scale = width / total if total > 0 else 0.0
+
+    lines = [
+        f"Trace {trace_id}: {len(rows)} Stufen, gesamt {total * 1000:.1f} ms",
+        f"{'Stufe':<16} {'Prozess':<16} {'Start ms':>10} {'Dauer ms':>10} {'Anzahl':>7}  Verlauf",
+    ]
+    for (stage, service), (start, end, count) in rows:
+        offset = int((start - origin) * scale)
+        length = max(1, int(round((end - start) * scale)))
+        bar = " " * min(offset, width - 1) + "█" * min(length, width - min(offset, width - 1))
+        lines.append(
+            f"{stage:<16} {service:<16} {(start - origin) * 1000:>10.1f} {(end - start) * 1000:>10.1f} "
+            f"{count:>7}  |{bar:<{width}}|"
+        )
+    return "\n".join(lines)
+
+
+_default_tracer: Optional[Tracer] = None
+_default_tracer_lock = threading.Lock()
+
+
+def get_tracer(service: Optional[str] = None) -> Tracer:
+    """
+    Liefert den prozessweiten Tracer (aktiv, wenn SUSPENSION_TRACING gesetzt ist)
+
+    Args:
+        service: Prozessname für den Export (setzt den Namen beim ersten Aufruf mit Namen)
+    """
+    global _default_tracer
+
+    if _default_tracer is None:
+        with _default_tracer_lock:
+            if _default_tracer is None:
+                enabled = os.environ.get(TRACING_ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+                _default_tracer = Tracer(service or "unknown", enabled=enabled)
+                if enabled:
+                    logger.info("Latenz-Tracing aktiviert")
+
+    if service and _default_tracer.service == "unknown":
+        _default_tracer.service = service
+    return _default_tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Setzt den prozessweiten Tracer (None = beim nächsten Zugriff neu bestimmen)"""
+    global _default_tracer
+
+    with _default_tracer_lock:
+        _default_tracer = tracer
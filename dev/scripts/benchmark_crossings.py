@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Micro-Benchmark: Kreuzungen des statischen Gewichts, Schleife vs. NumPy
+
+Vergleicht für ein 30-s-Testsignal (1 kHz, 20 → 5 Hz):
+- loop:       ursprüngliche Python-Schleife über alle Samples
+- vectorized: EGEASignalProcessor.find_static_weight_crossing_times
+
+Aufruf aus dem Projektverzeichnis:
+    python dev/scripts/benchmark_crossings.py [--repeats 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from common.suspension_core.egea.utils.signal_processing import (  # noqa: E402
+    EGEASignalProcessor,
+    create_egea_test_signals,
+)
+
+
+def loop_crossings(force_signal, time_array, static_weight):
+    """Ursprüngliche Schleifen-Implementierung"""
+    crossings = []
+    for i in range(1, len(force_signal)):
+        prev_force = force_signal[i - 1]
+        curr_force = force_signal[i]
+        if (prev_force < static_weight < curr_force) or (prev_force > static_weight > curr_force):
+            fraction = (static_weight - prev_force) / (curr_force - prev_force)
+            crossing_time = time_array[i - 1] + fraction * (time_array[i] - time_array[i - 1])
+            crossings.append((crossing_time, "up" if curr_force > prev_force else "down"))
+    return crossings
+
+
+def best_of(func, repeats):
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    processor = EGEASignalProcessor()
+    t, _, force = create_egea_test_signals(duration=30.0, fs=1000.0, start_freq=20.0, end_freq=5.0)
+    static_weight = 500.0
+
+    loop_time = best_of(lambda: loop_crossings(force, t, static_weight), args.repeats)
+    vectorized_time = best_of(
+        lambda: processor.find_static_weight_crossing_times(force, t, static_weight), args.repeats
+    )
+
+    print(f"{'Variante':<12} {'ms':>10}")
+    print(f"{'loop':<12} {loop_time * 1000:>10.2f}")
+    print(f"{'vectorized':<12} {vectorized_time * 1000:>10.2f}")
+    print(f"Speedup: {loop_time / vectorized_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Micro-Benchmark: MQTT-Zustellung über Topic-Trie vs. lineare Pattern-Suche
+
+Vergleicht die Kosten pro Nachricht für 10, 100 und 1000 Subscriptions:
+- linear: bisheriges Verfahren (exakter Lookup + _topic_matches über alle Patterns)
+- trie:   TopicRouter.match mit Cache pro konkretem Topic
+
+Aufruf aus dem Projektverzeichnis:
+    python dev/scripts/benchmark_topic_router.py [--messages 20000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from common.suspension_core.mqtt.topic_router import TopicRouter  # noqa: E402
+
+POSITIONS = ("front_left", "front_right", "rear_left", "rear_right")
+KINDS = ("raw", "processed", "status", "result", "config")
+
+
+def topic_matches(pattern: str, topic: str) -> bool:
+    """Bisherige Wildcard-Prüfung aus MqttClient (teilt beide Strings pro Aufruf)"""
+    pattern_parts = pattern.split("/")
+    topic_parts = topic.split("/")
+
+    for i, pattern_part in enumerate(pattern_parts):
+        if pattern_part == "#":
+            return True
+        if i >= len(topic_parts):
+            return False
+        if pattern_part == "+":
+            continue
+        if pattern_part != topic_parts[i]:
+            return False
+
+    return len(pattern_parts) == len(topic_parts)
+
+
+def linear_dispatch(callbacks, topic):
+    calls = 0
+    if topic in callbacks:
+        calls += len(callbacks[topic])
+    for pattern, handlers in callbacks.items():
+        if topic_matches(pattern, topic) and pattern != topic:
+            calls += len(handlers)
+    return calls
+
+
+def trie_dispatch(router, topic):
+    return len(router.match(topic))
+
+
+def build_patterns(count: int, rng: random.Random):
+    """Erzeugt exakte Topics und einen Anteil Wildcard-Patterns"""
+    patterns = []
+    for i in range(count):
+        service = f"service_{i}"
+        kind = rng.choice(KINDS)
+        if i % 10 == 0:
+            patterns.append(f"suspension/{service}/+")
+        elif i % 25 == 0:
+            patterns.append(f"suspension/{service}/#")
+        else:
+            patterns.append(f"suspension/{service}/{kind}")
+    return patterns
+
+
+def build_topics(patterns, rng: random.Random, count: int):
+    """Konkrete Topics, wie sie im Betrieb wiederkehrend eintreffen"""
+    concrete = [p.replace("+", rng.choice(KINDS)).replace("#", rng.choice(POSITIONS)) for p in patterns]
+    concrete += [f"suspension/unknown/{rng.choice(POSITIONS)}" for _ in range(10)]
+    return [rng.choice(concrete) for _ in range(count)]
+
+
+def measure(fn, target, topics) -> float:
+    start = time.perf_counter()
+    for topic in topics:
+        fn(target, topic)
+    return (time.perf_counter() - start) / len(topics) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000, help="Nachrichten pro Messung")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'Subscriptions':>13} | {'linear [µs]':>11} | {'trie [µs]':>9} | {'Faktor':>6}")
+    print("-" * 50)
+
+    for count in (10, 100, 1000):
+        rng = random.Random(args.seed)
+        patterns = build_patterns(count, rng)
+        topics = build_topics(patterns, rng, args.messages)
+
+        callbacks = {pattern: [object()] for pattern in patterns}
+        router = TopicRouter()
+        for pattern, handlers in callbacks.items():
+            router.add(pattern, handlers[0])
+
+        # Gleiche Ergebnisse sicherstellen
+        for topic in set(topics):
+            assert linear_dispatch(callbacks, topic) == trie_dispatch(router, topic), topic
+
+        linear = measure(linear_dispatch, callbacks, topics)
+        trie = measure(trie_dispatch, router, topics)
+        print(f"{count:>13} | {linear:>11.2f} | {trie:>9.2f} | {linear / trie:>5.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,16 @@ import numpy as np
 # MQTT Client Import (angepasst)
 import paho.mqtt.client as mqtt
 
+# Latenz-Tracing aus der Common Library (optional, aktiv mit SUSPENSION_TRACING=1)
+try:
+    import sys
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).resolve().parents[2] / "common"))
+    from suspension_core.tracing import STAGE_GUI_RENDER, TRACE_TOPIC, get_tracer
+    TRACING_AVAILABLE = True
+except ImportError:
+    TRACING_AVAILABLE = False
+
 # Logging Setup
 import logging
 logging.basicConfig(level=logging.DEBUG)  # DEBUG statt INFO
@@ -824,6 +834,18 @@ class SimplifiedGUI:
         except Exception as e:
             self._log_message("Error", f"Fehler bei Live-Daten: {e}", "error")
 
+    def _trace_render(self, test_id: Optional[str]):
+        """Stempelt die Darstellung eines Ergebnisses und publiziert den Trace"""
+        if not TRACING_AVAILABLE:
+            return
+        tracer = get_tracer("desktop_gui")
+        if not tracer.enabled:
+            return
+        tracer.stamp(test_id, STAGE_GUI_RENDER)
+        record = tracer.complete(test_id)
+        if record is not None:
+            self.mqtt_client.publish(TRACE_TOPIC, record)
+
     def _handle_final_test_result(self, topic: str, payload: Dict[str, Any]):
         """Verarbeitet finale Testergebnisse mit vollständigen Sinuskurven"""
         try:
@@ -844,6 +866,7 @@ class SimplifiedGUI:
 
                 # Zeige finale Sinuskurven
                 self.live_data_display.display_final_result(result_data)
+                self._trace_render(result_data.get('test_id'))
 
                 # Test-Control zurücksetzen
                 self.test_control._reset_ui()
@@ -86,166 +86,196 @@ class MemoryPool:
             }
 
 
+class RingSnapshot:
+    """
+    Consistent window of a RingBuffer without copying.
+
+    Holds one or two views into the ring storage (two when the window wraps
+    around the end of the array). The views stay valid until the writer laps
+    the ring; ``is_valid()`` tells whether that has happened yet.
+    """
+
+    def __init__(self, ring: 'RingBuffer', start: int, end: int, segments: tuple):
+        self.ring = ring
+        self.start = start
+        self.end = end
+        self.segments = segments
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def is_valid(self) -> bool:
+        """Check that no sample of the window has been overwritten since."""
+        return self.ring._is_intact(self.start)
+
+    def channel(self, name: str) -> np.ndarray:
+        """Get one channel; a view unless the window wraps around."""
+        if len(self.segments) == 1:
+            return self.segments[0][name]
+        return np.concatenate([segment[name] for segment in self.segments])
+
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """Get all channels as contiguous copies."""
+        return {name: np.concatenate([segment[name] for segment in self.segments])
+                for name in RingBuffer.CHANNELS}
+
+
 class RingBuffer:
     """
     High-performance ring buffer for time-series data.
-    Memory-efficient with pre-allocated arrays.
+
+    All channels share one structured array (one row per sample), so a sample
+    is stored with a single row assignment. Reads never block the writer:
+    the single producer bumps a sequence counter before and after each row
+    (odd = write in progress), readers derive their window from it and check
+    it again after copying, retrying if the writer lapped them meanwhile. One
+    spare slot keeps the row being written outside every visible window.
     """
-    
+
+    CHANNELS = ('time', 'platform_position', 'tire_force', 'frequency', 'phase_shift')
+    MAX_READ_RETRIES = 8
+
     def __init__(self, capacity: int, dtype=np.float64):
         self.capacity = capacity
-        self.dtype = dtype
-        
-        # Pre-allocated arrays
-        self.time_data = np.zeros(capacity, dtype=dtype)
-        self.platform_data = np.zeros(capacity, dtype=dtype)
-        self.force_data = np.zeros(capacity, dtype=dtype)
-        self.frequency_data = np.zeros(capacity, dtype=dtype)
-        self.phase_data = np.zeros(capacity, dtype=dtype)
-        
-        # Ring buffer state
-        self.write_index = 0
-        self.size = 0
-        self.lock = threading.RLock()
-        
+        self.dtype = np.dtype(dtype)
+
+        # Time stays float64, float32 would round epoch timestamps to minutes
+        self.row_dtype = np.dtype([('time', np.float64)] +
+                                  [(name, self.dtype) for name in self.CHANNELS[1:]])
+        self._slots = capacity + 1
+        self._data = np.zeros(self._slots, dtype=self.row_dtype)
+
+        # Ring buffer state: samples written = _seq >> 1
+        self._seq = 0
+        self._base = 0  # first visible sample, moved forward by clear()
+
         # Performance tracking
-        self.total_writes = 0
         self.total_reads = 0
-        
-        logger.debug(f"RingBuffer initialized: capacity={capacity}, dtype={dtype}")
-    
+        self.reader_retries = 0
+        self.copies_avoided = 0
+
+        logger.debug(f"RingBuffer initialized: capacity={capacity}, dtype={self.dtype}")
+
+    @property
+    def total_writes(self) -> int:
+        return self._seq >> 1
+
+    @property
+    def size(self) -> int:
+        start, end = self._window(None)
+        return end - start
+
     def append(self, time_val: float, platform_val: float, force_val: float,
               frequency_val: float = 0.0, phase_val: float = 0.0):
-        """Append data point to ring buffer."""
-        with self.lock:
-            idx = self.write_index
-            
-            # Write data
-            self.time_data[idx] = time_val
-            self.platform_data[idx] = platform_val
-            self.force_data[idx] = force_val
-            self.frequency_data[idx] = frequency_val
-            self.phase_data[idx] = phase_val
-            
-            # Update indices
-            self.write_index = (self.write_index + 1) % self.capacity
-            self.size = min(self.size + 1, self.capacity)
-            self.total_writes += 1
-    
-    def get_data(self, max_points: Optional[int] = None) -> Dict[str, np.ndarray]:
-        """Get data from ring buffer with memory-efficient copying."""
-        with self.lock:
-            if self.size == 0:
-                return self._empty_result()
-            
-            # Determine number of points to return
-            n_points = self.size
-            if max_points and max_points < n_points:
-                # Use decimation for memory efficiency
-                step = n_points // max_points
-                indices = np.arange(0, n_points, step)[:max_points]
-            else:
-                indices = np.arange(n_points)
-            
-            # Handle ring buffer wraparound
-            if self.size < self.capacity:
-                # Buffer not full yet
-                actual_indices = indices
-            else:
-                # Buffer is full, need to handle wraparound
-                start_idx = self.write_index
-                actual_indices = (start_idx + indices) % self.capacity
-            
-            # Extract data (memory views, not copies where possible)
-            result = {
-                'time': self.time_data[actual_indices].copy(),
-                'platform_position': self.platform_data[actual_indices].copy(),
-                'tire_force': self.force_data[actual_indices].copy(),
-                'frequency': self.frequency_data[actual_indices].copy(),
-                'phase_shift': self.phase_data[actual_indices].copy()
-            }
-            
-            self.total_reads += 1
-            return result
-    
-    def get_recent_data(self, n_points: int) -> Dict[str, np.ndarray]:
-        """Get most recent n points efficiently."""
-        with self.lock:
-            if self.size == 0:
+        """Append data point to ring buffer (single producer only)."""
+        seq = self._seq
+        self._seq = seq + 1
+        self._data[(seq >> 1) % self._slots] = (time_val, platform_val, force_val,
+                                                frequency_val, phase_val)
+        self._seq = seq + 2
+
+    def snapshot(self, n_points: Optional[int] = None) -> RingSnapshot:
+        """Get the most recent n points (None = all) as two-segment views."""
+        start, end = self._window(n_points)
+        self.total_reads += 1
+        return RingSnapshot(self, start, end, self._segments(start, end))
+
+    def get_data(self, max_points: Optional[int] = None, copy: bool = True) -> Dict[str, np.ndarray]:
+        """Get all data, decimated to at most max_points."""
+        return self._read(None, copy, max_points)
+
+    def get_recent_data(self, n_points: int, copy: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Get most recent n points.
+
+        With copy=False the channels are views into the ring when the window
+        does not wrap around; they are valid until the writer laps the ring,
+        so only use them for immediate reads in the calling thread.
+        """
+        return self._read(n_points, copy)
+
+    def _read(self, n_points: Optional[int], copy: bool,
+              max_points: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Read a window and retry while the writer overwrote part of it."""
+        for _ in range(self.MAX_READ_RETRIES + 1):
+            start, end = self._window(n_points)
+            n = end - start
+            if n == 0:
                 return self._empty_result()
-            
-            # Get actual number of points available
-            actual_n = min(n_points, self.size)
-            
-            if self.size < self.capacity:
-                # Buffer not full, simple slice
-                start_idx = max(0, self.size - actual_n)
-                result = {
-                    'time': self.time_data[start_idx:self.size].copy(),
-                    'platform_position': self.platform_data[start_idx:self.size].copy(),
-                    'tire_force': self.force_data[start_idx:self.size].copy(),
-                    'frequency': self.frequency_data[start_idx:self.size].copy(),
-                    'phase_shift': self.phase_data[start_idx:self.size].copy()
-                }
+
+            zero_copy = False
+
+            if max_points and max_points < n:
+                # Decimation gathers (and copies) every step-th sample
+                step = n // max_points
+                slots = (start + np.arange(0, n, step)[:max_points]) % self._slots
+                result = {name: self._data[name][slots] for name in self.CHANNELS}
             else:
-                # Buffer full, handle wraparound
-                if actual_n >= self.capacity:
-                    # Want all data
-                    start_idx = self.write_index
-                    indices = (start_idx + np.arange(self.capacity)) % self.capacity
+                segments = self._segments(start, end)
+                if len(segments) == 1 and not copy:
+                    result = {name: segments[0][name] for name in self.CHANNELS}
+                    zero_copy = True
+                elif len(segments) == 1:
+                    result = {name: segments[0][name].copy() for name in self.CHANNELS}
                 else:
-                    # Want recent subset
-                    end_idx = (self.write_index - 1) % self.capacity
-                    start_idx = (end_idx - actual_n + 1) % self.capacity
-                    
-                    if start_idx <= end_idx:
-                        indices = np.arange(start_idx, end_idx + 1)
-                    else:
-                        # Wraparound case
-                        indices = np.concatenate([
-                            np.arange(start_idx, self.capacity),
-                            np.arange(0, end_idx + 1)
-                        ])
-                
-                result = {
-                    'time': self.time_data[indices].copy(),
-                    'platform_position': self.platform_data[indices].copy(),
-                    'tire_force': self.force_data[indices].copy(),
-                    'frequency': self.frequency_data[indices].copy(),
-                    'phase_shift': self.phase_data[indices].copy()
-                }
-            
-            return result
-    
+                    result = {name: np.concatenate((segments[0][name], segments[1][name]))
+                              for name in self.CHANNELS}
+
+            if self._is_intact(start):
+                break
+            self.reader_retries += 1
+        else:
+            logger.warning("RingBuffer read overtaken by writer, returning partially overwritten data")
+
+        if zero_copy:
+            self.copies_avoided += 1
+        self.total_reads += 1
+        return result
+
+    def _window(self, n_points: Optional[int]):
+        """Get the [start, end) sample range of the visible window."""
+        end = self._seq >> 1
+        start = max(self._base, end - self.capacity)
+        if n_points is not None:
+            start = max(start, end - n_points)
+        return min(start, end), end
+
+    def _segments(self, start: int, end: int) -> tuple:
+        """Map a sample range to one or two slices of the storage array."""
+        first = start % self._slots
+        last = first + (end - start)
+        if last <= self._slots:
+            return (self._data[first:last],)
+        return (self._data[first:], self._data[:last - self._slots])
+
+    def _is_intact(self, start: int) -> bool:
+        """Check that the writer has not touched the slot of sample start or later ones."""
+        touched = (self._seq + 1) >> 1  # includes a row currently being written
+        return touched - self._slots <= start
+
     def _empty_result(self) -> Dict[str, np.ndarray]:
         """Return empty result structure."""
-        return {
-            'time': np.array([]),
-            'platform_position': np.array([]),
-            'tire_force': np.array([]),
-            'frequency': np.array([]),
-            'phase_shift': np.array([])
-        }
-    
+        return {name: np.array([], dtype=self.row_dtype[name]) for name in self.CHANNELS}
+
     def clear(self):
         """Clear the ring buffer."""
-        with self.lock:
-            self.write_index = 0
-            self.size = 0
-            # Don't need to zero arrays, just reset indices
-    
+        # Hide everything written so far, including a row in progress
+        self._base = (self._seq + 1) >> 1
+
     def get_stats(self) -> Dict[str, Any]:
         """Get ring buffer statistics."""
-        with self.lock:
-            return {
-                'capacity': self.capacity,
-                'size': self.size,
-                'usage_percent': (self.size / self.capacity) * 100,
-                'total_writes': self.total_writes,
-                'total_reads': self.total_reads,
-                'memory_usage_mb': (self.capacity * 5 * 8) / (1024 * 1024)  # 5 arrays * 8 bytes per float64
-            }
-
+        size = self.size
+        return {
+            'capacity': self.capacity,
+            'size': size,
+            'usage_percent': (size / self.capacity) * 100,
+            'dtype': str(self.dtype),
+            'total_writes': self.total_writes,
+            'total_reads': self.total_reads,
+            'reader_retries': self.reader_retries,
+            'copies_avoided': self.copies_avoided,
+            'memory_usage_mb': self._data.nbytes / (1024 * 1024)
+        }
 
 class OptimizedDataBuffer:
     """
@@ -258,11 +288,11 @@ class OptimizedDataBuffer:
     - Performance monitoring
     """
     
-    def __init__(self, max_size: int = 5000):
+    def __init__(self, max_size: int = 5000, dtype=np.float64):
         self.max_size = max_size
         
-        # Memory-optimized storage
-        self.ring_buffer = RingBuffer(max_size)
+        # Memory-optimized storage (dtype=np.float32 halves the measurement channels)
+        self.ring_buffer = RingBuffer(max_size, dtype=dtype)
         self.memory_pool = MemoryPool(pool_size=20, array_size=1000)
         
         # Background processing
@@ -380,7 +410,8 @@ class OptimizedDataBuffer:
             force_data=recent_data['tire_force'],
             time_data=recent_data['time'],
             static_weight=self.static_weight or 512.0,
-            callback=self._on_egea_result
+            callback=self._on_egea_result,
+            coalesce_key=f"intermediate:{self.position}:{self.test_start_time}"
         )
         
         self.performance_stats['background_tasks'] += 1
@@ -435,9 +466,9 @@ class OptimizedDataBuffer:
         if result.success:
             logger.info(f"Final EGEA result: {self.current_egea_status}")
     
-    def get_data(self, max_points: Optional[int] = None) -> Dict[str, Any]:
+    def get_data(self, max_points: Optional[int] = None, copy: bool = True) -> Dict[str, Any]:
         """Get data with EGEA status."""
-        data = self.ring_buffer.get_data(max_points)
+        data = self.ring_buffer.get_data(max_points, copy=copy)
         
         # Add EGEA status
         data['egea_status'] = self.current_egea_status.copy()
@@ -447,9 +478,14 @@ class OptimizedDataBuffer:
         
         return data
     
-    def get_recent_data(self, n_points: int) -> Dict[str, Any]:
-        """Get recent data efficiently."""
-        data = self.ring_buffer.get_recent_data(n_points)
+    def get_recent_data(self, n_points: int, copy: bool = True) -> Dict[str, Any]:
+        """
+        Get recent data efficiently.
+        
+        copy=False returns views into the ring buffer where possible; use it
+        only when the caller consumes the data right away (UI updates).
+        """
+        data = self.ring_buffer.get_recent_data(n_points, copy=copy)
         
         # Add metadata
         data['egea_status'] = self.current_egea_status.copy()
@@ -509,7 +545,10 @@ class OptimizedDataBuffer:
                 'data_points': ring_stats['size'],
                 'capacity': ring_stats['capacity'],
                 'usage_percent': ring_stats['usage_percent'],
-                'total_operations': ring_stats['total_writes'] + ring_stats['total_reads']
+                'total_operations': ring_stats['total_writes'] + ring_stats['total_reads'],
+                'reader_retries': ring_stats['reader_retries'],
+                'copies_avoided': ring_stats['copies_avoided'],
+                'dtype': ring_stats['dtype']
             },
             'memory_pool': memory_stats,
             'background_processing': bg_stats,
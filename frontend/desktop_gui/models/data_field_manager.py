@@ -28,7 +28,7 @@ class DataFieldManager:
 	def get_available_fields(self) -> Dict[str, DataField]:
 		"""Returns available data fields with updated statistics"""
 		# Get recent data to check for new fields and update values
-		recent_data = self.data_buffer.get_recent_data(100)
+		recent_data = self.data_buffer.get_recent_data(100, copy=False)
 		current_count = self.data_buffer.get_data_count()
 
 		# Update existing fields with latest values
@@ -606,7 +606,9 @@ class MainPresenter:
             
             # Update charts with recent data
             if hasattr(self.view, 'chart_widget') and self.view.chart_widget:
-                recent_data = self.data_buffer.get_recent_data(500)
+                # Copy: the chart update runs later in the Tk main thread, views into
+                # the ring would be overwritten once the writer laps it
+                recent_data = self.data_buffer.get_recent_data(500, copy=True)
                 if recent_data:
                     # Use threading to prevent UI blocking
                     def update_charts():
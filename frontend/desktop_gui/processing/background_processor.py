@@ -4,11 +4,13 @@ Background Processor for EGEA Phase-Shift Calculations.
 ✅ KONSOLIDIERT: Nutzt zentrale suspension_core.egea Implementation
 
 Responsibility: High-performance background processing using central EGEA algorithms.
-Features: Threading, queue management, performance monitoring, central implementation wrapper.
+Features: Process pool with shared-memory transfer (or threads), queue management,
+job coalescing, performance monitoring, central implementation wrapper.
 
 MIGRATION STATUS: ✅ Consolidated to use suspension_core.egea.PhaseShiftProcessor
 """
 
+import sys
 import threading
 import queue
 import time
@@ -16,14 +18,17 @@ import logging
 import numpy as np
 from typing import Dict, Any, List, Optional, Callable
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
 import multiprocessing as mp
 
 logger = logging.getLogger(__name__)
 
 # Zentrale EGEA-Implementation importieren
 try:
-    from suspension_core.egea import EGEAPhaseShiftProcessor
+    from suspension_core.egea import EGEAPhaseShiftProcessor, get_analysis_cache, get_filter_bank
     from suspension_core.config import ConfigManager
     CENTRAL_EGEA_AVAILABLE = True
     logger.info("✅ Zentrale EGEA PhaseShiftProcessor erfolgreich importiert")
@@ -41,6 +46,7 @@ class ProcessingTask:
     data: Dict[str, Any]
     timestamp: float
     priority: int = 0  # 0 = highest priority
+    coalesce_key: Optional[str] = None  # newer task with same key replaces this one while queued
     
     def __lt__(self, other):
         """For priority queue ordering."""
@@ -85,6 +91,9 @@ class PhaseShiftProcessor:
         # Zentrale EGEA-Implementation
         self.egea_processor = EGEAPhaseShiftProcessor()
         
+        # Filter einmal je Abtastrate vorberechnen (bei der ersten Messung mit dieser Rate)
+        self._prepared_rates = set()
+        
         # GUI-spezifische Parameter (für Kompatibilität)
         self.min_freq = 6.0
         self.max_freq = 25.0
@@ -92,16 +101,13 @@ class PhaseShiftProcessor:
         
         # Performance settings
         self.use_vectorized = True
-        self.cache_fft = True
-        self.max_cache_size = 100
+        self.cache_fft = True  # Shared analysis cache (keyed by content digest)
         
-        # GUI-spezifische Caching (für Performance)
-        self._result_cache = {}
+        # Results are cached centrally and shared with process_complete_test
+        self.analysis_cache = get_analysis_cache()
         
         # Performance tracking
         self.processing_times = deque(maxlen=1000)
-        self.cache_hits = 0
-        self.cache_misses = 0
         
         logger.info("✅ GUI PhaseShiftProcessor initialisiert mit zentraler EGEA-Implementation")
     
@@ -128,16 +134,10 @@ class PhaseShiftProcessor:
             if not self._validate_inputs(platform_data, force_data, time_data):
                 return self._create_error_result("Invalid input data")
             
-            # Generate cache key für GUI-Performance
-            cache_key = self._generate_cache_key(platform_data, force_data, static_weight)
-            
-            # Check cache first
-            if self.cache_fft and cache_key in self._result_cache:
-                self.cache_hits += 1
-                logger.debug("Phase shift result from GUI cache")
-                return self._result_cache[cache_key]
+            self._prepare_filters(time_data)
             
-            self.cache_misses += 1
+            # Cache lookup happens inside the central processor (content digest, no copies)
+            self.egea_processor.cache = self.analysis_cache if self.cache_fft else None
             
             # ✅ ZENTRALE EGEA-IMPLEMENTATION VERWENDEN
             egea_result = self.egea_processor.calculate_phase_shift_advanced(
@@ -150,10 +150,6 @@ class PhaseShiftProcessor:
             # Konvertierung zu GUI-kompatiblem Format
             gui_result = self._convert_egea_to_gui_format(egea_result)
             
-            # Cache result für GUI-Performance
-            if self.cache_fft and len(self._result_cache) < self.max_cache_size:
-                self._result_cache[cache_key] = gui_result
-            
             # Performance tracking
             processing_time = time.perf_counter() - start_time
             self.processing_times.append(processing_time)
@@ -168,6 +164,18 @@ class PhaseShiftProcessor:
             logger.error(f"❌ Phase shift calculation error (zentrale Implementation): {e}")
             return self._create_error_result(str(e))
     
+    def _prepare_filters(self, time_data: np.ndarray):
+        """Berechnet die Filter für die Abtastrate der Messung vorab (einmal je Rate)"""
+        intervals = np.diff(np.asarray(time_data, dtype=np.float64))
+        intervals = intervals[intervals > 0]
+        if intervals.size == 0:
+            return
+        
+        rate = float(round(1.0 / float(np.median(intervals))))
+        if rate not in self._prepared_rates:
+            get_filter_bank().prepare(rate)
+            self._prepared_rates.add(rate)
+    
     def _convert_egea_to_gui_format(self, egea_result) -> Dict[str, Any]:
         """
         Konvertiert EGEA-Result zu GUI-kompatiblem Format.
@@ -249,18 +257,6 @@ class PhaseShiftProcessor:
             logger.error(f"GUI-Input-Validierung fehlgeschlagen: {e}")
             return False
     
-    def _generate_cache_key(self, platform_data: np.ndarray, force_data: np.ndarray, 
-                          static_weight: float) -> str:
-        """Generate cache key for GUI performance."""
-        try:
-            # Use hash of data for caching (simplified for GUI)
-            platform_hash = hash(platform_data.tobytes())
-            force_hash = hash(force_data.tobytes())
-            return f"gui_{platform_hash}_{force_hash}_{static_weight}"
-        except Exception:
-            # Fallback cache key
-            return f"gui_{len(platform_data)}_{static_weight}_{time.time()}"
-    
     def _create_error_result(self, error_message: str) -> Dict[str, Any]:
         """Create GUI-compatible error result."""
         return {
@@ -278,10 +274,13 @@ class PhaseShiftProcessor:
     
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get performance statistics for GUI monitoring."""
+        cache_stats = self.analysis_cache.get_stats()
         if not self.processing_times:
             return {
                 'central_implementation': True,
-                'cache_available': True
+                'cache_available': True,
+                'analysis_cache': cache_stats,
+                'filter_bank': get_filter_bank().get_stats()
             }
         
         times = list(self.processing_times)
@@ -290,8 +289,12 @@ class PhaseShiftProcessor:
             'min_processing_time': np.min(times),
             'max_processing_time': np.max(times),
             'total_calculations': len(times),
-            'cache_hit_rate': self.cache_hits / (self.cache_hits + self.cache_misses) if (self.cache_hits + self.cache_misses) > 0 else 0,
-            'cache_size': len(self._result_cache),
+            'cache_hit_rate': cache_stats['hit_rate'],
+            'cache_size': cache_stats['size'],
+            'cache_bytes': cache_stats['bytes_held'],
+            'cache_evictions': cache_stats['evictions'],
+            'analysis_cache': cache_stats,
+            'filter_bank': get_filter_bank().get_stats(),
             
             # EGEA-spezifische Stats
             'central_implementation': True,
@@ -300,17 +303,73 @@ class PhaseShiftProcessor:
         }
     
     def clear_cache(self):
-        """Clear GUI-specific caches."""
-        self._result_cache.clear()
-        self.cache_hits = 0
-        self.cache_misses = 0
-        
-        # Zentrale Implementation hat eigenes Cache-Management
-        # Hier nur GUI-spezifische Caches löschen
+        """Clear the shared analysis cache (in memory; persisted entries stay on disk)."""
+        self.analysis_cache.clear()
         
         logger.info("✅ GUI Phase shift processor cache cleared")
 
 
+# Process-pool worker state: each worker process builds its processor once (warm worker)
+_worker_processor: Optional[PhaseShiftProcessor] = None
+
+
+def _init_process_worker():
+    """Process-pool initializer: import suspension_core and prepare filters once per process."""
+    global _worker_processor
+    _worker_processor = PhaseShiftProcessor()
+
+
+def _warmup_process_worker() -> int:
+    """No-op task that forces a worker process to start (and run its initializer)."""
+    return mp.current_process().pid
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to a shared memory block owned (and unlinked) by the parent process.
+    
+    Before Python 3.13 attaching also registers the block with the resource
+    tracker, which then reports it as leaked or unlinks it a second time.
+    Registration is skipped for the attach; pool workers run one task at a
+    time, so swapping the hook is not racy.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _process_shared_phase_shift(shm_name: str, lengths: List[int], static_weight: float) -> Dict[str, Any]:
+    """
+    Run a phase shift calculation in a worker process on shared-memory input.
+    
+    Args:
+        shm_name: Name of the shared memory block (platform, force, time back to back)
+        lengths: Lengths of the three arrays
+        static_weight: Static weight value
+        
+    Returns:
+        GUI-compatible result dictionary
+    """
+    shm = _attach_shared_memory(shm_name)
+    try:
+        packed = np.ndarray(sum(lengths), dtype=np.float64, buffer=shm.buf)
+        platform_end = lengths[0]
+        force_end = platform_end + lengths[1]
+        result = _worker_processor.calculate_phase_shift(
+            packed[:platform_end], packed[platform_end:force_end], packed[force_end:], static_weight
+        )
+        del packed
+        return result
+    finally:
+        shm.close()
+
+
 class BackgroundProcessor:
     """
     Background processor for EGEA calculations and data processing.
@@ -318,15 +377,26 @@ class BackgroundProcessor:
     ✅ MIGRATION: Updated to use central EGEA implementation via PhaseShiftProcessor wrapper
     
     Features:
-    - Multi-threaded processing
-    - Priority queue for tasks
+    - Process pool backend (EGEA math in parallel, outside the GIL of the Tk process)
+    - Shared-memory transfer of platform/force/time arrays to warm workers
+    - Priority queue for tasks, coalescing of superseded intermediate jobs
     - Performance monitoring
     - Central EGEA implementation integration
     - Graceful shutdown
     """
     
-    def __init__(self, num_workers: int = None):
-        """Initialize background processor with central EGEA integration."""
+    BACKENDS = ("process", "thread")
+    
+    def __init__(self, num_workers: int = None, backend: str = "process",
+                 mp_context: str = "spawn"):
+        """
+        Initialize background processor with central EGEA integration.
+        
+        Args:
+            num_workers: Number of parallel workers (default: CPU count - 1)
+            backend: "process" (process pool) or "thread" (worker threads in this process)
+            mp_context: Start method for the process pool (spawn is safe next to Tk threads)
+        """
         
         if not CENTRAL_EGEA_AVAILABLE:
             raise ImportError(
@@ -334,7 +404,12 @@ class BackgroundProcessor:
                 "Bitte installieren Sie suspension_core."
             )
         
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {self.BACKENDS}")
+        
         self.num_workers = num_workers or max(1, mp.cpu_count() - 1)
+        self.backend = backend
+        self.mp_context = mp_context
         
         # Task management
         self.task_queue = queue.PriorityQueue()
@@ -342,19 +417,32 @@ class BackgroundProcessor:
         self.workers = []
         self.running = False
         
+        # Process pool (created on start); dispatch threads wait on it without holding the GIL
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._warmup_futures = []
+        
+        # Coalescing: key -> queued task id, superseded task ids are skipped on dequeue
+        self._coalesce_lock = threading.Lock()
+        self._queued_by_key: Dict[str, str] = {}
+        self._superseded = set()
+        
         # ✅ ZENTRALE IMPLEMENTATION über GUI-Wrapper
         self.phase_shift_processor = PhaseShiftProcessor()
         
         # Performance tracking
         self.tasks_processed = 0
         self.tasks_failed = 0
+        self.tasks_coalesced = 0
+        self.shared_memory_bytes_total = 0  # cumulative, all transfers
+        self.shared_memory_bytes_live = 0  # blocks currently allocated
+        self._shm_lock = threading.Lock()
         self.start_time = None
         
         # Result callbacks
         self.result_callbacks = {}
         
         logger.info(f"✅ BackgroundProcessor initialized with {self.num_workers} workers "
-                   f"(central EGEA implementation)")
+                   f"({backend} backend, central EGEA implementation)")
     
     def start(self):
         """Start background processing with central EGEA integration."""
@@ -364,7 +452,10 @@ class BackgroundProcessor:
         self.running = True
         self.start_time = time.time()
         
-        # Start worker threads
+        if self.backend == "process":
+            self._start_pool()
+        
+        # Start worker threads (dispatch threads for the process pool)
         for i in range(self.num_workers):
             worker = threading.Thread(
                 target=self._worker_loop,
@@ -383,7 +474,23 @@ class BackgroundProcessor:
         result_dispatcher.start()
         
         logger.info(f"✅ Background processor started with {self.num_workers} workers "
-                   f"(central EGEA implementation)")
+                   f"({self.backend} backend, central EGEA implementation)")
+    
+    def _start_pool(self):
+        """Start the process pool and warm up every worker in the background."""
+        try:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=mp.get_context(self.mp_context),
+                initializer=_init_process_worker
+            )
+            self._warmup_futures = [
+                self._pool.submit(_warmup_process_worker) for _ in range(self.num_workers)
+            ]
+        except Exception as e:
+            logger.error(f"❌ Process pool could not be started, using threads: {e}")
+            self._pool = None
+            self.backend = "thread"
     
     def stop(self):
         """Stop background processing."""
@@ -400,11 +507,21 @@ class BackgroundProcessor:
         for worker in self.workers:
             worker.join(timeout=1.0)
         
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        
         logger.info("✅ Background processor stopped (central EGEA implementation)")
     
     def submit_task(self, task_type: str, data: Dict[str, Any], 
-                   callback: Optional[Callable] = None, priority: int = 0) -> str:
-        """Submit a processing task to central EGEA implementation."""
+                   callback: Optional[Callable] = None, priority: int = 0,
+                   coalesce_key: Optional[str] = None) -> str:
+        """
+        Submit a processing task to central EGEA implementation.
+        
+        With coalesce_key, a task that is still queued under the same key is
+        dropped (its callback is not called) in favour of this one.
+        """
         task_id = f"egea_{task_type}_{time.time()}_{id(data)}"
         
         task = ProcessingTask(
@@ -412,13 +529,23 @@ class BackgroundProcessor:
             task_type=task_type,
             data=data,
             timestamp=time.time(),
-            priority=priority
+            priority=priority,
+            coalesce_key=coalesce_key
         )
         
         # Store callback if provided
         if callback:
             self.result_callbacks[task_id] = callback
         
+        if coalesce_key is not None:
+            with self._coalesce_lock:
+                previous = self._queued_by_key.get(coalesce_key)
+                if previous is not None:
+                    self._superseded.add(previous)
+                    self.result_callbacks.pop(previous, None)
+                    self.tasks_coalesced += 1
+                self._queued_by_key[coalesce_key] = task_id
+        
         self.task_queue.put(task)
         
         logger.debug(f"✅ EGEA task submitted: {task_type} (id: {task_id})")
@@ -426,7 +553,8 @@ class BackgroundProcessor:
     
     def submit_phase_shift_calculation(self, platform_data: np.ndarray, force_data: np.ndarray,
                                      time_data: np.ndarray, static_weight: float,
-                                     callback: Optional[Callable] = None) -> str:
+                                     callback: Optional[Callable] = None,
+                                     coalesce_key: Optional[str] = None) -> str:
         """Submit phase shift calculation to central EGEA implementation."""
         data = {
             'platform_data': platform_data,
@@ -435,7 +563,20 @@ class BackgroundProcessor:
             'static_weight': static_weight
         }
         
-        return self.submit_task('phase_shift', data, callback, priority=0)
+        return self.submit_task('phase_shift', data, callback, priority=0,
+                                coalesce_key=coalesce_key)
+    
+    def _claim_task(self, task: ProcessingTask) -> bool:
+        """Take a dequeued task off the coalescing table; False if it was superseded."""
+        if task.coalesce_key is None:
+            return True
+        with self._coalesce_lock:
+            if task.task_id in self._superseded:
+                self._superseded.discard(task.task_id)
+                return False
+            if self._queued_by_key.get(task.coalesce_key) == task.task_id:
+                del self._queued_by_key[task.coalesce_key]
+        return True
     
     def _worker_loop(self):
         """Main worker loop using central EGEA implementation."""
@@ -451,6 +592,11 @@ class BackgroundProcessor:
                 if task.task_type == "stop":
                     break
                 
+                # Skip tasks replaced by a newer one with the same coalesce key
+                if not self._claim_task(task):
+                    self.task_queue.task_done()
+                    continue
+                
                 # Process task with central implementation
                 result = self._process_task(task)
                 
@@ -474,12 +620,15 @@ class BackgroundProcessor:
         try:
             if task.task_type == "phase_shift":
                 # ✅ ZENTRALE EGEA-IMPLEMENTATION VERWENDEN
-                result_data = self.phase_shift_processor.calculate_phase_shift(
-                    task.data['platform_data'],
-                    task.data['force_data'],
-                    task.data['time_data'],
-                    task.data['static_weight']
-                )
+                if self._pool is not None:
+                    result_data = self._calculate_in_pool(task.data)
+                else:
+                    result_data = self.phase_shift_processor.calculate_phase_shift(
+                        task.data['platform_data'],
+                        task.data['force_data'],
+                        task.data['time_data'],
+                        task.data['static_weight']
+                    )
                 success = result_data.get('success', False)
                 
             else:
@@ -523,6 +672,48 @@ class BackgroundProcessor:
                 error=str(e)
             )
     
+    def _calculate_in_pool(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a phase shift calculation in the process pool.
+        
+        The three arrays are copied once into a shared memory block; the
+        worker maps them without pickling. The block is released here after
+        the worker has finished.
+        """
+        arrays = [np.asarray(data[key], dtype=np.float64).ravel()
+                  for key in ('platform_data', 'force_data', 'time_data')]
+        lengths = [len(a) for a in arrays]
+        size = max(8, sum(lengths) * 8)
+        
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        with self._shm_lock:
+            self.shared_memory_bytes_total += size
+            self.shared_memory_bytes_live += size
+        try:
+            packed = np.ndarray(sum(lengths), dtype=np.float64, buffer=shm.buf)
+            offset = 0
+            for array in arrays:
+                packed[offset:offset + len(array)] = array
+                offset += len(array)
+            del packed
+            
+            future = self._pool.submit(_process_shared_phase_shift, shm.name, lengths,
+                                       float(data['static_weight']))
+            return future.result()
+        
+        except BrokenProcessPool as e:
+            logger.error(f"❌ EGEA process pool broken, falling back to threads: {e}")
+            self._pool = None
+            self.backend = "thread"
+            return self.phase_shift_processor.calculate_phase_shift(
+                arrays[0], arrays[1], arrays[2], data['static_weight']
+            )
+        finally:
+            shm.close()
+            shm.unlink()
+            with self._shm_lock:
+                self.shared_memory_bytes_live -= size
+    
     def _result_dispatcher_loop(self):
         """Dispatch results to callbacks."""
         logger.debug("✅ EGEA Result dispatcher started")
@@ -557,12 +748,18 @@ class BackgroundProcessor:
         # Basis-Status
         status = {
             'running': self.running,
+            'backend': self.backend,
             'num_workers': self.num_workers,
             'active_workers': sum(1 for w in self.workers if w.is_alive()),
+            'warm_workers': sum(1 for f in self._warmup_futures
+                                if f.done() and not f.cancelled() and f.exception() is None),
             'task_queue_size': self.task_queue.qsize(),
             'result_queue_size': self.result_queue.qsize(),
             'tasks_processed': self.tasks_processed,
             'tasks_failed': self.tasks_failed,
+            'tasks_coalesced': self.tasks_coalesced,
+            'shared_memory_bytes_total': self.shared_memory_bytes_total,
+            'shared_memory_bytes_live': self.shared_memory_bytes_live,
             'uptime': uptime,
             'tasks_per_second': self.tasks_processed / uptime if uptime > 0 else 0,
             
@@ -21,6 +21,252 @@ matplotlib.use("TkAgg")
 
 logger = logging.getLogger(__name__)
 
+# Datenschlüssel je Chart (erster vorhandener Schlüssel gewinnt)
+TIME_KEYS = ["time", "time_data", "timestamp"]
+CHANNEL_KEYS = {
+    "platform": ["platform_position"],
+    "force": ["tire_force"],
+    "phase": ["phase_shift", "phase_shifts"],
+    "frequency": ["frequency", "frequencies"],
+}
+
+
+def minmax_decimate(x: np.ndarray, y: np.ndarray, n_bins: int):
+    """
+    Min/Max-Dezimierung für Liniendiagramme
+
+    Teilt die Daten in n_bins gleich große Blöcke (bei gleichmäßiger
+    Abtastung ein Block pro Pixelspalte) und behält je Block Minimum und
+    Maximum in zeitlicher Reihenfolge sowie den ersten und letzten Punkt.
+    Spitzen bleiben damit sichtbar und die y-Grenzen der Ausgabe entsprechen
+    exakt denen der Eingabe.
+
+    Args:
+        x: Sortierte x-Werte
+        y: y-Werte (gleiche Länge wie x)
+        n_bins: Anzahl Blöcke (Ausgabe ≤ 2 * n_bins + 2 Punkte)
+
+    Returns:
+        Tuple (x, y) der ausgewählten Punkte
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_bins < 1 or n <= 2 * n_bins + 2:
+        return x, y
+
+    size = -(-n // n_bins)
+    bins = -(-n // size)
+    padded = np.empty(bins * size)
+    padded[:n] = y
+    padded[n:] = y[-1]
+    blocks = padded.reshape(bins, size)
+
+    offsets = np.arange(bins) * size
+    extremes = np.concatenate((
+        [0],
+        blocks.argmin(axis=1) + offsets,
+        blocks.argmax(axis=1) + offsets,
+        [n - 1],
+    ))
+    indices = np.unique(np.minimum(extremes, n - 1))
+    return x[indices], y[indices]
+
+
+def target_ylim(y_min: float, y_max: float):
+    """
+    Berechnet y-Grenzen mit 10 % Rand (Fallbacks für konstante Werte)
+
+    Args:
+        y_min: Minimum der Daten
+        y_max: Maximum der Daten
+
+    Returns:
+        Tuple (untere Grenze, obere Grenze)
+    """
+    if y_max != y_min:
+        margin = (y_max - y_min) * 0.1
+        return y_min - margin, y_max + margin
+    # Fallback für konstante Werte
+    if abs(y_min) > 0.01:  # Nicht-Null-Werte
+        margin = max(abs(y_min) * 0.1, 1.0)
+        return y_min - margin, y_max + margin
+    return -1.0, 1.0  # Standard für Null-Werte
+
+
+def rescale_ylim(current, y_min: float, y_max: float, hysteresis: float = 0.5):
+    """
+    Prüft, ob eine Achse neu skaliert werden muss (Hysterese)
+
+    Solange die Daten innerhalb der aktuellen Grenzen liegen und mindestens
+    `hysteresis` des Bereichs nutzen, bleiben die Grenzen stehen. Erst beim
+    Verlassen des Bandes (oder bei stark geschrumpftem Signal) wird neu
+    skaliert.
+
+    Args:
+        current: Aktuelle Grenzen (unten, oben)
+        y_min: Minimum der Daten
+        y_max: Maximum der Daten
+        hysteresis: Minimaler genutzter Anteil des Bereichs vor dem Verkleinern
+
+    Returns:
+        Neue Grenzen oder None, wenn die aktuellen bleiben
+    """
+    new_lo, new_hi = target_ylim(y_min, y_max)
+    cur_lo, cur_hi = current
+    inside = cur_lo <= y_min and y_max <= cur_hi
+    if inside and (new_hi - new_lo) >= hysteresis * (cur_hi - cur_lo):
+        return None
+    return new_lo, new_hi
+
+
+class FramePacer:
+    """
+    Misst Frame-Kosten und passt das Render-Intervall an
+
+    Das Intervall wird so gewählt, dass Zeichnen höchstens `budget` der
+    Tk-Hauptschleife belegt, begrenzt auf [min_interval_ms, max_interval_ms].
+    """
+
+    def __init__(self, min_interval_ms: int = 50, max_interval_ms: int = 500, budget: float = 0.5):
+        self.min_interval_ms = min_interval_ms
+        self.max_interval_ms = max_interval_ms
+        self.budget = budget
+        self.interval_ms = min_interval_ms
+
+        self.frames = 0
+        self.blit_frames = 0
+        self.full_redraws = 0
+        self.last_frame_ms = 0.0
+        self.avg_frame_ms = 0.0
+        self._frame_times = deque(maxlen=50)
+
+    def record(self, start: float, blitted: bool):
+        """
+        Erfasst einen gezeichneten Frame
+
+        Args:
+            start: time.perf_counter() zu Beginn des Frames
+            blitted: True, wenn nur per Blitting aktualisiert wurde
+        """
+        now = time.perf_counter()
+        cost_ms = (now - start) * 1000.0
+
+        self.frames += 1
+        if blitted:
+            self.blit_frames += 1
+        else:
+            self.full_redraws += 1
+        self.last_frame_ms = cost_ms
+        self.avg_frame_ms = cost_ms if self.frames == 1 else 0.9 * self.avg_frame_ms + 0.1 * cost_ms
+        self._frame_times.append(now)
+
+        self.interval_ms = int(min(self.max_interval_ms,
+                                   max(self.min_interval_ms, self.avg_frame_ms / self.budget)))
+
+    @property
+    def fps(self) -> float:
+        """Erreichte Bildrate über die letzten Frames"""
+        if len(self._frame_times) < 2:
+            return 0.0
+        span = self._frame_times[-1] - self._frame_times[0]
+        return (len(self._frame_times) - 1) / span if span > 0 else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Render-Statistiken zurück"""
+        return {
+            "fps": round(self.fps, 1),
+            "avg_frame_ms": round(self.avg_frame_ms, 2),
+            "last_frame_ms": round(self.last_frame_ms, 2),
+            "interval_ms": self.interval_ms,
+            "frames": self.frames,
+            "blit_frames": self.blit_frames,
+            "full_redraws": self.full_redraws,
+        }
+
+
+class ChartSampleBuffer:
+    """
+    Zeitreihenpuffer für die Charts
+
+    Zeit und Kanäle liegen als zusammenhängende Spalten in einem Array
+    doppelter Kapazität. Neue Samples werden angehängt; erst wenn das Array
+    voll ist, wird das jüngste Fenster an den Anfang kopiert. Das Live-Fenster
+    ist dadurch immer ein nach Zeit sortierter Slice ohne Umbruch, auf dem
+    np.searchsorted direkt arbeitet.
+    """
+
+    def __init__(self, channels, capacity: int = 20000):
+        """
+        Args:
+            channels: Kanalnamen (zusätzlich zur Zeitspalte)
+            capacity: Maximale Anzahl gehaltener Samples
+        """
+        self.channels = tuple(channels)
+        self.capacity = capacity
+        self._data = np.zeros((len(self.channels) + 1, 2 * capacity))
+        self._end = 0
+
+    def __len__(self) -> int:
+        return min(self._end, self.capacity)
+
+    @property
+    def time(self) -> np.ndarray:
+        return self._data[0, self._end - len(self):self._end]
+
+    @property
+    def last_time(self) -> float:
+        return self._data[0, self._end - 1] if self._end else -np.inf
+
+    def column(self, name: str) -> np.ndarray:
+        """Gibt einen Kanal als View zurück"""
+        row = self.channels.index(name) + 1
+        return self._data[row, self._end - len(self):self._end]
+
+    def append(self, block: np.ndarray):
+        """
+        Hängt Samples an
+
+        Args:
+            block: Array (1 + Kanäle, n) mit Zeit in der ersten Zeile
+        """
+        count = block.shape[1]
+        if count == 0:
+            return
+        if count >= self.capacity:
+            block = block[:, -self.capacity:]
+            count = self.capacity
+            self._end = 0
+
+        if self._end + count > self._data.shape[1]:
+            keep = self.capacity - count
+            self._data[:, :keep] = self._data[:, self._end - keep:self._end]
+            self._end = keep
+
+        self._data[:, self._end:self._end + count] = block
+        self._end += count
+
+    def window(self, seconds: float):
+        """
+        Liefert die Samples der letzten `seconds` Sekunden als Views
+
+        Returns:
+            Tuple (Zeit, {Kanal: Werte})
+        """
+        time_data = self.time
+        start = 0
+        if len(time_data):
+            start = int(np.searchsorted(time_data, time_data[-1] - seconds, side="left"))
+        offset = self._end - len(time_data) + start
+        return time_data[start:], {
+            name: self._data[row + 1, offset:self._end]
+            for row, name in enumerate(self.channels)
+        }
+
+    def clear(self):
+        """Verwirft alle Samples"""
+        self._end = 0
+
 
 class ChartWidget:
     """
@@ -38,15 +284,20 @@ class ChartWidget:
 
         # Performance-Einstellungen
         self.time_window = 10.0
-        self.max_points = 1000
+        self.max_points = 1000  # Obergrenze Punkte je Linie nach Dezimierung
         self.update_interval = 50
 
-        # Rolling-Window Datenstrukturen
-        self.time_data = deque(maxlen=self.max_points)
-        self.platform_data = deque(maxlen=self.max_points)
-        self.force_data = deque(maxlen=self.max_points)
-        self.phase_data = deque(maxlen=self.max_points)
-        self.frequency_data = deque(maxlen=self.max_points)
+        # Rolling-Window Datenstruktur (10 s bei 1 kHz plus Reserve)
+        self.samples = ChartSampleBuffer(CHANNEL_KEYS.keys(), capacity=20000)
+
+        # Rendering: Blitting zeichnet nur die Linien vor gecachten Achsen-Hintergründen
+        self.enable_blitting = True
+        self.rescale_hysteresis = 0.5
+        self.pacer = FramePacer(min_interval_ms=self.update_interval)
+        self.rescale_count = 0
+        self._backgrounds = {}
+        self._needs_full_redraw = True
+        self._frame_pending = False
 
         # Chart-Komponenten
         self.figure = None
@@ -84,6 +335,7 @@ class ChartWidget:
         self.figure.patch.set_facecolor("white")
 
         self.canvas = FigureCanvasTkAgg(self.figure, self.parent)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
@@ -148,11 +400,12 @@ class ChartWidget:
         self.axes["phase"].legend(fontsize=8)
 
         # Line-Objekte erstellen
+        animated = self.enable_blitting
         self.lines = {
-            "platform": self.axes["platform"].plot([], [], "b-", linewidth=1.5)[0],
-            "force": self.axes["force"].plot([], [], "g-", linewidth=1.5)[0],
-            "phase": self.axes["phase"].plot([], [], "r-", linewidth=2)[0],
-            "frequency": self.axes["frequency"].plot([], [], "m-", linewidth=1.5)[0],
+            "platform": self.axes["platform"].plot([], [], "b-", linewidth=1.5, animated=animated)[0],
+            "force": self.axes["force"].plot([], [], "g-", linewidth=1.5, animated=animated)[0],
+            "phase": self.axes["phase"].plot([], [], "r-", linewidth=2, animated=animated)[0],
+            "frequency": self.axes["frequency"].plot([], [], "m-", linewidth=1.5, animated=animated)[0],
         }
 
         self.figure.tight_layout(pad=2.0)
@@ -168,38 +421,74 @@ class ChartWidget:
 
     def update_charts(self, result_data: dict):
         """
-        Aktualisiert die Charts mit verbessertem Layout
+        Übernimmt neue Messwerte und aktualisiert die Charts
+
+        Arrays werden als Messreihe übernommen, und zwar nur Samples, die neuer
+        als der zuletzt gepufferte Zeitpunkt sind (überlappende Fenster aus dem
+        Datenpuffer sind damit unkritisch). Skalare ergeben einen Messpunkt.
 
         Args:
-                result_data: Dictionary mit Testergebnissen
+                result_data: Dictionary mit Messdaten (Skalare oder Arrays)
         """
         try:
-            # Daten extrahieren
-            time_data = np.array(result_data.get("time_data", []))
-            platform_data = np.array(result_data.get("platform_position", []))
-            force_data = np.array(result_data.get("tire_force", []))
-            phase_shifts = np.array(result_data.get("phase_shifts", []))
-            frequencies = np.array(result_data.get("frequencies", []))
-
-            # VERBESSERUNG: Alle Achsen leeren und neu konfigurieren
-            self.ax1.clear()
-            self.ax2.clear()
-
-            if len(time_data) > 0:
-                self._plot_combined_signals(time_data, platform_data, force_data)
-                self._plot_phase_analysis(frequencies, phase_shifts)
-            else:
-                self._plot_placeholder()
-
-            # KRITISCHE VERBESSERUNG: Layout optimieren
-            self._optimize_layout()
+            block = self._extract_sample_block(result_data)
+            if block is not None:
+                self.samples.append(block)
+                self._frame_pending = True
 
-            # Canvas aktualisieren
-            self.canvas.draw()
+            # Gezeichnet wird im Update-Zyklus (adaptives Intervall)
+            self.update_count += 1
 
         except Exception as e:
             logger.error(f"Fehler beim Aktualisieren der Charts: {e}")
-            self._plot_error_message(str(e))
+
+    def _extract_sample_block(self, data: dict):
+        """
+        Wandelt Messdaten in einen Sample-Block (Zeit + Kanäle) um
+
+        Args:
+            data: Dictionary mit Skalaren oder Arrays
+
+        Returns:
+            Array (1 + Kanäle, n) mit neuen Samples oder None
+        """
+        time_series = self._extract_series(data, TIME_KEYS)
+
+        if time_series is None:
+            # Einzelner Messpunkt
+            row = [self._extract_value_robust(data, TIME_KEYS, time.time(), "time")]
+            row += [
+                self._extract_value_robust(data, keys, np.nan, name)
+                for name, keys in CHANNEL_KEYS.items()
+            ]
+            block = np.array(row, dtype=np.float64)[:, None]
+        else:
+            rows = [time_series]
+            for name, keys in CHANNEL_KEYS.items():
+                series = self._extract_series(data, keys)
+                if series is None or len(series) != len(time_series):
+                    # Fehlende/abweichende Kanäle mit dem aktuellen Wert auffüllen
+                    series = np.full(
+                        len(time_series),
+                        self._extract_value_robust(data, keys, np.nan, name),
+                    )
+                rows.append(series)
+            block = np.vstack(rows)
+
+        # Nur Samples nach dem letzten gepufferten Zeitpunkt übernehmen
+        start = np.searchsorted(block[0], self.samples.last_time, side="right")
+        return block[:, start:] if start < block.shape[1] else None
+
+    def _extract_series(self, data: Dict, keys: List[str]):
+        """Gibt die erste Messreihe (Array/Liste mit > 1 Wert) zu den Schlüsseln zurück."""
+        for key in keys:
+            value = data.get(key)
+            if isinstance(value, (np.ndarray, list, tuple)) and len(value) > 1:
+                try:
+                    return np.asarray(value, dtype=np.float64).ravel()
+                except (ValueError, TypeError):
+                    self.numpy_conversion_stats["conversion_failures"] += 1
+        return None
 
     def _plot_combined_signals(self, time_data, platform_data, force_data):
         """
@@ -432,95 +721,122 @@ class ChartWidget:
 
         return default
 
-    def _get_display_data(self) -> Dict[str, List[float]]:
-        """Rolling-Window Datenextraktion."""
-        if not self.time_data:
-            return {
-                "time": [],
-                "platform": [],
-                "force": [],
-                "phase": [],
-                "frequency": [],
-            }
+    def _get_display_data(self) -> Dict[str, np.ndarray]:
+        """Rolling-Window Datenextraktion (Binärsuche auf der Zeitspalte, Views)."""
+        time_data, channels = self.samples.window(self.time_window)
 
-        latest_time = self.time_data[-1]
-        window_start = max(0, latest_time - self.time_window)
-
-        # Daten im Zeitfenster sammeln
-        display_time = []
-        display_platform = []
-        display_force = []
-        display_phase = []
-        display_frequency = []
-
-        for i, t in enumerate(self.time_data):
-            if t >= window_start:
-                relative_t = t - window_start
-                display_time.append(relative_t)
-                display_platform.append(self.platform_data[i])
-                display_force.append(self.force_data[i])
-                display_phase.append(self.phase_data[i])
-                display_frequency.append(self.frequency_data[i])
+        if len(time_data) == 0:
+            return {"time": time_data, **channels}
 
-        return {
-            "time": display_time,
-            "platform": display_platform,
-            "force": display_force,
-            "phase": display_phase,
-            "frequency": display_frequency,
+        window_start = max(0, time_data[-1] - self.time_window)
+        return {"time": time_data - window_start, **channels}
+
+    def _plot_bins(self, ax) -> int:
+        """Anzahl Dezimierungsblöcke: eine Pixelspalte je Block, höchstens max_points / 2."""
+        bins = max(1, self.max_points // 2)
+        try:
+            width = int(ax.get_window_extent().width)
+        except Exception:
+            width = 0
+        return min(bins, width) if width > 0 else bins
+
+    def _render_frame(self):
+        """Zeichnet einen Frame und passt das Update-Intervall an die Frame-Kosten an."""
+        start = time.perf_counter()
+        self._frame_pending = False
+        blitted = self._update_charts_display(self._get_display_data())
+        if blitted is not None:
+            self.pacer.record(start, blitted)
+
+    def _on_draw(self, event):
+        """Sichert nach jedem vollständigen Zeichnen die Achsen-Hintergründe (Blitting)."""
+        if not self.enable_blitting or not self.axes:
+            return
+        self._backgrounds = {
+            name: self.canvas.copy_from_bbox(ax.bbox) for name, ax in self.axes.items()
         }
+        # Animierte Linien sind im vollständigen Zeichnen nicht enthalten
+        for name, line in self.lines.items():
+            self.axes[name].draw_artist(line)
+
+    def _blit_lines(self) -> bool:
+        """Stellt die Hintergründe wieder her und zeichnet nur die Linien neu."""
+        if len(self._backgrounds) != len(self.lines):
+            return False
+        for name, line in self.lines.items():
+            ax = self.axes[name]
+            self.canvas.restore_region(self._backgrounds[name])
+            ax.draw_artist(line)
+            self.canvas.blit(ax.bbox)
+        return True
+
+    def _set_blitting(self, enabled: bool):
+        """Schaltet zwischen Blitting und vollständigem Neuzeichnen um."""
+        self.enable_blitting = enabled
+        for line in self.lines.values():
+            line.set_animated(enabled)
+        self._backgrounds = {}
+        self._needs_full_redraw = True
+        self._frame_pending = True
+
+    def _update_charts_display(self, display_data: Dict[str, np.ndarray]):
+        """
+        Chart-Update mit Datenvalidierung und Min/Max-Dezimierung auf Pixelbreite
 
-    def _update_charts_display(self, display_data: Dict[str, List[float]]):
-        """Chart-Update mit Datenvalidierung."""
+        Returns:
+            True bei Blitting, False bei vollständigem Neuzeichnen, None ohne Daten
+        """
         time_data = display_data["time"]
 
-        if not time_data:
-            return
+        if len(time_data) == 0:
+            return None
 
-        data_mapping = {
-            "platform": display_data["platform"],
-            "force": display_data["force"],
-            "phase": display_data["phase"],
-            "frequency": display_data["frequency"],
-        }
-
-        for chart_name, y_data in data_mapping.items():
-            if chart_name in self.lines and len(y_data) == len(time_data):
-                # Line-Daten setzen
-                self.lines[chart_name].set_data(time_data, y_data)
+        full_redraw = self._needs_full_redraw or not self.enable_blitting
 
-                # Achsen-Limits aktualisieren
+        for chart_name, line in self.lines.items():
+            y_data = display_data.get(chart_name)
+            if y_data is not None and len(y_data) == len(time_data):
                 ax = self.axes[chart_name]
-                ax.set_xlim(0, self.time_window)
 
-                # Y-Achse auto-scale
-                if y_data and len(y_data) > 0:
-                    y_min, y_max = min(y_data), max(y_data)
-                    if y_max != y_min:
-                        margin = (y_max - y_min) * 0.1
-                        ax.set_ylim(y_min - margin, y_max + margin)
-                    else:
-                        # Fallback für konstante Werte
-                        if abs(y_min) > 0.01:  # Nicht-Null-Werte
-                            margin = max(abs(y_min) * 0.1, 1.0)
-                            ax.set_ylim(y_min - margin, y_max + margin)
-                        else:
-                            ax.set_ylim(-1, 1)  # Standard für Null-Werte
+                # Line-Daten setzen (ein vordezimiertes Array je Linie)
+                x_plot, y_plot = minmax_decimate(time_data, y_data, self._plot_bins(ax))
+                line.set_data(x_plot, y_plot)
+
+                # Achsen-Limits nur bei Änderung setzen (erzwingt Neuzeichnen)
+                if ax.get_xlim() != (0, self.time_window):
+                    ax.set_xlim(0, self.time_window)
+                    full_redraw = True
+
+                # Y-Achse auto-scale mit Hysterese (Min/Max bleiben bei der Dezimierung erhalten)
+                finite = y_plot[np.isfinite(y_plot)]
+                if len(finite) > 0:
+                    limits = rescale_ylim(
+                        ax.get_ylim(), float(finite.min()), float(finite.max()),
+                        self.rescale_hysteresis,
+                    )
+                    if limits is not None:
+                        ax.set_ylim(*limits)
+                        self.rescale_count += 1
+                        full_redraw = True
 
-        # Canvas aktualisieren
-        self.canvas.draw_idle()
+        if not full_redraw and self._blit_lines():
+            return True
+
+        # Canvas aktualisieren (Blitting: synchron, damit die Hintergründe aktuell sind)
+        self._needs_full_redraw = False
+        if self.enable_blitting:
+            self.canvas.draw()
+        else:
+            self.canvas.draw_idle()
+        return False
 
     def clear_charts(self):
         """Leert alle Chart-Daten."""
         try:
             logger.info("🗑️ Clearing all chart data...")
 
-            # Alle Buffers leeren
-            self.time_data.clear()
-            self.platform_data.clear()
-            self.force_data.clear()
-            self.phase_data.clear()
-            self.frequency_data.clear()
+            # Buffer leeren
+            self.samples.clear()
 
             # Startzeit zurücksetzen
             self.start_time = None
@@ -558,11 +874,13 @@ class ChartWidget:
         self._schedule_next_update()
 
     def _schedule_next_update(self):
-        """Plant nächstes Update."""
+        """Zeichnet ausstehende Daten und plant das nächste Update (adaptives Intervall)."""
         try:
+            if self._frame_pending:
+                self._render_frame()
             if hasattr(self.canvas, "get_tk_widget"):
                 self.canvas.get_tk_widget().after(
-                    self.update_interval, self._schedule_next_update
+                    self.pacer.interval_ms, self._schedule_next_update
                 )
         except Exception as e:
             logger.error(f"❌ Update scheduling error: {e}")
@@ -575,6 +893,7 @@ class ChartWidget:
         max_points: int = None,
         update_interval: int = None,
         debug_enabled: bool = None,
+        enable_blitting: bool = None,
     ):
         """Konfiguriert Performance-Einstellungen."""
         if time_window is not None:
@@ -587,8 +906,13 @@ class ChartWidget:
 
         if update_interval is not None:
             self.update_interval = max(20, update_interval)
+            self.pacer.min_interval_ms = self.update_interval
             logger.info(f"⚙️ Update interval set to {self.update_interval}ms")
 
+        if enable_blitting is not None and enable_blitting != self.enable_blitting:
+            self._set_blitting(enable_blitting)
+            logger.info(f"⚙️ Blitting: {'enabled' if enable_blitting else 'disabled'}")
+
         if debug_enabled is not None:
             self.debug_enabled = debug_enabled
             logger.info(f"⚙️ Debug mode: {'enabled' if debug_enabled else 'disabled'}")
@@ -601,27 +925,33 @@ class ChartWidget:
                 "numpy_stats": self.numpy_conversion_stats.copy(),
             },
             "buffers": {
-                "time_points": len(self.time_data),
-                "platform_points": len(self.platform_data),
-                "force_points": len(self.force_data),
-                "phase_points": len(self.phase_data),
-                "frequency_points": len(self.frequency_data),
+                "time_points": len(self.samples),
+                "platform_points": len(self.samples),
+                "force_points": len(self.samples),
+                "phase_points": len(self.samples),
+                "frequency_points": len(self.samples),
+                "capacity": self.samples.capacity,
             },
             "performance": {
                 "time_window": self.time_window,
                 "max_points": self.max_points,
                 "update_interval": self.update_interval,
             },
+            "rendering": {
+                "mode": "blitting" if self.enable_blitting else "full_redraw",
+                "rescales": self.rescale_count,
+                **self.pacer.get_stats(),
+            },
         }
 
         # Buffer-Samples (letzte Werte)
-        if self.time_data:
+        if len(self.samples):
             debug_info["buffer_samples"] = {
-                "time": list(self.time_data)[-5:],
-                "platform": list(self.platform_data)[-5:],
-                "force": list(self.force_data)[-5:],
-                "phase": list(self.phase_data)[-5:],
-                "frequency": list(self.frequency_data)[-5:],
+                "time": self.samples.time[-5:].tolist(),
+                **{
+                    name: self.samples.column(name)[-5:].tolist()
+                    for name in self.samples.channels
+                },
             }
 
         return debug_info
@@ -644,6 +974,12 @@ class ChartWidget:
         print(f"   Scalars received: {numpy_stats['scalars_received']}")
         print(f"   Conversion failures: {numpy_stats['conversion_failures']}")
 
+        rendering = debug_info["rendering"]
+        print("\n🖼️ RENDERING:")
+        print(f"   Mode: {rendering['mode']}")
+        print(f"   FPS: {rendering['fps']:.1f} (interval {rendering['interval_ms']}ms)")
+        print(f"   Frame cost: {rendering['avg_frame_ms']:.2f}ms avg, {rendering['last_frame_ms']:.2f}ms last")
+
         print("\n📈 BUFFER STATUS:")
         for name, count in debug_info["buffers"].items():
             print(f"   {name}: {count} points")
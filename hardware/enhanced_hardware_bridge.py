@@ -12,6 +12,7 @@ Neue Funktionen:
 import asyncio
 import json
 import logging
+import math
 import signal
 import sys
 import threading
@@ -32,7 +33,13 @@ try:
     from common.suspension_core.can.interface_factory import create_can_interface
     from common.suspension_core.can.converters.json_converter import CanMessageConverter
     from common.suspension_core.config.manager import ConfigManager
+    from common.suspension_core.can.session_store import SessionFrameStore, session_dataset_columns
     from common.suspension_core.mqtt.handler import MqttHandler
+    from common.suspension_core.mqtt.chunked_transfer import (
+        ACK_TOPIC,
+        RETRANSMIT_TOPIC,
+        ChunkedDatasetSender,
+    )
     from common.suspension_core.protocols import create_protocol
     from common.suspension_core.protocols.messages import (
         Position,
@@ -208,15 +215,31 @@ class EnhancedHardwareBridge:
         # Datensammlung-Parameter
         self.data_buffer_size = self.config.get(["bridge", "buffer_size"], 10000)
         self.auto_save_interval = self.config.get(["bridge", "auto_save_interval"], 30.0)
+        # Session-Speicher: erwartete Frame-Rate (beide Seiten) und maximale Testdauer
+        self.session_frame_rate = self.config.get(["bridge", "session_frame_rate"], 2000)
+        self.max_session_duration = self.config.get(["bridge", "max_session_duration"], 120.0)
         
         # Service-Status
         self.running = False
         self.message_count = 0
         self.last_message_time = None
         
-        # Threading für asynchrone Verarbeitung
+        # Frames außerhalb einer Session (Diagnose-Puffer)
         self.message_queue = deque(maxlen=self.data_buffer_size)
         self.queue_lock = threading.Lock()
+
+        # Frames laufender Sessions: Session-ID -> SessionFrameStore
+        self.session_frames: Dict[str, SessionFrameStore] = {}
+        
+        # Chunk-Übertragung kompletter Datasets (benötigt MqttHandler aus suspension_core)
+        self.dataset_sender = (
+            ChunkedDatasetSender(
+                self.mqtt_handler.publish,
+                chunk_size=self.config.get(["bridge", "dataset_chunk_size"], 1000),
+            )
+            if SUSPENSION_CORE_AVAILABLE
+            else None
+        )
         
         # Graceful Shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -411,6 +434,11 @@ class EnhancedHardwareBridge:
                 self._handle_test_stop_command
             )
             
+            # Rückkanal der Dataset-Übertragung
+            if self.dataset_sender is not None:
+                self.mqtt_handler.subscribe(RETRANSMIT_TOPIC, self._handle_dataset_retransmit)
+                self.mqtt_handler.subscribe(ACK_TOPIC, self._handle_dataset_ack)
+            
             logger.info("MQTT-Verbindung und Subscriptions erfolgreich eingerichtet")
             return True
             
@@ -457,8 +485,7 @@ class EnhancedHardwareBridge:
                 "is_extended_id": getattr(message, 'is_extended_id', True)
             }
             
-            with self.queue_lock:
-                self.message_queue.append(message_data)
+            self._store_can_message(message_data)
             
             self.message_count += 1
             self.last_message_time = time.time()
@@ -485,8 +512,7 @@ class EnhancedHardwareBridge:
                 "is_extended_id": getattr(message, 'is_extended_id', True)
             }
             
-            with self.queue_lock:
-                self.message_queue.append(message_data)
+            self._store_can_message(message_data)
             
             self.message_count += 1
             self.last_message_time = time.time()
@@ -496,6 +522,71 @@ class EnhancedHardwareBridge:
         except Exception as e:
             logger.error(f"Fehler bei Simulator CAN-Message-Verarbeitung: {e}")
     
+    def _store_can_message(self, message_data: Dict[str, Any]):
+        """
+        Speichert eine CAN-Message genau einmal: während einer laufenden Session
+        im Session-Speicher, sonst im Diagnose-Puffer
+
+        Args:
+            message_data: CAN-Message-Daten mit source, timestamp, arbitration_id, data
+        """
+        session = self.current_session
+        frames = (
+            self.session_frames.get(session.session_id)
+            if session and session.status == "running"
+            else None
+        )
+
+        if frames is not None:
+            frames.append(
+                message_data["timestamp"],
+                message_data["arbitration_id"],
+                message_data["data"],
+                message_data["source"],
+            )
+            return
+
+        with self.queue_lock:
+            self.message_queue.append(message_data)
+
+    def _session_capacity(self, metadata: Dict[str, Any]) -> int:
+        """
+        Bestimmt die Kapazität des Session-Speichers aus der erwarteten Testdauer
+
+        Args:
+            metadata: Test-Start-Payload (duration direkt oder unter parameters)
+
+        Returns:
+            Anzahl Frames
+        """
+        parameters = metadata.get("parameters") or {}
+        duration = metadata.get("duration") or parameters.get("duration") or self.max_session_duration
+        return int(math.ceil(float(duration) * self.session_frame_rate * 1.2))
+
+    def _current_frame_stats(self) -> Optional[Dict[str, Any]]:
+        """Statistik des Session-Speichers der laufenden Session"""
+        if not self.current_session:
+            return None
+        frames = self.session_frames.get(self.current_session.session_id)
+        return frames.get_stats() if frames is not None else None
+
+    def _decode_session_frames(self, session: TestSession, frames: "SessionFrameStore"):
+        """
+        Dekodiert die seit dem letzten Aufruf eingetroffenen Frames einer Session
+
+        Args:
+            session: Test-Session, deren raw_data erweitert wird
+            frames: Session-Speicher
+        """
+        for message_data in frames.take_pending():
+            try:
+                # Protokoll-spezifische Dekodierung
+                decoded = self._decode_can_message(message_data)
+                if decoded:
+                    session.raw_data.append(decoded)
+            except Exception as e:
+                logger.warning(f"Fehler bei Message-Dekodierung: {e}")
+
     async def _handle_bridge_command(self, topic: str, payload: Dict[str, Any]):
         """
         Behandelt Bridge-Commands über MQTT
@@ -573,6 +664,10 @@ class EnhancedHardwareBridge:
         if self.current_session and self.current_session.status == "running":
             await self._complete_test_session("interrupted")
         
+        # Session-Speicher vorab dimensionieren (ohne Suspension Core: Diagnose-Puffer)
+        if SUSPENSION_CORE_AVAILABLE:
+            self.session_frames[test_id] = SessionFrameStore(self._session_capacity(metadata))
+
         # Neue Session erstellen
         self.current_session = TestSession(
             session_id=test_id,
@@ -609,32 +704,21 @@ class EnhancedHardwareBridge:
         self.current_session.end_time = time.time()
         self.current_session.status = status
         
-        # Sammle alle Daten der Session
-        session_data = []
-        with self.queue_lock:
-            # Filtere Daten für diese Session
-            session_start = self.current_session.start_time
-            session_data = [
-                msg for msg in self.message_queue 
-                if msg["timestamp"] >= session_start
-            ]
-        
-        # Konvertiere CAN-Messages zu strukturierten Daten
-        processed_data = []
-        for msg in session_data:
-            try:
-                # Protokoll-spezifische Dekodierung
-                decoded = self._decode_can_message(msg)
-                if decoded:
-                    processed_data.append(decoded)
-            except Exception as e:
-                logger.warning(f"Fehler bei Message-Dekodierung: {e}")
-        
-        # Setze verarbeitete Daten
-        self.current_session.raw_data = processed_data
-        
+        # Restliche Frames der Session dekodieren (O(1) Zugriff über die Session-ID)
+        frames = self.session_frames.pop(self.current_session.session_id, None)
+        frame_stats = None
+        if frames is not None:
+            frames.close()
+            self._decode_session_frames(self.current_session, frames)
+            frame_stats = frames.get_stats()
+            if frames.overflow:
+                logger.warning(
+                    f"Session {self.current_session.session_id}: {frames.overflow} Frames "
+                    f"wegen vollem Session-Speicher verworfen"
+                )
+
         # Publiziere komplettes Dataset
-        await self._publish_complete_dataset()
+        await self._publish_complete_dataset(frame_stats)
         
         # Session zur Historie hinzufügen
         self.session_history.append(self.current_session)
@@ -684,8 +768,13 @@ class EnhancedHardwareBridge:
         
         return None
     
-    async def _publish_complete_dataset(self):
-        """Publiziert das komplette Dataset der aktuellen Session"""
+    async def _publish_complete_dataset(self, frame_stats: Optional[Dict[str, Any]] = None):
+        """
+        Publiziert das komplette Dataset der aktuellen Session
+
+        Args:
+            frame_stats: Statistik des Session-Speichers (Kapazität, Überlauf)
+        """
         if not self.current_session:
             return
         
@@ -702,15 +791,20 @@ class EnhancedHardwareBridge:
             "statistics": {
                 "total_messages": len(self.current_session.raw_data),
                 "message_rate": len(self.current_session.raw_data) / (self.current_session.end_time - self.current_session.start_time),
-                "data_sources": list(set(msg.get("source", "unknown") for msg in self.current_session.raw_data))
+                "data_sources": list(set(msg.get("source", "unknown") for msg in self.current_session.raw_data)),
+                "dropped_frames": frame_stats["overflow"] if frame_stats else 0,
+                "frame_store": frame_stats,
             }
         }
         
-        # Publiziere für Pi Processing Service
-        await self.mqtt_handler.publish_async(
-            "suspension/raw_data/complete",
-            complete_dataset
-        )
+        # Publiziere für Pi Processing Service (chunkweise, sonst als ein JSON-Objekt)
+        if self.dataset_sender is not None:
+            await self._send_dataset_chunked(complete_dataset)
+        else:
+            await self.mqtt_handler.publish_async(
+                "suspension/raw_data/complete",
+                complete_dataset
+            )
         
         # Publiziere Test-Completion-Signal
         await self.mqtt_handler.publish_async(
@@ -726,6 +820,54 @@ class EnhancedHardwareBridge:
         
         logger.info(f"Komplettes Dataset publiziert: {len(self.current_session.raw_data)} Datenpunkte")
     
+    async def _send_dataset_chunked(self, dataset: Dict[str, Any]):
+        """
+        Überträgt ein Dataset als Manifest, Chunks und Commit
+
+        Die Rohdaten-Samples der Testposition werden spaltenweise in typisierte
+        Arrays übernommen; der Event-Loop wird nach jedem Chunk freigegeben.
+
+        Args:
+            dataset: Komplettes Dataset (raw_data wird spaltenweise übertragen)
+        """
+        try:
+            columns = session_dataset_columns(dataset["raw_data"], dataset.get("position"))
+            metadata = {key: value for key, value in dataset.items() if key != "raw_data"}
+
+            transfer = await self.dataset_sender.send_async(dataset["test_id"], columns, metadata)
+            logger.info(
+                f"Dataset übertragen: {transfer.total_samples} Samples in {transfer.chunk_count} Chunks "
+                f"({self.dataset_sender.last_throughput_kbps:.0f} KB/s)"
+            )
+        except Exception as e:
+            logger.error(f"Fehler bei der Chunk-Übertragung des Datasets: {e}")
+    
+    def _handle_dataset_retransmit(self, topic: str, payload: Dict[str, Any]):
+        """
+        Wiederholt vom Processing Service angeforderte Dataset-Chunks
+
+        Args:
+            topic: MQTT-Topic
+            payload: {"transfer_id", "missing"}
+        """
+        try:
+            self.dataset_sender.handle_retransmit(payload)
+        except Exception as e:
+            logger.error(f"Fehler bei der Wiederholung von Dataset-Chunks: {e}")
+    
+    def _handle_dataset_ack(self, topic: str, payload: Dict[str, Any]):
+        """
+        Gibt ein vom Processing Service bestätigtes Dataset frei
+
+        Args:
+            topic: MQTT-Topic
+            payload: {"transfer_id", "status", "stats"}
+        """
+        try:
+            self.dataset_sender.handle_ack(payload)
+        except Exception as e:
+            logger.error(f"Fehler bei der Dataset-Bestätigung: {e}")
+    
     async def _can_message_loop(self):
         """CAN-Message-Loop für kontinuierliche Verarbeitung"""
         logger.info("CAN-Message-Loop gestartet")
@@ -738,6 +880,13 @@ class EnhancedHardwareBridge:
                 # Simuliere CAN-Messages im Simulator-Modus
                 if self.bridge_mode in [BridgeMode.SIMULATOR, BridgeMode.HYBRID]:
                     await self._simulate_can_messages()
+
+                # Neue Frames der laufenden Session dekodieren
+                session = self.current_session
+                if session and session.status == "running":
+                    frames = self.session_frames.get(session.session_id)
+                    if frames is not None:
+                        self._decode_session_frames(session, frames)
                 
             except Exception as e:
                 logger.error(f"Fehler in CAN-Message-Loop: {e}")
@@ -772,8 +921,7 @@ class EnhancedHardwareBridge:
                 "tire_force": force
             }
             
-            with self.queue_lock:
-                self.message_queue.append(sim_message)
+            self._store_can_message(sim_message)
             
             self.message_count += 1
             self.last_message_time = time.time()
@@ -850,6 +998,7 @@ class EnhancedHardwareBridge:
             "statistics": {
                 "message_count": self.message_count,
                 "queue_size": queue_size,
+                "session_frames": self._current_frame_stats(),
                 "last_message_time": self.last_message_time,
                 "active_session": self.current_session.session_id if self.current_session else None
             },
@@ -901,7 +1050,9 @@ class EnhancedHardwareBridge:
             "statistics": {
                 "total_messages": self.message_count,
                 "queue_size": len(self.message_queue),
-                "session_history_count": len(self.session_history)
+                "session_frames": self._current_frame_stats(),
+                "session_history_count": len(self.session_history),
+                "dataset_transfer": self.dataset_sender.get_stats() if self.dataset_sender else None
             },
             "interfaces": {
                 "hardware_can_available": self.can_interface is not None,
@@ -12,6 +12,7 @@ Funktionen:
 import asyncio
 import json
 import logging
+import math
 import signal
 import sys
 import threading
@@ -33,6 +34,20 @@ try:
     from common.suspension_core.can.converters.json_converter import CanMessageConverter
     from common.suspension_core.config.manager import ConfigManager
     from common.suspension_core.mqtt.handler import MqttHandler
+    from common.suspension_core.mqtt.chunked_transfer import (
+        ACK_TOPIC,
+        RETRANSMIT_TOPIC,
+        ChunkedDatasetSender,
+    )
+    from common.suspension_core.clock import Clock, create_clock, get_clock
+    from common.suspension_core.can.session_store import SessionFrameStore, session_dataset_columns
+    from common.suspension_core.tracing import (
+        STAGE_CAN_RECEIVE,
+        STAGE_MQTT_PUBLISH,
+        STAGE_PROTOCOL_DECODE,
+        TRACE_TOPIC,
+        get_tracer,
+    )
     from common.suspension_core.protocols import create_protocol
     from common.suspension_core.protocols.messages import (
         Position,
@@ -161,13 +176,17 @@ class HardwareBridge:
     - Robuste Fehlerbehandlung
     """
 
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, clock: Optional["Clock"] = None):
         """
         Initialisiert die Hardware Bridge
 
         Args:
             config_path: Pfad zur Konfigurationsdatei
+            clock: Uhr für Zeitstempel und Loop-Takt (Standard: prozessweite Uhr)
         """
+        # Zeitquelle (ohne Suspension Core: Wanduhr)
+        self.clock = clock or (get_clock() if SUSPENSION_CORE_AVAILABLE else None)
+
         # Konfiguration laden
         if SUSPENSION_CORE_AVAILABLE:
             self.config = ConfigManager(config_path)
@@ -214,16 +233,35 @@ class HardwareBridge:
         self.auto_save_interval = self.config.get(
             ["bridge", "auto_save_interval"], 30.0
         )
+        # Session-Speicher: erwartete Frame-Rate (beide Seiten) und maximale Testdauer
+        self.session_frame_rate = self.config.get(["bridge", "session_frame_rate"], 2000)
+        self.max_session_duration = self.config.get(["bridge", "max_session_duration"], 120.0)
 
         # Service-Status
         self.running = False
         self.message_count = 0
         self.last_message_time = None
 
-        # Threading für asynchrone Verarbeitung
+        # Frames außerhalb einer Session (Diagnose-Puffer)
         self.message_queue = deque(maxlen=self.data_buffer_size)
         self.queue_lock = threading.Lock()
 
+        # Frames laufender Sessions: Session-ID -> SessionFrameStore
+        self.session_frames: Dict[str, SessionFrameStore] = {}
+
+        # Chunk-Übertragung kompletter Datasets (benötigt MqttHandler aus suspension_core)
+        self.dataset_sender = (
+            ChunkedDatasetSender(
+                self.mqtt_handler.publish,
+                chunk_size=self.config.get(["bridge", "dataset_chunk_size"], 1000),
+            )
+            if SUSPENSION_CORE_AVAILABLE
+            else None
+        )
+
+        # Latenz-Tracing (aktiv mit SUSPENSION_TRACING=1)
+        self.tracer = get_tracer("hardware_bridge") if SUSPENSION_CORE_AVAILABLE else None
+
         # Graceful Shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -449,6 +487,11 @@ class HardwareBridge:
                 # Synchrone Subscriptions (MqttHandler verwaltet Callbacks anders)
                 # Verwende add_callback für Kategorien
                 self.mqtt_handler.add_callback("commands", self._handle_bridge_command_sync)
+
+                # Rückkanal der Dataset-Übertragung
+                if self.dataset_sender is not None:
+                    self.mqtt_handler.subscribe(RETRANSMIT_TOPIC, self._handle_dataset_retransmit)
+                    self.mqtt_handler.subscribe(ACK_TOPIC, self._handle_dataset_ack)
                 
                 logger.info("MQTT-Verbindung und Callbacks erfolgreich eingerichtet")
                 return True
@@ -504,7 +547,7 @@ class HardwareBridge:
             (),
             {
                 "decode_message": lambda self, msg_id, data: {
-                    "timestamp": time.time(),
+                    "timestamp": self._now(),
                     "platform_position": 0.0,
                     "tire_force": 500.0,
                     "source": "mock",
@@ -523,17 +566,16 @@ class HardwareBridge:
             # Message in Queue einreihen mit Quelle
             message_data = {
                 "source": "hardware",
-                "timestamp": time.time(),
+                "timestamp": self._now(),
                 "arbitration_id": getattr(message, "arbitration_id", 0),
                 "data": list(getattr(message, "data", [])),
                 "is_extended_id": getattr(message, "is_extended_id", True),
             }
 
-            with self.queue_lock:
-                self.message_queue.append(message_data)
+            self._store_can_message(message_data)
 
             self.message_count += 1
-            self.last_message_time = time.time()
+            self.last_message_time = self._now()
 
             logger.debug(
                 f"Hardware CAN-Message empfangen: ID=0x{message_data['arbitration_id']:X}"
@@ -553,17 +595,16 @@ class HardwareBridge:
             # Message in Queue einreihen mit Quelle
             message_data = {
                 "source": "simulator",
-                "timestamp": time.time(),
+                "timestamp": self._now(),
                 "arbitration_id": getattr(message, "arbitration_id", 0),
                 "data": list(getattr(message, "data", [])),
                 "is_extended_id": getattr(message, "is_extended_id", True),
             }
 
-            with self.queue_lock:
-                self.message_queue.append(message_data)
+            self._store_can_message(message_data)
 
             self.message_count += 1
-            self.last_message_time = time.time()
+            self.last_message_time = self._now()
 
             logger.debug(
                 f"Simulator CAN-Message empfangen: ID=0x{message_data['arbitration_id']:X}"
@@ -572,6 +613,78 @@ class HardwareBridge:
         except Exception as e:
             logger.error(f"Fehler bei Simulator CAN-Message-Verarbeitung: {e}")
 
+    def _store_can_message(self, message_data: Dict[str, Any]):
+        """
+        Speichert eine CAN-Message genau einmal: während einer laufenden Session
+        im Session-Speicher, sonst im Diagnose-Puffer
+
+        Args:
+            message_data: CAN-Message-Daten mit source, timestamp, arbitration_id, data
+        """
+        session = self.current_session
+        frames = (
+            self.session_frames.get(session.session_id)
+            if session and session.status == "running"
+            else None
+        )
+
+        if frames is not None:
+            frames.append(
+                message_data["timestamp"],
+                message_data["arbitration_id"],
+                message_data["data"],
+                message_data["source"],
+            )
+            if self.tracer is not None and self.tracer.enabled:
+                self.tracer.stamp(session.session_id, STAGE_CAN_RECEIVE)
+            return
+
+        with self.queue_lock:
+            self.message_queue.append(message_data)
+
+    def _session_capacity(self, metadata: Dict[str, Any]) -> int:
+        """
+        Bestimmt die Kapazität des Session-Speichers aus der erwarteten Testdauer
+
+        Args:
+            metadata: Test-Start-Payload (duration direkt oder unter parameters)
+
+        Returns:
+            Anzahl Frames
+        """
+        parameters = metadata.get("parameters") or {}
+        duration = metadata.get("duration") or parameters.get("duration") or self.max_session_duration
+        return int(math.ceil(float(duration) * self.session_frame_rate * 1.2))
+
+    def _current_frame_stats(self) -> Optional[Dict[str, Any]]:
+        """Statistik des Session-Speichers der laufenden Session"""
+        if not self.current_session:
+            return None
+        frames = self.session_frames.get(self.current_session.session_id)
+        return frames.get_stats() if frames is not None else None
+
+    def _decode_session_frames(self, session: TestSession, frames: "SessionFrameStore"):
+        """
+        Dekodiert die seit dem letzten Aufruf eingetroffenen Frames einer Session
+
+        Args:
+            session: Test-Session, deren raw_data erweitert wird
+            frames: Session-Speicher
+        """
+        decoded_count = 0
+        for message_data in frames.take_pending():
+            try:
+                # Protokoll-spezifische Dekodierung
+                decoded = self._decode_can_message(message_data)
+                if decoded:
+                    session.raw_data.append(decoded)
+                    decoded_count += 1
+            except Exception as e:
+                logger.warning(f"Fehler bei Message-Dekodierung: {e}")
+
+        if decoded_count and self.tracer is not None:
+            self.tracer.stamp(session.session_id, STAGE_PROTOCOL_DECODE, decoded_count)
+
     def _handle_bridge_command_sync(self, message: Dict[str, Any]):
         """
         Synchroner Bridge-Command-Handler für MqttHandler
@@ -664,11 +777,15 @@ class HardwareBridge:
         if self.current_session and self.current_session.status == "running":
             await self._complete_test_session("interrupted")
 
+        # Session-Speicher vorab dimensionieren (ohne Suspension Core: Diagnose-Puffer)
+        if SUSPENSION_CORE_AVAILABLE:
+            self.session_frames[test_id] = SessionFrameStore(self._session_capacity(metadata))
+
         # Neue Session erstellen
         self.current_session = TestSession(
             session_id=test_id,
             position=position,
-            start_time=time.time(),
+            start_time=self._now(),
             metadata=metadata,
         )
 
@@ -697,34 +814,24 @@ class HardwareBridge:
             return
 
         # Session beenden
-        self.current_session.end_time = time.time()
+        self.current_session.end_time = self._now()
         self.current_session.status = status
 
-        # Sammle alle Daten der Session
-        session_data = []
-        with self.queue_lock:
-            # Filtere Daten für diese Session
-            session_start = self.current_session.start_time
-            session_data = [
-                msg for msg in self.message_queue if msg["timestamp"] >= session_start
-            ]
-
-        # Konvertiere CAN-Messages zu strukturierten Daten
-        processed_data = []
-        for msg in session_data:
-            try:
-                # Protokoll-spezifische Dekodierung
-                decoded = self._decode_can_message(msg)
-                if decoded:
-                    processed_data.append(decoded)
-            except Exception as e:
-                logger.warning(f"Fehler bei Message-Dekodierung: {e}")
-
-        # Setze verarbeitete Daten
-        self.current_session.raw_data = processed_data
+        # Restliche Frames der Session dekodieren (O(1) Zugriff über die Session-ID)
+        frames = self.session_frames.pop(self.current_session.session_id, None)
+        frame_stats = None
+        if frames is not None:
+            frames.close()
+            self._decode_session_frames(self.current_session, frames)
+            frame_stats = frames.get_stats()
+            if frames.overflow:
+                logger.warning(
+                    f"Session {self.current_session.session_id}: {frames.overflow} Frames "
+                    f"wegen vollem Session-Speicher verworfen"
+                )
 
         # Publiziere komplettes Dataset
-        await self._publish_complete_dataset()
+        await self._publish_complete_dataset(frame_stats)
 
         # Session zur Historie hinzufügen
         self.session_history.append(self.current_session)
@@ -779,8 +886,13 @@ class HardwareBridge:
 
         return None
 
-    async def _publish_complete_dataset(self):
-        """Publiziert das komplette Dataset der aktuellen Session"""
+    async def _publish_complete_dataset(self, frame_stats: Optional[Dict[str, Any]] = None):
+        """
+        Publiziert das komplette Dataset der aktuellen Session
+
+        Args:
+            frame_stats: Statistik des Session-Speichers (Kapazität, Überlauf)
+        """
         if not self.current_session:
             return
 
@@ -804,13 +916,18 @@ class HardwareBridge:
                         for msg in self.current_session.raw_data
                     )
                 ),
+                "dropped_frames": frame_stats["overflow"] if frame_stats else 0,
+                "frame_store": frame_stats,
             },
         }
 
-        # Publiziere für Pi Processing Service
-        await self._publish_mqtt(
-            "suspension/raw_data/complete", complete_dataset
-        )
+        # Publiziere für Pi Processing Service (chunkweise, sonst als ein JSON-Objekt)
+        if self.dataset_sender is not None:
+            await self._send_dataset_chunked(complete_dataset)
+        else:
+            await self._publish_mqtt(
+                "suspension/raw_data/complete", complete_dataset
+            )
 
         # Publiziere Test-Completion-Signal
         await self._publish_mqtt(
@@ -828,22 +945,101 @@ class HardwareBridge:
             f"Komplettes Dataset publiziert: {len(self.current_session.raw_data)} Datenpunkte"
         )
 
+        # Trace der Bridge-Stufen abschließen und publizieren
+        if self.tracer is not None and self.tracer.enabled:
+            self.tracer.stamp(
+                self.current_session.session_id, STAGE_MQTT_PUBLISH, len(self.current_session.raw_data)
+            )
+            record = self.tracer.complete(self.current_session.session_id)
+            if record is not None:
+                await self._publish_mqtt(TRACE_TOPIC, record)
+
+    async def _send_dataset_chunked(self, dataset: Dict[str, Any]):
+        """
+        Überträgt ein Dataset als Manifest, Chunks und Commit
+
+        Die Rohdaten-Samples der Testposition werden spaltenweise in typisierte
+        Arrays übernommen; der Event-Loop wird nach jedem Chunk freigegeben.
+
+        Args:
+            dataset: Komplettes Dataset (raw_data wird spaltenweise übertragen)
+        """
+        try:
+            columns = session_dataset_columns(dataset["raw_data"], dataset.get("position"))
+            metadata = {key: value for key, value in dataset.items() if key != "raw_data"}
+
+            transfer = await self.dataset_sender.send_async(dataset["test_id"], columns, metadata)
+            logger.info(
+                f"Dataset übertragen: {transfer.total_samples} Samples in {transfer.chunk_count} Chunks "
+                f"({self.dataset_sender.last_throughput_kbps:.0f} KB/s)"
+            )
+        except Exception as e:
+            logger.error(f"Fehler bei der Chunk-Übertragung des Datasets: {e}")
+
+    def _handle_dataset_retransmit(self, topic: str, payload: Dict[str, Any]):
+        """
+        Wiederholt vom Processing Service angeforderte Dataset-Chunks
+
+        Args:
+            topic: MQTT-Topic
+            payload: {"transfer_id", "missing"}
+        """
+        try:
+            self.dataset_sender.handle_retransmit(payload)
+        except Exception as e:
+            logger.error(f"Fehler bei der Wiederholung von Dataset-Chunks: {e}")
+
+    def _handle_dataset_ack(self, topic: str, payload: Dict[str, Any]):
+        """
+        Gibt ein vom Processing Service bestätigtes Dataset frei
+
+        Args:
+            topic: MQTT-Topic
+            payload: {"transfer_id", "status", "stats"}
+        """
+        try:
+            self.dataset_sender.handle_ack(payload)
+        except Exception as e:
+            logger.error(f"Fehler bei der Dataset-Bestätigung: {e}")
+
+    def _now(self) -> float:
+        """Aktuelle Zeit der Bridge-Uhr"""
+        return self.clock.time() if self.clock else time.time()
+
+    async def _sleep(self, seconds: float):
+        """Wartet seconds Simulationszeit (rückt eine Stepped-Uhr vor)"""
+        if self.clock:
+            await self.clock.async_sleep(seconds)
+        else:
+            await asyncio.sleep(seconds)
+
+    async def _idle(self, seconds: float):
+        """Idle-Wartezeit von Hilfs-Loops (rückt die Uhr nicht vor)"""
+        await asyncio.sleep(self.clock.idle_timeout(seconds) if self.clock else seconds)
+
     async def _can_message_loop(self):
         """CAN-Message-Loop für kontinuierliche Verarbeitung"""
         logger.info("CAN-Message-Loop gestartet")
 
         while self.running:
             try:
-                # Kurze Pause um CPU zu entlasten
-                await asyncio.sleep(0.01)
+                # Kurze Pause um CPU zu entlasten (Simulationstakt)
+                await self._sleep(0.01)
 
                 # Simuliere CAN-Messages im Simulator-Modus
                 if self.bridge_mode in [BridgeMode.SIMULATOR, BridgeMode.HYBRID]:
                     await self._simulate_can_messages()
 
+                # Neue Frames der laufenden Session dekodieren
+                session = self.current_session
+                if session and session.status == "running":
+                    frames = self.session_frames.get(session.session_id)
+                    if frames is not None:
+                        self._decode_session_frames(session, frames)
+
             except Exception as e:
                 logger.error(f"Fehler in CAN-Message-Loop: {e}")
-                await asyncio.sleep(1.0)
+                await self._idle(1.0)
 
         logger.info("CAN-Message-Loop beendet")
 
@@ -853,7 +1049,7 @@ class HardwareBridge:
             # Simuliere realistische Fahrzeugdaten
             import math
 
-            elapsed = time.time() - self.current_session.start_time
+            elapsed = self._now() - self.current_session.start_time
             freq = 10.0  # 10 Hz Grundfrequenz
 
             # Simulierte Plattformposition (Sinuswelle)
@@ -864,13 +1060,13 @@ class HardwareBridge:
             force = (
                 500
                 + 100 * math.sin(2 * math.pi * freq * elapsed + phase_shift)
-                + 10 * (0.5 - time.time() % 1)
+                + 10 * (0.5 - self._now() % 1)
             )
 
             # Erstelle simulierte CAN-Message
             sim_message = {
                 "source": "simulator",
-                "timestamp": time.time(),
+                "timestamp": self._now(),
                 "arbitration_id": 0x08AAAA72,
                 "data": [
                     int(platform_pos * 10) & 0xFF,
@@ -882,11 +1078,10 @@ class HardwareBridge:
                 "tire_force": force,
             }
 
-            with self.queue_lock:
-                self.message_queue.append(sim_message)
+            self._store_can_message(sim_message)
 
             self.message_count += 1
-            self.last_message_time = time.time()
+            self.last_message_time = self._now()
 
     async def _mqtt_message_loop(self):
         """MQTT-Message-Loop"""
@@ -894,12 +1089,12 @@ class HardwareBridge:
 
         while self.running:
             try:
-                await asyncio.sleep(0.1)
+                await self._idle(0.1)
                 # MQTT-Messages werden über Callbacks verarbeitet
 
             except Exception as e:
                 logger.error(f"Fehler in MQTT-Message-Loop: {e}")
-                await asyncio.sleep(1.0)
+                await self._idle(1.0)
 
         logger.info("MQTT-Message-Loop beendet")
 
@@ -912,16 +1107,16 @@ class HardwareBridge:
                 # Auto-Save der aktuellen Session
                 if (
                     self.current_session
-                    and time.time() - self.current_session.start_time
+                    and self._now() - self.current_session.start_time
                     > self.auto_save_interval
                 ):
                     await self._auto_save_session_data()
 
-                await asyncio.sleep(5.0)  # Weniger häufig als andere Loops
+                await self._idle(5.0)  # Weniger häufig als andere Loops
 
             except Exception as e:
                 logger.error(f"Fehler in Data-Processing-Loop: {e}")
-                await asyncio.sleep(5.0)
+                await self._idle(5.0)
 
         logger.info("Data-Processing-Loop beendet")
 
@@ -932,11 +1127,11 @@ class HardwareBridge:
         while self.running:
             try:
                 await self._send_heartbeat()
-                await asyncio.sleep(heartbeat_interval)
+                await self._idle(heartbeat_interval)
 
             except Exception as e:
                 logger.error(f"Heartbeat-Fehler: {e}")
-                await asyncio.sleep(5.0)
+                await self._idle(5.0)
 
     async def _send_status(self, status: str, message: str):
         """Sendet Status-Update"""
@@ -947,7 +1142,7 @@ class HardwareBridge:
                 "status": status,
                 "message": message,
                 "mode": self.bridge_mode.value,
-                "timestamp": time.time(),
+                "timestamp": self._now(),
             },
         )
 
@@ -957,12 +1152,13 @@ class HardwareBridge:
 
         heartbeat_data = {
             "service": "hardware_bridge",
-            "timestamp": time.time(),
+            "timestamp": self._now(),
             "mode": self.bridge_mode.value,
             "running": self.running,
             "statistics": {
                 "message_count": self.message_count,
                 "queue_size": queue_size,
+                "session_frames": self._current_frame_stats(),
                 "last_message_time": self.last_message_time,
                 "active_session": self.current_session.session_id
                 if self.current_session
@@ -979,6 +1175,10 @@ class HardwareBridge:
             "suspension/system/heartbeat", heartbeat_data
         )
 
+        # Latenz-Histogramme der Bridge
+        if self.tracer is not None and self.tracer.enabled:
+            await self._publish_mqtt(TRACE_TOPIC, self.tracer.export())
+
     async def _auto_save_session_data(self):
         """Auto-Save der aktuellen Session-Daten"""
         if not self.current_session:
@@ -989,7 +1189,7 @@ class HardwareBridge:
             "session_id": self.current_session.session_id,
             "position": self.current_session.position,
             "start_time": self.current_session.start_time,
-            "current_time": time.time(),
+            "current_time": self._now(),
             "data_points": len(self.current_session.raw_data)
             if self.current_session.raw_data
             else 0,
@@ -1015,21 +1215,25 @@ class HardwareBridge:
                 "position": self.current_session.position
                 if self.current_session
                 else None,
-                "duration": time.time() - self.current_session.start_time
+                "duration": self._now() - self.current_session.start_time
                 if self.current_session
                 else 0,
             },
             "statistics": {
                 "total_messages": self.message_count,
                 "queue_size": len(self.message_queue),
+                "session_frames": self._current_frame_stats(),
                 "session_history_count": len(self.session_history),
+                "dataset_transfer": self.dataset_sender.get_stats()
+                if self.dataset_sender
+                else None,
             },
             "interfaces": {
                 "hardware_can_available": self.can_interface is not None,
                 "simulator_can_available": self.simulator_can_interface is not None,
                 "protocol_initialized": self.protocol is not None,
             },
-            "timestamp": time.time(),
+            "timestamp": self._now(),
         }
 
         await self._publish_mqtt(
@@ -1056,7 +1260,7 @@ class HardwareBridge:
                     {
                         "old_mode": old_mode.value,
                         "new_mode": new_mode.value,
-                        "timestamp": time.time(),
+                        "timestamp": self._now(),
                     },
                 )
         except ValueError:
@@ -1072,7 +1276,7 @@ class HardwareBridge:
 
         await self._publish_mqtt(
             "suspension/bridge/buffer_cleared",
-            {"cleared_messages": cleared_count, "timestamp": time.time()},
+            {"cleared_messages": cleared_count, "timestamp": self._now()},
         )
 
     async def _save_current_session(self):
@@ -1084,7 +1288,7 @@ class HardwareBridge:
 
         await self._publish_mqtt(
             "suspension/bridge/session_saved",
-            {"session_data": session_data, "timestamp": time.time()},
+            {"session_data": session_data, "timestamp": self._now()},
         )
 
         logger.info(f"Session gespeichert: {self.current_session.session_id}")
@@ -1114,6 +1318,10 @@ async def main():
         choices=["hardware", "simulator", "hybrid"],
         help="Bridge-Modus überschreiben",
     )
+    parser.add_argument(
+        "--clock",
+        help="Uhr-Modus: realtime, scaled:<N> oder stepped (Standard: SUSPENSION_CLOCK)",
+    )
     parser.add_argument("--debug", action="store_true", help="Debug-Modus")
 
     args = parser.parse_args()
@@ -1122,7 +1330,8 @@ async def main():
         logging.getLogger().setLevel(logging.DEBUG)
 
     # Bridge erstellen und starten
-    bridge = HardwareBridge(args.config)
+    clock = create_clock(args.clock) if args.clock and SUSPENSION_CORE_AVAILABLE else None
+    bridge = HardwareBridge(args.config, clock=clock)
 
     # Modus überschreiben falls angegeben
     if args.mode:
@@ -1140,4 +1349,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -12,6 +12,7 @@ from unittest.mock import Mock, AsyncMock
 
 # Import der neuen standardisierten MQTT-Komponenten
 from suspension_core.mqtt.service import MqttServiceBase, MqttTopics
+from suspension_core.mqtt.ingest_queue import MessageIngestQueue
 from suspension_core.config.manager import ConfigManager
 
 
@@ -49,7 +50,7 @@ async def test_mqtt_service_base_initialization():
     assert service.service_name == "test_init"
     assert service._status == "initializing"
     assert service._running == False
-    assert isinstance(service._message_queue, asyncio.Queue)
+    assert isinstance(service._message_queue, MessageIngestQueue)
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,103 @@
+"""
+Tests für das Test-Archiv (Memory-Mapped-Spaltendateien und Index)
+"""
+
+import time
+
+import numpy as np
+
+from common.suspension_core.archive.archive import INDEX_DTYPE, TestArchive
+
+
+def _signals(count=3000):
+    t = np.arange(count) / 1000.0
+    return {
+        "time": t,
+        "platform_position": np.sin(2 * np.pi * 12 * t),
+        "tire_force": (500 + 80 * np.cos(2 * np.pi * 12 * t)).astype(np.float32),
+        "dms": np.arange(count * 4, dtype=np.float32).reshape(count, 4),
+    }
+
+
+def test_store_and_memmap_channels(tmp_path):
+    """Kanäle werden als schreibgeschützte Memory-Maps ohne Kopie gelesen"""
+    archive = TestArchive(str(tmp_path))
+    signals = _signals()
+    archive.store("test_1", signals, position="front_left", vehicle_type="M1",
+                  timestamp=1.7e9, min_phase_shift=38.5, passed=True, evaluation="GOOD",
+                  metadata={"static_weight": 512})
+
+    test = archive.get("test_1")
+    assert test.sample_count == 3000
+    assert test.metadata["static_weight"] == 512
+    assert set(test.channel_names()) == set(signals)
+
+    force = test.channel("tire_force")
+    assert isinstance(force, np.memmap)
+    assert not force.flags.writeable
+    np.testing.assert_array_equal(force, signals["tire_force"])
+    np.testing.assert_array_equal(test["dms"], signals["dms"])
+    assert test.record["passed"] == 1
+    assert archive.get("unknown") is None
+
+
+def test_query_and_replace(tmp_path):
+    """Filter nach Zeitraum, Position und Bewertung; spätere Einträge ersetzen frühere"""
+    archive = TestArchive(str(tmp_path))
+    small = _signals(20)
+    archive.store("a", small, position="front_left", timestamp=100.0, min_phase_shift=20.0, passed=False)
+    archive.store("b", small, position="front_right", timestamp=200.0, min_phase_shift=40.0, passed=True)
+    archive.store("c", small, position="front_left", timestamp=300.0, min_phase_shift=36.0, passed=True)
+    archive.store("a", small, position="front_left", timestamp=110.0, min_phase_shift=37.0, passed=True)
+
+    assert len(archive) == 3
+    assert archive.query(start=150.0, end=250.0)["test_id"].tolist() == [b"b"]
+    assert sorted(archive.query(position="front_left")["test_id"].tolist()) == [b"a", b"c"]
+    assert len(archive.query(passed=False)) == 0
+    assert archive.record("a")["min_phase_shift"] == 37.0
+
+    # Zweite Instanz (z.B. GUI-Prozess) sieht denselben Stand
+    reader = TestArchive(str(tmp_path))
+    assert len(reader) == 3
+    np.testing.assert_array_equal(reader.get("a")["time"], small["time"])
+
+
+def test_filter_large_index(tmp_path):
+    """100k Index-Einträge werden in Millisekunden gefiltert"""
+    archive = TestArchive(str(tmp_path))
+    count = 100_000
+    records = np.zeros(count, dtype=INDEX_DTYPE)
+    records["test_id"] = [f"test_{i}".encode() for i in range(count)]
+    records["position"] = np.where(np.arange(count) % 2, b"front_left", b"front_right")
+    records["timestamp"] = np.arange(count, dtype=np.float64)
+    records["passed"] = np.arange(count) % 3 == 0
+    with open(archive.index_path, "ab") as f:
+        f.write(records.tobytes())
+
+    archive.refresh()
+    start = time.perf_counter()
+    result = archive.query(start=10_000, end=59_999, position="front_left", passed=True)
+    elapsed = time.perf_counter() - start
+
+    assert len(result) == len([i for i in range(10_000, 60_000) if i % 2 and i % 3 == 0])
+    assert elapsed < 0.1
+    assert archive.record("test_99999")["timestamp"] == 99_999
+
+
+def test_list_tests_and_unknown_result(tmp_path):
+    """list_tests liefert JSON-taugliche Kennwerte, neueste zuerst; unbekannt bleibt None"""
+    archive = TestArchive(str(tmp_path))
+    small = _signals(20)
+    archive.store("a", small, position="front_left", timestamp=100.0, min_phase_shift=20.0, passed=False)
+    archive.store("b", small, position="front_left", timestamp=200.0)
+    archive.store("c", small, position="front_right", timestamp=300.0, min_phase_shift=40.0, passed=True)
+
+    tests = archive.list_tests(position="front_left")
+    assert [test["test_id"] for test in tests] == ["b", "a"]
+    assert tests[0]["passed"] is None and tests[0]["min_phase_shift"] is None
+    assert tests[1] == {
+        "test_id": "a", "position": "front_left", "vehicle_type": "", "evaluation": "",
+        "timestamp": 100.0, "min_phase_shift": 20.0, "sample_count": 20, "passed": False,
+    }
+    assert [test["test_id"] for test in archive.list_tests(limit=1)] == ["c"]
+    assert len(archive.query(passed=False)) == 1  # unbekannt zählt nicht als nicht bestanden
@@ -0,0 +1,92 @@
+"""
+Tests für den BackgroundProcessor (Prozess-Pool mit Shared Memory, Job-Coalescing)
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+# Der Processor importiert suspension_core ohne Paketpräfix
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "common"))
+
+from frontend.desktop_gui.processing.background_processor import BackgroundProcessor
+
+
+def _signals(count=2000, fs=1000.0):
+    t = np.arange(count) / fs
+    platform = 3.0 * np.sin(2 * np.pi * 12 * t)
+    force = 500 + 80 * np.sin(2 * np.pi * 12 * t + 0.7)
+    return platform, force, t
+
+
+def _collect(processor, expected, submit):
+    results = []
+    done = threading.Event()
+
+    def callback(result):
+        results.append(result)
+        if len(results) >= expected:
+            done.set()
+
+    submit(callback)
+    processor.start()
+    try:
+        assert done.wait(timeout=60)
+    finally:
+        processor.stop()
+    return results
+
+
+def test_coalescing_replaces_queued_intermediate_jobs():
+    """Neuere Zwischenanalysen ersetzen noch wartende ältere desselben Tests"""
+    processor = BackgroundProcessor(num_workers=1, backend="thread")
+    platform, force, t = _signals()
+    submitted = []
+
+    def submit(callback):
+        for i in range(5):
+            submitted.append(processor.submit_phase_shift_calculation(
+                platform + i, force, t, 500.0, callback=callback, coalesce_key="intermediate:FL"))
+        processor.submit_phase_shift_calculation(platform, force, t, 500.0, callback=callback)
+
+    results = _collect(processor, 2, submit)
+
+    assert processor.tasks_coalesced == 4
+    assert submitted[-1] in {r.task_id for r in results}
+    assert not set(submitted[:-1]) & {r.task_id for r in results}
+
+
+def test_process_backend_matches_thread_backend():
+    """Prozess-Pool liefert über Shared Memory dasselbe Ergebnis wie Threads"""
+    platform, force, t = _signals()
+    outputs = {}
+
+    for backend in ("thread", "process"):
+        processor = BackgroundProcessor(num_workers=2, backend=backend)
+        results = _collect(processor, 1, lambda callback: processor.submit_phase_shift_calculation(
+            platform, force, t, 500.0, callback=callback))
+        outputs[backend] = (results[0].result, processor.get_status())
+
+    thread_result, _ = outputs["thread"]
+    process_result, process_status = outputs["process"]
+    for key in ("success", "min_phase_shift", "cycle_count", "evaluation"):
+        assert process_result[key] == thread_result[key]
+    assert process_status["backend"] == "process"
+    assert process_status["shared_memory_bytes_total"] == 3 * len(t) * 8
+    assert process_status["shared_memory_bytes_live"] == 0
+
+
+def test_filters_prepared_per_sample_rate():
+    """Filter werden für die Abtastrate der Messung vorbereitet, nicht fest für 1 kHz"""
+    from frontend.desktop_gui.processing.background_processor import PhaseShiftProcessor
+
+    processor = PhaseShiftProcessor()
+    assert processor._prepared_rates == set()
+
+    for fs in (500.0, 500.0, 1000.0):
+        platform, force, t = _signals(count=int(2 * fs), fs=fs)
+        processor.calculate_phase_shift(platform, force, t, 500.0)
+
+    assert processor._prepared_rates == {500.0, 1000.0}
@@ -0,0 +1,100 @@
+"""
+Tests für die Dataset-Übertragung der Hardware Bridge (nur Rohdaten-Samples der Testposition)
+"""
+
+import asyncio
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Die Bridge und das can-Paket importieren suspension_core ohne Paketpräfix
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "common"))
+
+from common.suspension_core.can.session_store import SessionFrameStore, session_dataset_columns
+from common.suspension_core.mqtt.chunked_transfer import (
+    CHUNK_TOPIC,
+    COMMIT_TOPIC,
+    MANIFEST_TOPIC,
+    ChunkedDatasetReceiver,
+    ChunkedDatasetSender,
+)
+from common.suspension_core.protocols.eusama_decoder import EusamaDecoder
+from hardware import hardware_bridge
+
+BASE_ID = 0x08AAAA60
+
+
+def _raw_frame(platform, force, frequency=12):
+    return list(struct.pack("<HHBB2x", platform, force, frequency, 128))
+
+
+def _session_frames(count=300):
+    """Abwechselnd linke und rechte Rohdaten, dazwischen Motorstatus und TOP-Meldungen"""
+    frames = SessionFrameStore(4 * count)
+    for i in range(count):
+        t = i / 1000.0
+        frames.append(t, BASE_ID + 0, _raw_frame(100 + i, 500 + i), "simulator")
+        frames.append(t, BASE_ID + 1, _raw_frame(9000, 9000), "simulator")
+        if i % 50 == 0:
+            frames.append(t, BASE_ID + 6, [0x03, 0, 0, 0, 0, 0, 0, 0], "simulator")
+            frames.append(t, BASE_ID + 7, [0x01], "simulator")
+    return frames
+
+
+class _Receiver:
+    def __init__(self):
+        self.receiver = ChunkedDatasetReceiver(lambda topic, payload: None)
+        self.datasets = []
+
+    def publish(self, topic, payload):
+        dataset = None
+        if topic == MANIFEST_TOPIC:
+            self.receiver.on_manifest(payload)
+        elif topic == CHUNK_TOPIC:
+            dataset = self.receiver.on_chunk(payload)
+        elif topic == COMMIT_TOPIC:
+            dataset = self.receiver.on_commit(payload)
+        if dataset is not None:
+            self.datasets.append(dataset)
+        return True
+
+
+def test_bridge_transfers_only_samples_of_test_position():
+    """Motorstatus, TOP-Meldungen und die Gegenseite landen nicht als Samples beim Empfänger"""
+    bridge = hardware_bridge.HardwareBridge()
+    decoder = EusamaDecoder(BASE_ID)
+    bridge.protocol = type("Protocol", (), {
+        "decode_message": staticmethod(lambda arbitration_id, data: decoder.decode_payload(arbitration_id, data)[1])
+    })()
+    link = _Receiver()
+    bridge.dataset_sender = ChunkedDatasetSender(link.publish, chunk_size=100)
+
+    session = hardware_bridge.TestSession(session_id="t1", position="front_left", start_time=0.0)
+    bridge._decode_session_frames(session, _session_frames())
+    assert len(session.raw_data) == 2 * 300 + 2 * 6  # alle Nachrichtentypen, beide Seiten
+
+    asyncio.run(bridge._send_dataset_chunked({
+        "test_id": "t1", "position": "front_left", "start_time": 0.0, "raw_data": session.raw_data,
+    }))
+
+    dataset = link.datasets[0]
+    assert len(dataset) == 300
+    assert dataset.metadata["position"] == "front_left"
+    np.testing.assert_array_equal(dataset.columns["tire_force"], 500 + np.arange(300))
+    np.testing.assert_array_equal(dataset.columns["platform_position"], 100 + np.arange(300))
+    assert np.all(np.diff(dataset.columns["timestamp"]) > 0)
+
+
+def test_short_positions_and_unknown_position():
+    """"left" passt zu "front_left"; ohne Position werden alle Rohdaten-Samples übernommen"""
+    rows = [
+        {"timestamp": 0.0, "platform_position": 1, "tire_force": 10, "position": "front_left"},
+        {"timestamp": 0.0, "platform_position": 2, "tire_force": 20, "position": "front_right"},
+        {"timestamp": 0.1, "left_running": True, "right_running": False},
+    ]
+
+    assert list(session_dataset_columns(rows, "left")["tire_force"]) == [10.0]
+    assert list(session_dataset_columns(rows, "front_right")["tire_force"]) == [20.0]
+    assert list(session_dataset_columns(rows, "unknown")["tire_force"]) == [10.0, 20.0]
@@ -0,0 +1,107 @@
+"""
+Tests für den blockweisen CAN-Empfang
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import can
+import numpy as np
+
+# Das can-Paket importiert suspension_core ohne Paketpräfix
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "common"))
+
+from common.suspension_core.can.can_interface import CanFrameBatch, CanInterface
+
+
+def _message(i):
+    return can.Message(arbitration_id=0x100 + i, data=bytes([i % 256, 1, 2]), timestamp=float(i),
+                       is_extended_id=False)
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def _virtual_interface(channel, **kwargs):
+    """CanInterface auf einem virtuellen Bus, ohne SocketCAN"""
+    interface = CanInterface(channel=channel, auto_detect_baud=False, **kwargs)
+    interface.interface = can.Bus(interface="virtual", channel=channel, receive_own_messages=False)
+    interface.connected = True
+    return interface
+
+
+def test_frame_batch_columns():
+    """Spalten-Views zeigen nur die belegten Frames; Nutzdaten werden mit 0 aufgefüllt"""
+    batch = CanFrameBatch(capacity=2)
+    assert batch.append(_message(3))
+    assert batch.append(can.Message(arbitration_id=0x1ABCDEF0, data=bytes(range(8)), is_extended_id=True))
+    assert batch.full
+    assert not batch.append(_message(4))
+
+    np.testing.assert_array_equal(batch.arbitration_ids, [0x103, 0x1ABCDEF0])
+    np.testing.assert_array_equal(batch.dlc, [3, 8])
+    np.testing.assert_array_equal(batch.data[0], [3, 1, 2, 0, 0, 0, 0, 0])
+    np.testing.assert_array_equal(batch.is_extended_id, [False, True])
+
+    snapshot = batch.copy()
+    batch.clear()
+    assert len(batch) == 0 and len(batch.arbitration_ids) == 0
+    np.testing.assert_array_equal(snapshot.data[1], list(range(8)))
+
+
+def test_batched_receive_and_frame_adapter():
+    """Batch-Callbacks erhalten Blöcke, Einzel-Callbacks weiterhin jeden Frame"""
+    interface = _virtual_interface("batch_test", batch_size=64, batch_timeout=0.05)
+    sender = can.Bus(interface="virtual", channel="batch_test")
+
+    batches = []
+    frames = []
+    interface.add_batch_callback(lambda batch: batches.append(batch.arbitration_ids.tolist()))
+    interface.add_message_callback(frames.append)
+    interface.start_receiver()
+    try:
+        for i in range(200):
+            sender.send(_message(i))
+        assert _wait_for(lambda: len(frames) == 200)
+    finally:
+        interface.stop_receiver()
+        interface.interface.shutdown()
+        sender.shutdown()
+
+    assert [msg.arbitration_id for msg in frames] == [0x100 + i for i in range(200)]
+    assert sum(batches, []) == [0x100 + i for i in range(200)]
+    assert max(len(ids) for ids in batches) <= 64
+
+    stats = interface.get_receive_stats()
+    assert stats["frames_received"] == 200
+    assert stats["batches_received"] == len(batches) < 200
+    assert stats["callback_errors"] == 0
+
+
+def test_callback_errors_are_isolated():
+    """Ein fehlerhafter Callback blockiert die übrigen nicht"""
+    interface = CanInterface(channel="unused", auto_detect_baud=False, batch_size=4)
+    received = []
+
+    def broken(batch):
+        raise RuntimeError("kaputt")
+
+    interface.add_batch_callback(broken)
+    interface.add_batch_callback(lambda batch: received.append(len(batch)))
+    assert not interface.add_batch_callback(broken)
+
+    batch = CanFrameBatch(4)
+    for i in range(4):
+        batch.append(_message(i))
+    interface._dispatch_batch(batch)
+
+    assert received == [4]
+    stats = interface.get_receive_stats()
+    assert stats["callback_errors"] == 1
+    assert stats["full_batches"] == 1
+    assert interface.remove_batch_callback(broken)
@@ -0,0 +1,116 @@
+"""
+Tests für binäre CAN-Aufzeichnung und Wiedergabe
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import can
+import numpy as np
+
+# Das can-Paket importiert suspension_core ohne Paketpräfix
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "common"))
+
+from common.suspension_core.can.can_interface import CanFrameBatch
+from common.suspension_core.can.capture import (
+    BLOCK_HEADER,
+    FILE_HEADER,
+    RECORD_DTYPE,
+    CaptureReader,
+    CaptureWriter,
+)
+from common.suspension_core.can.replay import ReplayCanInterface
+
+
+def _message(i):
+    return can.Message(timestamp=100.0 + i * 0.001, arbitration_id=0x08AAAA60 + (i % 2),
+                       data=bytes([i % 256, (i >> 8) % 256, 0, 0, 50, 10, 0, 0]))
+
+
+def _record(tmp_path, count=2500, **kwargs):
+    writer = CaptureWriter(str(tmp_path), site="bench1", block_records=1000, **kwargs)
+    writer.start()
+    batch = CanFrameBatch(500)
+    for i in range(count):
+        batch.append(_message(i))
+        if batch.full:
+            writer.write_batch(batch)
+            batch.clear()
+    writer.write_batch(batch)
+    writer.write(_message(count))
+    writer.stop()
+    return writer
+
+
+def test_roundtrip_with_index(tmp_path):
+    """Records, Header und Block-Index überstehen Schreiben und Lesen"""
+    writer = _record(tmp_path)
+    assert writer.get_stats()["frames_written"] == 2501
+    assert len(writer.files) == 1
+
+    reader = CaptureReader(writer.files[0])
+    assert reader.header.site == "bench1"
+    assert reader.header.bitrate == 1000000
+    assert len(reader) == 2501
+    assert all(block.count <= 1000 for block in reader.index)
+
+    messages = list(reader.messages())
+    assert [msg.arbitration_id for msg in messages] == [_message(i).arbitration_id for i in range(2501)]
+    assert messages[1234].data == _message(1234).data
+    assert messages[1234].timestamp == _message(1234).timestamp
+
+    window = reader.read(start=101.0, end=101.5)
+    assert len(window) == 501
+    assert window["timestamp"][0] == 101.0
+
+
+def test_truncated_file_is_readable(tmp_path):
+    """Ein abgeschnittener letzter Block wird bis zum letzten vollständigen Frame gelesen"""
+    path = _record(tmp_path).files[0]
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        f.truncate(size - 5)
+
+    reader = CaptureReader(path)
+    assert len(reader) == 2500
+    assert reader.read()["timestamp"][-1] == _message(2499).timestamp
+    expected = FILE_HEADER.size + len(reader.index) * BLOCK_HEADER.size + len(reader) * RECORD_DTYPE.itemsize
+    assert expected <= os.path.getsize(path)
+
+
+def test_rotation_by_size(tmp_path):
+    """Dateien werden nach max_bytes rotiert"""
+    writer = _record(tmp_path, max_bytes=30 * 1024)
+    assert len(writer.files) > 1
+    assert sum(len(CaptureReader(path)) for path in writer.files) == 2501
+
+
+def test_replay_is_deterministic(tmp_path):
+    """Wiedergabe mit Maximalgeschwindigkeit liefert die aufgezeichneten Zeitstempel"""
+    _record(tmp_path)
+
+    runs = []
+    for _ in range(2):
+        received = []
+        replay = ReplayCanInterface(str(tmp_path), speed=0, batch_size=128, autostart=False)
+        replay.add_batch_callback(lambda batch: received.append(batch.timestamps.copy()))
+        replay.connect()
+        assert replay.wait(5.0)
+        runs.append(np.concatenate(received))
+        assert replay.get_replay_stats()["frames_received"] == 2501
+
+    np.testing.assert_array_equal(runs[0], runs[1])
+    np.testing.assert_array_equal(runs[0], [_message(i).timestamp for i in range(2501)])
+
+
+def test_replay_paced(tmp_path):
+    """Bei speed=N dauert die Wiedergabe etwa Dauer/N"""
+    _record(tmp_path, count=200)  # 0.2 s Aufzeichnung
+    frames = []
+    replay = ReplayCanInterface(str(tmp_path), speed=2.0, autostart=False)
+    replay.add_message_callback(frames.append)
+    replay.connect()
+    assert not replay.wait(0.05)
+    assert replay.wait(2.0)
+    assert len(frames) == 201
@@ -0,0 +1,68 @@
+"""
+Tests für den Session-Speicher der CAN-Frames (Kapazität, Überlauf, Dekodier-Reihenfolge)
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# Das can-Paket importiert suspension_core ohne Paketpräfix
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "common"))
+
+from common.suspension_core.can.session_store import SessionFrameStore
+
+
+def test_capacity_and_overflow_counting():
+    """Ab Erreichen der Kapazität werden Frames verworfen und gezählt, die ersten bleiben erhalten"""
+    store = SessionFrameStore(capacity=3)
+    results = [store.append(float(i), 0x100 + i, [i] * 10, "hardware") for i in range(5)]
+
+    assert results == [True, True, True, False, False]
+    stats = store.get_stats()
+    assert stats["frames"] == 3 and stats["overflow"] == 2 and stats["utilization"] == 1.0
+    assert [frame["timestamp"] for frame in store.take_pending()] == [0.0, 1.0, 2.0]
+    assert store.nbytes == 3 * (8 + 4 + 8 + 1 + 1)
+
+    store.close()
+    assert SessionFrameStore(0).capacity == 1
+    assert store.append(9.0, 0x1, [1], "hardware") is False
+    assert store.get_stats()["overflow"] == 2  # geschlossen zählt nicht als Überlauf
+
+
+def test_take_pending_returns_new_frames_in_order():
+    """take_pending liefert jeden Frame genau einmal in Empfangsreihenfolge"""
+    store = SessionFrameStore(capacity=100)
+    store.append(0.5, 0x18FF0001, bytes([1, 2, 3]), "simulator")
+    store.append(0.6, 0x18FF0002, [4, 5, 6, 7, 8, 9, 10, 11, 12], "unknown")
+
+    first = store.take_pending()
+    assert first == [
+        {"source": "simulator", "timestamp": 0.5, "arbitration_id": 0x18FF0001,
+         "data": [1, 2, 3], "is_extended_id": True},
+        {"source": "hardware", "timestamp": 0.6, "arbitration_id": 0x18FF0002,
+         "data": [4, 5, 6, 7, 8, 9, 10, 11], "is_extended_id": True},
+    ]
+    assert store.take_pending() == []
+
+    store.append(0.7, 0x3, [0], "hardware")
+    assert [frame["arbitration_id"] for frame in store.take_pending()] == [0x3]
+    assert store.get_stats()["decoded"] == 3
+
+
+def test_concurrent_appends_are_not_lost():
+    """Gleichzeitiges Schreiben aus mehreren Threads verliert keine Frames"""
+    store = SessionFrameStore(capacity=4000)
+
+    def writer(offset):
+        for i in range(1000):
+            store.append(float(offset + i), offset + i, [1], "hardware")
+
+    threads = [threading.Thread(target=writer, args=(n * 1000,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    frames = store.take_pending()
+    assert len(frames) == 4000 and store.overflow == 0
+    assert sorted(frame["arbitration_id"] for frame in frames) == list(range(4000))
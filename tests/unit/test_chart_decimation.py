@@ -0,0 +1,68 @@
+"""
+Tests für Zeitfenster-Auswahl und Min/Max-Dezimierung der Chart-Pipeline
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("tkinter")
+
+from frontend.desktop_gui.views.chart_widget import ChartSampleBuffer, minmax_decimate
+
+
+def test_minmax_decimate_keeps_extremes_and_order():
+    """Spitzen, Endpunkte und zeitliche Reihenfolge bleiben erhalten"""
+    x = np.arange(10_000) / 1000.0
+    y = np.sin(2 * np.pi * 5 * x)
+    y[1234] = 7.5
+    y[8765] = -9.0
+
+    x_plot, y_plot = minmax_decimate(x, y, 400)
+
+    assert len(x_plot) <= 2 * 400 + 2
+    assert y_plot.max() == 7.5 and y_plot.min() == -9.0
+    assert x_plot[0] == x[0] and x_plot[-1] == x[-1]
+    assert np.all(np.diff(x_plot) > 0)
+
+
+def test_minmax_decimate_small_input_unchanged():
+    x = np.arange(50.0)
+    x_plot, y_plot = minmax_decimate(x, x * 2, 400)
+    assert len(x_plot) == 50
+    np.testing.assert_array_equal(y_plot, x * 2)
+
+
+def test_sample_buffer_window_and_compaction():
+    """Zeitfenster per Binärsuche, auch nach dem Umkopieren des vollen Arrays"""
+    buffer = ChartSampleBuffer(("platform", "force"), capacity=5000)
+    for start in range(0, 12_000, 1000):
+        t = np.arange(start, start + 1000) / 1000.0
+        buffer.append(np.vstack((t, 2 * t, 3 * t)))
+
+    assert len(buffer) == 5000
+    assert buffer.last_time == 11.999
+
+    time_data, channels = buffer.window(2.0)
+    assert time_data[0] == pytest.approx(9.999)
+    assert len(time_data) == 2001
+    np.testing.assert_allclose(channels["force"], 3 * time_data)
+    assert np.shares_memory(time_data, buffer._data)
+
+    buffer.clear()
+    assert len(buffer) == 0
+    assert len(buffer.window(2.0)[0]) == 0
+
+
+def test_decimation_cost_independent_of_sample_count():
+    """Ausgabegröße hängt von der Pixelbreite ab, nicht von der Sampleanzahl"""
+    x = np.arange(1_000_000) / 1000.0
+    y = np.random.default_rng(0).standard_normal(len(x))
+
+    start = time.perf_counter()
+    x_plot, _ = minmax_decimate(x, y, 500)
+    elapsed = time.perf_counter() - start
+
+    assert len(x_plot) <= 1002
+    assert elapsed < 0.5
@@ -0,0 +1,48 @@
+"""
+Tests für Achsen-Hysterese und adaptive Bildrate des Blitting-Renderers
+"""
+
+import time
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from frontend.desktop_gui.views.chart_widget import FramePacer, rescale_ylim, target_ylim
+
+
+def test_rescale_only_when_leaving_hysteresis_band():
+    """Kleine Schwankungen innerhalb des Bandes lösen kein Neuskalieren aus"""
+    limits = target_ylim(-3.0, 3.0)
+    assert limits == pytest.approx((-3.6, 3.6))
+
+    assert rescale_ylim(limits, -2.9, 3.1) is None
+    assert rescale_ylim(limits, -2.0, 2.0) is None
+
+    # Daten verlassen das Band
+    assert rescale_ylim(limits, -3.0, 4.0) == pytest.approx(target_ylim(-3.0, 4.0))
+    # Signal schrumpft unter die Hysterese-Schwelle
+    assert rescale_ylim(limits, -1.0, 1.0) == pytest.approx(target_ylim(-1.0, 1.0))
+
+
+def test_constant_signal_limits():
+    assert target_ylim(500.0, 500.0) == pytest.approx((450.0, 550.0))
+    assert target_ylim(0.0, 0.0) == (-1.0, 1.0)
+
+
+def test_frame_pacer_adapts_interval():
+    """Teure Frames verlängern das Intervall, günstige halten das Minimum"""
+    pacer = FramePacer(min_interval_ms=50, max_interval_ms=500, budget=0.5)
+
+    pacer.record(time.perf_counter() - 0.002, blitted=True)
+    assert pacer.interval_ms == 50
+
+    for _ in range(30):
+        pacer.record(time.perf_counter() - 0.120, blitted=False)
+    assert 200 <= pacer.interval_ms <= 500
+
+    stats = pacer.get_stats()
+    assert stats["frames"] == 31
+    assert stats["blit_frames"] == 1
+    assert stats["full_redraws"] == 30
+    assert stats["fps"] > 0
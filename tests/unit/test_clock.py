@@ -0,0 +1,160 @@
+"""
+Tests für die injizierbare Uhr (Echtzeit, beschleunigt, schrittweise)
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Das can-Paket importiert suspension_core ohne Paketpräfix
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "common"))
+
+from common.suspension_core.can.hybrid_simulator import HybridSimulator
+from common.suspension_core.clock import (
+    STEPPED_EPOCH,
+    RealTimeClock,
+    ScaledClock,
+    SteppedClock,
+    create_clock,
+    get_clock,
+    set_clock,
+)
+from common.suspension_core.mqtt.chunked_transfer import (
+    RETRANSMIT_TOPIC,
+    ChunkedDatasetReceiver,
+    ChunkedDatasetSender,
+)
+
+
+def test_stepped_clock_advances_without_waiting():
+    """Wartezeiten kehren sofort zurück und rücken die virtuelle Uhr vor"""
+    clock = SteppedClock()
+    event = threading.Event()
+
+    start = time.perf_counter()
+    clock.sleep(10.0)
+    assert clock.wait(event, timeout=5.0) is False
+    asyncio.run(clock.async_sleep(15.0))
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(clock.wait_for(asyncio.sleep(3600), timeout=30.0))
+
+    assert time.perf_counter() - start < 1.0
+    assert clock.time() == STEPPED_EPOCH + 60.0
+    assert clock.monotonic() == 60.0
+    assert clock.get_stats()["sleeps"] == 4
+
+    event.set()
+    assert clock.wait(event, timeout=5.0) is True
+    assert clock.time() == STEPPED_EPOCH + 60.0  # gesetztes Event: keine Wartezeit
+
+
+def test_scaled_clock_and_specs():
+    """Beschleunigte Uhr teilt Wartezeiten; Modi werden aus Kurzbeschreibungen erstellt"""
+    clock = ScaledClock(50.0)
+    start_sim, start_real = clock.time(), time.perf_counter()
+    clock.sleep(1.0)
+    assert time.perf_counter() - start_real < 0.5
+    assert clock.time() - start_sim >= 0.9
+
+    assert isinstance(create_clock("realtime"), RealTimeClock)
+    assert create_clock("scaled:20").factor == 20.0
+    assert create_clock("stepped:100").time() == 100.0
+    assert SteppedClock().idle_timeout(1.0) == 0.05
+    with pytest.raises(ValueError):
+        create_clock("warp:9")
+
+
+def test_simulator_test_runs_instantly_and_deterministic():
+    """Ein 30-s-Test des Hybrid-Simulators läuft schrittweise in Rechenzeit mit festen Zeitstempeln"""
+
+    def run():
+        simulator = HybridSimulator(clock=SteppedClock())
+        simulator.set_generate_low_level(False)
+        done = threading.Event()
+        messages = []
+
+        def on_message(msg):
+            messages.append((msg.timestamp, msg.interpreted_data.get("tire_force")))
+            if msg.interpreted_data.get("event") == "test_completed":
+                done.set()
+
+        simulator.add_message_callback(on_message)
+        simulator.start_test("left", 30.0)
+        assert done.wait(timeout=20.0)
+        return messages
+
+    start = time.perf_counter()
+    first = run()
+    assert time.perf_counter() - start < 15.0
+
+    assert first == run()
+    assert first[-1][0] - first[0][0] == pytest.approx(30.0, abs=0.1)
+    assert len(first) >= 500
+
+
+def test_receiver_timeouts_follow_clock():
+    """Retransmit-Timeouts des Dataset-Empfängers laufen in Simulationszeit"""
+    clock = SteppedClock()
+    requests = []
+    receiver = ChunkedDatasetReceiver(
+        lambda topic, payload: requests.append((topic, payload)), retransmit_timeout=2.0, clock=clock
+    )
+    sender = ChunkedDatasetSender(lambda topic, payload: None, chunk_size=100)
+    transfer = sender.prepare("test_1", {"tire_force": list(range(1000))}, {})
+
+    receiver.on_manifest(transfer.manifest())
+    clock.advance(1.5)
+    receiver.check_timeouts()
+    assert requests == []
+
+    clock.advance(1.0)
+    receiver.check_timeouts()
+    assert requests[0][0] == RETRANSMIT_TOPIC
+    assert requests[0][1]["transfer_id"] == "test_1"
+
+
+def test_clock_module_shared_between_import_paths():
+    """suspension_core.clock und common.suspension_core.clock sind dasselbe Modul mit einer Standarduhr"""
+    import suspension_core.clock as short_path
+    from suspension_core.mqtt import chunked_transfer
+
+    from common.suspension_core import clock as full_path
+
+    assert short_path is full_path
+    assert short_path.SteppedClock is SteppedClock
+
+    clock = SteppedClock()
+    set_clock(clock)
+    try:
+        assert short_path.get_clock() is clock
+        assert chunked_transfer.get_clock() is clock
+    finally:
+        set_clock(None)
+    assert get_clock() is not clock
+
+
+def test_import_paths_share_package_and_singletons():
+    """Beide Präfixe liefern dasselbe Paket, Attributzugriff und dieselben Singletons"""
+    import suspension_core
+    import suspension_core.clock
+    from suspension_core.egea.utils import analysis_cache as short_cache
+    from suspension_core.egea.utils import filter_bank as short_filter_bank
+    from suspension_core.tracing import get_tracer as short_get_tracer
+
+    import common.suspension_core
+    import common.suspension_core.clock
+    from common.suspension_core.egea.utils import analysis_cache as full_cache
+    from common.suspension_core.egea.utils import filter_bank as full_filter_bank
+    from common.suspension_core.tracing import get_tracer as full_get_tracer
+
+    assert common.suspension_core is suspension_core
+    assert common.suspension_core.clock is suspension_core.clock
+    assert common.suspension_core.clock.get_clock is get_clock
+    assert short_get_tracer() is full_get_tracer()
+    assert short_filter_bank.get_filter_bank() is full_filter_bank.get_filter_bank()
+    assert short_cache.get_analysis_cache() is full_cache.get_analysis_cache()
+    assert short_cache.EGEAAnalysisCache is full_cache.EGEAAnalysisCache
@@ -0,0 +1,95 @@
+"""
+Tests für den EUSAMA-Frame-Dekoder
+"""
+
+import struct
+from types import SimpleNamespace
+
+import numpy as np
+
+from common.suspension_core.protocols.eusama_decoder import RAW_SAMPLE_DTYPE, EusamaDecoder
+from common.suspension_core.protocols.eusama_protocol import EusamaProtocol
+
+
+def _raw_frame(arbitration_id, position, force, frequency, phase, timestamp):
+    data = bytearray(struct.pack("<HHBB2x", position, force, frequency, phase))
+    return SimpleNamespace(arbitration_id=arbitration_id, data=data, timestamp=timestamp)
+
+
+def _frames(count=20):
+    frames = []
+    for i in range(count):
+        arbitration_id = EusamaProtocol.RAW_DATA_LEFT_ID if i % 2 == 0 else EusamaProtocol.RAW_DATA_RIGHT_ID
+        frames.append(_raw_frame(arbitration_id, 500 + i, 1000 - i, 10 + i % 5, (i * 13) % 256, 1.0 + i * 0.001))
+    return frames
+
+
+class FakeCanInterface:
+    def __init__(self):
+        self.callbacks = []
+
+    def add_message_callback(self, callback):
+        self.callbacks.append(callback)
+
+
+def test_single_frame_matches_wire_layout():
+    """Einzel-Dekodierung liefert die Werte aus Byte-Layout und Skalierung"""
+    decoder = EusamaDecoder()
+    message_type, data = decoder.decode(_raw_frame(EusamaProtocol.RAW_DATA_RIGHT_ID, 0x0302, 0x0104, 17, 255, 2.5))
+
+    assert message_type == "raw_data"
+    assert data == {
+        "platform_position": 0x0302,
+        "tire_force": 0x0104,
+        "frequency": 17,
+        "phase_shift": 90.0,
+        "timestamp": 2.5,
+        "position": "front_right",
+    }
+    assert decoder.decode(SimpleNamespace(arbitration_id=0x123, data=b"", timestamp=0)) == (None, None)
+
+    short = SimpleNamespace(arbitration_id=EusamaProtocol.RAW_DATA_LEFT_ID, data=b"\x00" * 4, timestamp=0)
+    assert decoder.decode(short) == ("raw_data", None)
+
+
+def test_batch_equals_single_frames():
+    """Batch-Dekodierung entspricht der Einzel-Dekodierung"""
+    decoder = EusamaDecoder()
+    frames = _frames()
+    foreign = SimpleNamespace(arbitration_id=EusamaProtocol.MOTOR_STATUS_ID, data=bytearray(8), timestamp=0.0)
+
+    batch = decoder.decode_raw_batch(frames[:10] + [foreign] + frames[10:])
+
+    assert batch.dtype == RAW_SAMPLE_DTYPE
+    assert len(batch) == len(frames)
+    np.testing.assert_array_equal(batch["side"], [i % 2 for i in range(len(frames))])
+
+    for row, expected in zip(decoder.batch_to_dicts(batch), (decoder.decode(f)[1] for f in frames)):
+        assert row.keys() == expected.keys()
+        for key, value in expected.items():
+            assert row[key] == value
+
+
+def test_protocol_dispatches_batches_and_dicts():
+    """EusamaProtocol liefert Arrays an raw_batch- und Dicts an raw_data-Callbacks"""
+    can_interface = FakeCanInterface()
+    protocol = EusamaProtocol(can_interface)
+    protocol.register_callbacks()
+
+    batches, samples, motor = [], [], []
+    protocol.add_callback("raw_batch", batches.append)
+    protocol.add_callback("raw_data", samples.append)
+    protocol.add_callback("motor_status", motor.append)
+
+    frames = _frames(8)
+    status = SimpleNamespace(arbitration_id=EusamaProtocol.MOTOR_STATUS_ID,
+                             data=bytearray([0x02, 0, 0, 0, 0, 0, 0, 0]), timestamp=0.0)
+    assert protocol.process_frames(frames + [status]) == 8
+
+    assert len(batches) == 1 and len(batches[0]) == 8
+    assert [s["position"] for s in samples[:2]] == ["front_left", "front_right"]
+    assert motor == [{"left_running": False, "right_running": True}]
+
+    # Einzelne Frames über den registrierten CAN-Callback
+    can_interface.callbacks[0](frames[0])
+    assert len(batches) == 2 and len(samples) == 9
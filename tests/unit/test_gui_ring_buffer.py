@@ -0,0 +1,152 @@
+"""
+Tests für den strukturierten RingBuffer der Desktop-GUI (sperrfreie Lese-Snapshots)
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+# BackgroundProcessor importiert suspension_core ohne Paketpräfix
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "common"))
+
+from frontend.desktop_gui.models.data_buffer import OptimizedDataBuffer, RingBuffer
+
+
+def _fill(ring, count, start=0):
+    for i in range(start, start + count):
+        ring.append(float(i), 2.0 * i, 3.0 * i, 10.0, 40.0)
+
+
+def test_recent_data_and_wraparound():
+    """Neueste Werte in Reihenfolge, auch über das Array-Ende hinweg"""
+    ring = RingBuffer(100)
+    _fill(ring, 250)
+
+    assert ring.size == 100
+    recent = ring.get_recent_data(30)
+    np.testing.assert_array_equal(recent['time'], np.arange(220, 250))
+    np.testing.assert_array_equal(recent['tire_force'], 3.0 * np.arange(220, 250))
+    np.testing.assert_array_equal(ring.get_data()['time'], np.arange(150, 250))
+    assert len(ring.get_data(max_points=10)['time']) == 10
+
+    snapshot = ring.snapshot()
+    assert len(snapshot) == 100
+    assert len(snapshot.segments) == 2
+    np.testing.assert_array_equal(snapshot.channel('platform_position'), 2.0 * np.arange(150, 250))
+    assert snapshot.is_valid()
+    _fill(ring, 101, start=250)
+    assert not snapshot.is_valid()
+
+
+def test_views_without_copy():
+    """copy=False liefert Views, solange das Fenster nicht umbricht"""
+    ring = RingBuffer(100)
+    _fill(ring, 50)
+
+    recent = ring.get_recent_data(20, copy=False)
+    assert np.shares_memory(recent['time'], ring._data)
+    assert ring.get_stats()['copies_avoided'] == 1
+    assert not np.shares_memory(ring.get_recent_data(20)['time'], ring._data)
+
+    ring.clear()
+    assert ring.size == 0
+    assert len(ring.get_recent_data(10)['time']) == 0
+    _fill(ring, 5, start=50)
+    np.testing.assert_array_equal(ring.get_data()['time'], np.arange(50, 55))
+
+
+def test_float32_storage_keeps_time_precision():
+    """float32 halbiert die Messkanäle, die Zeit bleibt float64"""
+    ring = RingBuffer(1000, dtype=np.float32)
+    ring.append(1.7e9 + 0.001, 1.5, 500.0)
+
+    data = ring.get_data()
+    assert data['tire_force'].dtype == np.float32
+    assert data['time'][0] == 1.7e9 + 0.001
+    assert ring.get_stats()['memory_usage_mb'] < RingBuffer(1000).get_stats()['memory_usage_mb']
+
+
+def test_concurrent_reads_are_consistent():
+    """Leser sehen trotz laufendem Schreiber nur vollständige, zusammenhängende Zeilen"""
+    ring = RingBuffer(64)
+    stop = threading.Event()
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            ring.append(float(i), 2.0 * i, 3.0 * i)
+            i += 1
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(2000):
+            data = ring.get_recent_data(64)
+            times = data['time']
+            if len(times) > 1:
+                assert np.all(np.diff(times) == 1.0)
+                np.testing.assert_array_equal(data['platform_position'], 2.0 * times)
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_data_buffer_reports_reader_stats():
+    """OptimizedDataBuffer meldet Retries und vermiedene Kopien"""
+    buffer = OptimizedDataBuffer(max_size=200, dtype=np.float32)
+    try:
+        for i in range(10):
+            buffer.add_data({'timestamp': float(i), 'platform_position': i, 'tire_force': 500})
+        buffer.get_recent_data(5, copy=False)
+
+        stats = buffer.get_performance_stats()['data_buffer']
+        assert stats['data_points'] == 10
+        assert stats['copies_avoided'] == 1
+        assert stats['reader_retries'] == 0
+        assert stats['dtype'] == 'float32'
+    finally:
+        buffer.shutdown()
+
+
+def test_presenter_chart_data_survives_ring_lap():
+    """Die verzögerte Chart-Aktualisierung des Presenters sieht die Daten zum Abfragezeitpunkt"""
+    from frontend.desktop_gui.presenters.main_presenter import MainPresenter
+
+    class _Charts:
+        def update_charts(self, data):
+            self.data = data
+
+    class _Root:
+        def after_idle(self, callback):
+            self.callback = callback
+
+    class _View:
+        def __init__(self):
+            self.chart_widget = _Charts()
+            self.root = _Root()
+
+        def update_data_count(self, count):
+            pass
+
+        def update_egea_status(self, status):
+            pass
+
+    buffer = OptimizedDataBuffer(max_size=600)
+    try:
+        for i in range(500):
+            buffer.add_data({'timestamp': float(i), 'platform_position': i, 'tire_force': 500})
+        presenter = MainPresenter()
+        view = _View()
+        presenter.view, presenter.data_buffer = view, buffer
+        presenter._update_ui()
+
+        # Writer überholt den Ring, bevor der Tk-Main-Thread den Callback ausführt
+        for i in range(500, 1100):
+            buffer.add_data({'timestamp': float(i), 'platform_position': i, 'tire_force': 500})
+        view.root.callback()
+
+        np.testing.assert_array_equal(view.chart_widget.data['time'], np.arange(500))
+    finally:
+        buffer.shutdown()
@@ -0,0 +1,104 @@
+"""
+Tests für das binäre Batch-Format der Mess-Topics
+"""
+
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from common.suspension_core.mqtt.binary_format import (
+    BinaryFrameError,
+    SampleBatch,
+    SampleBatchWriter,
+    binary_topic,
+    decode_sample_batch,
+    encode_sample_batch,
+    is_binary_frame,
+)
+from common.suspension_core.mqtt.client import MqttClient
+
+
+def _columns(count=50):
+    t = np.arange(count) / 1000.0
+    return {
+        "elapsed": t,
+        "platform_position": np.sin(2 * np.pi * 10 * t),
+        "tire_force": 500.0 + 50.0 * np.cos(2 * np.pi * 10 * t),
+        "dms_values": np.arange(count * 4, dtype=float).reshape(count, 4),
+    }
+
+
+def test_roundtrip():
+    """Kodieren und Dekodieren liefert Header und Spalten zurück"""
+    columns = _columns()
+    frame = encode_sample_batch("test_1", "front_left", columns, sequence=7,
+                                sample_rate=1000.0, static_weight=480.0)
+
+    assert is_binary_frame(frame)
+    batch = decode_sample_batch(frame)
+
+    assert (batch.test_id, batch.position, batch.sequence) == ("test_1", "front_left", 7)
+    assert batch.sample_rate == 1000.0
+    assert batch.static_weight == 480.0
+    assert len(batch) == 50
+    assert set(batch.columns) == set(columns)
+    np.testing.assert_array_equal(batch.columns["elapsed"], columns["elapsed"])
+    np.testing.assert_allclose(batch.columns["tire_force"], columns["tire_force"], rtol=1e-6)
+    assert batch.columns["dms_values"].shape == (50, 4)
+
+    # Deutlich kleiner als ein JSON-Objekt pro Sample
+    json_size = sum(len(json.dumps(s)) for s in batch.to_samples())
+    assert len(frame) * 4 < json_size
+
+
+def test_invalid_frames_rejected():
+    """Falsche Magic und abgeschnittene Frames werden erkannt"""
+    frame = encode_sample_batch("t", "front_left", _columns(10))
+
+    with pytest.raises(BinaryFrameError):
+        decode_sample_batch(frame[:-3])
+    with pytest.raises(BinaryFrameError):
+        decode_sample_batch(b"XXXX" + frame[4:])
+    assert not is_binary_frame(b'{"elapsed": 0.0}')
+
+
+def test_writer_batches_samples():
+    """SampleBatchWriter bündelt Sample-Dicts zu Frames"""
+    published = []
+    writer = SampleBatchWriter(lambda topic, frame: published.append((topic, frame)),
+                               "suspension/raw_data/complete", "t", "front_left", batch_size=4)
+
+    for i in range(10):
+        writer.add({"elapsed": i * 0.001, "tire_force": 500.0 + i, "static_weight": 500})
+    writer.flush()
+
+    assert [topic for topic, _ in published] == [binary_topic("suspension/raw_data/complete")] * 3
+    batches = [decode_sample_batch(frame) for _, frame in published]
+    assert [len(b) for b in batches] == [4, 4, 2]
+    assert [b.sequence for b in batches] == [0, 1, 2]
+    assert batches[2].to_samples()[-1]["tire_force"] == 509.0
+
+
+def test_client_dispatch_batch_and_legacy():
+    """Batch-fähige Callbacks erhalten SampleBatch, Legacy-Callbacks einzelne Dicts"""
+    client = MqttClient()
+    batches, samples = [], []
+    client.add_callback("suspension/raw_data/complete", lambda t, p: batches.append((t, p)),
+                        accepts_batches=True)
+    client.add_callback("suspension/raw_data/complete", lambda t, p: samples.append((t, p)))
+
+    frame = encode_sample_batch("t", "front_left", _columns(5))
+    client._on_message(None, None, SimpleNamespace(topic="suspension/raw_data/complete/bin", payload=frame))
+
+    assert len(batches) == 1 and isinstance(batches[0][1], SampleBatch)
+    assert batches[0][0] == "suspension/raw_data/complete"
+    assert len(samples) == 5
+    assert samples[0][1]["test_id"] == "t"
+    assert client.get_stats()["binary_samples_received"] == 5
+
+    # JSON-Nachrichten unverändert
+    client._on_message(None, None, SimpleNamespace(
+        topic="suspension/raw_data/complete", payload=b'{"elapsed": 1.0}'))
+    assert samples[-1][1] == {"elapsed": 1.0}
@@ -0,0 +1,135 @@
+"""
+Tests für die chunkweise Dataset-Übertragung zwischen Bridge und Processing Service
+"""
+
+import asyncio
+
+import numpy as np
+
+from common.suspension_core.mqtt.chunked_transfer import (
+    ACK_TOPIC,
+    CHUNK_TOPIC,
+    COMMIT_TOPIC,
+    MANIFEST_TOPIC,
+    RETRANSMIT_TOPIC,
+    STATUS_COMPLETE,
+    STATUS_FAILED,
+    ChunkedDatasetReceiver,
+    ChunkedDatasetSender,
+)
+
+
+def _columns(count=2500):
+    t = np.arange(count) / 1000.0
+    return {
+        "timestamp": 1000.0 + t,
+        "platform_position": np.sin(2 * np.pi * 10 * t).astype(np.float32),
+        "tire_force": (500 + 100 * np.cos(2 * np.pi * 10 * t)).astype(np.float32),
+    }
+
+
+class _Link:
+    """Verbindet Sender und Empfänger; Chunks können verloren gehen oder verfälscht werden"""
+
+    def __init__(self, lose=(), corrupt=()):
+        self.lose = set(lose)
+        self.corrupt = set(corrupt)
+        self.sender = ChunkedDatasetSender(self.to_receiver, chunk_size=1000)
+        self.receiver = ChunkedDatasetReceiver(self.to_sender, retransmit_timeout=0.0, max_retransmits=2)
+        self.datasets = []
+        self.acks = []
+        self.requests = []
+
+    def to_receiver(self, topic, payload):
+        if topic == MANIFEST_TOPIC:
+            if "manifest" in self.lose:
+                self.lose.discard("manifest")
+                return
+            self.receiver.on_manifest(payload)
+        elif topic == CHUNK_TOPIC:
+            sequence = int.from_bytes(payload[8:12], "little")
+            if sequence in self.lose:
+                self.lose.discard(sequence)
+                return
+            if sequence in self.corrupt:
+                self.corrupt.discard(sequence)
+                payload = payload[:-1] + bytes([payload[-1] ^ 0xFF])
+            self._collect(self.receiver.on_chunk(payload))
+        elif topic == COMMIT_TOPIC:
+            self._collect(self.receiver.on_commit(payload))
+
+    def to_sender(self, topic, payload):
+        if topic == RETRANSMIT_TOPIC:
+            self.requests.append(payload)
+            self.sender.handle_retransmit(payload)
+        elif topic == ACK_TOPIC:
+            self.acks.append(payload)
+            self.sender.handle_ack(payload)
+
+    def _collect(self, dataset):
+        if dataset is not None:
+            self.datasets.append(dataset)
+
+
+def test_roundtrip():
+    """Chunks werden in vorab allokierte Spalten zusammengesetzt und bestätigt"""
+    link = _Link()
+    columns = _columns()
+    transfer = asyncio.run(link.sender.send_async("test_1", columns, {"position": "front_left"}))
+
+    assert transfer.chunk_count == 3
+    assert len(link.datasets) == 1
+    dataset = link.datasets[0]
+    assert dataset.metadata == {"position": "front_left"}
+    for name, values in columns.items():
+        np.testing.assert_array_equal(dataset.columns[name], values)
+        assert dataset.columns[name].dtype == values.dtype
+
+    assert link.acks[0]["status"] == STATUS_COMPLETE
+    assert link.requests == []
+    assert link.sender.get_stats()["pending_transfers"] == 0
+    assert dataset.stats["reassembly_ms"] >= 0.0
+
+
+def test_lost_and_corrupted_chunks_are_retransmitted():
+    """Fehlende und CRC-fehlerhafte Chunks werden nach dem Commit angefordert"""
+    link = _Link(lose={0}, corrupt={2})
+    columns = _columns()
+    link.sender.send("test_2", columns, {})
+
+    assert link.requests == [{"transfer_id": "test_2", "missing": [0, 2]}]
+    assert len(link.datasets) == 1
+    np.testing.assert_array_equal(link.datasets[0].columns["tire_force"], columns["tire_force"])
+
+    stats = link.receiver.get_stats()
+    assert stats["crc_errors"] == 1
+    assert stats["transfers_completed"] == 1
+    assert link.sender.get_stats()["chunks_retransmitted"] == 2
+
+
+def test_lost_manifest_requests_full_transfer():
+    """Ohne Manifest fordert der Commit die komplette Übertragung an"""
+    link = _Link(lose={"manifest"})
+    link.sender.send("test_3", _columns(1500), {})
+
+    assert link.requests == [{"transfer_id": "test_3", "missing": None}]
+    assert len(link.datasets) == 1
+    assert len(link.datasets[0]) == 1500
+
+
+def test_gives_up_after_max_retransmits():
+    """Bleiben Chunks aus, wird die Übertragung nach max_retransmits verworfen"""
+    sent = []
+    receiver = ChunkedDatasetReceiver(lambda topic, payload: sent.append((topic, payload)),
+                                      retransmit_timeout=0.0, max_retransmits=2)
+    sender = ChunkedDatasetSender(lambda topic, payload: None, chunk_size=1000)
+    transfer = sender.prepare("test_4", _columns(), {})
+
+    receiver.on_manifest(transfer.manifest())
+    assert receiver.on_commit(transfer.commit()) is None
+    assert receiver.check_timeouts() == []
+    assert receiver.check_timeouts() == ["test_4"]
+
+    assert [topic for topic, _ in sent] == [RETRANSMIT_TOPIC, RETRANSMIT_TOPIC, ACK_TOPIC]
+    assert sent[-1][1]["status"] == STATUS_FAILED
+    assert receiver.get_stats()["active_transfers"] == 0
@@ -0,0 +1,93 @@
+"""
+Tests für die Eingangs-Queue zwischen paho-Thread und asyncio
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from common.suspension_core.mqtt.ingest_queue import (
+    CLASS_CONTROL,
+    CLASS_DEFAULT,
+    CLASS_TELEMETRY,
+    MessageIngestQueue,
+)
+
+TELEMETRY = "suspension/measurements/processed"
+STATUS = "suspension/test/status"
+
+
+def _drain(queue):
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def test_classification():
+    """Topics werden über Patterns Klassen zugeordnet"""
+    queue = MessageIngestQueue(topic_classes={"custom/#": CLASS_CONTROL})
+    assert queue.classify(TELEMETRY) == CLASS_TELEMETRY
+    assert queue.classify("suspension/can/raw") == CLASS_TELEMETRY
+    assert queue.classify("suspension/test/results/live") == CLASS_TELEMETRY
+    assert queue.classify(STATUS) == CLASS_CONTROL
+    assert queue.classify("suspension/processing/command") == CLASS_CONTROL
+    assert queue.classify("custom/topic") == CLASS_CONTROL
+    assert queue.classify("suspension/system/status") == CLASS_DEFAULT
+
+
+def test_telemetry_drops_oldest():
+    """Volle Queue verwirft die älteste Telemetrie"""
+    queue = MessageIngestQueue(capacity=3)
+    for i in range(5):
+        assert queue.put(TELEMETRY, i)
+
+    assert [message for _, message in _drain(queue)] == [2, 3, 4]
+    assert queue.get_stats()["dropped"][CLASS_TELEMETRY] == 2
+
+
+def test_control_never_dropped():
+    """Kommandos und Test-Status verdrängen Telemetrie und gehen nie verloren"""
+    queue = MessageIngestQueue(capacity=3)
+    queue.put(TELEMETRY, "t0")
+    queue.put(STATUS, "s0")
+    queue.put(TELEMETRY, "t1")
+
+    assert queue.put(STATUS, "s1")  # verdrängt t0
+    assert queue.put(STATUS, "s2")  # verdrängt t1
+    assert queue.put(STATUS, "s3")  # keine Telemetrie mehr: über Kapazität
+
+    assert [message for _, message in _drain(queue)] == ["s0", "s1", "s2", "s3"]
+    stats = queue.get_stats()
+    assert stats["dropped"][CLASS_TELEMETRY] == 2
+    assert stats["dropped"][CLASS_CONTROL] == 0
+    assert stats["overflow"] == 1
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        MessageIngestQueue(policies={CLASS_TELEMETRY: "drop_random"})
+
+
+def test_cross_thread_put_wakes_consumer():
+    """Nachrichten aus einem fremden Thread wecken den wartenden Consumer"""
+    queue = MessageIngestQueue(capacity=100000)
+    count = 5000
+
+    def producer():
+        for i in range(count):
+            queue.put(TELEMETRY if i % 10 else STATUS, i)
+
+    async def consume():
+        thread = threading.Thread(target=producer)
+        thread.start()
+        received = [(await asyncio.wait_for(queue.get(), timeout=5.0))[1] for _ in range(count)]
+        thread.join()
+        return received
+
+    assert asyncio.run(consume()) == list(range(count))
+    stats = queue.get_stats()
+    assert stats["enqueued"] == count
+    assert stats["size"] == 0
+    assert stats["max_lag_ms"] >= stats["avg_lag_ms"] >= 0.0
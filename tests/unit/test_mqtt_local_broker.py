@@ -0,0 +1,90 @@
+"""
+Tests für den In-Process-Broker (Ersatz für Mosquitto in Lasttests)
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from common.suspension_core.mqtt.binary_format import SampleBatch
+from common.suspension_core.mqtt.client import MqttClient
+from common.suspension_core.mqtt.local_broker import LocalBroker
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def _client(broker, client_id):
+    client = MqttClient(client_id=client_id, client_factory=broker.create_client)
+    assert client.connect(timeout=1.0)
+    return client
+
+
+def test_json_and_wildcard_delivery():
+    """MqttClient publiziert und empfängt über den lokalen Broker inkl. Wildcards"""
+    broker = LocalBroker()
+    publisher, subscriber = _client(broker, "pub"), _client(broker, "sub")
+    received = []
+    subscriber.subscribe("suspension/test/#", lambda topic, payload: received.append((topic, payload)))
+
+    assert publisher.publish("suspension/test/status", {"status": "started", "test_id": "t1"})
+    assert publisher.publish("suspension/other", {"ignored": True})
+
+    assert _wait_for(lambda: len(received) == 1)
+    assert received[0] == ("suspension/test/status", {"status": "started", "test_id": "t1"})
+
+    publisher.disconnect()
+    assert not publisher.publish("suspension/test/status", {})
+    broker.stop()
+
+
+def test_binary_batches_and_retained_messages():
+    """Binär-Frames werden als SampleBatch zugestellt, Retained Messages an neue Abonnenten"""
+    broker = LocalBroker()
+    publisher = _client(broker, "pub")
+    batches = []
+    subscriber = _client(broker, "sub")
+    subscriber.subscribe(
+        "suspension/raw_data/complete", lambda topic, payload: batches.append(payload), accepts_batches=True
+    )
+
+    columns = {"elapsed": np.arange(50) / 1000.0, "tire_force": np.full(50, 512.0)}
+    assert publisher.publish_batch("suspension/raw_data/complete", "t1", "front_left", columns, sample_rate=1000.0)
+    assert _wait_for(lambda: len(batches) == 1)
+    assert isinstance(batches[0], SampleBatch) and len(batches[0]) == 50
+
+    publisher.publish("suspension/system/status", {"state": "ready"}, retain=True)
+    assert _wait_for(lambda: broker.pending() == 0)
+    late = []
+    _client(broker, "late").subscribe("suspension/system/status", lambda topic, payload: late.append(payload))
+    assert late and late[0]["state"] == "ready"
+    broker.stop()
+
+
+def test_overflow_drops_and_stats():
+    """Bei voller Zustell-Queue werden Nachrichten verworfen und gezählt"""
+    broker = LocalBroker(capacity=5)
+    publisher, subscriber = _client(broker, "pub"), _client(broker, "sub")
+    release = threading.Event()
+    received = []
+
+    def slow(topic, payload):
+        release.wait(2.0)
+        received.append(payload)
+
+    subscriber.subscribe("load/#", slow)
+    results = [publisher.publish(f"load/{i}", {"i": i}) for i in range(20)]
+    release.set()
+
+    stats = broker.get_stats()
+    assert not all(results)
+    assert stats["dropped"] == results.count(False)
+    assert stats["high_watermark"] <= 5
+    assert _wait_for(lambda: broker.pending() == 0)
+    assert len(received) == stats["messages_in"] - stats["dropped"]
+    broker.stop()
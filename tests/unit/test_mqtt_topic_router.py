@@ -0,0 +1,95 @@
+"""
+Tests für den Topic-Trie der MQTT-Zustellung
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from common.suspension_core.mqtt.client import MqttClient
+from common.suspension_core.mqtt.topic_router import TopicRouter
+
+
+def _patterns(router, topic):
+    return [pattern for pattern, _ in router.match(topic)]
+
+
+def test_wildcards():
+    """+ passt auf genau eine Ebene, # auf beliebig viele (auch keine)"""
+    router = TopicRouter()
+    for pattern in ("suspension/#", "suspension/+/status", "suspension/test/status",
+                    "suspension/test/+", "#", "other/topic"):
+        router.add(pattern, pattern)
+
+    assert _patterns(router, "suspension/test/status") == [
+        "suspension/test/status", "suspension/#", "suspension/+/status", "suspension/test/+", "#"
+    ]
+    assert _patterns(router, "suspension") == ["suspension/#", "#"]
+    assert _patterns(router, "suspension/test") == ["suspension/#", "#"]
+    assert _patterns(router, "suspension/test/status/extra") == ["suspension/#", "#"]
+    assert _patterns(router, "other/topic/x") == ["#"]
+
+
+def test_cache_invalidated_on_change():
+    """Subscribe und Unsubscribe verwerfen die gecachten Zuordnungen"""
+    router = TopicRouter()
+    router.add("a/+", "h1")
+    assert router.match("a/b") == (("a/+", "h1"),)
+    assert router.match("a/b") == (("a/+", "h1"),)
+    assert router.cache_hits == 1
+
+    router.add("a/b", "h2")
+    assert router.match("a/b") == (("a/b", "h2"), ("a/+", "h1"))
+
+    router.remove("a/+", "h1")
+    assert router.match("a/b") == (("a/b", "h2"),)
+    assert "a/+" not in router
+
+    router.remove("a/b")
+    assert router.match("a/b") == ()
+    assert len(router) == 0
+
+
+def test_handler_delivered_once():
+    """Ein Handler auf mehreren passenden Patterns wird nur einmal geliefert"""
+    router = TopicRouter()
+    router.add("a/#", "h")
+    router.add("a/b", "h")
+    assert router.match("a/b") == (("a/b", "h"),)
+
+
+def test_client_dispatch_with_wildcards():
+    """MqttClient stellt exakte und Wildcard-Subscriptions über den Trie zu"""
+    client = MqttClient()
+    received = []
+    client.add_callback("suspension/+/status", lambda t, p: received.append(("wildcard", t)))
+    client.add_callback("suspension/test/status", lambda t, p: received.append(("exact", t)))
+
+    client._on_message(None, None, SimpleNamespace(topic="suspension/test/status", payload=b"{}"))
+    assert received == [("exact", "suspension/test/status"), ("wildcard", "suspension/test/status")]
+
+    received.clear()
+    client.add_callback("suspension/#", lambda t, p: received.append(("all", t)))
+    client._on_message(None, None, SimpleNamespace(topic="suspension/motor/status", payload=b"{}"))
+    assert received == [("wildcard", "suspension/motor/status"), ("all", "suspension/motor/status")]
+
+
+def test_service_routes_wildcard_handlers():
+    """MqttServiceBase ruft auch über Wildcards registrierte Handler auf"""
+    from common.suspension_core.mqtt.service import SimpleMqttService
+
+    service = SimpleMqttService("router_test")
+    service.mqtt.subscribe = lambda *args, **kwargs: None
+    received = []
+
+    async def handler(topic, message):
+        received.append((topic, message["value"]))
+        service._running = False
+
+    async def run():
+        service.register_topic_handler("suspension/measurements/+", handler)
+        service._running = True
+        service._message_queue.put("suspension/measurements/processed", {"value": 1})
+        await asyncio.wait_for(service._process_message_queue(), timeout=5.0)
+
+    asyncio.run(run())
+    assert received == [("suspension/measurements/processed", 1)]
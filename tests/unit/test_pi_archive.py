@@ -0,0 +1,90 @@
+"""
+Tests für Archivierung und Archiv-Abfragen des Pi Processing Service
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Der Service importiert suspension_core ohne Paketpräfix
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "common"))
+
+from backend.pi_processing_service.main import PiProcessingService
+from backend.pi_processing_service.processing.post_processor import ProcessingResult, ProcessingTask
+from suspension_core.config import ConfigManager
+
+
+def _service(tmp_path):
+    # Archiv über die Konfiguration im temporären Verzeichnis aktivieren
+    config = ConfigManager()
+    config.set("processing.archive.directory", str(tmp_path))
+    config.set("processing.archive.enabled", True)
+    try:
+        service = PiProcessingService()
+    finally:
+        config.set("processing.archive.enabled", False)
+    assert service.archive.root == str(tmp_path)
+    return service
+
+
+def test_archive_disabled_by_default():
+    """Ohne Konfiguration schreibt der Service kein Archiv"""
+    config = ConfigManager()
+    enabled = config.config.get("processing", {}).get("archive", {}).pop("enabled", None)
+    try:
+        assert PiProcessingService().archive is None
+    finally:
+        if enabled is not None:
+            config.set("processing.archive.enabled", enabled)
+
+
+def _archive(service, test_id, min_phase_shift, timestamp):
+    t = np.arange(100) / 1000.0
+    task = ProcessingTask(
+        task_id=test_id,
+        position="front_left",
+        raw_data={
+            "time_data": t,
+            "platform_position_data": np.sin(t),
+            "tire_force_data": np.full(100, 500.0),
+            "frequency_data": np.full(100, 12.0),
+            "phase_shift_data": np.zeros(100),
+            "start_time": timestamp,
+        },
+        timestamp=timestamp,
+    )
+    results = {} if min_phase_shift is None else {"min_phase_shift": min_phase_shift}
+    service._archive_test(task, ProcessingResult(test_id, "front_left", True, results, 0.1, time.time()))
+
+
+def test_missing_phase_shift_is_archived_as_unknown(tmp_path):
+    """Ohne φmin (None oder NaN) wird passed=None statt "nicht bestanden" archiviert"""
+    service = _service(tmp_path)
+    _archive(service, "none", None, 100.0)
+    _archive(service, "nan", float("nan"), 200.0)
+    _archive(service, "good", 42.0, 300.0)
+    _archive(service, "poor", 20.0, 400.0)
+
+    passed = {test["test_id"]: test["passed"] for test in service.archive.list_tests()}
+    assert passed == {"none": None, "nan": None, "good": True, "poor": False}
+
+
+def test_archive_query_and_get_commands(tmp_path):
+    """archive_query filtert den Index, archive_get lädt Kennwerte und angefragte Kanäle"""
+    service = _service(tmp_path)
+    _archive(service, "t1", 42.0, 100.0)
+    _archive(service, "t2", 20.0, 200.0)
+
+    query = service._archive_request("archive_query", {"command": "archive_query", "passed": True, "request_id": 7})
+    assert query["request_id"] == 7
+    assert [test["test_id"] for test in query["tests"]] == ["t1"]
+
+    loaded = service._archive_request("archive_get", {"test_id": "t2", "channels": ["tire_force", "unknown"]})
+    assert loaded["test"]["passed"] is False and loaded["test"]["min_phase_shift"] == 20.0
+    assert "time" in loaded["channels"]
+    assert loaded["signals"] == {"tire_force": [500.0] * 100}
+
+    missing = service._archive_request("archive_get", {"test_id": "nope"})
+    assert "error" in missing and "test" not in missing
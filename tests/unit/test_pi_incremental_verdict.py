@@ -0,0 +1,102 @@
+"""
+Tests für das inkrementelle Ergebnis des Pi Processing Service bei Testende
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Der Service importiert suspension_core ohne Paketpräfix
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "common"))
+
+from backend.pi_processing_service.main import PiProcessingService
+from backend.pi_processing_service.processing.worker_pool import (
+    MODE_PROCESS,
+    MODE_THREAD,
+    ProcessingWorkerPool,
+)
+from suspension_core.config import ConfigManager
+from suspension_core.mqtt import SampleBatch
+from suspension_core.mqtt.service import MqttTopics
+from suspension_core.egea.utils.signal_processing import create_egea_test_signals
+
+
+def _service():
+    # Kein Archiv: Tests schreiben nicht ins System-Verzeichnis
+    ConfigManager().set("processing.archive.enabled", False)
+    service = PiProcessingService()
+    assert service.archive is None
+    published = []
+
+    async def publish(topic, payload):
+        published.append(payload)
+        return True
+
+    service.publish = publish
+    return service, published
+
+
+def test_verdict_without_periods_is_unknown():
+    """Ohne auswertbare Periode wird kein "very_poor" publiziert, sondern "unknown\""""
+    service, published = _service()
+    analyzer = service.phase_shift_calculator.create_incremental_analyzer(500.0)
+
+    asyncio.run(service._publish_incremental_verdict(
+        {"analyzer": analyzer, "test_id": "t1", "position": "front_left"}
+    ))
+
+    assert published[0]["evaluation"] == "unknown"
+    assert published[0]["insufficient_data"] is True
+    assert published[0]["min_phase_shift"] is None
+
+
+def _run_test(service, t, platform, force, mode):
+    """Fährt einen Test durch den Service: Live-Batches, Testende, Post-Processing, Ergebnis"""
+    service.worker_pool = ProcessingWorkerPool(mode=mode, max_workers=1)
+
+    async def scenario():
+        service._start_test_data_collection("t1", {"position": "front_left", "duration": 15})
+        for i in range(0, len(t), 100):
+            await service.handle_raw_data(MqttTopics.RAW_DATA_COMPLETE, SampleBatch(
+                test_id="t1",
+                position="front_left",
+                sequence=i // 100,
+                sample_rate=1000.0,
+                columns={
+                    "elapsed": t[i:i + 100],
+                    "platform_position": platform[i:i + 100],
+                    "tire_force": force[i:i + 100],
+                },
+                static_weight=500.0,
+            ))
+        await service._finalize_test_data_collection("t1")
+        _, task = service.processing_queue.get_nowait()
+        await service._publish_results(await service._process_test_data(task))
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        service.worker_pool.shutdown()
+
+
+def test_early_verdict_equals_final_result():
+    """Das Verdict bei Testende und das finale Ergebnis des Post-Processing sind identisch"""
+    np.random.seed(42)
+    t, platform, force = create_egea_test_signals(duration=15.0, fs=1000.0, start_freq=20.0, end_freq=5.0)
+    # Rauschen auf der Plattformposition darf keine zusätzlichen TOPs erzeugen
+    platform = platform + np.random.normal(0, 0.01 * np.ptp(platform), len(platform))
+
+    for mode in (MODE_THREAD, MODE_PROCESS):
+        service, published = _service()
+        _run_test(service, t, platform, force, mode)
+
+        verdict = next(p for p in published if p.get("type") == "verdict")
+        final = next(p for p in published if "time_data" in p)  # suspension/test/final_result
+
+        assert verdict["insufficient_data"] is False and verdict["period_count"] > 0
+        assert final["min_phase_shift"] == verdict["min_phase_shift"]
+        assert final["evaluation"] == verdict["evaluation"]
+        assert final["period_count"] == verdict["period_count"]
+        assert final["min_phase_frequency"] == verdict["min_phase_frequency"]
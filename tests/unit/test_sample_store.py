@@ -0,0 +1,87 @@
+"""
+Tests für den spaltenbasierten Sample-Speicher des Pi Processing Service
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Das processing-Paket importiert suspension_core ohne Paketpräfix
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "common"))
+
+from backend.pi_processing_service.processing.sample_store import TestSampleStore
+
+
+def _payload(i):
+    return {
+        "test_id": "t1",
+        "position": "front_left",
+        "elapsed": i / 1000.0,
+        "platform_position": float(np.sin(i / 10.0)),
+        "tire_force": 500.0 + i,
+        "frequency": 12.5,
+        "phase_shift": 42.0,
+        "static_weight": 480.0,
+    }
+
+
+def test_append_and_column_export():
+    """Einzelne Payloads landen typisiert in den Spalten, Export ohne Kopie"""
+    store = TestSampleStore(capacity=16)
+    for i in range(10):
+        store.append(_payload(i))
+    store.append({"elapsed": 0.01, "dms_values": [1, 2, 3, 4, 5]})
+
+    assert len(store) == 11
+    assert store.static_weight == 480.0
+    columns = store.columns()
+    assert columns["time"].dtype == np.float64 and columns["frequency"].dtype == np.float32
+    np.testing.assert_array_equal(columns["tire_force"][:10], 500.0 + np.arange(10))
+    assert columns["tire_force"][10] == 0.0
+    assert columns["dms"].shape == (11, 4)
+    assert np.isnan(columns["dms"][0]).all()
+    np.testing.assert_array_equal(columns["dms"][10], [1, 2, 3, 4])
+    assert np.shares_memory(store.column("time"), store._analysis)
+
+    with pytest.raises(KeyError):
+        store.column("unknown")
+
+
+def test_growth_keeps_data_and_is_geometric():
+    """Überschreiten der Kapazität vergrößert geometrisch und erhält die Daten"""
+    store = TestSampleStore(capacity=4)
+    for i in range(3):
+        store.append(_payload(i))
+    store.extend(np.arange(3, 1000) / 1000.0, np.zeros(997), np.full(997, 600.0))
+
+    assert len(store) == 1000
+    assert store.capacity >= 1000
+    assert store.resize_count <= 2
+    np.testing.assert_allclose(store.column("time"), np.arange(1000) / 1000.0)
+    assert store.column("tire_force")[2] == 502.0 and store.column("tire_force")[-1] == 600.0
+    assert store.columns()["dms"].shape == (0, 4)
+
+    sized = TestSampleStore.for_duration(30.0, 1000.0)
+    assert sized.capacity == 33000
+    assert TestSampleStore.for_duration(0.0, 1000.0).capacity == TestSampleStore.MIN_CAPACITY
+
+
+def test_bytes_per_sample_vs_list_of_dicts():
+    """Spaltenspeicher braucht pro Sample ein Vielfaches weniger als die Dict-Liste"""
+    count = 5000
+    store = TestSampleStore.for_duration(count / 1000.0, 1000.0, margin=1.0)
+    payloads = [_payload(i) for i in range(count)]
+    for payload in payloads:
+        store.append(payload)
+
+    # Bisheriges Layout: Listeneintrag + Dict + eigene Float-Objekte je Sample
+    dict_bytes = sum(
+        8 + sys.getsizeof(p) + sum(sys.getsizeof(v) for v in p.values() if isinstance(v, float))
+        for p in payloads
+    ) / count
+    column_bytes = store.nbytes / store.capacity
+
+    assert column_bytes == 3 * 8 + 2 * 4 + 4 * 4
+    assert dict_bytes > 5 * column_bytes
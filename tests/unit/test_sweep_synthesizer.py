@@ -0,0 +1,65 @@
+"""
+Tests für den blockweisen Sweep-Synthesizer der Simulatoren
+"""
+
+import time
+
+import numpy as np
+
+from common.suspension_core.egea.utils.sweep_synthesizer import SweepModel, SweepSynthesizer
+
+
+def test_carrier_follows_instantaneous_frequency():
+    """Die Ableitung der Trägerphase entspricht der Sollfrequenz (keine Sweep-Verzerrung)"""
+    synthesizer = SweepSynthesizer(SweepModel(freq_start=25.0, freq_end=6.0, duration=30.0))
+    t = np.arange(0, 35.0, 0.001)
+
+    measured = np.diff(synthesizer.carrier_phase(t)) / (2 * np.pi * 0.001)
+    expected = synthesizer.frequency(t[:-1] + 0.0005)
+
+    np.testing.assert_allclose(measured, expected, atol=1e-3)
+    assert synthesizer.frequency(35.0) == 6.0
+
+
+def test_blocks_match_one_shot_generation():
+    """Fortlaufende Blöcke und Einzelsamples ergeben dasselbe Signal wie ein Gesamtblock"""
+    synthesizer = SweepSynthesizer(sample_rate=1000.0)
+    complete = synthesizer.generate(2.0)
+
+    streamed = [synthesizer.next_block(500) for _ in range(4)]
+    np.testing.assert_allclose(
+        np.concatenate([block.tire_force for block in streamed]), complete.tire_force
+    )
+    np.testing.assert_array_equal(np.vstack([block.dms for block in streamed]), complete.dms)
+
+    single = synthesizer.samples(complete.elapsed[1234])
+    assert single.platform_position[0] == complete.platform_position[1234]
+    assert complete.dms.dtype == np.uint16
+    assert complete.dms.max() <= 1023
+
+
+def test_phase_shift_model():
+    """Kraft eilt der Plattform um die Modellphase nach; Minimum abseits der Resonanz"""
+    model = SweepModel(min_phase=38.0, phase_boost=15.0, resonance_freq=11.8)
+    synthesizer = SweepSynthesizer(model)
+
+    assert synthesizer.phase_shift(11.8) == 53.0
+    assert synthesizer.phase_shift(25.0) < synthesizer.phase_shift(15.0)
+
+    constant = synthesizer.with_model(phase_boost=0.0, min_phase=45.0)
+    block = constant.generate(1.0)
+    np.testing.assert_allclose(block.phase_shift, 45.0)
+
+
+def test_complete_test_generated_quickly():
+    """Ein 30-s-Test mit 1 kHz wird in Millisekunden erzeugt"""
+    synthesizer = SweepSynthesizer(SweepModel(dms_noise=5.0), sample_rate=1000.0, seed=1)
+    synthesizer.generate()
+
+    start = time.perf_counter()
+    block = synthesizer.generate()
+    elapsed = time.perf_counter() - start
+
+    assert len(block) == 30_000
+    assert block.dms.shape == (30_000, 4)
+    assert elapsed < 0.1
@@ -0,0 +1,103 @@
+"""
+Tests für das Latenz-Tracing der Pipeline (Stufen-Zeitstempel, Histogramme, Wasserfall)
+"""
+
+import json
+import time
+
+from common.suspension_core.tracing import (
+    STAGE_ANALYSIS_END,
+    STAGE_ANALYSIS_START,
+    STAGE_CAN_RECEIVE,
+    STAGE_GUI_RENDER,
+    STAGE_MQTT_PUBLISH,
+    STAGE_MQTT_RECEIVE,
+    STAGE_QUEUE_ENTER,
+    STAGE_RESULT_PUBLISH,
+    StageHistogram,
+    Tracer,
+    format_waterfall,
+    trace_id_of,
+)
+
+
+def test_disabled_tracer_records_nothing():
+    """Deaktivierter Tracer speichert nichts und kostet kaum Zeit"""
+    tracer = Tracer("bridge", enabled=False)
+
+    start = time.perf_counter()
+    for _ in range(100000):
+        tracer.stamp("t1", STAGE_CAN_RECEIVE)
+    elapsed = time.perf_counter() - start
+
+    assert tracer.complete("t1") is None
+    assert tracer.get_stats()["stamps"] == 0
+    assert elapsed < 0.5
+
+
+def test_spans_histograms_and_export():
+    """Stufen ergeben Spannen pro Trace; Abschluss füllt die Histogramme"""
+    tracer = Tracer("pi_processing", enabled=True)
+    for i in range(10):
+        tracer.stamp("t1", STAGE_MQTT_RECEIVE, count=50, timestamp=100.0 + i * 0.1)
+    tracer.stamp("t1", STAGE_QUEUE_ENTER, timestamp=101.0)
+    tracer.stamp("t1", STAGE_ANALYSIS_START, timestamp=101.02)
+    tracer.stamp("t1", STAGE_ANALYSIS_END, timestamp=101.5)
+    tracer.stamp("t1", STAGE_RESULT_PUBLISH, timestamp=101.51)
+
+    record = tracer.complete("t1")
+    receive = record["spans"][STAGE_MQTT_RECEIVE]
+    assert receive["count"] == 500
+    assert abs(receive["end"] - receive["start"] - 0.9) < 1e-9
+    assert list(record["spans"])[0] == STAGE_MQTT_RECEIVE
+    assert tracer.complete("t1") is None
+
+    summary = json.loads(json.dumps(tracer.export()))
+    histograms = summary["histograms"]
+    assert histograms[STAGE_ANALYSIS_END]["count"] == 1
+    assert 250.0 < histograms[STAGE_ANALYSIS_END]["max_ms"] < 1000.0
+    assert abs(histograms["total"]["mean_ms"] - 1510.0) < 1e-6
+    assert summary["traces"][0]["trace_id"] == "t1"
+    assert trace_id_of({"test_id": "t1"}) == "t1"
+
+    histogram = StageHistogram()
+    for value in [1.0] * 90 + [400.0] * 10:
+        histogram.add(value)
+    assert histogram.percentile(50) == 1.0
+    assert histogram.percentile(95) == 400.0
+
+
+def test_bounded_active_traces():
+    """Offene Traces sind begrenzt, der älteste wird verworfen"""
+    tracer = Tracer("bridge", enabled=True, max_traces=3)
+    for i in range(5):
+        tracer.stamp(f"t{i}", STAGE_CAN_RECEIVE)
+
+    stats = tracer.get_stats()
+    assert stats["active_traces"] == 3
+    assert stats["evicted"] == 2
+    assert tracer.trace("t0") is None
+    assert tracer.trace("t4")["spans"][STAGE_CAN_RECEIVE]["count"] == 1
+
+
+def test_waterfall_merges_services():
+    """Records verschiedener Prozesse werden über den Uhrenversatz zusammengeführt"""
+    bridge = Tracer("hardware_bridge", enabled=True)
+    bridge.stamp("t1", STAGE_CAN_RECEIVE, timestamp=10.0)
+    bridge.stamp("t1", STAGE_CAN_RECEIVE, timestamp=12.0)
+    bridge.stamp("t1", STAGE_MQTT_PUBLISH, timestamp=12.1)
+    bridge_record = bridge.complete("t1")
+    bridge_record["clock_offset"] = 1000.0
+
+    gui = Tracer("desktop_gui", enabled=True)
+    gui.stamp("t1", STAGE_GUI_RENDER, timestamp=5.0)
+    gui_record = gui.complete("t1")
+    gui_record["clock_offset"] = 1007.5  # anderer Prozess, andere monotone Basis
+
+    text = format_waterfall("t1", [gui_record, {"type": "summary", "traces": [], "clock_offset": 0.0}, bridge_record])
+    lines = text.splitlines()
+
+    assert "gesamt 2500.0 ms" in lines[0]
+    assert [line.split()[0] for line in lines[2:]] == [STAGE_CAN_RECEIVE, STAGE_MQTT_PUBLISH, STAGE_GUI_RENDER]
+    assert "hardware_bridge" in lines[2] and "desktop_gui" in lines[4]
+    assert "Keine Trace-Daten" in format_waterfall("t2", [bridge_record])
@@ -0,0 +1,109 @@
+"""
+Tests für den Worker-Pool des Pi Processing Service (Prozess-/Thread-Modus, Absturz, Beenden)
+"""
+
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Das processing-Paket importiert suspension_core ohne Paketpräfix
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "common"))
+
+from backend.pi_processing_service.processing.post_processor import ProcessingTask
+from backend.pi_processing_service.processing.worker_pool import (
+    MODE_PROCESS,
+    MODE_THREAD,
+    ProcessingWorkerPool,
+)
+
+
+def _task(task_id="t1", count=2000):
+    t = np.arange(count) / 1000.0
+    return ProcessingTask(
+        task_id=task_id,
+        position="front_left",
+        raw_data={
+            "time_data": t,
+            "platform_position_data": 3.0 * np.sin(2 * np.pi * 12 * t),
+            "tire_force_data": 500 + 80 * np.sin(2 * np.pi * 12 * t + 0.7),
+            "frequency_data": np.full(count, 12.0),
+            "phase_shift_data": np.full(count, 40.0),
+            "static_weight": 500.0,
+        },
+        timestamp=time.time(),
+    )
+
+
+def test_process_and_thread_mode_return_same_result():
+    """Prozessmodus (Shared Memory) liefert dasselbe Ergebnis wie der Thread-Modus"""
+    results = {}
+    for mode in (MODE_THREAD, MODE_PROCESS):
+        pool = ProcessingWorkerPool(mode=mode, max_workers=1)
+        try:
+            results[mode] = asyncio.run(pool.submit(_task()))
+            stats = pool.get_stats()
+        finally:
+            pool.shutdown()
+        assert stats["tasks_completed"] == 1 and stats["tasks_failed"] == 0
+
+    assert results[MODE_PROCESS].success and results[MODE_THREAD].success
+    assert results[MODE_PROCESS].results["min_phase_shift"] == results[MODE_THREAD].results["min_phase_shift"]
+    assert results[MODE_PROCESS].results["phase_shift_result"]["period_count"] > 0
+
+
+def test_latency_independent_of_task_clock():
+    """Die Latenz misst echte Sekunden ab Task-Erstellung, nicht den Zeitstempel der injizierten Uhr"""
+    pool = ProcessingWorkerPool(mode=MODE_THREAD, max_workers=1)
+    task = _task()
+    task.timestamp = 1_700_000_000.0  # z.B. SteppedClock
+    try:
+        asyncio.run(pool.submit(task))
+        stats = pool.get_stats()
+    finally:
+        pool.shutdown()
+
+    assert 0.0 < stats["last_latency"] < 60.0
+
+
+def test_worker_crash_restarts_pool():
+    """Ein abgestürzter Worker-Prozess liefert ein Fehlerergebnis, danach läuft der Pool wieder"""
+    pool = ProcessingWorkerPool(mode=MODE_PROCESS, max_workers=1)
+    pool.start()
+    try:
+        with pytest.raises(BrokenProcessPool):
+            pool._executor.submit(os._exit, 1).result(timeout=60)
+
+        failed = asyncio.run(pool.submit(_task("crashed")))
+        assert not failed.success and failed.error_message
+        assert pool.restarts == 1
+
+        recovered = asyncio.run(pool.submit(_task("after_restart")))
+        assert recovered.success
+        assert pool.get_stats()["tasks_failed"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_invalid_task_and_shutdown():
+    """Fehlerhafte Tasks ergeben success=False; nach shutdown startet submit den Pool neu"""
+    pool = ProcessingWorkerPool(mode=MODE_THREAD, max_workers=1)
+    task = _task()
+    task.raw_data["time_data"] = np.empty(0)
+
+    result = asyncio.run(pool.submit(task))
+    assert not result.success and "Zeitreihen" in result.error_message
+
+    pool.shutdown()
+    assert pool._executor is None
+    pool.shutdown()  # idempotent
+    assert asyncio.run(pool.submit(_task())).success
+    pool.shutdown()
+
+    with pytest.raises(ValueError):
+        ProcessingWorkerPool(mode="gpu")
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Lastgenerator und Durchsatz-Benchmark für die MQTT-Pipeline
+
+Startet K virtuelle Prüfstände, die gleichzeitig komplette Test-Lebenszyklen
+gegen einen PiProcessingService fahren: Status "started", Messdaten-Stream
+als Binär-Batches (Sweep-Modell der Simulatoren) mit einstellbarer Rate,
+Status "completed", dann Warten auf das Ergebnis. Broker ist ein LocalBroker
+im selben Prozess, sodass kein Mosquitto nötig ist.
+
+Pro Lastniveau K werden ausgegeben:
+- Ergebnis-Latenz (p50/p95/p99) vom Testende bis zum inkrementellen Verdict
+  und bis zum finalen Ergebnis
+- Verlorene Samples (gesendet minus ausgewertet, Broker- und Queue-Verwürfe)
+- Broker-Durchsatz in Nachrichten/s und MB/s
+- Tiefe der Processing-Queue und der Ingest-Queue des Services
+
+Das erste K, bei dem Samples verloren gehen, Ergebnisse ausbleiben oder die
+p95-Latenz ein Vielfaches der Latenz beim kleinsten K und zugleich eine
+absolute Marge darüber erreicht, wird als Sättigungspunkt gemeldet. Die Latenz
+wird nur bei mindestens --min-tests Ergebnissen pro Niveau bewertet.
+Lastgenerator, Broker und Service teilen sich einen Prozess; die gemessene
+Sättigung ist daher eine untere Schranke für getrennte Rechner.
+
+Usage:
+    python tools/pipeline_load_test.py --lanes 1,2,4,8
+    python tools/pipeline_load_test.py --lanes 1,4,16 --duration 10 --rate 1000 --tests 2
+    python tools/pipeline_load_test.py --lanes 8 --clock scaled:5 --json result.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / "common"))
+
+from backend.pi_processing_service.main import PiProcessingService  # noqa: E402
+from suspension_core.clock import Clock, create_clock  # noqa: E402
+from suspension_core.config import ConfigManager  # noqa: E402
+from suspension_core.egea.utils.sweep_synthesizer import SweepModel, SweepSynthesizer  # noqa: E402
+from suspension_core.mqtt import MqttHandler, MqttTopics  # noqa: E402
+from suspension_core.mqtt.local_broker import LocalBroker  # noqa: E402
+
+logger = logging.getLogger("pipeline_load_test")
+
+FINAL_RESULT_TOPIC = "suspension/test/final_result"
+POSITIONS = ("front_left", "front_right", "rear_left", "rear_right")
+
+
+@dataclass
+class TestRecord:
+    """Messwerte eines Tests"""
+
+    test_id: str
+    lane: int
+    samples_sent: int = 0
+    samples_rejected: int = 0  # publish() fehlgeschlagen
+    pacing_lag: float = 0.0  # maximale Verspätung des Streams in s
+    completed_at: float = 0.0
+    verdict_latency: Optional[float] = None
+    final_latency: Optional[float] = None
+    samples_processed: Optional[int] = None
+
+
+@dataclass
+class LevelResult:
+    """Ergebnis eines Lastniveaus"""
+
+    lanes: int
+    tests: int
+    verdicts: int
+    finals: int
+    verdict_latency_ms: Dict[str, float]
+    final_latency_ms: Dict[str, float]
+    samples_sent: int
+    samples_lost: int
+    broker_dropped: int
+    ingest_dropped: int
+    broker_messages_per_second: float
+    broker_mb_per_second: float
+    processing_queue_max: int
+    processing_queue_mean: float
+    ingest_queue_max: int
+    max_pacing_lag_ms: float
+    wall_time: float
+    saturated: bool = False
+    records: List[TestRecord] = field(default_factory=list)
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """
+    Berechnet p50/p95/p99/max in Millisekunden
+
+    Args:
+        values: Latenzen in Sekunden
+
+    Returns:
+        Dict mit Perzentilen (leer ohne Werte)
+    """
+    if not values:
+        return {}
+    data = np.asarray(values) * 1000
+    p50, p95, p99 = np.percentile(data, [50, 95, 99])
+    return {"p50": float(p50), "p95": float(p95), "p99": float(p99), "max": float(data.max())}
+
+
+class ResultCollector:
+    """
+    Empfängt Verdicts und finale Ergebnisse (Rolle der GUI)
+
+    Die Callbacks laufen im Zustell-Thread des Brokers; Wartende werden über
+    den Event-Loop benachrichtigt.
+    """
+
+    def __init__(self, handler: MqttHandler, loop: asyncio.AbstractEventLoop):
+        self.handler = handler
+        self.loop = loop
+        self._records: Dict[str, TestRecord] = {}
+        self._done: Dict[str, asyncio.Event] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        self.handler.subscribe(MqttTopics.TEST_RESULTS_LIVE, self._on_live)
+        self.handler.subscribe(FINAL_RESULT_TOPIC, self._on_final)
+
+    def expect(self, record: TestRecord) -> asyncio.Event:
+        """Registriert einen Test, dessen Ergebnis erwartet wird"""
+        done = asyncio.Event()
+        with self._lock:
+            self._records[record.test_id] = record
+            self._done[record.test_id] = done
+        return done
+
+    def _on_live(self, topic: str, payload: Any):
+        if not isinstance(payload, dict) or payload.get("type") != "verdict":
+            return
+        now = time.monotonic()
+        with self._lock:
+            record = self._records.get(payload.get("test_id"))
+            if record is not None and record.verdict_latency is None and record.completed_at:
+                record.verdict_latency = now - record.completed_at
+
+    def _on_final(self, topic: str, payload: Any):
+        if not isinstance(payload, dict):
+            return
+        now = time.monotonic()
+        with self._lock:
+            record = self._records.get(payload.get("test_id"))
+            done = self._done.get(payload.get("test_id"))
+            if record is None or record.final_latency is not None or not record.completed_at:
+                return
+            record.final_latency = now - record.completed_at
+            record.samples_processed = payload.get("sample_count")
+        self.loop.call_soon_threadsafe(done.set)
+
+
+class VirtualTester:
+    """Virtueller Prüfstand: fährt Tests nacheinander und streamt Messdaten"""
+
+    def __init__(self, lane: int, handler: MqttHandler, collector: ResultCollector,
+                 clock: Clock, args: argparse.Namespace):
+        self.lane = lane
+        self.handler = handler
+        self.collector = collector
+        self.clock = clock
+        self.args = args
+        model = SweepModel(duration=args.duration)
+        self.synthesizer = SweepSynthesizer(model, sample_rate=args.rate)
+        self.static_weight = model.static_force
+        self.records: List[TestRecord] = []
+
+    async def run(self):
+        for index in range(self.args.tests):
+            self.records.append(await self.run_test(index))
+            await self.clock.async_sleep(self.args.pause)
+
+    async def run_test(self, index: int) -> TestRecord:
+        """
+        Fährt einen kompletten Test-Lebenszyklus
+
+        Args:
+            index: Laufende Testnummer der Lane
+
+        Returns:
+            TestRecord mit Latenzen
+        """
+        args = self.args
+        record = TestRecord(test_id=f"load_l{self.lane:02d}_t{index:03d}", lane=self.lane)
+        position = POSITIONS[self.lane % len(POSITIONS)]
+        done = self.collector.expect(record)
+
+        self.handler.publish(MqttTopics.TEST_STATUS, {
+            "status": "started",
+            "test_id": record.test_id,
+            "position": position,
+            "duration": args.duration,
+            "sample_rate": args.rate,
+        })
+
+        total = int(round(args.duration * args.rate))
+        start = self.clock.monotonic()
+        for sequence, offset in enumerate(range(0, total, args.batch)):
+            count = min(args.batch, total - offset)
+            block = self.synthesizer.block(offset / args.rate, count)
+            columns = {
+                "elapsed": block.elapsed,
+                "platform_position": block.platform_position,
+                "tire_force": block.tire_force,
+                "frequency": block.frequency,
+                "phase_shift": block.phase_shift,
+            }
+            if self.handler.publish_samples(
+                MqttTopics.RAW_DATA_COMPLETE, record.test_id, position, columns,
+                sequence=sequence, sample_rate=args.rate, static_weight=self.static_weight,
+            ):
+                record.samples_sent += count
+            else:
+                record.samples_rejected += count
+
+            # Echtzeit-Takt des Prüfstands (Drift wird über den Sollzeitpunkt ausgeglichen)
+            due = start + (offset + count) / args.rate
+            delay = due - self.clock.monotonic()
+            record.pacing_lag = max(record.pacing_lag, -delay)
+            await self.clock.async_sleep(max(delay, 0.0))
+
+        record.completed_at = time.monotonic()
+        self.handler.publish(MqttTopics.TEST_STATUS, {
+            "status": "completed",
+            "test_id": record.test_id,
+            "position": position,
+        })
+
+        try:
+            await asyncio.wait_for(done.wait(), timeout=args.result_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Kein finales Ergebnis für {record.test_id} nach {args.result_timeout}s")
+        return record
+
+
+def _connect(broker: LocalBroker, client_id: str, app_type: str) -> MqttHandler:
+    handler = MqttHandler(client_id=client_id, app_type=app_type)
+    broker.attach(handler)
+    if not handler.connect():
+        raise RuntimeError(f"Verbindung zum lokalen Broker fehlgeschlagen: {client_id}")
+    return handler
+
+
+async def run_level(lanes: int, args: argparse.Namespace) -> LevelResult:
+    """
+    Misst ein Lastniveau mit frischem Broker und Service
+
+    Args:
+        lanes: Anzahl gleichzeitiger virtueller Prüfstände
+        args: Kommandozeilenparameter
+
+    Returns:
+        LevelResult
+    """
+    clock = create_clock(args.clock)
+    broker = LocalBroker(capacity=args.broker_capacity)
+
+    config = ConfigManager(args.config)
+    config.set("processing.workers.mode", args.workers)
+    config.set("processing.archive.enabled", False)
+
+    service = PiProcessingService(args.config, clock=clock)
+    broker.attach(service)
+    service_task = asyncio.create_task(service.start())
+
+    deadline = time.monotonic() + 10.0
+    while service._status != "ready":
+        if service_task.done() or time.monotonic() > deadline:
+            raise RuntimeError("PiProcessingService nicht bereit")
+        await asyncio.sleep(0.05)
+
+    loop = asyncio.get_running_loop()
+    collector = ResultCollector(_connect(broker, "load_collector", "load_collector"), loop)
+    collector.subscribe()
+    testers = [
+        VirtualTester(lane, _connect(broker, f"load_tester_{lane}", "tester"), collector, clock, args)
+        for lane in range(lanes)
+    ]
+
+    # Queue-Tiefen während der Last abtasten
+    depths: List[int] = []
+    ingest_depths: List[int] = []
+
+    async def monitor():
+        while True:
+            depths.append(service.processing_queue.qsize())
+            ingest_depths.append(service._message_queue.qsize())
+            await asyncio.sleep(0.1)
+
+    monitor_task = asyncio.create_task(monitor())
+    started = time.monotonic()
+    await asyncio.gather(*(tester.run() for tester in testers))
+    wall_time = time.monotonic() - started
+    monitor_task.cancel()
+
+    broker_stats = broker.get_stats()
+    ingest_stats = service._message_queue.get_stats()
+
+    # Herunterfahren
+    for tester in testers:
+        tester.handler.disconnect()
+    collector.handler.disconnect()
+    service._running = False
+    await service_task
+    await service.stop()
+    broker.stop()
+
+    records = [record for tester in testers for record in tester.records]
+    verdicts = [r.verdict_latency for r in records if r.verdict_latency is not None]
+    finals = [r.final_latency for r in records if r.final_latency is not None]
+    sent = sum(r.samples_sent + r.samples_rejected for r in records)
+    lost = sum(
+        r.samples_sent + r.samples_rejected - (r.samples_processed or 0) for r in records
+    )
+
+    return LevelResult(
+        lanes=lanes,
+        tests=len(records),
+        verdicts=len(verdicts),
+        finals=len(finals),
+        verdict_latency_ms=percentiles(verdicts),
+        final_latency_ms=percentiles(finals),
+        samples_sent=sent,
+        samples_lost=lost,
+        broker_dropped=broker_stats["dropped"],
+        ingest_dropped=ingest_stats["dropped_total"],
+        broker_messages_per_second=broker_stats["messages_in"] / wall_time,
+        broker_mb_per_second=broker_stats["bytes_in"] / wall_time / 1e6,
+        processing_queue_max=max(depths, default=0),
+        processing_queue_mean=float(np.mean(depths)) if depths else 0.0,
+        ingest_queue_max=ingest_stats["high_watermark"],
+        max_pacing_lag_ms=max((r.pacing_lag for r in records), default=0.0) * 1000,
+        wall_time=wall_time,
+        records=records,
+    )
+
+
+def mark_saturation(
+    results: List[LevelResult],
+    factor: float,
+    margin_ms: float = 100.0,
+    min_tests: int = 5,
+) -> Optional[int]:
+    """
+    Markiert gesättigte Lastniveaus
+
+    Gesättigt ist ein Niveau mit verlorenen Samples, fehlenden Ergebnissen
+    oder einer gestiegenen p95-Latenz. Die Latenz zählt nur, wenn das Niveau
+    und die Basis (kleinstes Niveau mit genügend Ergebnissen) je mindestens
+    min_tests finale Ergebnisse haben und p95 sowohl factor × Basis als auch
+    Basis + margin_ms überschreitet - einzelne Ausreißer kleiner Stichproben
+    im Millisekundenbereich gelten nicht als Sättigung.
+
+    Args:
+        results: Ergebnisse der Lastniveaus in aufsteigender Reihenfolge
+        factor: Relativer p95-Anstieg gegenüber der Basis
+        margin_ms: Absoluter p95-Mindestanstieg in ms
+        min_tests: Mindestanzahl finaler Ergebnisse für die Latenzbewertung
+
+    Returns:
+        Kleinstes gesättigtes K oder None
+    """
+    baseline = next(
+        (r.final_latency_ms["p95"] for r in results if r.final_latency_ms and r.finals >= min_tests),
+        None,
+    )
+    limit = None if baseline is None else max(factor * baseline, baseline + margin_ms)
+    for result in results:
+        p95 = result.final_latency_ms.get("p95")
+        result.saturated = (
+            result.samples_lost > 0
+            or result.finals < result.tests
+            or (limit is not None and p95 is not None and result.finals >= min_tests and p95 > limit)
+        )
+    return next((r.lanes for r in results if r.saturated), None)
+
+
+def print_report(results: List[LevelResult], saturation: Optional[int], min_tests: int = 0):
+    header = (
+        f"{'K':>4} {'Tests':>6} {'Verdict p50/p95 ms':>20} {'Final p50/p95/p99 ms':>24} "
+        f"{'Verloren':>9} {'Msg/s':>9} {'MB/s':>7} {'PQ max':>7} {'IQ max':>7} {'Lag ms':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        verdict = r.verdict_latency_ms
+        final = r.final_latency_ms
+        verdict_text = f"{verdict['p50']:.0f}/{verdict['p95']:.0f}" if verdict else "-"
+        final_text = f"{final['p50']:.0f}/{final['p95']:.0f}/{final['p99']:.0f}" if final else "-"
+        flag = " *" if r.saturated else ""
+        print(
+            f"{r.lanes:>4} {r.tests:>6} {verdict_text:>20} {final_text:>24} "
+            f"{r.samples_lost:>9} {r.broker_messages_per_second:>9.0f} {r.broker_mb_per_second:>7.2f} "
+            f"{r.processing_queue_max:>7} {r.ingest_queue_max:>7} {r.max_pacing_lag_ms:>8.1f}{flag}"
+        )
+    print()
+    few = [str(r.lanes) for r in results if r.finals < min_tests]
+    if few:
+        print(f"Latenz nicht bewertet für K={','.join(few)} (weniger als {min_tests} Ergebnisse, --tests erhöhen)")
+    if saturation is None:
+        print("Keine Sättigung im gemessenen Bereich")
+    else:
+        print(f"Sättigung ab K={saturation} (* = Samples verloren, Ergebnisse fehlen oder p95-Latenz gestiegen)")
+
+
+async def run(args: argparse.Namespace) -> List[LevelResult]:
+    results = []
+    for lanes in args.lanes:
+        logger.info(f"Lastniveau K={lanes}")
+        results.append(await run_level(lanes, args))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lastgenerator für die MQTT-Pipeline")
+    parser.add_argument("--lanes", default="1,2,4,8",
+                        help="Kommagetrennte Anzahl gleichzeitiger Prüfstände (Standard: 1,2,4,8)")
+    parser.add_argument("--tests", type=int, default=2, help="Tests pro Prüfstand und Lastniveau")
+    parser.add_argument("--duration", type=float, default=10.0, help="Testdauer in s")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Abtastrate in Hz")
+    parser.add_argument("--batch", type=int, default=50, help="Samples pro Binär-Frame")
+    parser.add_argument("--pause", type=float, default=1.0, help="Pause zwischen Tests in s")
+    parser.add_argument("--result-timeout", type=float, default=60.0,
+                        help="Maximale Wartezeit auf das finale Ergebnis in s")
+    parser.add_argument("--workers", choices=["process", "thread"], default="process",
+                        help="Worker-Pool-Modus des Processing Service")
+    parser.add_argument("--broker-capacity", type=int, default=100000,
+                        help="Maximale unzugestellte Nachrichten im Broker")
+    parser.add_argument("--clock", default="realtime", help="Uhr-Modus: realtime oder scaled:<N>")
+    parser.add_argument("--saturation-factor", type=float, default=2.0,
+                        help="p95-Anstieg gegenüber dem kleinsten bewerteten Niveau, ab dem ein Niveau als gesättigt gilt")
+    parser.add_argument("--saturation-margin-ms", type=float, default=100.0,
+                        help="Absoluter p95-Mindestanstieg in ms für Latenz-Sättigung")
+    parser.add_argument("--min-tests", type=int, default=5,
+                        help="Mindestanzahl Ergebnisse pro Niveau für die Latenzbewertung")
+    parser.add_argument("--config", help="Pfad zur Konfigurationsdatei des Services")
+    parser.add_argument("--json", help="Ergebnisse zusätzlich als JSON speichern")
+    parser.add_argument("--debug", action="store_true", help="Debug-Logging")
+
+    args = parser.parse_args()
+    args.lanes = [int(value) for value in args.lanes.split(",") if value.strip()]
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    logger.setLevel(logging.DEBUG if args.debug else logging.INFO)
+
+    results = asyncio.run(run(args))
+    saturation = mark_saturation(results, args.saturation_factor, args.saturation_margin_ms, args.min_tests)
+    print_report(results, saturation, args.min_tests)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"saturation": saturation, "levels": [asdict(r) for r in results]}, f, indent=2)
+        print(f"Ergebnisse gespeichert: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Wasserfall-Anzeige der Pipeline-Latenz eines Tests
+
+Sammelt die Trace-Nachrichten aller Services auf TRACE_TOPIC (Bridge, Pi
+Processing Service, GUI; Tracing aktiv mit SUSPENSION_TRACING=1) und zeigt
+pro Stufe Start, Dauer und Anzahl relativ zum ersten Stempel des Tests.
+Alternativ werden mitgeschnittene Nachrichten aus einer JSONL-Datei gelesen
+(eine Nachricht pro Zeile, z.B. mosquitto_sub -t suspension/diagnostics/trace).
+
+Usage:
+    python tools/trace_waterfall.py test_123 --broker localhost --timeout 60
+    python tools/trace_waterfall.py test_123 --file traces.jsonl
+    python tools/trace_waterfall.py test_123 --histograms
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / "common"))
+
+from suspension_core.tracing import STAGES, TRACE_TOPIC, format_waterfall
+
+
+def _has_trace(records: List[Dict[str, Any]], test_id: str) -> bool:
+    for record in records:
+        candidates = record.get("traces", []) if record.get("type") == "summary" else [record]
+        if any(trace.get("trace_id") == test_id for trace in candidates):
+            return True
+    return False
+
+
+def collect_from_file(path: str) -> List[Dict[str, Any]]:
+    """Liest Trace-Nachrichten aus einer JSONL-Datei"""
+    records = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+def collect_from_broker(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """
+    Abonniert TRACE_TOPIC und sammelt Nachrichten bis zum Timeout
+
+    Mit --histograms wird bis zum Timeout gewartet, sonst endet die Sammlung
+    eine Sekunde nach der letzten Trace-Nachricht des Tests.
+    """
+    from suspension_core.mqtt.client import MqttClient
+
+    records: List[Dict[str, Any]] = []
+    last_match = [0.0]
+    lock = threading.Lock()
+
+    def on_trace(topic: str, payload: Any):
+        if not isinstance(payload, dict):
+            return
+        with lock:
+            records.append(payload)
+            if _has_trace([payload], args.test_id):
+                last_match[0] = time.monotonic()
+
+    client = MqttClient(broker=args.broker, port=args.port, client_id=f"trace_waterfall_{int(time.time())}")
+    if not client.connect(timeout=5.0):
+        print(f"❌ Keine Verbindung zu {args.broker}:{args.port}")
+        return records
+
+    client.subscribe(TRACE_TOPIC, on_trace)
+    print(f"Warte auf Traces für {args.test_id} (max. {args.timeout:.0f} s) ...")
+
+    deadline = time.monotonic() + args.timeout
+    try:
+        while time.monotonic() < deadline:
+            time.sleep(0.2)
+            with lock:
+                settled = last_match[0] and time.monotonic() - last_match[0] > 1.0
+            if settled and not args.histograms:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.disconnect()
+
+    with lock:
+        return list(records)
+
+
+def print_histograms(records: List[Dict[str, Any]]):
+    """Gibt die jeweils letzten Stufen-Histogramme pro Service aus"""
+    summaries = {record.get("service"): record for record in records if record.get("type") == "summary"}
+    if not summaries:
+        print("Keine Histogramme empfangen")
+        return
+
+    order = {stage: index for index, stage in enumerate(STAGES + ("total",))}
+    for service, summary in sorted(summaries.items(), key=lambda item: str(item[0])):
+        print(f"\nHistogramme {service} (Abstand zur vorherigen Stufe):")
+        print(f"{'Stufe':<16} {'Anzahl':>7} {'Mittel ms':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'Max ms':>9}")
+        histograms = summary.get("histograms", {})
+        for stage in sorted(histograms, key=lambda name: order.get(name, len(order))):
+            h = histograms[stage]
+            print(
+                f"{stage:<16} {h['count']:>7} {h['mean_ms']:>10.1f} {h['p50_ms']:>9.1f} "
+                f"{h['p95_ms']:>9.1f} {h['p99_ms']:>9.1f} {h['max_ms']:>9.1f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wasserfall der Pipeline-Latenz eines Tests")
+    parser.add_argument("test_id", help="Test-ID (Trace-ID)")
+    parser.add_argument("--broker", default="localhost", help="MQTT-Broker")
+    parser.add_argument("--port", type=int, default=1883, help="MQTT-Port")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Maximale Wartezeit in s")
+    parser.add_argument("--file", help="Trace-Nachrichten aus JSONL-Datei statt vom Broker lesen")
+    parser.add_argument("--histograms", action="store_true", help="Zusätzlich Stufen-Histogramme ausgeben")
+
+    args = parser.parse_args()
+
+    records = collect_from_file(args.file) if args.file else collect_from_broker(args)
+
+    print(format_waterfall(args.test_id, records))
+    if args.histograms:
+        print_histograms(records)
+
+    sys.exit(0 if _has_trace(records, args.test_id) else 1)
+
+
+if __name__ == "__main__":
+    main()